@@ -6,7 +6,9 @@ import inspect
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from .models import Academia, UsuarioOperacional, AcademiaCampeonatoSenha
+from .services import autorizacao_sessao
 
 
 def academia_required(view_func):
@@ -20,10 +22,17 @@ def academia_required(view_func):
             messages.warning(request, 'Você precisa fazer login como academia para acessar esta página.')
             return redirect('academia_login')
         
+        # Snapshot válido na sessão: autorização sem consulta; a academia só é
+        # carregada se a view usar request.academia
+        if autorizacao_sessao.ler(request, autorizacao_sessao.ACADEMIA, academia_id) is not None:
+            request.academia = SimpleLazyObject(lambda: Academia.objects.get(id=academia_id))
+            return view_func(request, *args, **kwargs)
+        
         try:
             academia = Academia.objects.get(id=academia_id, ativo_login=True)
             
             # Verificar se credencial temporária está expirada
+            expira_em = None
             if credencial_id:
                 try:
                     credencial = AcademiaCampeonatoSenha.objects.get(id=credencial_id)
@@ -31,9 +40,11 @@ def academia_required(view_func):
                         messages.error(request, 'O acesso temporário da sua academia expirou. Para acessar novos eventos, aguarde o envio de novo convite.')
                         request.session.flush()
                         return redirect('academia_login')
+                    expira_em = credencial.data_expiracao
                 except AcademiaCampeonatoSenha.DoesNotExist:
                     pass
             
+            autorizacao_sessao.gravar(request, autorizacao_sessao.ACADEMIA, academia.id, expira_em=expira_em)
             request.academia = academia  # Adicionar academia ao request
             return view_func(request, *args, **kwargs)
         except Academia.DoesNotExist:
@@ -71,6 +82,10 @@ def operacional_required(view_func):
             messages.warning(request, 'Você precisa fazer login operacional para acessar esta página.')
             return redirect('login')
         
+        # Snapshot válido na sessão: perfil já validado, sem consulta
+        if autorizacao_sessao.ler(request, autorizacao_sessao.OPERACIONAL, request.user.pk) is not None:
+            return view_func(request, *args, **kwargs)
+        
         # Superusers sempre têm acesso
         if request.user.is_superuser:
             # Garantir que superuser tenha perfil
@@ -92,6 +107,10 @@ def operacional_required(view_func):
                     ativo=True,
                     senha_alterada=True
                 )
+            autorizacao_sessao.gravar(
+                request, autorizacao_sessao.OPERACIONAL, request.user.pk,
+                superuser=True, pode_resetar_campeonato=True, pode_criar_usuarios=True,
+            )
             return view_func(request, *args, **kwargs)
         
         # Verificar se o usuário tem perfil operacional e se está ativo
@@ -118,6 +137,13 @@ def operacional_required(view_func):
             )
             messages.info(request, 'Perfil operacional criado. Acesso válido por 30 dias.')
         
+        autorizacao_sessao.gravar(
+            request, autorizacao_sessao.OPERACIONAL, request.user.pk,
+            expira_em=perfil.data_expiracao,
+            superuser=False,
+            pode_resetar_campeonato=perfil.pode_resetar_campeonato,
+            pode_criar_usuarios=perfil.pode_criar_usuarios,
+        )
         return view_func(request, *args, **kwargs)
     
     return _wrapped_view
@@ -140,6 +166,26 @@ def operacional_ou_academia_required(view_func):
 
     return _wrapped_view
 
+def _permissao_sessao(request, permissao):
+    """
+    Flag do perfil operacional gravada no snapshot por operacional_required.
+
+    None quando não há snapshot válido (expirado, invalidado por alteração do
+    perfil ou sessão sem login operacional): quem chama consulta o banco.
+    """
+    snapshot = autorizacao_sessao.ler(request, autorizacao_sessao.OPERACIONAL, request.user.pk)
+    if snapshot is None or permissao not in snapshot:
+        return None
+    return bool(snapshot[permissao])
+
+
+def _redirect_sem_permissao(request):
+    organizacao = getattr(request, "organizacao", None)
+    if organizacao and getattr(organizacao, "slug", None):
+        return redirect('index', organizacao_slug=organizacao.slug)
+    return redirect('landing_publica')
+
+
 def pode_resetar_required(view_func):
     """Decorator para verificar se o usuário pode resetar campeonato"""
     @wraps(view_func)
@@ -148,20 +194,16 @@ def pode_resetar_required(view_func):
             messages.error(request, 'Você precisa estar autenticado.')
             return redirect('login')
         
-        try:
-            perfil = request.user.perfil_operacional
-            if not perfil.pode_resetar_campeonato:
-                messages.error(request, 'Você não tem permissão para resetar campeonato.')
-                organizacao = getattr(request, "organizacao", None)
-                if organizacao and getattr(organizacao, "slug", None):
-                    return redirect('index', organizacao_slug=organizacao.slug)
-                return redirect('landing_publica')
-        except UsuarioOperacional.DoesNotExist:
+        permitido = _permissao_sessao(request, 'pode_resetar_campeonato')
+        if permitido is None:
+            try:
+                permitido = request.user.perfil_operacional.pode_resetar_campeonato
+            except UsuarioOperacional.DoesNotExist:
+                permitido = False
+        
+        if not permitido:
             messages.error(request, 'Você não tem permissão para resetar campeonato.')
-            organizacao = getattr(request, "organizacao", None)
-            if organizacao and getattr(organizacao, "slug", None):
-                return redirect('index', organizacao_slug=organizacao.slug)
-            return redirect('landing_publica')
+            return _redirect_sem_permissao(request)
         
         return view_func(request, *args, **kwargs)
     
@@ -185,6 +227,11 @@ def pode_criar_usuarios_required(view_func):
         if request.user.is_superuser:
             return view_func(request, *args, **kwargs)
         
+        # Permissão do perfil operacional já validada na sessão: sem consulta
+        permitido_perfil = _permissao_sessao(request, 'pode_criar_usuarios')
+        if permitido_perfil:
+            return view_func(request, *args, **kwargs)
+        
         # Usuários com organizador têm acesso
         try:
             if hasattr(request.user, 'profile') and request.user.profile.organizador:
@@ -192,50 +239,22 @@ def pode_criar_usuarios_required(view_func):
         except Exception:
             pass
         
-        # Usuários com perfil operacional e permissão específica
-        try:
-            perfil = request.user.perfil_operacional
-            if perfil.pode_criar_usuarios:
-                return view_func(request, *args, **kwargs)
-        except UsuarioOperacional.DoesNotExist:
-            pass
+        # Usuários com perfil operacional e permissão específica (sem snapshot na sessão)
+        if permitido_perfil is None:
+            try:
+                perfil = request.user.perfil_operacional
+                if perfil.pode_criar_usuarios:
+                    return view_func(request, *args, **kwargs)
+            except UsuarioOperacional.DoesNotExist:
+                pass
         
         # Se chegou aqui, não tem permissão
         messages.error(request, 'Você não tem permissão para criar usuários operacionais.')
         # Se estivermos em um contexto multi-tenant, tentar redirecionar para o dashboard da organização
-        organizacao = getattr(request, "organizacao", None)
-        if organizacao and getattr(organizacao, "slug", None):
-            return redirect('index', organizacao_slug=organizacao.slug)
-        return redirect('landing_publica')
+        return _redirect_sem_permissao(request)
     
     return _wrapped_view
 
-from functools import wraps
-from django.shortcuts import redirect
-from .models import AcademiaCampeonatoSenha, Academia
-
-def academia_required(view_func):
-    @wraps(view_func)
-    def wrapper(request, *args, **kwargs):
-
-        academia_id = request.session.get("academia_id")
-
-        # Se não tem sessão → redireciona
-        if not academia_id:
-            return redirect("academia_login")
-
-        # Carrega a academia na requisição
-        try:
-            request.academia = Academia.objects.get(id=academia_id)
-        except Academia.DoesNotExist:
-            request.session.flush()
-            return redirect("academia_login")
-
-        return view_func(request, *args, **kwargs)
-
-    return wrapper
-
-
 def organizacao_required(view_func):
     """
     Garante que a request está associada a uma organização válida.
@@ -6,7 +6,7 @@ from django.http import JsonResponse
 from .models import (
     Organizador, UserProfile, Academia, Classe, Categoria, Atleta, Chave, Luta, 
     AdminLog, Inscricao, Campeonato, EquipeTecnicaCampeonato, PessoaEquipeTecnica, 
-    PesagemHistorico, CadastroOperacional
+    PesagemHistorico, CadastroOperacional, TarefaBackground
 )
 
 
@@ -187,6 +187,16 @@ class CadastroOperacionalAdmin(admin.ModelAdmin):
     date_hierarchy = 'data_cadastro'
 
 
+@admin.register(TarefaBackground)
+class TarefaBackgroundAdmin(admin.ModelAdmin):
+    list_display = ('id', 'tipo', 'status', 'progresso', 'tentativas', 'campeonato', 'criado_por', 'criado_em')
+    list_filter = ('status', 'tipo')
+    search_fields = ('tipo', 'mensagem')
+    raw_id_fields = ('campeonato', 'criado_por')
+    readonly_fields = ('criado_em', 'iniciado_em', 'concluido_em', 'erro')
+    ordering = ['-criado_em']
+
+
 class JudoAdminSite(admin.AdminSite):
     site_header = "Administração - Sistema de Judô"
     site_title = "Admin Judô"
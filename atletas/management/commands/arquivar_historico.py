@@ -0,0 +1,73 @@
+"""
+Arquiva o histórico de campeonatos encerrados em arquivos JSONL.gz e o remove da tabela.
+Uso: python manage.py arquivar_historico [--dias 30] [--campeonato-id N] [--diretorio DIR] [--simular]
+
+Um arquivo por campeonato em HISTORICO_ARQUIVO_DIR (ou --diretorio); sem um dos
+dois o comando recusa, pois apaga as linhas da tabela. Pesquisa offline com
+`manage.py buscar_historico_arquivado`.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from atletas.models import Campeonato, HistoricoSistema
+from atletas.services.historico import (
+    DIAS_RETENCAO,
+    arquivar_campeonato,
+    caminho_arquivo,
+    campeonatos_encerrados,
+    diretorio_arquivo,
+)
+
+
+class Command(BaseCommand):
+    help = 'Move o histórico de campeonatos encerrados para arquivos JSONL.gz por campeonato'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=DIAS_RETENCAO,
+            help=f'Arquivar campeonatos inativos com competição há mais de N dias (padrão: {DIAS_RETENCAO})',
+        )
+        parser.add_argument(
+            '--campeonato-id',
+            type=int,
+            help='Arquiva apenas este campeonato (precisa estar inativo)',
+        )
+        parser.add_argument('--diretorio', help='Diretório dos arquivos (padrão: HISTORICO_ARQUIVO_DIR)')
+        parser.add_argument(
+            '--simular',
+            action='store_true',
+            help='Apenas lista o que seria arquivado',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            diretorio = diretorio_arquivo(options.get('diretorio'))
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options.get('campeonato_id'):
+            campeonatos = Campeonato.objects.filter(id=options['campeonato_id'])
+            campeonato = campeonatos.first()
+            if campeonato is None:
+                raise CommandError('Campeonato não encontrado.')
+            if campeonato.ativo:
+                raise CommandError('O campeonato está ativo; o histórico de temporadas ativas fica na tabela.')
+        else:
+            campeonatos = campeonatos_encerrados(options['dias'])
+
+        total = 0
+        for campeonato in campeonatos:
+            caminho = caminho_arquivo(campeonato, diretorio)
+            if options['simular']:
+                quantidade = HistoricoSistema.objects.filter(campeonato=campeonato).count()
+                self.stdout.write(f'  {campeonato.nome} (ID: {campeonato.id}): {quantidade} registro(s) → {caminho}')
+                total += quantidade
+                continue
+            arquivados = arquivar_campeonato(campeonato, diretorio)
+            total += arquivados
+            self.stdout.write(self.style.SUCCESS(
+                f'  ✓ {campeonato.nome} (ID: {campeonato.id}): {arquivados} registro(s) → {caminho}'
+            ))
+
+        acao = 'seriam arquivados' if options['simular'] else 'arquivados'
+        self.stdout.write(self.style.SUCCESS(f'✓ {total} registro(s) de histórico {acao}'))
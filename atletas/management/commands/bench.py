@@ -0,0 +1,325 @@
+"""
+Suíte de benchmark dos caminhos quentes do dia do evento.
+Uso:
+    python manage.py bench [--academias 50] [--atletas 3000] [--categorias 200]
+                           [--repeticoes 5] [--saida bench.json]
+                           [--baseline bench_baseline.json] [--tolerancia 0.25]
+
+Monta um campeonato sintético, mede tempo e número de consultas de cada
+cenário e grava o resultado em JSON. Com --baseline, compara com um resultado
+anterior e falha (código de saída 1) se algum cenário fizer mais consultas ou
+ficar mais lento que a tolerância permitida.
+
+Os dados são criados dentro de uma transação desfeita ao final: o banco não é alterado.
+"""
+import json
+import random
+import statistics
+import time
+from datetime import date
+from decimal import Decimal
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from atletas.models import (
+    Academia,
+    AcademiaCampeonato,
+    Atleta,
+    Campeonato,
+    Categoria,
+    Classe,
+    Inscricao,
+    Luta,
+    Organizador,
+)
+from atletas.services.indice_categorias import invalidar_indice_categorias
+from atletas.services.organizacao_cache import invalidar_cache_organizacoes
+from organizations.models import Organization
+
+CENARIOS = (
+    'index',
+    'montar_contexto_pesagem',
+    'registrar_peso',
+    'gerar_todas_chaves',
+    'registrar_vencedor',
+    'calcular_pontuacao_academias',
+    'ranking_global',
+    'metricas_evento',
+)
+
+
+class _Desfazer(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Mede tempo e consultas dos caminhos quentes (pesagem, chaves, mesa, ranking) num campeonato sintético'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--academias', type=int, default=50, help='Academias participantes (padrão: 50)')
+        parser.add_argument('--atletas', type=int, default=3000, help='Atletas inscritos (padrão: 3000)')
+        parser.add_argument('--categorias', type=int, default=200, help='Categorias de peso (padrão: 200)')
+        parser.add_argument('--repeticoes', type=int, default=5, help='Execuções por cenário (padrão: 5)')
+        parser.add_argument('--semente', type=int, default=42, help='Semente dos dados aleatórios (padrão: 42)')
+        parser.add_argument('--cenarios', nargs='+', choices=CENARIOS, help='Executa apenas os cenários informados')
+        parser.add_argument('--saida', help='Arquivo JSON onde gravar o resultado')
+        parser.add_argument('--baseline', help='Resultado JSON anterior para comparação')
+        parser.add_argument(
+            '--tolerancia',
+            type=float,
+            default=0.25,
+            help='Aumento relativo de tempo (mediana) aceito em relação à baseline (padrão: 0.25)',
+        )
+
+    def handle(self, *args, **options):
+        self.repeticoes = max(1, options['repeticoes'])
+        self.random = random.Random(options['semente'])
+        cenarios = options['cenarios'] or CENARIOS
+
+        resultados = {}
+        try:
+            with transaction.atomic(), override_settings(TAREFAS_EXECUCAO_IMEDIATA=True):
+                self._popular(options['academias'], options['atletas'], options['categorias'])
+                for nome in CENARIOS:
+                    if nome in cenarios:
+                        resultados[nome] = getattr(self, f'_cenario_{nome}')()
+                        self._exibir(nome, resultados[nome])
+                raise _Desfazer
+        except _Desfazer:
+            pass
+        finally:
+            # Índices em memória podem ter carregado dados desfeitos
+            invalidar_cache_organizacoes()
+            invalidar_indice_categorias()
+
+        relatorio = {
+            'meta': {
+                'academias': options['academias'],
+                'atletas': options['atletas'],
+                'categorias': options['categorias'],
+                'repeticoes': self.repeticoes,
+                'semente': options['semente'],
+                'banco': connection.vendor,
+                'django': django.get_version(),
+                'data': date.today().isoformat(),
+            },
+            'cenarios': resultados,
+        }
+        if options['saida']:
+            with open(options['saida'], 'w', encoding='utf-8') as arquivo:
+                json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"Resultado gravado em {options['saida']}"))
+
+        if options['baseline']:
+            self._comparar(relatorio, options['baseline'], options['tolerancia'])
+
+    # ----- medição -----
+    def _medir(self, executar):
+        """executar(i) é chamado `repeticoes` vezes; devolve mediana/melhor (ms) e consultas."""
+        duracoes = []
+        consultas = []
+        for i in range(self.repeticoes):
+            with CaptureQueriesContext(connection) as ctx:
+                inicio = time.perf_counter()
+                executar(i)
+                duracoes.append((time.perf_counter() - inicio) * 1000)
+            consultas.append(len(ctx.captured_queries))
+        return {
+            'mediana_ms': round(statistics.median(duracoes), 2),
+            'melhor_ms': round(min(duracoes), 2),
+            'consultas': max(consultas),
+        }
+
+    def _exibir(self, nome, resultado):
+        self.stdout.write(
+            f"{nome:<30} {resultado['consultas']:>9} consultas "
+            f"{resultado['mediana_ms']:>10.1f} ms (mediana) {resultado['melhor_ms']:>10.1f} ms (melhor)"
+        )
+
+    def _comparar(self, relatorio, caminho, tolerancia):
+        try:
+            with open(caminho, encoding='utf-8') as arquivo:
+                baseline = json.load(arquivo)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Não foi possível ler a baseline {caminho}: {e}')
+
+        if baseline.get('meta', {}).get('atletas') != relatorio['meta']['atletas']:
+            self.stdout.write(self.style.WARNING('Baseline gerada com outro tamanho de campeonato; comparação aproximada.'))
+
+        regressoes = []
+        for nome, atual in relatorio['cenarios'].items():
+            anterior = baseline.get('cenarios', {}).get(nome)
+            if not anterior:
+                continue
+            if atual['consultas'] > anterior['consultas']:
+                regressoes.append(f"{nome}: consultas {anterior['consultas']} -> {atual['consultas']}")
+            limite = anterior['mediana_ms'] * (1 + tolerancia)
+            if atual['mediana_ms'] > limite:
+                regressoes.append(
+                    f"{nome}: mediana {anterior['mediana_ms']:.1f} ms -> {atual['mediana_ms']:.1f} ms "
+                    f"(limite {limite:.1f} ms)"
+                )
+
+        if regressoes:
+            for regressao in regressoes:
+                self.stdout.write(self.style.ERROR(f"REGRESSÃO {regressao}"))
+            raise CommandError(f'{len(regressoes)} regressão(ões) em relação à baseline {caminho}')
+        self.stdout.write(self.style.SUCCESS('Sem regressões em relação à baseline'))
+
+    # ----- dados sintéticos -----
+    def _popular(self, num_academias, num_atletas, num_categorias):
+        sufixo = f'{int(time.time())}-{self.random.randint(0, 9999)}'
+        self.organizacao = Organizador.objects.create(nome=f'Benchmark {sufixo}', slug=f'benchmark-{sufixo}')
+        # bulk_create evita o post_save de Campeonato (credenciais das academias)
+        self.campeonato = Campeonato.objects.bulk_create([
+            Campeonato(
+                nome=f'Benchmark {sufixo}',
+                organizador=self.organizacao,
+                ativo=True,
+                data_competicao=date.today(),
+            )
+        ])[0]
+
+        # Classes x sexos x faixas de 5 kg até somar o número pedido de categorias
+        num_classes = max(1, num_categorias // 20)
+        classes = Classe.objects.bulk_create([
+            Classe(nome=f'BENCH {sufixo} {i}', idade_min=8 + 2 * i, idade_max=9 + 2 * i)
+            for i in range(num_classes)
+        ])
+        categorias = Categoria.objects.bulk_create([
+            Categoria(
+                classe=classes[i % num_classes],
+                sexo='M' if (i // num_classes) % 2 == 0 else 'F',
+                categoria_nome=f'Faixa {i // (2 * num_classes)}',
+                limite_min=Decimal(20 + 5 * (i // (2 * num_classes))),
+                limite_max=Decimal(25 + 5 * (i // (2 * num_classes))),
+                label=f'BENCH {i}',
+            )
+            for i in range(num_categorias)
+        ])
+        invalidar_indice_categorias()
+
+        academias = Academia.objects.bulk_create([
+            Academia(nome=f'Academia Benchmark {i}', cidade='Volta Redonda', estado='RJ', organizador=self.organizacao)
+            for i in range(num_academias)
+        ])
+        AcademiaCampeonato.objects.bulk_create([
+            AcademiaCampeonato(academia=academia, campeonato=self.campeonato, permitido=True)
+            for academia in academias
+        ])
+
+        # Distribuição desigual entre categorias (chaves de 1 a 32 atletas)
+        pesos = [self.random.choice((1, 1, 2, 3, 5, 8)) for _ in categorias]
+        escolhidas = self.random.choices(categorias, weights=pesos, k=num_atletas)
+        atletas = Atleta.objects.bulk_create([
+            Atleta(
+                nome=f'Atleta Benchmark {i:05d}',
+                sexo=categoria.sexo,
+                academia=academias[i % num_academias],
+                ano_nasc=2010,
+                faixa='BRANCA',
+            )
+            for i, categoria in enumerate(escolhidas)
+        ])
+        Inscricao.objects.bulk_create([
+            Inscricao(
+                atleta=atleta,
+                campeonato=self.campeonato,
+                classe_escolhida=categoria.classe.nome,
+                categoria_escolhida=categoria.categoria_nome,
+                classe_real=categoria.classe,
+                categoria_real=categoria,
+                peso=categoria.limite_min + 1,
+                peso_real=categoria.limite_min + 1,
+                status_inscricao='aprovado',
+                status_atual='aprovado',
+            )
+            for atleta, categoria in zip(atletas, escolhidas)
+        ])
+
+        organization = Organization.objects.create(name=f'Benchmark {sufixo}', slug=f'benchmark-{sufixo}')
+        self.usuario = get_user_model().objects.create_superuser(
+            f'benchmark-{sufixo}@bench.local',
+            'benchmark',
+            organization=organization,
+            role=get_user_model().Roles.ADMIN,
+        )
+        self.client = Client()
+        self.client.force_login(self.usuario)
+        self.slug = self.organizacao.slug
+
+    def _get(self, nome_url, **kwargs):
+        resposta = self.client.get(reverse(nome_url, kwargs={'organizacao_slug': self.slug, **kwargs}))
+        if resposta.status_code != 200:
+            raise CommandError(f'{nome_url} respondeu {resposta.status_code}')
+        return resposta
+
+    # ----- cenários -----
+    def _cenario_index(self):
+        return self._medir(lambda i: self._get('index'))
+
+    def _cenario_montar_contexto_pesagem(self):
+        from atletas.views import _montar_contexto_pesagem
+
+        request = RequestFactory().get('/pesagem/', {'campeonato_id': self.campeonato.id})
+        request.user = self.usuario
+        request.organizacao = self.organizacao
+        return self._medir(lambda i: _montar_contexto_pesagem(request))
+
+    def _cenario_registrar_peso(self):
+        from atletas.services.pesagem import registrar_peso
+
+        inscricoes = list(
+            Inscricao.objects.filter(campeonato=self.campeonato)
+            .select_related('atleta', 'classe_real', 'categoria_real')
+            .order_by('?')[:self.repeticoes]
+        )
+
+        def executar(i):
+            inscricao = inscricoes[i % len(inscricoes)]
+            registrar_peso(inscricao, inscricao.categoria_real.limite_min + Decimal('0.5'), usuario=self.usuario)
+
+        return self._medir(executar)
+
+    def _cenario_gerar_todas_chaves(self):
+        url = reverse('gerar_todas_chaves', kwargs={'organizacao_slug': self.slug})
+        return self._medir(lambda i: self.client.post(url))
+
+    def _cenario_registrar_vencedor(self):
+        if not Luta.objects.filter(chave__campeonato=self.campeonato).exists():
+            from atletas.services.chaveamento import gerar_chaves_campeonato
+            gerar_chaves_campeonato(self.campeonato)
+        lutas = list(
+            Luta.objects.filter(
+                chave__campeonato=self.campeonato,
+                concluida=False,
+                atleta_a__isnull=False,
+                atleta_b__isnull=False,
+            ).values_list('id', 'atleta_a_id')[:self.repeticoes]
+        )
+        if not lutas:
+            raise CommandError('Nenhuma luta disponível para registrar_vencedor')
+
+        def executar(i):
+            luta_id, vencedor_id = lutas[i % len(lutas)]
+            url = reverse('registrar_vencedor', kwargs={'organizacao_slug': self.slug, 'luta_id': luta_id})
+            self.client.post(url, {'vencedor': vencedor_id, 'tipo_vitoria': 'IPPON'})
+
+        return self._medir(executar)
+
+    def _cenario_calcular_pontuacao_academias(self):
+        from atletas.utils import calcular_pontuacao_academias
+
+        return self._medir(lambda i: calcular_pontuacao_academias(self.campeonato.id))
+
+    def _cenario_ranking_global(self):
+        return self._medir(lambda i: self._get('ranking_global'))
+
+    def _cenario_metricas_evento(self):
+        return self._medir(lambda i: self._get('metricas_evento'))
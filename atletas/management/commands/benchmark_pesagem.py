@@ -0,0 +1,116 @@
+"""
+Benchmark do modelo de leitura da pesagem (número de consultas e latência).
+Uso: python manage.py benchmark_pesagem [--tamanhos 100 500 2000] [--repeticoes 3]
+
+Os dados são criados dentro de uma transação desfeita ao final: o banco não é alterado.
+"""
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from atletas.models import (
+    Academia,
+    Atleta,
+    Campeonato,
+    Categoria,
+    Classe,
+    Inscricao,
+    Organizador,
+    PesagemHistorico,
+)
+from atletas.services.pesagem_contexto import inscricoes_pesagem, montar_linhas_pesagem
+
+
+class _Desfazer(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Mede consultas e latência da montagem da lista de pesagem para N inscrições'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tamanhos',
+            nargs='+',
+            type=int,
+            default=[100, 500, 2000],
+            help='Quantidades de inscrições a medir (padrão: 100 500 2000)',
+        )
+        parser.add_argument(
+            '--repeticoes',
+            type=int,
+            default=3,
+            help='Execuções por tamanho; é exibida a melhor latência (padrão: 3)',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'inscrições':>11} {'consultas':>10} {'latência (ms)':>14}")
+        for tamanho in options['tamanhos']:
+            try:
+                with transaction.atomic():
+                    campeonato = self._popular(tamanho)
+                    consultas, latencia = self._medir(campeonato, max(1, options['repeticoes']))
+                    raise _Desfazer
+            except _Desfazer:
+                pass
+            self.stdout.write(f"{tamanho:>11} {consultas:>10} {latencia * 1000:>14.1f}")
+
+    def _medir(self, campeonato, repeticoes):
+        melhor = None
+        consultas = 0
+        for _ in range(repeticoes):
+            with CaptureQueriesContext(connection) as ctx:
+                inicio = time.perf_counter()
+                linhas = montar_linhas_pesagem(inscricoes_pesagem(campeonato), campeonato)
+                duracao = time.perf_counter() - inicio
+            assert linhas, 'Nenhuma linha de pesagem montada'
+            consultas = len(ctx.captured_queries)
+            melhor = duracao if melhor is None else min(melhor, duracao)
+        return consultas, melhor
+
+    def _popular(self, tamanho):
+        organizador = Organizador.objects.create(nome='Benchmark Pesagem', slug=f'benchmark-pesagem-{tamanho}')
+        # bulk_create evita o post_save de Campeonato (credenciais das academias)
+        campeonato = Campeonato.objects.bulk_create([
+            Campeonato(nome=f'Benchmark {tamanho}', organizador=organizador, ativo=False)
+        ])[0]
+        academias = Academia.objects.bulk_create([
+            Academia(nome=f'Academia Benchmark {i}', cidade='SP', estado='SP', organizador=organizador)
+            for i in range(20)
+        ])
+        classe, _ = Classe.objects.get_or_create(nome='BENCH', defaults={'idade_min': 10, 'idade_max': 11})
+        categorias = Categoria.objects.bulk_create([
+            Categoria(
+                classe=classe, sexo='M', categoria_nome=f'Bench {i}',
+                limite_min=Decimal(30 + 5 * i), limite_max=Decimal(35 + 5 * i), label=f'BENCH - {i}',
+            )
+            for i in range(8)
+        ])
+        atletas = Atleta.objects.bulk_create([
+            Atleta(nome=f'Atleta {i:05d}', sexo='M', academia=academias[i % len(academias)], ano_nasc=2014)
+            for i in range(tamanho)
+        ])
+        inscricoes = Inscricao.objects.bulk_create([
+            Inscricao(
+                atleta=atleta,
+                campeonato=campeonato,
+                classe_escolhida=classe.nome,
+                categoria_escolhida=categorias[i % len(categorias)].categoria_nome,
+                classe_real=classe if i % 3 else None,
+                # Parte das inscrições sem categoria força a busca por peso
+                categoria_real=categorias[i % len(categorias)] if i % 2 else None,
+                peso_real=Decimal(31 + (i % 40)),
+                status_atual='aprovado',
+                status_inscricao='aprovado',
+            )
+            for i, atleta in enumerate(atletas)
+        ])
+        PesagemHistorico.objects.bulk_create([
+            PesagemHistorico(inscricao=inscricao, campeonato=campeonato, peso_registrado=Decimal(31 + j))
+            for inscricao in inscricoes
+            for j in range(3)
+        ])
+        return campeonato
@@ -0,0 +1,50 @@
+"""
+Pesquisa offline nos arquivos de histórico gerados por `arquivar_historico`.
+Uso: python manage.py buscar_historico_arquivado [--campeonato-id N] [--texto "Pesagem"] [--tipo-acao PESAGEM] [--json]
+"""
+import glob
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from atletas.services.historico import buscar_arquivo, diretorio_arquivo
+
+
+class Command(BaseCommand):
+    help = 'Pesquisa registros de histórico arquivados (JSONL.gz) sem consultar o banco'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campeonato-id', type=int, help='Pesquisa apenas o arquivo deste campeonato')
+        parser.add_argument('--texto', default='', help='Trecho da descrição (sem distinção de caixa)')
+        parser.add_argument('--tipo-acao', default='', help='Filtra pelo tipo de ação (ex.: PESAGEM)')
+        parser.add_argument('--diretorio', help='Diretório dos arquivos (padrão: HISTORICO_ARQUIVO_DIR)')
+        parser.add_argument('--json', action='store_true', help='Uma linha JSON por registro encontrado')
+
+    def handle(self, *args, **options):
+        try:
+            diretorio = diretorio_arquivo(options.get('diretorio'))
+        except ValueError as e:
+            raise CommandError(str(e))
+        padrao = (
+            f"historico_campeonato_{options['campeonato_id']}_*.jsonl.gz"
+            if options.get('campeonato_id') else 'historico_campeonato_*.jsonl.gz'
+        )
+        arquivos = sorted(glob.glob(os.path.join(diretorio, padrao)))
+        if not arquivos:
+            self.stdout.write(self.style.WARNING(f'Nenhum arquivo de histórico em {diretorio}.'))
+            return
+
+        encontrados = 0
+        for caminho in arquivos:
+            for registro in buscar_arquivo(caminho, options['texto'], options['tipo_acao']):
+                encontrados += 1
+                if options['json']:
+                    self.stdout.write(json.dumps(registro, ensure_ascii=False))
+                else:
+                    self.stdout.write(
+                        f"{registro['data_hora']}  [{registro['tipo_acao']}]  "
+                        f"campeonato {registro['campeonato_id']}  {registro['descricao']}"
+                    )
+        if not options['json']:
+            self.stdout.write(self.style.SUCCESS(f'✓ {encontrados} registro(s) em {len(arquivos)} arquivo(s)'))
@@ -2,12 +2,9 @@
 Comando Django para gerar senhas para todas as academias que ainda não têm senha em campeonatos ativos.
 """
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from datetime import timedelta, datetime as dt
-import random
-import string
 
-from atletas.models import Academia, Campeonato, AcademiaCampeonatoSenha, AcademiaCampeonato
+from atletas.models import Academia, Campeonato
+from atletas.services.credenciais import provisionar_credenciais
 
 
 class Command(BaseCommand):
@@ -47,63 +44,26 @@ class Command(BaseCommand):
         for campeonato in campeonatos:
             self.stdout.write(f'\nProcessando campeonato: {campeonato.nome} (ID: {campeonato.id})')
             
-            # Buscar academias vinculadas a este campeonato
-            academias_vinculadas = AcademiaCampeonato.objects.filter(
-                campeonato=campeonato
-            ).select_related('academia')
+            # Academias vinculadas a este campeonato e com login ativo
+            academias = Academia.objects.filter(
+                vinculos_campeonatos__campeonato=campeonato, ativo_login=True
+            )
+            total_vinculadas = academias.count()
+            total_academias_processadas += total_vinculadas
+            self.stdout.write(f'  Encontradas {total_vinculadas} academias vinculadas e ativas.')
             
-            academias_ids = academias_vinculadas.values_list('academia_id', flat=True)
-            academias = Academia.objects.filter(id__in=academias_ids, ativo_login=True)
+            credenciais = provisionar_credenciais(campeonato)
+            senhas_geradas_campeonato = len(credenciais)
+            total_senhas_geradas += senhas_geradas_campeonato
             
-            self.stdout.write(f'  Encontradas {academias.count()} academias vinculadas e ativas.')
+            existentes = total_vinculadas - senhas_geradas_campeonato
+            if existentes:
+                self.stdout.write(self.style.WARNING(f'    {existentes} academia(s) já possuem senha.'))
             
-            senhas_geradas_campeonato = 0
-            
-            for academia in academias:
-                total_academias_processadas += 1
-                
-                # Verificar se já existe senha
-                senha_existente = AcademiaCampeonatoSenha.objects.filter(
-                    academia=academia,
-                    campeonato=campeonato
-                ).first()
-                
-                if senha_existente:
-                    self.stdout.write(
-                        self.style.WARNING(f'    {academia.nome}: Senha já existe (Login: {senha_existente.login})')
-                    )
-                    continue
-                
-                # Gerar login e senha
-                login = f"ACADEMIA_{academia.id:03d}"
-                senha_plana = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-                
-                # Calcular data de expiração (5 dias após término do campeonato)
-                data_expiracao = None
-                if campeonato.data_competicao:
-                    data_expiracao = timezone.make_aware(
-                        dt.combine(campeonato.data_competicao, dt.min.time())
-                    ) + timedelta(days=5)
-                
-                # Criar senha
-                senha_obj = AcademiaCampeonatoSenha.objects.create(
-                    academia=academia,
-                    campeonato=campeonato,
-                    login=login,
-                    senha_plana=senha_plana,
-                    data_expiracao=data_expiracao,
-                )
-                
-                # Definir senha (criptografa)
-                senha_obj.definir_senha(senha_plana)
-                senha_obj.save()
-                
-                senhas_geradas_campeonato += 1
-                total_senhas_geradas += 1
-                
+            for credencial in credenciais:
                 self.stdout.write(
                     self.style.SUCCESS(
-                        f'    {academia.nome}: Senha gerada - Login: {login} | Senha: {senha_plana}'
+                        f'    {credencial.academia.nome}: Senha gerada - Login: {credencial.login} | Senha: {credencial.senha_plana}'
                     )
                 )
             
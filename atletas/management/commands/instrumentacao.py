@@ -0,0 +1,55 @@
+"""
+Relatório da instrumentação por etapa (tempo, consultas e tempo de banco).
+Uso: python manage.py instrumentacao [--etapa pesagem.validar] [--json]
+
+Lê os resumos que cada processo (web e worker) publica no cache do Django.
+Com o cache em memória local, apenas o próprio processo do comando é visível:
+use um cache compartilhado (Redis/banco) ou o endpoint /<organizacao>/instrumentacao/.
+"""
+import json
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from atletas.services.instrumentacao import LIMITES_MS, resumos_publicados
+
+
+class Command(BaseCommand):
+    help = 'Exibe percentis de tempo e consultas por etapa publicados pelos processos da aplicação'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--etapa', help='Mostra apenas a etapa informada (ex.: chave.persistir_lutas)')
+        parser.add_argument('--json', action='store_true', help='Saída em JSON (inclui o histograma)')
+
+    def handle(self, *args, **options):
+        etapa = options.get('etapa')
+        processos = resumos_publicados()
+        for processo in processos:
+            if etapa:
+                processo['etapas'] = {k: v for k, v in processo['etapas'].items() if k == etapa}
+
+        if options['json']:
+            self.stdout.write(json.dumps({'limites_ms': list(LIMITES_MS), 'processos': processos}, indent=2))
+            return
+
+        if not processos:
+            self.stdout.write(self.style.WARNING(
+                'Nenhum resumo publicado. Com cache em memória local os processos web/worker '
+                'não são visíveis daqui; consulte /<organizacao>/instrumentacao/.'
+            ))
+            return
+
+        cabecalho = (
+            f"{'etapa':<32} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'max ms':>9} {'consultas':>10} {'db ms':>8}"
+        )
+        for processo in processos:
+            publicado = datetime.fromtimestamp(processo['em']).strftime('%d/%m/%Y %H:%M:%S')
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Processo {processo['pid']} (publicado em {publicado})"))
+            self.stdout.write(cabecalho)
+            for nome, dados in processo['etapas'].items():
+                self.stdout.write(
+                    f"{nome:<32} {dados['amostras']:>6} {dados['p50_ms']:>9.1f} {dados['p95_ms']:>9.1f} "
+                    f"{dados['p99_ms']:>9.1f} {dados['max_ms']:>9.1f} {dados['media_consultas']:>10.1f} "
+                    f"{dados['media_db_ms']:>8.1f}"
+                )
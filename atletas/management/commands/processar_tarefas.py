@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from atletas.services.tarefas import executar, recuperar_abandonadas, reservar_proxima
+from atletas.utils_historico import descarregar_historico
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker da fila de tarefas em segundo plano (geração de chaves, "
+        "recálculo de pontuação, PDFs). Consulta o banco periodicamente; "
+        "não depende de broker externo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=2.0,
+            help='Segundos de espera quando a fila está vazia (padrão: 2)',
+        )
+        parser.add_argument(
+            '--uma-vez',
+            action='store_true',
+            help='Processa as tarefas pendentes e encerra (útil em cron/testes)',
+        )
+
+    def handle(self, *args, **options):
+        intervalo = options['intervalo']
+        uma_vez = options['uma_vez']
+
+        reenfileiradas = recuperar_abandonadas()
+        if reenfileiradas:
+            self.stdout.write(self.style.WARNING(f"{reenfileiradas} tarefa(s) abandonada(s) reenfileirada(s)"))
+
+        self.stdout.write("Worker de tarefas iniciado")
+        processadas = 0
+        try:
+            while True:
+                close_old_connections()
+                tarefa = reservar_proxima()
+                if tarefa is None:
+                    if uma_vez:
+                        break
+                    time.sleep(intervalo)
+                    continue
+
+                self.stdout.write(f"→ Tarefa #{tarefa.id} ({tarefa.tipo}), tentativa {tarefa.tentativas}")
+                tarefa = executar(tarefa)
+                processadas += 1
+                if tarefa.status == 'CONCLUIDA':
+                    self.stdout.write(self.style.SUCCESS(f"  ✓ #{tarefa.id} concluída: {tarefa.mensagem}"))
+                elif tarefa.status == 'ERRO':
+                    self.stdout.write(self.style.ERROR(f"  ✗ #{tarefa.id} falhou: {tarefa.mensagem}"))
+                else:
+                    self.stdout.write(self.style.WARNING(f"  ↻ #{tarefa.id} {tarefa.mensagem}"))
+        finally:
+            # Grava o histórico ainda em buffer neste processo (fim normal ou Ctrl+C)
+            descarregar_historico()
+
+        self.stdout.write(self.style.SUCCESS(f"✓ {processadas} tarefa(s) processada(s)"))
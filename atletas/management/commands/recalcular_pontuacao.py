@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from atletas.models import Campeonato
+from atletas.services.pontuacao import recalcular_pontuacao_campeonato
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula do zero a pontuação das academias de um campeonato, o quadro "
+        "de medalhas (MedalhaAtleta) e a classificação salva nas chaves. "
+        "Os painéis usam a pontuação incremental; use este comando apenas para "
+        "corrigir inconsistências, após importações em massa ou, com --todos, "
+        "para preencher campeonatos anteriores à migração 0043."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--campeonato',
+            type=int,
+            help='ID do campeonato (padrão: campeonato ativo)',
+        )
+        parser.add_argument(
+            '--todos',
+            action='store_true',
+            help='Recalcula todos os campeonatos (o ativo por último, pois define Academia.pontos)',
+        )
+
+    def handle(self, *args, **options):
+        campeonato_id = options.get('campeonato')
+        if options.get('todos'):
+            if campeonato_id:
+                raise CommandError('Use --campeonato ou --todos, não os dois.')
+            campeonatos = list(Campeonato.objects.order_by('ativo', 'data_competicao', 'id'))
+        elif campeonato_id:
+            campeonatos = list(Campeonato.objects.filter(id=campeonato_id))
+        else:
+            campeonatos = list(Campeonato.objects.filter(ativo=True)[:1])
+
+        if not campeonatos:
+            raise CommandError('Campeonato não encontrado.')
+
+        for campeonato in campeonatos:
+            with transaction.atomic():
+                total = recalcular_pontuacao_campeonato(campeonato)
+            self.stdout.write(
+                self.style.SUCCESS(f'✓ Pontuação recalculada: {total} academia(s) em "{campeonato.nome}"')
+            )
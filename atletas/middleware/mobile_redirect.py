@@ -2,11 +2,19 @@
 import re
 from django.http import HttpResponseRedirect, HttpResponseNotFound
 
-from atletas.models import Organizador
+from atletas.services.organizacao_cache import resolver_organizacao
 
 
 class MobileRedirectMiddleware:
-    """Middleware que redireciona automaticamente para versões mobile"""
+    """
+    Middleware que redireciona automaticamente para versões mobile.
+
+    Apenas decide o redirecionamento no servidor; a resposta segue intacta
+    (inclusive StreamingHttpResponse/FileResponse, que não são lidas nem
+    copiadas). O script de detecção de largura de tela, antes injetado aqui
+    decodificando o corpo de toda resposta HTML, fica no fragmento
+    atletas/ui/_mobile_redirect.html, incluído pelos templates base.
+    """
     
     MOBILE_PATTERNS = [
         r'android',
@@ -19,6 +27,8 @@ class MobileRedirectMiddleware:
         r'opera mini',
         r'opera mobi'
     ]
+    # Uma única busca por requisição em vez de um re.search por padrão
+    MOBILE_REGEX = re.compile('|'.join(MOBILE_PATTERNS))
     
     def __init__(self, get_response):
         self.get_response = get_response
@@ -26,12 +36,11 @@ class MobileRedirectMiddleware:
     def __call__(self, request):
         # Verificar se já está na versão mobile ou se tem parâmetro ?desktop
         if request.GET.get('desktop') == '1' or 'mobile' in request.path:
-            response = self.get_response(request)
-            return response
+            return self.get_response(request)
         
         # Verificar User-Agent
         user_agent = request.META.get('HTTP_USER_AGENT', '').lower()
-        is_mobile = any(re.search(pattern, user_agent) for pattern in self.MOBILE_PATTERNS)
+        is_mobile = self.MOBILE_REGEX.search(user_agent) is not None
         
         # Verificar largura da tela (se disponível via cookie)
         screen_width = request.COOKIES.get('screen_width')
@@ -52,63 +61,9 @@ class MobileRedirectMiddleware:
             # Chave (apenas se for detalhe de chave específica)
             elif path.startswith('chaves/') and path.count('/') == 1 and path.replace('chaves/', '').isdigit():
                 chave_id = path.split('/')[-1]
-                try:
-                    int(chave_id)  # Verificar se é um ID válido
-                    return HttpResponseRedirect(f'/chave/mobile/{chave_id}/')
-                except ValueError:
-                    pass
-        
-        response = self.get_response(request)
+                return HttpResponseRedirect(f'/chave/mobile/{chave_id}/')
         
-        # Adicionar script para detectar largura da tela e redirecionar se necessário
-        if response.get('Content-Type', '').startswith('text/html'):
-            script = '''
-            <script>
-            (function() {
-                // Detectar largura da tela e definir cookie
-                var screenWidth = window.innerWidth;
-                if (!document.cookie.includes('screen_width')) {
-                    document.cookie = 'screen_width=' + screenWidth + '; path=/';
-                }
-                
-                // Verificar se já está na versão mobile ou tem desktop=1
-                if (window.location.href.includes('mobile') || window.location.href.includes('desktop=1')) {
-                    return;
-                }
-                
-                // Detectar mobile
-                var isMobile = /Android|webOS|iPhone|iPad|iPod|BlackBerry|IEMobile|Opera Mini/i.test(navigator.userAgent) || 
-                               screenWidth < 768;
-                
-                if (isMobile) {
-                    var path = window.location.pathname;
-                    
-                    // Pesagem
-                    if (path === '/pesagem/' || path === '/pesagem') {
-                        window.location.href = '/pesagem/mobile/';
-                        return;
-                    }
-                    
-                    // Detalhe da chave
-                    var chaveMatch = path.match(/^\\/chaves\\/(\\d+)\\/?$/);
-                    if (chaveMatch) {
-                        window.location.href = '/chave/mobile/' + chaveMatch[1] + '/';
-                        return;
-                    }
-                }
-            })();
-            </script>
-            '''
-            # Inserir script antes do fechamento do body
-            try:
-                content = response.content.decode('utf-8')
-                if '</body>' in content:
-                    content = content.replace('</body>', script + '</body>')
-                    response.content = content.encode('utf-8')
-            except (UnicodeDecodeError, AttributeError):
-                pass
-        
-        return response
+        return self.get_response(request)
 
 
 class OrganizacaoMiddleware:
@@ -152,9 +107,9 @@ class OrganizacaoMiddleware:
 
         slug = partes[0]
 
-        try:
-            organizacao = Organizador.objects.get(slug=slug, ativo=True)
-        except Organizador.DoesNotExist:
+        # Organização e campeonato ativo vêm do cache em processo (TTL + invalidação por sinais)
+        organizacao, campeonato_ativo = resolver_organizacao(slug)
+        if organizacao is None:
             # Se não encontrar organização para um path que deveria ser multi-tenant,
             # retornamos 404 explicando o problema.
             return HttpResponseNotFound("Organização não encontrada ou inativa.")
@@ -163,6 +118,7 @@ class OrganizacaoMiddleware:
         request.organizacao = organizacao
         request.organizador = organizacao  # alias para compatibilidade
         request.organizacao_slug = slug
+        request.campeonato_ativo = campeonato_ativo
 
         return self.get_response(request)
 
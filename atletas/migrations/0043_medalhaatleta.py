@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('atletas', '0042_chave_grupo_faixas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MedalhaAtleta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('colocacao', models.PositiveSmallIntegerField(choices=[(1, 'Ouro'), (2, 'Prata'), (3, 'Bronze')])),
+                ('classe', models.CharField(blank=True, max_length=20)),
+                ('sexo', models.CharField(blank=True, max_length=1)),
+                ('categoria', models.CharField(blank=True, max_length=100)),
+                ('atleta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='medalhas', to='atletas.atleta')),
+                ('campeonato', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='medalhas', to='atletas.campeonato')),
+                ('chave', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='medalhas', to='atletas.chave')),
+            ],
+            options={
+                'verbose_name': 'Medalha de Atleta',
+                'verbose_name_plural': 'Quadro de Medalhas',
+                'indexes': [models.Index(fields=['campeonato', 'atleta'], name='atletas_med_campeon_bf5ff1_idx'), models.Index(fields=['campeonato', 'classe'], name='atletas_med_campeon_9bdd44_idx'), models.Index(fields=['campeonato', 'sexo'], name='atletas_med_campeon_147d9c_idx'), models.Index(fields=['campeonato', 'categoria'], name='atletas_med_campeon_3bae5d_idx')],
+                'unique_together': {('chave', 'colocacao', 'atleta')},
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:56
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('atletas', '0043_medalhaatleta'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TarefaBackground',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(db_index=True, max_length=50, verbose_name='Tipo')),
+                ('parametros', models.JSONField(blank=True, default=dict, verbose_name='Parâmetros')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('EXECUTANDO', 'Executando'), ('CONCLUIDA', 'Concluída'), ('ERRO', 'Erro')], default='PENDENTE', max_length=20, verbose_name='Status')),
+                ('progresso', models.PositiveSmallIntegerField(default=0, verbose_name='Progresso (%)')),
+                ('mensagem', models.CharField(blank=True, max_length=255, verbose_name='Mensagem')),
+                ('resultado', models.JSONField(blank=True, null=True, verbose_name='Resultado')),
+                ('erro', models.TextField(blank=True, verbose_name='Erro')),
+                ('arquivo', models.FileField(blank=True, null=True, upload_to='tarefas/', verbose_name='Arquivo Gerado')),
+                ('tentativas', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('max_tentativas', models.PositiveSmallIntegerField(default=3, verbose_name='Máximo de Tentativas')),
+                ('executar_apos', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Executar Após')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('iniciado_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('concluido_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+                ('campeonato', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tarefas', to='atletas.campeonato', verbose_name='Campeonato')),
+                ('criado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tarefas_criadas', to=settings.AUTH_USER_MODEL, verbose_name='Criado por')),
+            ],
+            options={
+                'verbose_name': 'Tarefa em Segundo Plano',
+                'verbose_name_plural': 'Tarefas em Segundo Plano',
+                'ordering': ['-criado_em'],
+                'indexes': [models.Index(fields=['status', 'executar_apos'], name='atletas_tar_status_8ac8cf_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:08
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+# Cópia congelada das regras de atletas.services.grafo_chave na data desta
+# migração: o módulo pode mudar depois, a migração não.
+TIPOS_ELIMINATORIOS = ('eliminatoria_simples', 'eliminatoria_repescagem', 'chave_olimpica')
+CAMPOS_GRAFO = ['proxima_luta', 'posicao_proxima', 'luta_perdedor', 'posicao_perdedor']
+ROUND_REPESCAGEM = 100
+
+
+def _posicao(indice):
+    return 'A' if indice % 2 == 0 else 'B'
+
+
+def _rounds_ordenados(rounds, filtro=lambda r: True):
+    por_numero = {int(k): v for k, v in (rounds or {}).items() if str(k).isdigit()}
+    return [por_numero[r] for r in sorted(por_numero) if filtro(r)]
+
+
+def _encadear(grafo, rounds):
+    for atual, seguinte in zip(rounds, rounds[1:]):
+        for indice, luta_id in enumerate(atual):
+            if indice // 2 < len(seguinte):
+                grafo[luta_id]['proxima_luta'] = seguinte[indice // 2]
+                grafo[luta_id]['posicao_proxima'] = _posicao(indice)
+
+
+def _calcular_grafo(estrutura):
+    grafo = defaultdict(dict)
+    principais = _rounds_ordenados(estrutura.get('rounds'), lambda r: r < ROUND_REPESCAGEM)
+    _encadear(grafo, principais)
+
+    if estrutura.get('tipo') == 'eliminatoria_repescagem':
+        repescagem = estrutura.get('repescagem') or {}
+        rounds_repescagem = _rounds_ordenados(repescagem.get('rounds'))
+        luta_3_lugar = repescagem.get('luta_3_lugar')
+        _encadear(grafo, rounds_repescagem)
+
+        if principais and rounds_repescagem:
+            primeiro_repescagem = rounds_repescagem[0]
+            for indice, luta_id in enumerate(principais[0]):
+                if indice // 2 < len(primeiro_repescagem):
+                    grafo[luta_id]['luta_perdedor'] = primeiro_repescagem[indice // 2]
+                    grafo[luta_id]['posicao_perdedor'] = _posicao(indice)
+
+        if luta_3_lugar:
+            if len(principais) >= 2:
+                for luta_id in principais[-2]:
+                    if 'luta_perdedor' not in grafo[luta_id]:
+                        grafo[luta_id]['luta_perdedor'] = luta_3_lugar
+                        grafo[luta_id]['posicao_perdedor'] = 'B'
+            if rounds_repescagem and len(rounds_repescagem[-1]) == 1:
+                final_repescagem = rounds_repescagem[-1][0]
+                grafo[final_repescagem]['proxima_luta'] = luta_3_lugar
+                grafo[final_repescagem]['posicao_proxima'] = 'A'
+
+    return grafo
+
+
+def preencher_grafo(apps, schema_editor):
+    """Calcula o grafo de avanço das chaves eliminatórias já existentes."""
+    Chave = apps.get_model('atletas', 'Chave')
+    Luta = apps.get_model('atletas', 'Luta')
+    for chave in Chave.objects.filter(estrutura__tipo__in=TIPOS_ELIMINATORIOS).iterator():
+        grafo = _calcular_grafo(chave.estrutura)
+        lutas = list(Luta.objects.filter(chave_id=chave.id))
+        for luta in lutas:
+            destino = grafo.get(luta.id, {})
+            luta.proxima_luta = destino.get('proxima_luta')
+            luta.posicao_proxima = destino.get('posicao_proxima', '')
+            luta.luta_perdedor = destino.get('luta_perdedor')
+            luta.posicao_perdedor = destino.get('posicao_perdedor', '')
+        Luta.objects.bulk_update(lutas, CAMPOS_GRAFO)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('atletas', '0044_tarefabackground'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='luta',
+            name='luta_perdedor',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='luta',
+            name='posicao_perdedor',
+            field=models.CharField(blank=True, choices=[('A', 'Atleta A'), ('B', 'Atleta B')], max_length=1),
+        ),
+        migrations.AddField(
+            model_name='luta',
+            name='posicao_proxima',
+            field=models.CharField(blank=True, choices=[('A', 'Atleta A'), ('B', 'Atleta B')], max_length=1),
+        ),
+        migrations.RunPython(preencher_grafo, migrations.RunPython.noop),
+    ]
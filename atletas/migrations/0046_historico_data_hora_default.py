@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:27
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('atletas', '0045_luta_grafo_avanco'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='historicosistema',
+            name='data_hora',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Data e Hora'),
+        ),
+    ]
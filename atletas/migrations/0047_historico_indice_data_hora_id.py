@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('atletas', '0046_historico_data_hora_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historicosistema',
+            index=models.Index(fields=['data_hora', 'id'], name='atletas_his_data_ho_84b7e5_idx'),
+        ),
+    ]
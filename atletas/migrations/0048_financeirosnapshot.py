@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('atletas', '0047_historico_indice_data_hora_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FinanceiroSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dados', models.JSONField(blank=True, default=dict, verbose_name='Totais')),
+                ('inscricoes_desatualizado', models.BooleanField(default=True, verbose_name='Inscrições desatualizadas')),
+                ('conferencias_desatualizado', models.BooleanField(default=True, verbose_name='Conferências desatualizadas')),
+                ('despesas_desatualizado', models.BooleanField(default=True, verbose_name='Despesas desatualizadas')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('campeonato', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='financeiro_snapshot', to='atletas.campeonato', verbose_name='Campeonato')),
+            ],
+            options={
+                'verbose_name': 'Snapshot Financeiro',
+                'verbose_name_plural': 'Snapshots Financeiros',
+            },
+        ),
+    ]
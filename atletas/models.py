@@ -394,12 +394,22 @@ class Luta(models.Model):
         ('AZUL', 'Azul'),
     ]
     
+    POSICAO_CHOICES = [
+        ('A', 'Atleta A'),
+        ('B', 'Atleta B'),
+    ]
+    
     chave = models.ForeignKey(Chave, on_delete=models.CASCADE, related_name='lutas')
     atleta_a = models.ForeignKey(Atleta, on_delete=models.CASCADE, related_name='lutas_como_a', null=True, blank=True)
     atleta_b = models.ForeignKey(Atleta, on_delete=models.CASCADE, related_name='lutas_como_b', null=True, blank=True)
     vencedor = models.ForeignKey(Atleta, on_delete=models.CASCADE, related_name='lutas_vencidas', null=True, blank=True)
     round = models.IntegerField()  # 1, 2, 3... (fase da chave)
     proxima_luta = models.IntegerField(null=True, blank=True)  # ID da próxima luta
+    # Grafo de avanço (services.grafo_chave): posição do vencedor na próxima luta
+    # e destino do perdedor (repescagem / 3º lugar), definidos na geração da chave
+    posicao_proxima = models.CharField(max_length=1, choices=POSICAO_CHOICES, blank=True)
+    luta_perdedor = models.IntegerField(null=True, blank=True)  # ID da luta que recebe o perdedor
+    posicao_perdedor = models.CharField(max_length=1, choices=POSICAO_CHOICES, blank=True)
     concluida = models.BooleanField(default=False)
     tipo_vitoria = models.CharField(max_length=20, choices=TIPO_VITORIA_CHOICES, blank=True)
     pontos_vencedor = models.IntegerField(default=0)
@@ -748,6 +758,43 @@ class AcademiaPontuacao(models.Model):
         return f"{self.academia.nome} - {self.campeonato.nome} ({self.pontos_totais} pts)"
 
 
+class MedalhaAtleta(models.Model):
+    """
+    Quadro de medalhas materializado por campeonato.
+    Uma linha por medalha (1º, 2º ou 3º) conquistada em uma chave; reescrita
+    apenas quando a classificação da chave muda (services.pontuacao).
+    Classe, sexo e categoria são copiados da chave para filtrar o ranking
+    sem consultar inscrições.
+    """
+    COLOCACAO_CHOICES = [
+        (1, 'Ouro'),
+        (2, 'Prata'),
+        (3, 'Bronze'),
+    ]
+
+    campeonato = models.ForeignKey(Campeonato, on_delete=models.CASCADE, related_name='medalhas')
+    chave = models.ForeignKey(Chave, on_delete=models.CASCADE, related_name='medalhas')
+    atleta = models.ForeignKey(Atleta, on_delete=models.CASCADE, related_name='medalhas')
+    colocacao = models.PositiveSmallIntegerField(choices=COLOCACAO_CHOICES)
+    classe = models.CharField(max_length=20, blank=True)
+    sexo = models.CharField(max_length=1, blank=True)
+    categoria = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        verbose_name = "Medalha de Atleta"
+        verbose_name_plural = "Quadro de Medalhas"
+        unique_together = ('chave', 'colocacao', 'atleta')
+        indexes = [
+            models.Index(fields=['campeonato', 'atleta']),
+            models.Index(fields=['campeonato', 'classe']),
+            models.Index(fields=['campeonato', 'sexo']),
+            models.Index(fields=['campeonato', 'categoria']),
+        ]
+
+    def __str__(self):
+        return f"{self.atleta.nome} - {self.get_colocacao_display()} ({self.categoria})"
+
+
 class Despesa(models.Model):
     """Despesas e Receitas do campeonato"""
     TIPO_CHOICES = [
@@ -1304,7 +1351,8 @@ class HistoricoSistema(models.Model):
         verbose_name="Atleta"
     )
     dados_extras = models.JSONField(null=True, blank=True, verbose_name="Dados Extras", help_text="Dados adicionais em formato JSON")
-    data_hora = models.DateTimeField(auto_now_add=True, verbose_name="Data e Hora")
+    # Hora do evento (gravada em lote depois, ver utils_historico): default em vez de auto_now_add
+    data_hora = models.DateTimeField(default=timezone.now, editable=False, verbose_name="Data e Hora")
     ip_address = models.GenericIPAddressField(null=True, blank=True, verbose_name="Endereço IP")
     
     class Meta:
@@ -1315,6 +1363,8 @@ class HistoricoSistema(models.Model):
             models.Index(fields=['tipo_acao', 'data_hora']),
             models.Index(fields=['campeonato', 'data_hora']),
             models.Index(fields=['usuario', 'data_hora']),
+            # Paginação por cursor sem filtro (services/historico.pagina_historico)
+            models.Index(fields=['data_hora', 'id']),
         ]
     
     def __str__(self):
@@ -1438,3 +1488,91 @@ class Ocorrencia(models.Model):
         if solucao:
             self.solucao = solucao
         self.save()
+
+
+class TarefaBackground(models.Model):
+    """
+    Fila de tarefas pesadas executadas fora da requisição.
+
+    As views apenas enfileiram (status PENDENTE) e retornam; o processo
+    `manage.py processar_tarefas` reserva e executa as tarefas, atualizando
+    progresso e status. O acompanhamento é feito por polling (JSON).
+    """
+    STATUS_CHOICES = [
+        ('PENDENTE', 'Pendente'),
+        ('EXECUTANDO', 'Executando'),
+        ('CONCLUIDA', 'Concluída'),
+        ('ERRO', 'Erro'),
+    ]
+
+    tipo = models.CharField(max_length=50, verbose_name="Tipo", db_index=True)
+    parametros = models.JSONField(default=dict, blank=True, verbose_name="Parâmetros")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDENTE', verbose_name="Status")
+    progresso = models.PositiveSmallIntegerField(default=0, verbose_name="Progresso (%)")
+    mensagem = models.CharField(max_length=255, blank=True, verbose_name="Mensagem")
+    resultado = models.JSONField(null=True, blank=True, verbose_name="Resultado")
+    erro = models.TextField(blank=True, verbose_name="Erro")
+    arquivo = models.FileField(upload_to='tarefas/', null=True, blank=True, verbose_name="Arquivo Gerado")
+
+    tentativas = models.PositiveSmallIntegerField(default=0, verbose_name="Tentativas")
+    max_tentativas = models.PositiveSmallIntegerField(default=3, verbose_name="Máximo de Tentativas")
+    executar_apos = models.DateTimeField(default=timezone.now, verbose_name="Executar Após")
+
+    campeonato = models.ForeignKey(
+        Campeonato,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='tarefas',
+        verbose_name="Campeonato"
+    )
+    criado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='tarefas_criadas',
+        verbose_name="Criado por"
+    )
+    criado_em = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+    iniciado_em = models.DateTimeField(null=True, blank=True, verbose_name="Iniciado em")
+    concluido_em = models.DateTimeField(null=True, blank=True, verbose_name="Concluído em")
+
+    class Meta:
+        verbose_name = "Tarefa em Segundo Plano"
+        verbose_name_plural = "Tarefas em Segundo Plano"
+        ordering = ['-criado_em']
+        indexes = [
+            models.Index(fields=['status', 'executar_apos']),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.tipo} ({self.get_status_display()})"
+
+    @property
+    def finalizada(self):
+        return self.status in ('CONCLUIDA', 'ERRO')
+
+
+class FinanceiroSnapshot(models.Model):
+    """
+    Totais financeiros agregados de um campeonato (painel financeiro).
+
+    Cada seção (inscrições, conferências, despesas) é recalculada com
+    agregações apenas quando marcada como desatualizada pelos sinais de
+    Inscricao, Pagamento/ConferenciaPagamento e Despesa
+    (ver atletas.services.financeiro).
+    """
+    campeonato = models.OneToOneField(Campeonato, on_delete=models.CASCADE, related_name='financeiro_snapshot', verbose_name="Campeonato")
+    dados = models.JSONField(default=dict, blank=True, verbose_name="Totais")
+    inscricoes_desatualizado = models.BooleanField(default=True, verbose_name="Inscrições desatualizadas")
+    conferencias_desatualizado = models.BooleanField(default=True, verbose_name="Conferências desatualizadas")
+    despesas_desatualizado = models.BooleanField(default=True, verbose_name="Despesas desatualizadas")
+    atualizado_em = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Snapshot Financeiro"
+        verbose_name_plural = "Snapshots Financeiros"
+
+    def __str__(self):
+        return f"Financeiro - {self.campeonato.nome}"
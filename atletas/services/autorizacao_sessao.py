@@ -0,0 +1,90 @@
+"""
+Snapshot de autorização guardado na sessão (academia_required / operacional_required).
+
+Depois da primeira validação completa, o decorator grava na sessão um
+snapshot assinado (django.core.signing, com timestamp) com o que a
+autorização precisa: id da academia/usuário, expiração da credencial ou do
+perfil e as flags do perfil operacional. Enquanto o snapshot for válido a
+autorização não consulta o banco.
+
+O snapshot é refeito (validação completa) quando:
+- passa de AUTORIZACAO_SESSAO_TTL segundos (limite para revogação entre processos);
+- a versão da academia/usuário muda: os sinais de Academia,
+  AcademiaCampeonatoSenha, UsuarioOperacional e User incrementam um contador
+  no cache do Django (ver atletas.signals). Com cache compartilhado a
+  revogação vale na hora em todos os processos; com o cache em memória
+  local (padrão) vale na hora neste processo e em até TTL nos demais;
+- a expiração gravada já passou.
+"""
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+
+CHAVE_SESSAO = '_autorizacao'
+SALT = 'atletas.autorizacao_sessao'
+
+ACADEMIA = 'academia'
+OPERACIONAL = 'operacional'
+
+
+def _ttl() -> int:
+    return getattr(settings, 'AUTORIZACAO_SESSAO_TTL', 60)
+
+
+def _chave_versao(tipo: str, identificador) -> str:
+    return f'atletas:autorizacao:{tipo}:{identificador}'
+
+
+def versao(tipo: str, identificador) -> int:
+    try:
+        return cache.get(_chave_versao(tipo, identificador), 0)
+    except Exception:
+        return 0
+
+
+def invalidar(tipo: str, identificador) -> None:
+    """Incrementa a versão: snapshots gravados antes deixam de valer."""
+    chave = _chave_versao(tipo, identificador)
+    try:
+        cache.incr(chave)
+    except ValueError:
+        cache.set(chave, 1, None)
+    except Exception:
+        pass
+
+
+def gravar(request, tipo: str, identificador, expira_em=None, **dados) -> None:
+    """Grava o snapshot da autorização que acabou de ser validada no banco."""
+    snapshot = {
+        'tipo': tipo,
+        'id': str(identificador),
+        'versao': versao(tipo, identificador),
+        'expira_em': expira_em.timestamp() if expira_em else None,
+    }
+    snapshot.update(dados)
+    request.session[CHAVE_SESSAO] = signing.dumps(snapshot, salt=SALT)
+
+
+def ler(request, tipo: str, identificador) -> Optional[Dict]:
+    """Snapshot válido para (tipo, identificador) ou None (exige validação completa)."""
+    token = request.session.get(CHAVE_SESSAO)
+    if not token:
+        return None
+    try:
+        snapshot = signing.loads(token, salt=SALT, max_age=_ttl())
+    except signing.BadSignature:
+        return None
+    if snapshot.get('tipo') != tipo or snapshot.get('id') != str(identificador):
+        return None
+    if snapshot.get('expira_em') is not None and time.time() > snapshot['expira_em']:
+        return None
+    if snapshot.get('versao') != versao(tipo, identificador):
+        return None
+    return snapshot
+
+
+def descartar(request) -> None:
+    request.session.pop(CHAVE_SESSAO, None)
@@ -0,0 +1,326 @@
+"""
+Geração em lote de chaves de um campeonato.
+
+`gerar_chave` (atletas.utils) atende uma categoria por vez e grava cada luta
+individualmente. Para "Gerar todas as chaves" este módulo:
+
+1. busca todas as inscrições aptas em UMA consulta e agrupa em memória;
+2. monta o plano de cada chave (lutas e rounds) em Python, usando as mesmas
+   regras de `gerar_chave_automatica`; o grafo de avanço (próxima luta,
+   destino do perdedor e posições) sai da estrutura via services.grafo_chave;
+3. persiste Chave, vínculos de atletas e Luta com bulk_create/bulk_update
+   dentro de uma única transação.
+
+Erros de uma categoria (ex.: atletas em grupos de faixas diferentes) não
+interrompem as demais: são devolvidos na lista `erros`, como a view fazia.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+
+from atletas.models import Atleta, Campeonato, Chave, Inscricao, Luta
+from atletas.services.grafo_chave import CAMPOS_GRAFO, TIPOS_ELIMINATORIOS, aplicar_grafo_avanco
+from atletas.services.pontuacao import aplicar_classificacoes
+from atletas.utils import (
+    agrupar_atletas_por_academia,
+    alternar_lado_kimono,
+    calcular_grupo_faixa,
+    classe_exige_grupo,
+)
+
+
+@dataclass
+class _LutaPlano:
+    round: int
+    atleta_a: Optional[Atleta] = None
+    atleta_b: Optional[Atleta] = None
+    lados: Optional[Tuple[str, str]] = None
+
+
+@dataclass
+class _ChavePlano:
+    classe: str
+    sexo: str
+    categoria: str
+    atletas: List[Atleta]
+    grupo_faixas: Optional[str] = None
+    lutas: List[_LutaPlano] = field(default_factory=list)
+    # Estrutura com índices do plano; convertida em IDs após o bulk_create
+    estrutura: Dict = field(default_factory=dict)
+
+    def nova_luta(self, round_num, atleta_a=None, atleta_b=None, lados=None) -> int:
+        self.lutas.append(_LutaPlano(round_num, atleta_a, atleta_b, lados))
+        return len(self.lutas) - 1
+
+
+@dataclass
+class ResultadoGeracao:
+    criadas: int = 0
+    atualizadas: int = 0
+    erros: List[Dict] = field(default_factory=list)
+    total_inscricoes: int = 0
+    total_combinacoes: int = 0
+
+
+# =========================
+# Planejamento (sem banco)
+# =========================
+def _planejar_melhor_de_3(plano: _ChavePlano) -> None:
+    atletas = plano.atletas
+    lutas = [
+        plano.nova_luta(1, atletas[0], atletas[1], alternar_lado_kimono(1, i))
+        for i in range(3)
+    ]
+    plano.estrutura = {
+        "tipo": "melhor_de_3",
+        "atletas": len(atletas),
+        "lutas": lutas,
+        "lutas_detalhes": {},
+    }
+
+
+def _planejar_round_robin(plano: _ChavePlano) -> None:
+    atletas = plano.atletas
+    lutas = []
+    for i in range(len(atletas)):
+        for j in range(i + 1, len(atletas)):
+            lados = alternar_lado_kimono(1, len(lutas))
+            lutas.append(plano.nova_luta(1, atletas[i], atletas[j], lados))
+    plano.estrutura = {
+        "tipo": "round_robin",
+        "atletas": len(atletas),
+        "lutas": lutas,
+        "rounds": {1: lutas},
+    }
+
+
+def _encadear_rounds(plano: _ChavePlano, anteriores: List[int], round_num: int, rounds: Dict) -> None:
+    """Cria os rounds seguintes até restar uma luta."""
+    while len(anteriores) > 1:
+        novo_round = [plano.nova_luta(round_num) for _ in range(len(anteriores) // 2)]
+        rounds[round_num] = novo_round
+        anteriores = novo_round
+        round_num += 1
+
+
+def _planejar_eliminatoria_repescagem(plano: _ChavePlano, tamanho_chave: int) -> None:
+    """Mesmo desenho de `gerar_eliminatoria_repescagem` (rounds 1.., 100.., 999)."""
+    num_atletas = len(plano.atletas)
+    organizados = agrupar_atletas_por_academia(plano.atletas)
+    com_bye = organizados + [None] * (tamanho_chave - num_atletas)
+
+    rounds = {}
+    round1 = []
+    for i in range(0, tamanho_chave, 2):
+        atleta_a = com_bye[i] if i < len(organizados) else None
+        atleta_b = com_bye[i + 1] if i + 1 < len(organizados) else None
+        round1.append(plano.nova_luta(1, atleta_a, atleta_b, alternar_lado_kimono(1, i // 2)))
+    rounds[1] = round1
+    _encadear_rounds(plano, round1, 2, rounds)
+
+    repescagem_rounds = {}
+    num_lutas_repescagem = len(round1) // 2
+    if num_lutas_repescagem > 0:
+        repescagem1 = [plano.nova_luta(100) for _ in range(num_lutas_repescagem)]
+        repescagem_rounds[100] = repescagem1
+        _encadear_rounds(plano, repescagem1, 101, repescagem_rounds)
+
+    luta_3_lugar = plano.nova_luta(999)
+    rounds[999] = [luta_3_lugar]
+
+    plano.estrutura = {
+        "tipo": "eliminatoria_repescagem",
+        "atletas": num_atletas,
+        "tamanho_chave": tamanho_chave,
+        "rounds": rounds,
+        "repescagem": {
+            "rounds": repescagem_rounds,
+            "luta_3_lugar": luta_3_lugar,
+        },
+    }
+
+
+def _planejar_chave(plano: _ChavePlano) -> None:
+    """Equivalente a `gerar_chave_automatica`, sem tocar no banco."""
+    num_atletas = len(plano.atletas)
+    if num_atletas == 1:
+        plano.estrutura = {
+            "tipo": "campeao_automatico",
+            "atletas": 1,
+            "vencedor": plano.atletas[0].id,
+        }
+    elif num_atletas == 2:
+        _planejar_melhor_de_3(plano)
+    elif 3 <= num_atletas <= 5:
+        _planejar_round_robin(plano)
+    elif num_atletas <= 8:
+        _planejar_eliminatoria_repescagem(plano, 8)
+    elif num_atletas <= 16:
+        _planejar_eliminatoria_repescagem(plano, 16)
+    else:
+        _planejar_eliminatoria_repescagem(plano, 32)
+
+
+def _definir_grupo_faixas(plano: _ChavePlano) -> None:
+    if not classe_exige_grupo(plano.classe):
+        return
+    grupos = {calcular_grupo_faixa(atleta.faixa, atleta.sexo) for atleta in plano.atletas}
+    if len(grupos) > 1:
+        raise ValueError(
+            f"Atletas pertencem a múltiplos grupos de faixas ({grupos}) "
+            f"para {plano.classe}/{plano.sexo}/{plano.categoria}."
+        )
+    plano.grupo_faixas = grupos.pop()
+
+
+def inscricoes_aptas_chaveamento(campeonato: Campeonato):
+    """Inscrições aptas a entrar em chave (mesmo critério da tela de chaves)."""
+    return (
+        Inscricao.objects.filter(
+            campeonato=campeonato,
+            classe_real__isnull=False,
+            categoria_real__isnull=False,
+            status_inscricao__in=['aprovado', 'remanejado'],
+            bloqueado_chave=False,
+            peso_real__gt=0,
+        )
+        .exclude(classe_real__nome__iexact='Festival')
+        .select_related('atleta__academia', 'classe_real', 'categoria_real')
+        .order_by('id')
+    )
+
+
+# =========================
+# Persistência
+# =========================
+def _converter_estrutura(estrutura, ids: List[int]):
+    """Troca índices do plano por IDs reais de Luta (recursivo)."""
+    if isinstance(estrutura, dict):
+        return {
+            k: (v if k in ("tipo", "atletas", "tamanho_chave", "vencedor") else _converter_estrutura(v, ids))
+            for k, v in estrutura.items()
+        }
+    if isinstance(estrutura, list):
+        return [ids[i] for i in estrutura]
+    if isinstance(estrutura, int):
+        return ids[estrutura]
+    return estrutura
+
+
+@transaction.atomic
+def _persistir(campeonato: Campeonato, planos: List[_ChavePlano], resultado: ResultadoGeracao) -> None:
+    existentes = {
+        (chave.classe, chave.sexo, chave.categoria): chave
+        for chave in Chave.objects.filter(
+            campeonato=campeonato,
+            classe__in={p.classe for p in planos},
+        )
+    }
+
+    # 1. Chaves: criar as que faltam em um único INSERT
+    chaves = []
+    novas = []
+    for plano in planos:
+        chave = existentes.get((plano.classe, plano.sexo, plano.categoria))
+        if chave is None:
+            chave = Chave(
+                campeonato=campeonato,
+                classe=plano.classe,
+                sexo=plano.sexo,
+                categoria=plano.categoria,
+                estrutura={},
+            )
+            novas.append(chave)
+        chaves.append(chave)
+    Chave.objects.bulk_create(novas)
+    resultado.criadas = len(novas)
+    resultado.atualizadas = len(chaves) - len(novas)
+
+    classificacoes_anteriores = [(chave.estrutura or {}).get("classificacao", []) for chave in chaves]
+
+    # 2. Limpar lutas e atletas antigos de todas as chaves de uma vez
+    chave_ids = [chave.id for chave in chaves]
+    Luta.objects.filter(chave_id__in=chave_ids).delete()
+    Chave.atletas.through.objects.filter(chave_id__in=chave_ids).delete()
+    Chave.atletas.through.objects.bulk_create([
+        Chave.atletas.through(chave_id=chave.id, atleta_id=atleta.id)
+        for chave, plano in zip(chaves, planos)
+        for atleta in plano.atletas
+    ])
+
+    # 3. Lutas de todas as chaves em um único bulk_create
+    lutas = []
+    for chave, plano in zip(chaves, planos):
+        for luta_plano in plano.lutas:
+            luta = Luta(
+                chave_id=chave.id,
+                atleta_a=luta_plano.atleta_a,
+                atleta_b=luta_plano.atleta_b,
+                round=luta_plano.round,
+            )
+            if luta_plano.lados:
+                luta.lado_atleta_a, luta.lado_atleta_b = luta_plano.lados
+            lutas.append(luta)
+    Luta.objects.bulk_create(lutas)
+
+    # 4. Resolver índices do plano em IDs (estrutura e grafo de avanço)
+    inicio = 0
+    com_grafo = []
+    alteracoes = []
+    for chave, plano, anterior in zip(chaves, planos, classificacoes_anteriores):
+        lutas_chave = lutas[inicio:inicio + len(plano.lutas)]
+        ids = [luta.id for luta in lutas_chave]
+        inicio += len(plano.lutas)
+
+        estrutura = _converter_estrutura(plano.estrutura, ids)
+        if estrutura["tipo"] in TIPOS_ELIMINATORIOS:
+            com_grafo.extend(aplicar_grafo_avanco(lutas_chave, estrutura))
+        classificacao = []
+        if estrutura["tipo"] == "campeao_automatico":
+            atleta = plano.atletas[0]
+            classificacao = [{"atleta_id": atleta.id, "colocacao": 1, "academia_id": atleta.academia_id}]
+        estrutura["classificacao"] = classificacao
+        chave.estrutura = estrutura
+        chave.grupo_faixas = plano.grupo_faixas
+        alteracoes.append((chave, anterior, classificacao))
+
+    Luta.objects.bulk_update(com_grafo, CAMPOS_GRAFO)
+    Chave.objects.bulk_update(chaves, ['estrutura', 'grupo_faixas'])
+
+    # 5. Pontuação: estorna colocações das chaves refeitas e aplica as novas
+    aplicar_classificacoes(campeonato, alteracoes)
+
+
+def gerar_chaves_campeonato(campeonato: Campeonato) -> ResultadoGeracao:
+    """Gera (ou refaz) todas as chaves do campeonato em lote."""
+    resultado = ResultadoGeracao()
+
+    grupos: Dict[Tuple[str, str, str], Dict[int, Atleta]] = {}
+    for inscricao in inscricoes_aptas_chaveamento(campeonato):
+        resultado.total_inscricoes += 1
+        classe = inscricao.classe_real.nome
+        categoria = inscricao.categoria_real.categoria_nome
+        if not categoria:
+            continue
+        atletas = grupos.setdefault((classe, inscricao.atleta.sexo, categoria), {})
+        atletas.setdefault(inscricao.atleta_id, inscricao.atleta)
+    resultado.total_combinacoes = len(grupos)
+
+    planos = []
+    for (classe, sexo, categoria), atletas in grupos.items():
+        plano = _ChavePlano(classe=classe, sexo=sexo, categoria=categoria, atletas=list(atletas.values()))
+        try:
+            _definir_grupo_faixas(plano)
+            _planejar_chave(plano)
+        except Exception as e:
+            resultado.erros.append({
+                'combinacao': f"{classe} - {sexo} - {categoria}",
+                'erro': str(e),
+            })
+            continue
+        planos.append(plano)
+
+    if planos:
+        _persistir(campeonato, planos, resultado)
+    return resultado
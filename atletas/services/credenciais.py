@@ -0,0 +1,108 @@
+"""
+Provisionamento em lote das credenciais temporárias (AcademiaCampeonatoSenha).
+
+Só recebem credencial as academias já vinculadas ao campeonato via
+AcademiaCampeonato (com `ativo_login`) que ainda não têm uma; este módulo
+não decide quais academias participam. As credenciais são montadas em
+memória e gravadas com um único bulk_create:
+
+    enfileirar('provisionar_credenciais', campeonato=campeonato, usuario=request.user)
+
+O hash de `definir_senha` é um SHA-256 simples (microssegundos por senha),
+então é calculado no próprio processo, sem pool.
+"""
+import secrets
+import string
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from atletas.models import Academia, AcademiaCampeonato, AcademiaCampeonatoSenha, Campeonato
+
+BULK_BATCH_SIZE = 500
+TAMANHO_SENHA = 8
+ALFABETO_SENHA = string.ascii_letters + string.digits
+# Acesso expira 5 dias após a data da competição
+DIAS_EXPIRACAO = 5
+
+
+def login_academia(academia_id: int) -> str:
+    return f"ACADEMIA_{academia_id:03d}"
+
+
+def gerar_senha_plana() -> str:
+    return ''.join(secrets.choice(ALFABETO_SENHA) for _ in range(TAMANHO_SENHA))
+
+
+def data_expiracao_credencial(campeonato: Campeonato):
+    """Meia-noite da data da competição + DIAS_EXPIRACAO (None = sem expiração)."""
+    if not campeonato.data_competicao:
+        return None
+    return timezone.make_aware(
+        datetime.combine(campeonato.data_competicao, datetime.min.time())
+    ) + timedelta(days=DIAS_EXPIRACAO)
+
+
+def vincular_academias(campeonato: Campeonato, academias: Iterable[Academia]) -> int:
+    """Cria os vínculos AcademiaCampeonato que faltam; retorna quantos foram criados."""
+    ids = {a.id if isinstance(a, Academia) else a for a in academias}
+    if not ids:
+        return 0
+    ja_vinculadas = set(
+        AcademiaCampeonato.objects.filter(campeonato=campeonato, academia_id__in=ids)
+        .values_list('academia_id', flat=True)
+    )
+    novos = [
+        AcademiaCampeonato(academia_id=academia_id, campeonato=campeonato, permitido=True)
+        for academia_id in sorted(ids - ja_vinculadas)
+    ]
+    # ignore_conflicts: outra requisição pode ter vinculado entre a leitura e a escrita
+    AcademiaCampeonato.objects.bulk_create(novos, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+    return len(novos)
+
+
+def academias_sem_credencial(campeonato: Campeonato, academia_ids: Optional[Iterable[int]] = None):
+    """Academias vinculadas e com login ativo que ainda não têm credencial no campeonato."""
+    academias = Academia.objects.filter(
+        vinculos_campeonatos__campeonato=campeonato,
+        ativo_login=True,
+    ).exclude(senhas_campeonatos__campeonato=campeonato)
+    if academia_ids is not None:
+        academias = academias.filter(id__in=list(academia_ids))
+    return academias.order_by('id')
+
+
+def provisionar_credenciais(
+    campeonato: Campeonato,
+    academia_ids: Optional[Iterable[int]] = None,
+) -> List[AcademiaCampeonatoSenha]:
+    """
+    Gera as credenciais que faltam no campeonato (uma leitura + bulk_create).
+
+    Retorna as credenciais montadas, com `senha_plana` preenchida para
+    exibição (sem pk: bulk_create com ignore_conflicts não a devolve). Pode
+    ser chamada de novo sem efeito colateral: academias que já têm
+    credencial são ignoradas.
+    """
+    data_expiracao = data_expiracao_credencial(campeonato)
+    credenciais = []
+    for academia in academias_sem_credencial(campeonato, academia_ids).only('id', 'nome'):
+        credencial = AcademiaCampeonatoSenha(
+            academia=academia,
+            campeonato=campeonato,
+            login=login_academia(academia.id),
+            data_expiracao=data_expiracao,
+        )
+        credencial.definir_senha(gerar_senha_plana())
+        credenciais.append(credencial)
+
+    if credenciais:
+        with transaction.atomic():
+            # unique_together (academia, campeonato) protege contra dois
+            # provisionamentos simultâneos do mesmo campeonato
+            AcademiaCampeonatoSenha.objects.bulk_create(
+                credenciais, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True
+            )
+    return credenciais
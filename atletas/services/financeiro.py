@@ -0,0 +1,170 @@
+"""
+Totais do painel financeiro calculados com agregações no banco.
+
+O painel lê o FinanceiroSnapshot do campeonato: uma consulta quando nada
+mudou. Os sinais de Inscricao/Atleta/Campeonato/Academia (seção
+'inscricoes'), Pagamento/ConferenciaPagamento ('conferencias') e Despesa
+('despesas') só marcam a seção como desatualizada (um UPDATE); na próxima
+leitura apenas as seções marcadas são recalculadas, cada uma com uma ou
+duas consultas de Sum/Count condicionais.
+
+O recálculo roda numa transação com a linha do snapshot travada
+(select_for_update), e as flags são relidas depois da trava: duas leituras
+simultâneas não gravam fora de ordem. A flag é limpa antes do cálculo.
+
+A marcação roda depois do commit de quem alterou os dados
+(transaction.on_commit) e é um UPDATE incondicional: se um recálculo estiver
+em andamento, o UPDATE espera a trava da linha e grava a flag depois dele,
+então a seção é refeita na leitura seguinte. Com filtro na própria flag
+(`..._desatualizado=False`) o Postgres descartaria a linha recém-limpa em vez
+de marcá-la, e a alteração se perderia.
+"""
+from decimal import Decimal
+from typing import Dict
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from atletas.models import ConferenciaPagamento, Despesa, FinanceiroSnapshot, Inscricao
+
+SECOES = ('inscricoes', 'conferencias', 'despesas')
+STATUS_CONFIRMADOS = ('confirmado', 'aprovado')
+
+ZERO = Decimal('0')
+_DECIMAL = DecimalField(max_digits=12, decimal_places=2)
+
+
+def _soma(expressao, **filtro):
+    return Coalesce(Sum(expressao, **filtro), Value(ZERO), output_field=_DECIMAL)
+
+
+def calcular_inscricoes(campeonato) -> Dict:
+    """Contagens por status, entradas federado/não federado e bônus das academias."""
+    valor_federado = campeonato.valor_inscricao_federado or ZERO
+    valor_nao_federado = campeonato.valor_inscricao_nao_federado or ZERO
+    confirmada = Q(status_inscricao__in=STATUS_CONFIRMADOS)
+
+    inscricoes = Inscricao.objects.filter(campeonato=campeonato)
+    totais = inscricoes.aggregate(
+        confirmadas=Count('id', filter=confirmada),
+        pendentes=Count('id', filter=~Q(status_inscricao__in=STATUS_CONFIRMADOS + ('reprovado',))),
+        federados=Count('id', filter=Q(atleta__federado=True)),
+        nao_federados=Count('id', filter=Q(atleta__federado=False)),
+    )
+
+    # Bônus (help_text de Academia): percentual sobre o valor das inscrições
+    # confirmadas + valor fixo por atleta confirmado
+    total_bonus = ZERO
+    por_academia = (
+        inscricoes.filter(confirmada)
+        .filter(Q(atleta__academia__bonus_fixo__isnull=False) | Q(atleta__academia__bonus_percentual__isnull=False))
+        .values('atleta__academia__bonus_fixo', 'atleta__academia__bonus_percentual')
+        .annotate(
+            confirmadas=Count('id'),
+            federadas=Count('id', filter=Q(atleta__federado=True)),
+        )
+    )
+    for item in por_academia:
+        valor_confirmado = (
+            item['federadas'] * valor_federado
+            + (item['confirmadas'] - item['federadas']) * valor_nao_federado
+        )
+        total_bonus += item['confirmadas'] * (item['atleta__academia__bonus_fixo'] or ZERO)
+        total_bonus += valor_confirmado * (item['atleta__academia__bonus_percentual'] or ZERO) / 100
+
+    return {
+        'inscricoes_confirmadas': totais['confirmadas'],
+        'inscricoes_pendentes': totais['pendentes'],
+        'entradas_federado': totais['federados'] * valor_federado,
+        'entradas_nao_federado': totais['nao_federados'] * valor_nao_federado,
+        'total_bonus': total_bonus.quantize(Decimal('0.01')),
+    }
+
+
+def calcular_conferencias(campeonato) -> Dict:
+    """Dinheiro em caixa (confirmadas) e pagamentos pendentes."""
+    # Recebido vazio ou zero conta o esperado (mesma regra do cálculo anterior em Python)
+    recebido = Case(
+        When(Q(valor_recebido__isnull=True) | Q(valor_recebido=0), then=F('valor_esperado')),
+        default=F('valor_recebido'),
+        output_field=_DECIMAL,
+    )
+    return ConferenciaPagamento.objects.filter(campeonato=campeonato).aggregate(
+        dinheiro_caixa=_soma(recebido, filter=Q(status='CONFIRMADO')),
+        pagamentos_pendentes=_soma('valor_esperado', filter=Q(status='PENDENTE')),
+    )
+
+
+def calcular_despesas(campeonato) -> Dict:
+    """Totais de despesas por status, patrocínios e os 5 maiores custos por categoria."""
+    despesas = Despesa.objects.filter(campeonato=campeonato)
+    totais = despesas.aggregate(
+        total_despesas=_soma('valor'),
+        despesas_pendentes=_soma('valor', filter=Q(status='pendente')),
+        despesas_pagas=_soma('valor', filter=Q(status='pago')),
+        patrocinios_total=_soma('valor', filter=Q(categoria='patrocinios', status='pago')),
+    )
+    top_custos = despesas.values('categoria').annotate(valor_total=Sum('valor')).order_by('-valor_total')[:5]
+    totais['top_custos'] = [
+        {'categoria': item['categoria'], 'valor': item['valor_total']} for item in top_custos
+    ]
+    return totais
+
+
+CALCULOS = {
+    'inscricoes': calcular_inscricoes,
+    'conferencias': calcular_conferencias,
+    'despesas': calcular_despesas,
+}
+
+
+def _serializar(valor):
+    if isinstance(valor, Decimal):
+        return str(valor)
+    if isinstance(valor, list):
+        return [{k: _serializar(v) for k, v in item.items()} for item in valor]
+    return valor
+
+
+def _desserializar(chave, valor):
+    if chave == 'top_custos':
+        return [{**item, 'valor': Decimal(item['valor'])} for item in valor]
+    if isinstance(valor, str):
+        return Decimal(valor)
+    return valor
+
+
+def marcar_desatualizado(campeonato_id, *secoes) -> None:
+    """Chamado pelos sinais: um UPDATE após o commit, sem recalcular nada na requisição que alterou os dados."""
+    if not campeonato_id:
+        return
+    transaction.on_commit(
+        lambda: FinanceiroSnapshot.objects.filter(campeonato_id=campeonato_id).update(
+            **{f'{secao}_desatualizado': True for secao in secoes}
+        )
+    )
+
+
+def obter_financeiro(campeonato) -> Dict:
+    """Totais do campeonato, recalculando só as seções desatualizadas."""
+    snapshot, _ = FinanceiroSnapshot.objects.get_or_create(campeonato=campeonato)
+    if any(getattr(snapshot, f'{secao}_desatualizado') for secao in SECOES):
+        with transaction.atomic():
+            # Uma requisição por vez recalcula; as flags são relidas com a linha
+            # travada, pois outra pode ter acabado de gravar o mesmo recálculo
+            snapshot = FinanceiroSnapshot.objects.select_for_update().get(pk=snapshot.pk)
+            pendentes = [secao for secao in SECOES if getattr(snapshot, f'{secao}_desatualizado')]
+            if pendentes:
+                FinanceiroSnapshot.objects.filter(pk=snapshot.pk).update(
+                    **{f'{secao}_desatualizado': False for secao in pendentes}
+                )
+                for secao in pendentes:
+                    snapshot.dados[secao] = {chave: _serializar(v) for chave, v in CALCULOS[secao](campeonato).items()}
+                snapshot.save(update_fields=['dados', 'atualizado_em'])
+
+    totais = {}
+    for secao in SECOES:
+        for chave, valor in snapshot.dados.get(secao, {}).items():
+            totais[chave] = _desserializar(chave, valor)
+    return totais
@@ -0,0 +1,149 @@
+"""
+Grafo de avanço das chaves eliminatórias.
+
+Cada Luta guarda para onde vão o vencedor e o perdedor e em qual posição
+(A/B) entram:
+
+    proxima_luta / posicao_proxima     -> vencedor
+    luta_perdedor / posicao_perdedor   -> perdedor (repescagem e 3º lugar)
+
+O grafo é calculado uma única vez, a partir da estrutura da chave, quando a
+chave é gerada. Registrar um resultado (`atualizar_proxima_luta`) passa a ser
+no máximo dois UPDATEs pela chave primária, sem ler `Chave.estrutura`.
+
+Regras (mesmas de `gerar_eliminatoria_repescagem`):
+- chave principal: luta i do round r alimenta a luta i // 2 do round r + 1,
+  na posição A (i par) ou B (i ímpar);
+- repescagem (rounds 100+): mesmo encadeamento; o vencedor da última luta da
+  repescagem vai para a posição A da luta de 3º lugar (round 999);
+- perdedores do round 1 vão para o primeiro round da repescagem;
+- perdedores da semifinal principal vão para a posição B da luta de 3º lugar.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+POSICAO_A = 'A'
+POSICAO_B = 'B'
+ROUND_REPESCAGEM = 100
+ROUND_TERCEIRO_LUGAR = 999
+
+TIPOS_ELIMINATORIOS = ('eliminatoria_simples', 'eliminatoria_repescagem', 'chave_olimpica')
+CAMPOS_GRAFO = ['proxima_luta', 'posicao_proxima', 'luta_perdedor', 'posicao_perdedor']
+
+
+def _posicao(indice: int) -> str:
+    return POSICAO_A if indice % 2 == 0 else POSICAO_B
+
+
+def _rounds_ordenados(rounds: Optional[Dict], filtro=lambda r: True) -> List[List[int]]:
+    """Listas de IDs por round em ordem numérica (a estrutura salva tem chaves em texto)."""
+    por_numero = {int(k): v for k, v in (rounds or {}).items() if str(k).isdigit()}
+    return [por_numero[r] for r in sorted(por_numero) if filtro(r)]
+
+
+def _encadear(grafo: Dict[int, Dict], rounds: List[List[int]]) -> None:
+    for atual, seguinte in zip(rounds, rounds[1:]):
+        for indice, luta_id in enumerate(atual):
+            if indice // 2 < len(seguinte):
+                grafo[luta_id]['proxima_luta'] = seguinte[indice // 2]
+                grafo[luta_id]['posicao_proxima'] = _posicao(indice)
+
+
+def calcular_grafo_avanco(estrutura: Optional[Dict]) -> Dict[int, Dict]:
+    """{luta_id: {campo do grafo: valor}} para a estrutura (já com IDs reais)."""
+    if not estrutura or estrutura.get('tipo') not in TIPOS_ELIMINATORIOS:
+        return {}
+
+    grafo: Dict[int, Dict] = defaultdict(dict)
+    principais = _rounds_ordenados(estrutura.get('rounds'), lambda r: r < ROUND_REPESCAGEM)
+    _encadear(grafo, principais)
+
+    if estrutura.get('tipo') == 'eliminatoria_repescagem':
+        repescagem = estrutura.get('repescagem') or {}
+        rounds_repescagem = _rounds_ordenados(repescagem.get('rounds'))
+        luta_3_lugar = repescagem.get('luta_3_lugar')
+        _encadear(grafo, rounds_repescagem)
+
+        if principais and rounds_repescagem:
+            primeiro_repescagem = rounds_repescagem[0]
+            for indice, luta_id in enumerate(principais[0]):
+                if indice // 2 < len(primeiro_repescagem):
+                    grafo[luta_id]['luta_perdedor'] = primeiro_repescagem[indice // 2]
+                    grafo[luta_id]['posicao_perdedor'] = _posicao(indice)
+
+        if luta_3_lugar:
+            if len(principais) >= 2:
+                for luta_id in principais[-2]:
+                    # Com só dois rounds a semifinal é o round 1, que já alimenta a repescagem
+                    if 'luta_perdedor' not in grafo[luta_id]:
+                        grafo[luta_id]['luta_perdedor'] = luta_3_lugar
+                        grafo[luta_id]['posicao_perdedor'] = POSICAO_B
+            if rounds_repescagem and len(rounds_repescagem[-1]) == 1:
+                final_repescagem = rounds_repescagem[-1][0]
+                grafo[final_repescagem]['proxima_luta'] = luta_3_lugar
+                grafo[final_repescagem]['posicao_proxima'] = POSICAO_A
+
+    return dict(grafo)
+
+
+def aplicar_grafo_avanco(lutas: Iterable, estrutura: Optional[Dict]) -> List:
+    """Preenche os campos do grafo nas instâncias de Luta (sem salvar) e as devolve."""
+    grafo = calcular_grafo_avanco(estrutura)
+    lutas = list(lutas)
+    for luta in lutas:
+        destino = grafo.get(luta.id, {})
+        luta.proxima_luta = destino.get('proxima_luta')
+        luta.posicao_proxima = destino.get('posicao_proxima', '')
+        luta.luta_perdedor = destino.get('luta_perdedor')
+        luta.posicao_perdedor = destino.get('posicao_perdedor', '')
+    return lutas
+
+
+def gravar_grafo_avanco(chave, estrutura: Optional[Dict]) -> None:
+    """Grava o grafo de todas as lutas da chave (uma leitura e um bulk_update)."""
+    from atletas.models import Luta
+
+    lutas = aplicar_grafo_avanco(Luta.objects.filter(chave=chave), estrutura)
+    Luta.objects.bulk_update(lutas, CAMPOS_GRAFO)
+
+
+def ocupar_posicao(luta_id: Optional[int], posicao: str, atleta_id: Optional[int], chave_id: int) -> bool:
+    """
+    Coloca o atleta na posição da luta de destino, se ela estiver livre
+    (um UPDATE pela chave primária). Sem posição definida (chaves sem grafo),
+    ocupa a primeira posição livre, como antes.
+
+    Chaves com lutas disputadas antes da migração 0045 foram preenchidas na
+    primeira posição livre, não na do grafo: se a posição do grafo já tem
+    outro atleta, o atleta vai para a outra posição livre em vez de ser
+    descartado.
+    """
+    from atletas.models import Luta
+
+    if not luta_id or not atleta_id:
+        return False
+    destino = Luta.objects.filter(id=luta_id, chave_id=chave_id)
+    if posicao:
+        campos = ['atleta_a', 'atleta_b'] if posicao == POSICAO_A else ['atleta_b', 'atleta_a']
+    else:
+        campos = ['atleta_a', 'atleta_b']
+    if destino.filter(**{f'{campos[0]}__isnull': True}).update(**{f'{campos[0]}_id': atleta_id}):
+        return True
+
+    # Resultado registrado de novo: o atleta já está na luta de destino
+    if destino.filter(Q(atleta_a_id=atleta_id) | Q(atleta_b_id=atleta_id)).exists():
+        return True
+    if destino.filter(**{f'{campos[1]}__isnull': True}).update(**{f'{campos[1]}_id': atleta_id}):
+        if posicao:
+            logger.warning(
+                'Posição %s da luta %s ocupada por outro atleta; atleta %s colocado na outra posição.',
+                posicao, luta_id, atleta_id,
+            )
+        return True
+    logger.error('Luta %s da chave %s sem posição livre para o atleta %s.', luta_id, chave_id, atleta_id)
+    return False
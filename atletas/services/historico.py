@@ -0,0 +1,176 @@
+"""
+Consulta paginada e arquivamento do HistoricoSistema.
+
+Paginação por cursor (keyset) em (data_hora, id), do mais recente para o
+mais antigo: cada página busca `data_hora/id` menores que o último item da
+anterior, então o custo não cresce com o tamanho da tabela (OFFSET cresce).
+Com filtro de campeonato ou tipo_acao a consulta usa os índices
+(campeonato, data_hora) / (tipo_acao, data_hora); sem filtro, (data_hora, id).
+
+Arquivamento: o histórico de campeonatos encerrados sai da tabela para um
+arquivo JSONL.gz por campeonato (uma linha JSON por registro). Os arquivos
+podem ser pesquisados offline com `manage.py buscar_historico_arquivado` ou
+`zcat arquivo.jsonl.gz | grep ...`. Rodar de novo acrescenta um novo membro
+gzip ao mesmo arquivo (gzip lê membros concatenados como um só fluxo).
+"""
+import base64
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from atletas.models import Campeonato, HistoricoSistema
+
+TAMANHO_PAGINA = 50
+LOTE_ARQUIVAMENTO = 1000
+# Campeonato só é arquivado depois de N dias da data da competição
+DIAS_RETENCAO = 30
+
+
+# =========================
+# Paginação por cursor
+# =========================
+def codificar_cursor(registro: HistoricoSistema) -> str:
+    bruto = f"{registro.data_hora.isoformat()}|{registro.pk}"
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Retorna (data_hora, id) ou None se o cursor for inválido."""
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        data_hora, pk = bruto.rsplit('|', 1)
+        return datetime.fromisoformat(data_hora), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def pagina_historico(queryset, cursor: Optional[str] = None, tamanho: int = TAMANHO_PAGINA) -> Tuple[List[HistoricoSistema], Optional[str]]:
+    """
+    Uma página do histórico (mais recente primeiro) a partir do cursor.
+
+    Retorna (registros, próximo_cursor); próximo_cursor é None na última página.
+    """
+    posicao = decodificar_cursor(cursor) if cursor else None
+    if posicao:
+        data_hora, pk = posicao
+        queryset = queryset.filter(Q(data_hora__lt=data_hora) | Q(data_hora=data_hora, pk__lt=pk))
+    registros = list(queryset.order_by('-data_hora', '-pk')[:tamanho + 1])
+    if len(registros) > tamanho:
+        registros = registros[:tamanho]
+        return registros, codificar_cursor(registros[-1])
+    return registros, None
+
+
+# =========================
+# Arquivamento
+# =========================
+def diretorio_arquivo(diretorio: Optional[str] = None) -> str:
+    """
+    Diretório informado ou HISTORICO_ARQUIVO_DIR; sem nenhum dos dois, ValueError.
+
+    Não há padrão: o arquivamento apaga as linhas da tabela, e um diretório
+    dentro do projeto some no próximo deploy.
+    """
+    diretorio = diretorio or getattr(settings, 'HISTORICO_ARQUIVO_DIR', '')
+    if not diretorio:
+        raise ValueError(
+            'Diretório de arquivo do histórico não configurado: defina HISTORICO_ARQUIVO_DIR '
+            'em um disco persistente ou informe --diretorio.'
+        )
+    return str(diretorio)
+
+
+def caminho_arquivo(campeonato: Campeonato, diretorio: Optional[str] = None) -> str:
+    nome = slugify(campeonato.nome)[:50] or 'campeonato'
+    return os.path.join(diretorio_arquivo(diretorio), f"historico_campeonato_{campeonato.id}_{nome}.jsonl.gz")
+
+
+def campeonatos_encerrados(dias: int = DIAS_RETENCAO):
+    """Campeonatos inativos cuja competição foi há mais de `dias` dias e que ainda têm histórico."""
+    limite = timezone.localdate() - timedelta(days=dias)
+    return Campeonato.objects.filter(
+        ativo=False,
+        data_competicao__lt=limite,
+        historico_acoes__isnull=False,
+    ).distinct().order_by('data_competicao', 'id')
+
+
+def _serializar(registro: HistoricoSistema) -> Dict:
+    usuario = registro.usuario
+    return {
+        'id': registro.pk,
+        'data_hora': registro.data_hora.isoformat(),
+        'tipo_acao': registro.tipo_acao,
+        'descricao': registro.descricao,
+        'usuario_id': registro.usuario_id,
+        'usuario': usuario.get_username() if usuario else None,
+        'campeonato_id': registro.campeonato_id,
+        'academia_id': registro.academia_id,
+        'academia': registro.academia.nome if registro.academia else None,
+        'atleta_id': registro.atleta_id,
+        'atleta': registro.atleta.nome if registro.atleta else None,
+        'dados_extras': registro.dados_extras,
+        'ip_address': registro.ip_address,
+    }
+
+
+def arquivar_campeonato(campeonato: Campeonato, diretorio: Optional[str] = None) -> int:
+    """
+    Move o histórico do campeonato para o arquivo JSONL.gz; retorna quantos registros.
+
+    Cada lote é gravado e sincronizado no disco antes de ser apagado da
+    tabela; uma falha no meio deixa no banco apenas o que ainda não foi escrito.
+    """
+    # Antes de qualquer coisa: sem diretório durável nada é apagado
+    caminho = caminho_arquivo(campeonato, diretorio)
+    base = HistoricoSistema.objects.filter(campeonato=campeonato).select_related('usuario', 'academia', 'atleta')
+    if not base.exists():
+        return 0
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+    total = 0
+    with open(caminho, 'ab') as bruto:
+        with gzip.GzipFile(fileobj=bruto, mode='ab') as arquivo:
+            ultimo_id = 0
+            while True:
+                lote = list(base.filter(pk__gt=ultimo_id).order_by('pk')[:LOTE_ARQUIVAMENTO])
+                if not lote:
+                    break
+                for registro in lote:
+                    arquivo.write((json.dumps(_serializar(registro), ensure_ascii=False) + '\n').encode())
+                arquivo.flush()
+                bruto.flush()
+                os.fsync(bruto.fileno())
+                ids = [registro.pk for registro in lote]
+                with transaction.atomic():
+                    HistoricoSistema.objects.filter(pk__in=ids).delete()
+                ultimo_id = ids[-1]
+                total += len(lote)
+    return total
+
+
+def ler_arquivo(caminho: str) -> Iterator[Dict]:
+    """Itera os registros de um arquivo de histórico arquivado."""
+    with gzip.open(caminho, 'rt', encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                yield json.loads(linha)
+
+
+def buscar_arquivo(caminho: str, texto: str = '', tipo_acao: str = '') -> Iterator[Dict]:
+    """Registros arquivados cuja descrição contém `texto` (sem distinção de caixa)."""
+    texto = texto.lower()
+    for registro in ler_arquivo(caminho):
+        if tipo_acao and registro['tipo_acao'] != tipo_acao:
+            continue
+        if texto and texto not in registro['descricao'].lower():
+            continue
+        yield registro
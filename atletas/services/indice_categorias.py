@@ -0,0 +1,227 @@
+"""
+Índice em memória de classes e categorias de peso (por processo, versionado).
+
+As tabelas Classe/Categoria são pequenas e praticamente não mudam durante o
+evento, mas eram consultadas a cada leitura da balança. O índice guarda, por
+(classe, sexo), as categorias ordenadas por limite com arrays de limites para
+busca com bisect:
+
+    indice = indice_categorias()
+    classe = indice.classe('SUB 13')
+    categoria = indice.por_peso(classe, 'M', Decimal('41.3'))
+
+Qualquer post_save/post_delete de Classe ou Categoria invalida o índice (ver
+atletas.signals). A versão também é publicada no cache do Django: com cache
+compartilhado (Redis/banco), os demais processos percebem a mudança em até
+INTERVALO_VERIFICACAO segundos. Alterações via queryset.update()/bulk_create
+não disparam sinais; chame invalidar_indice_categorias() nesses casos.
+
+Os objetos devolvidos são compartilhados entre requisições: trate-os como
+somente leitura.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+
+from atletas.models import Categoria, Classe
+
+CHAVE_CACHE_VERSAO = 'atletas:indice_categorias:versao'
+INTERVALO_VERIFICACAO = 5  # segundos entre consultas à versão compartilhada
+
+_SEM_LIMITE = Decimal('Infinity')
+
+
+class _Faixas:
+    """Categorias de uma (classe, sexo) ordenadas por limite_min."""
+
+    __slots__ = ('categorias', 'minimos', 'maximos', 'maximos_ordenados')
+
+    def __init__(self, categorias: List[Categoria]):
+        self.categorias = categorias
+        self.minimos = [c.limite_min for c in categorias]
+        self.maximos = [c.limite_max if c.limite_max is not None else _SEM_LIMITE for c in categorias]
+        # Faixas oficiais não se sobrepõem; se o cadastro tiver sobreposição,
+        # a busca da faixa que contém o peso cai para varredura linear.
+        self.maximos_ordenados = all(a <= b for a, b in zip(self.maximos, self.maximos[1:]))
+
+    def contendo(self, peso: Decimal, max_aberto: bool = True) -> Optional[Categoria]:
+        """Primeira faixa (menor limite_min) com limite_min <= peso <= limite_max."""
+        fim = bisect_right(self.minimos, peso)
+        if self.maximos_ordenados:
+            i = bisect_left(self.maximos, peso, 0, fim)
+            candidatas = range(i, fim)
+        else:
+            candidatas = range(fim)
+        for i in candidatas:
+            if self.maximos[i] >= peso and (max_aberto or self.categorias[i].limite_max is not None):
+                return self.categorias[i]
+        return None
+
+    def acima(self, peso: Decimal) -> Optional[Categoria]:
+        i = bisect_right(self.minimos, peso)
+        return self.categorias[i] if i < len(self.categorias) else None
+
+    def abaixo(self, peso: Decimal) -> Optional[Categoria]:
+        i = bisect_right(self.minimos, peso)
+        return self.categorias[i - 1] if i > 0 else None
+
+
+class IndiceCategorias:
+    def __init__(self, versao: int = 0):
+        from atletas.services.pesagem import _normalize_classe_nome
+        from atletas.utils import normalizar_nome_classe
+
+        self.versao = versao
+        self.classes: List[Classe] = list(Classe.objects.all())
+        classes_por_id = {c.id: c for c in self.classes}
+        self._por_nome_exato = {c.nome: c for c in self.classes}
+        self._por_nome_lower: Dict[str, Classe] = {}
+        self._por_normalizacao_pesagem: Dict[str, Classe] = {}
+        self._por_normalizacao_utils: Dict[str, Classe] = {}
+        # Classes vêm ordenadas por idade_min: o primeiro nome vence, como no .first()
+        for c in self.classes:
+            self._por_nome_lower.setdefault(c.nome.lower(), c)
+            self._por_normalizacao_pesagem.setdefault(_normalize_classe_nome(c.nome), c)
+            self._por_normalizacao_utils.setdefault(normalizar_nome_classe(c.nome), c)
+
+        agrupadas: Dict[Tuple[int, str], List[Categoria]] = defaultdict(list)
+        self._por_sexo_nome: Dict[Tuple[str, str], Categoria] = {}
+        for categoria in Categoria.objects.order_by('limite_min', 'id'):
+            categoria.classe = classes_por_id.get(categoria.classe_id)
+            agrupadas[(categoria.classe_id, categoria.sexo)].append(categoria)
+            self._por_sexo_nome.setdefault((categoria.sexo, categoria.categoria_nome), categoria)
+        self._faixas = {chave: _Faixas(categorias) for chave, categorias in agrupadas.items()}
+        self._vazia = _Faixas([])
+
+        # Elegibilidade memorizada por nome de classe (as classes do índice não mudam)
+        self._classes_permitidas: Dict[str, Tuple[str, ...]] = {}
+        self._categorias_elegiveis: Dict[Tuple[str, str], List[Categoria]] = {}
+
+    # ----- classes -----
+    def classe_sem_caixa(self, nome: str) -> Optional[Classe]:
+        """Equivalente a Classe.objects.filter(nome__iexact=nome).first()."""
+        return self._por_nome_lower.get(nome.lower()) if nome else None
+
+    def classe(self, nome: str) -> Optional[Classe]:
+        """Busca de classe da pesagem: nome exato (sem caixa) e depois 'SUB 13' == 'SUB-13'."""
+        from atletas.services.pesagem import _normalize_classe_nome
+
+        if not nome:
+            return None
+        return self._por_nome_lower.get(nome.lower()) or self._por_normalizacao_pesagem.get(_normalize_classe_nome(nome))
+
+    def classe_no_banco(self, nome: str) -> Optional[Classe]:
+        """Mesma regra de utils.buscar_classe_no_banco ('SUB 13' == 'SUB13')."""
+        from atletas.utils import normalizar_nome_classe
+
+        if not nome:
+            return None
+        return self._por_nome_lower.get(nome.lower()) or self._por_normalizacao_utils.get(normalizar_nome_classe(nome))
+
+    # ----- elegibilidade -----
+    def classes_permitidas(self, classe_atleta: str) -> Tuple[str, ...]:
+        """Nomes das classes em que a classe do atleta pode competir (utils.calcular_classes_permitidas)."""
+        from atletas.utils import calcular_classes_permitidas
+
+        chave = classe_atleta or ''
+        permitidas = self._classes_permitidas.get(chave)
+        if permitidas is None:
+            permitidas = tuple(calcular_classes_permitidas(classe_atleta, self.classe_no_banco))
+            self._classes_permitidas[chave] = permitidas
+        return permitidas
+
+    def categorias_elegiveis(self, classe_atleta: str, sexo: str) -> List[Categoria]:
+        """Categorias de todas as classes permitidas, ordenadas por idade_min da classe e limite_min."""
+        chave = (classe_atleta or '', sexo)
+        categorias = self._categorias_elegiveis.get(chave)
+        if categorias is None:
+            classes = {}
+            for nome in self.classes_permitidas(classe_atleta):
+                classe = self.classe_no_banco(nome)
+                if classe:
+                    classes[classe.id] = classe
+            categorias = sorted(
+                (c for classe in classes.values() for c in self.categorias(classe, sexo)),
+                key=lambda c: (c.classe.idade_min, c.limite_min),
+            )
+            self._categorias_elegiveis[chave] = categorias
+        return categorias
+
+    # ----- categorias -----
+    def faixas(self, classe: Optional[Classe], sexo: str) -> _Faixas:
+        if not classe:
+            return self._vazia
+        return self._faixas.get((classe.id, sexo), self._vazia)
+
+    def categorias(self, classe: Optional[Classe], sexo: str) -> List[Categoria]:
+        return self.faixas(classe, sexo).categorias
+
+    def por_nome(self, categoria_nome: str, classe_nome: str, sexo: str) -> Optional[Categoria]:
+        """Categoria pelo nome dentro da classe de nome exato (classe__nome=...)."""
+        classe = self._por_nome_exato.get(classe_nome)
+        for categoria in self.categorias(classe, sexo):
+            if categoria.categoria_nome == categoria_nome:
+                return categoria
+        return None
+
+    def por_nome_qualquer_classe(self, categoria_nome: str, sexo: str) -> Optional[Categoria]:
+        """Categoria de menor limite_min com esse nome, em qualquer classe."""
+        return self._por_sexo_nome.get((sexo, categoria_nome))
+
+    def por_peso(self, classe: Optional[Classe], sexo: str, peso: Decimal, max_aberto: bool = True) -> Optional[Categoria]:
+        """
+        Categoria que contém o peso; se não houver, a mais próxima acima ou abaixo.
+        Com max_aberto=False categorias sem limite_max não contam como "contendo".
+        """
+        if not classe or not sexo or peso is None:
+            return None
+        faixas = self.faixas(classe, sexo)
+        return faixas.contendo(peso, max_aberto) or faixas.acima(peso) or faixas.abaixo(peso)
+
+
+_lock = threading.Lock()
+_indice: Optional[IndiceCategorias] = None
+_versao_local = 0
+_verificado_em = 0.0
+
+
+def _versao_compartilhada() -> int:
+    try:
+        return cache.get(CHAVE_CACHE_VERSAO, 0)
+    except Exception:
+        return 0
+
+
+def indice_categorias() -> IndiceCategorias:
+    """Índice atual; reconstruído se invalidado neste ou (com cache compartilhado) em outro processo."""
+    global _indice, _versao_local, _verificado_em
+
+    agora = time.monotonic()
+    if _indice is not None and agora - _verificado_em < INTERVALO_VERIFICACAO:
+        return _indice
+
+    with _lock:
+        versao = max(_versao_local, _versao_compartilhada())
+        if _indice is None or _indice.versao != versao:
+            _indice = IndiceCategorias(versao)
+        _versao_local = versao
+        _verificado_em = agora
+        return _indice
+
+
+def invalidar_indice_categorias() -> None:
+    """Descarta o índice; chamado pelos sinais de Classe/Categoria e após alterações em massa."""
+    global _indice, _versao_local
+
+    with _lock:
+        _versao_local = max(_versao_local, _versao_compartilhada()) + 1
+        _indice = None
+    try:
+        cache.set(CHAVE_CACHE_VERSAO, _versao_local, None)
+    except Exception:
+        pass
@@ -10,6 +10,8 @@ from atletas.models import (
     Classe,
     Categoria,
 )
+from atletas.services.pontuacao import sincronizar_inscricao
+from atletas.services.indice_categorias import indice_categorias
 
 
 # =========================
@@ -118,16 +120,17 @@ def _idade_evento(ano_nascimento: Optional[int], ano_evento: int) -> Optional[in
 def _get_classe_por_nome(classe_nome: Optional[str]) -> Optional[Classe]:
     if not classe_nome:
         return None
+    indice = indice_categorias()
     nome = _normalize_classe_nome(classe_nome)
-    classe = Classe.objects.filter(nome__iexact=nome).first()
+    classe = indice.classe_sem_caixa(nome)
     if classe:
         return classe
     if nome == "VETERANOS":
-        classe = Classe.objects.filter(nome__iexact="MASTER").first()
+        classe = indice.classe_sem_caixa("MASTER")
         if classe:
             return classe
     alt = nome.replace("-", " ")
-    return Classe.objects.filter(nome__iexact=alt).first()
+    return indice.classe_sem_caixa(alt)
 
 
 # =========================
@@ -147,20 +150,8 @@ def _normalize_decimal(peso) -> Optional[Decimal]:
 def calcular_categoria_por_peso(classe: Classe, sexo: str, peso: Decimal) -> Optional[Categoria]:
     if not classe or not sexo or peso is None:
         return None
-    qs = Categoria.objects.filter(
-        classe=classe,
-        sexo=sexo
-    ).order_by('limite_min')
-    cat = qs.filter(
-        limite_min__lte=peso
-    ).filter(
-        limite_max__gte=peso
-    ).first()
-    if cat:
-        return cat
-    acima = qs.filter(limite_min__gt=peso).order_by('limite_min').first()
-    abaixo = qs.filter(limite_min__lte=peso).order_by('-limite_min').first()
-    return acima or abaixo
+    # Sem limite_max não conta como "contém" (filtro limite_max__gte original)
+    return indice_categorias().por_peso(classe, sexo, peso, max_aberto=False)
 
 
 def validar_peso_oficial(peso) -> Optional[Decimal]:
@@ -228,6 +219,7 @@ def aprovar(inscricao: Inscricao, peso=None):
     inscricao.bloqueado_chave = False
     inscricao.remanejado = False
     inscricao.save(update_fields=["peso_real", "status_atual", "bloqueado_chave", "remanejado"])
+    sincronizar_inscricao(inscricao)
     return inscricao
 
 
@@ -242,6 +234,7 @@ def remanejar(inscricao: Inscricao, nova_categoria: Categoria, peso=None):
     inscricao.remanejado = True
     inscricao.bloqueado_chave = False
     inscricao.save(update_fields=["peso_real", "categoria_real", "status_atual", "remanejado", "bloqueado_chave"])
+    sincronizar_inscricao(inscricao)
     return inscricao
 
 
@@ -253,4 +246,5 @@ def desclassificar(inscricao: Inscricao, motivo: str = ""):
     if motivo:
         inscricao.motivo_ajuste = motivo
     inscricao.save(update_fields=["status_atual", "bloqueado_chave", "remanejado", "motivo_ajuste"])
+    sincronizar_inscricao(inscricao)
     return inscricao
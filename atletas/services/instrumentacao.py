@@ -0,0 +1,192 @@
+"""
+Instrumentação leve dos caminhos quentes (pesagem e geração de chaves).
+
+Cada etapa nomeada registra tempo de parede, número de consultas e tempo
+gasto no banco:
+
+    with medir('chave.buscar_inscricoes'):
+        ...
+
+    @medir('pesagem.validar')
+    def validar_peso(...):
+        ...
+
+As consultas são contadas com `connection.execute_wrapper`, sem depender de
+DEBUG. Etapas aninhadas são inclusivas (a externa conta também as consultas
+da interna).
+
+As amostras ficam numa janela deslizante por etapa (últimas
+INSTRUMENTACAO_JANELA execuções) neste processo. O resumo de cada processo é
+publicado no cache do Django a cada INTERVALO_PUBLICACAO segundos, para o
+comando `manage.py instrumentacao`. Com o cache em memória local (padrão),
+o comando só enxerga o próprio processo; a visão de um processo web está em
+/<organizacao>/instrumentacao/.
+
+A auditoria detalhada (antigos prints "[AUDITORIA ...]") passou para o logger
+'atletas' em nível DEBUG.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import ContextDecorator
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+# Limites (ms) dos baldes do histograma; o último balde é "acima do maior limite"
+LIMITES_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+INTERVALO_PUBLICACAO = 10  # segundos
+CHAVE_CACHE_PROCESSOS = 'atletas:instrumentacao:processos'
+TTL_CACHE = 3600
+
+_lock = threading.Lock()
+_amostras: Dict[str, deque] = {}
+_publicado_em = 0.0
+
+
+def _ativa() -> bool:
+    return getattr(settings, 'INSTRUMENTACAO_ATIVA', True)
+
+
+def _janela() -> int:
+    return getattr(settings, 'INSTRUMENTACAO_JANELA', 1000)
+
+
+class _ContadorConsultas:
+    """execute_wrapper que acumula quantidade e duração das consultas."""
+
+    __slots__ = ('consultas', 'tempo_db')
+
+    def __init__(self):
+        self.consultas = 0
+        self.tempo_db = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tempo_db += time.perf_counter() - inicio
+            self.consultas += 1
+
+
+class medir(ContextDecorator):
+    """Mede uma etapa nomeada; usável como `with medir(...)` ou `@medir(...)`."""
+
+    def __init__(self, etapa: str):
+        self.etapa = etapa
+        self._estado = None
+
+    def _recreate_cm(self):
+        # Cada chamada da função decorada usa sua própria instância (threads/reentrância)
+        return medir(self.etapa)
+
+    def __enter__(self):
+        if _ativa():
+            contador = _ContadorConsultas()
+            wrapper = connection.execute_wrapper(contador)
+            wrapper.__enter__()
+            self._estado = (contador, wrapper, time.perf_counter())
+        return self
+
+    def __exit__(self, *exc):
+        if self._estado is None:
+            return False
+        contador, wrapper, inicio = self._estado
+        self._estado = None
+        duracao = time.perf_counter() - inicio
+        wrapper.__exit__(None, None, None)
+        registrar_amostra(self.etapa, duracao, contador.consultas, contador.tempo_db)
+        return False
+
+
+def registrar_amostra(etapa: str, duracao: float, consultas: int = 0, tempo_db: float = 0.0) -> None:
+    """Adiciona uma amostra (segundos) à janela da etapa."""
+    with _lock:
+        janela = _amostras.get(etapa)
+        if janela is None or janela.maxlen != _janela():
+            janela = _amostras[etapa] = deque(janela or (), maxlen=_janela())
+        janela.append((duracao, consultas, tempo_db))
+    _publicar_se_necessario()
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(round(p * (len(ordenados) - 1))))]
+
+
+def _resumir(amostras) -> Dict:
+    duracoes = sorted(a[0] * 1000 for a in amostras)
+    consultas = [a[1] for a in amostras]
+    tempos_db = [a[2] * 1000 for a in amostras]
+    baldes = [0] * (len(LIMITES_MS) + 1)
+    for duracao in duracoes:
+        baldes[bisect_left(LIMITES_MS, duracao)] += 1
+    n = len(duracoes)
+    return {
+        'amostras': n,
+        'p50_ms': round(_percentil(duracoes, 0.50), 2),
+        'p95_ms': round(_percentil(duracoes, 0.95), 2),
+        'p99_ms': round(_percentil(duracoes, 0.99), 2),
+        'max_ms': round(duracoes[-1], 2) if n else 0.0,
+        'media_consultas': round(sum(consultas) / n, 1) if n else 0.0,
+        'max_consultas': max(consultas) if n else 0,
+        'media_db_ms': round(sum(tempos_db) / n, 2) if n else 0.0,
+        'histograma': baldes,
+    }
+
+
+def resumo(etapa: Optional[str] = None) -> Dict[str, Dict]:
+    """Estatísticas da janela de cada etapa deste processo (ordenadas por nome)."""
+    with _lock:
+        copias = {nome: list(janela) for nome, janela in _amostras.items() if etapa in (None, nome)}
+    return {nome: _resumir(amostras) for nome, amostras in sorted(copias.items())}
+
+
+def limpar() -> None:
+    """Descarta as amostras deste processo."""
+    global _publicado_em
+    with _lock:
+        _amostras.clear()
+        _publicado_em = 0.0
+
+
+def _chave_processo(pid: int) -> str:
+    return f'atletas:instrumentacao:{pid}'
+
+
+def _publicar_se_necessario() -> None:
+    global _publicado_em
+    agora = time.monotonic()
+    if agora - _publicado_em < INTERVALO_PUBLICACAO:
+        return
+    _publicado_em = agora
+    publicar()
+
+
+def publicar() -> None:
+    """Publica o resumo deste processo no cache (lido pelo comando de relatório)."""
+    pid = os.getpid()
+    try:
+        cache.set(_chave_processo(pid), {'pid': pid, 'em': time.time(), 'etapas': resumo()}, TTL_CACHE)
+        processos = set(cache.get(CHAVE_CACHE_PROCESSOS) or ())
+        if pid not in processos:
+            processos.add(pid)
+            cache.set(CHAVE_CACHE_PROCESSOS, sorted(processos), TTL_CACHE)
+    except Exception:
+        pass
+
+
+def resumos_publicados() -> List[Dict]:
+    """Resumos publicados pelos processos ativos (expirados são ignorados)."""
+    try:
+        pids = cache.get(CHAVE_CACHE_PROCESSOS) or []
+        publicados = cache.get_many([_chave_processo(pid) for pid in pids])
+    except Exception:
+        return []
+    return sorted(publicados.values(), key=lambda r: r['pid'])
@@ -0,0 +1,145 @@
+"""
+Métricas do painel operacional do evento (metricas_evento).
+
+Todos os indicadores saem de poucas consultas agregadas com
+Count(filter=...): o custo do painel não cresce com o número de chaves.
+O mesmo resultado alimenta a página HTML e o endpoint JSON de atualização.
+"""
+from django.db.models import Count, Q
+
+from atletas.models import AcademiaCampeonato, Campeonato, Chave, Inscricao
+
+
+def _percentual(parte, total):
+    return round((parte / total * 100) if total > 0 else 0, 1)
+
+
+class MetricasEvento:
+    """Calcula os indicadores de pesagem, categorias, remanejamentos e chaves."""
+
+    LIMITE_LISTA_PENDENTES = 10
+
+    def __init__(self, campeonato: Campeonato):
+        self.campeonato = campeonato
+
+    def _inscricoes(self):
+        inscricoes = Inscricao.objects.filter(campeonato=self.campeonato)
+        academias_permitidas_ids = list(AcademiaCampeonato.objects.filter(
+            campeonato=self.campeonato,
+            permitido=True
+        ).values_list('academia_id', flat=True))
+        if academias_permitidas_ids:
+            inscricoes = inscricoes.filter(atleta__academia_id__in=academias_permitidas_ids)
+        return inscricoes
+
+    def calcular(self):
+        inscricoes = self._inscricoes()
+
+        # ========== PESAGEM + REMANEJAMENTOS (uma consulta) ==========
+        pesado = Q(peso__isnull=False) & ~Q(peso=0)
+        ajustada = Q(categoria_ajustada__isnull=False) & ~Q(categoria_ajustada='')
+        remanejado = Q(remanejado=True)
+        rejeitado = Q(status_inscricao='rejeitado')
+        totais = inscricoes.aggregate(
+            total_inscritos=Count('id'),
+            total_pesados=Count('id', filter=pesado),
+            total_fora_categoria=Count('id', filter=remanejado),
+            remanejados_aceitos=Count('id', filter=remanejado & ajustada),
+            remanejados_desclassificados=Count('id', filter=remanejado & ~ajustada & rejeitado),
+        )
+        total_inscritos = totais['total_inscritos']
+        total_pesados = totais['total_pesados']
+        total_remanejados = totais['total_fora_categoria']
+        remanejados_aceitos = totais['remanejados_aceitos']
+
+        indicadores_pesagem = {
+            'total_inscritos': total_inscritos,
+            'total_pesados': total_pesados,
+            'total_pendentes': total_inscritos - total_pesados,
+            'total_fora_categoria': total_remanejados,
+            'remanejados_aceitos': remanejados_aceitos,
+            'remanejados_pendentes': total_remanejados - remanejados_aceitos,
+            'percentual_pesados': _percentual(total_pesados, total_inscritos),
+        }
+
+        # ========== ATLETAS POR CATEGORIA (uma consulta agrupada) ==========
+        atletas_por_categoria = [
+            {
+                'classe': item['classe_escolhida'],
+                'categoria': item['categoria_ajustada'] or item['categoria_escolhida'],
+                'total': item['total'],
+                'pesados': item['pesados'],
+                'pendentes': item['pendentes'],
+                'remanejados': item['remanejados'],
+            }
+            for item in inscricoes.values(
+                'classe_escolhida', 'categoria_escolhida', 'categoria_ajustada'
+            ).annotate(
+                total=Count('id'),
+                pesados=Count('id', filter=pesado),
+                pendentes=Count('id', filter=~pesado),
+                remanejados=Count('id', filter=remanejado),
+            ).order_by('classe_escolhida', 'categoria_escolhida')
+        ]
+
+        # ========== REMANEJAMENTOS PENDENTES (lista limitada) ==========
+        pendentes_qs = inscricoes.filter(remanejado & ~ajustada & ~rejeitado)
+        lista_pendentes = [
+            {
+                'id': inscricao.id,
+                'atleta_nome': inscricao.atleta.nome,
+                'peso_registrado': inscricao.peso or 0,
+                'professor': inscricao.atleta.academia.responsavel if inscricao.atleta.academia else 'N/A',
+                'academia': inscricao.atleta.academia.nome if inscricao.atleta.academia else 'N/A',
+                'categoria_original': inscricao.categoria_escolhida,
+                'categoria_proposta': inscricao.categoria_ajustada or 'Aguardando decisão',
+                'classe': inscricao.classe_escolhida,
+            }
+            for inscricao in pendentes_qs.select_related('atleta', 'atleta__academia')[:self.LIMITE_LISTA_PENDENTES]
+        ]
+        remanejamentos = {
+            'pendentes': total_remanejados - remanejados_aceitos - totais['remanejados_desclassificados'],
+            'resolvidos': remanejados_aceitos,
+            'desclassificados': totais['remanejados_desclassificados'],
+            'total': total_remanejados,
+            'lista_pendentes': lista_pendentes,
+        }
+
+        # ========== CHAVES (uma consulta agrupada por chave) ==========
+        chaves = Chave.objects.filter(campeonato=self.campeonato).values('id').annotate(
+            lutas_total=Count('lutas'),
+            lutas_concluidas=Count('lutas', filter=Q(lutas__concluida=True)),
+        ).values_list('lutas_total', 'lutas_concluidas')
+
+        indicadores_chaves = {
+            'total_chaves': 0,
+            'chaves_finalizadas': 0,
+            'chaves_pendentes': 0,
+            'chaves_em_construcao': 0,
+            'total_lutas_geradas': 0,
+            'total_lutas_finalizadas': 0,
+        }
+        for lutas_total, lutas_concluidas in chaves:
+            indicadores_chaves['total_chaves'] += 1
+            indicadores_chaves['total_lutas_geradas'] += lutas_total
+            indicadores_chaves['total_lutas_finalizadas'] += lutas_concluidas
+            if lutas_total == 0:
+                indicadores_chaves['chaves_em_construcao'] += 1
+            elif lutas_concluidas == lutas_total:
+                indicadores_chaves['chaves_finalizadas'] += 1
+            else:
+                indicadores_chaves['chaves_pendentes'] += 1
+
+        progresso_campeonato = _percentual(
+            indicadores_chaves['total_lutas_finalizadas'],
+            indicadores_chaves['total_lutas_geradas'],
+        )
+        indicadores_chaves['progresso_campeonato'] = progresso_campeonato
+
+        return {
+            'indicadores_pesagem': indicadores_pesagem,
+            'atletas_por_categoria': atletas_por_categoria,
+            'remanejamentos': remanejamentos,
+            'indicadores_chaves': indicadores_chaves,
+            'progresso_campeonato': progresso_campeonato,
+        }
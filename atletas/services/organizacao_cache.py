@@ -0,0 +1,58 @@
+"""
+Cache em processo das organizações ativas (por slug) e do campeonato ativo de cada uma.
+
+O OrganizacaoMiddleware resolve a organização em toda requisição multi-tenant,
+inclusive nos polls AJAX da pesagem e da mesa. Com o cache, a resolução e o
+campeonato ativo saem da memória; as entradas expiram após
+ORGANIZACAO_CACHE_TTL segundos (limite de defasagem entre processos) e são
+descartadas neste processo quando Organizador ou Campeonato é salvo/excluído
+(ver atletas.signals).
+
+Cada chamada devolve cópias das instâncias: uma view que altere o objeto não
+contamina as requisições seguintes.
+"""
+import copy
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+
+from atletas.models import Campeonato, Organizador
+
+_lock = threading.Lock()
+# slug -> (expira_em, organizacao, campeonato_ativo)
+_entradas: Dict[str, Tuple[float, Organizador, Optional[Campeonato]]] = {}
+
+
+def _ttl() -> float:
+    return getattr(settings, 'ORGANIZACAO_CACHE_TTL', 60)
+
+
+def resolver_organizacao(slug: str) -> Tuple[Optional[Organizador], Optional[Campeonato]]:
+    """(organização ativa, campeonato ativo dela) para o slug; (None, None) se não existir."""
+    agora = time.monotonic()
+    entrada = _entradas.get(slug)
+    if entrada is None or entrada[0] <= agora:
+        organizacao = Organizador.objects.filter(slug=slug, ativo=True).first()
+        if organizacao is None:
+            # Slugs inexistentes não são guardados: o cache não cresce com URLs arbitrárias
+            with _lock:
+                _entradas.pop(slug, None)
+            return None, None
+        campeonato = Campeonato.objects.filter(ativo=True, organizador=organizacao).first()
+        entrada = (agora + _ttl(), organizacao, campeonato)
+        with _lock:
+            _entradas[slug] = entrada
+    _, organizacao, campeonato = entrada
+    organizacao = copy.copy(organizacao)
+    if campeonato is not None:
+        campeonato = copy.copy(campeonato)
+        campeonato.organizador = organizacao
+    return organizacao, campeonato
+
+
+def invalidar_cache_organizacoes() -> None:
+    """Descarta todas as entradas (chamado nos sinais de Organizador e Campeonato)."""
+    with _lock:
+        _entradas.clear()
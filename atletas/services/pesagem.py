@@ -1,3 +1,4 @@
+import logging
 from typing import Optional, Tuple, Dict
 from decimal import Decimal
 from django.db import transaction, models
@@ -8,12 +9,15 @@ from atletas.models import (
     Inscricao,
     PesagemHistorico,
     OcorrenciaAtleta,
-    AcademiaPontuacao,
     Chave,
     Luta,
-    Classe,
 )
 from atletas.utils import validar_faixa_e_categoria_por_idade
+from atletas.services.pontuacao import sincronizar_chave, sincronizar_inscricao
+from atletas.services.indice_categorias import indice_categorias
+from atletas.services.instrumentacao import medir
+
+logger = logging.getLogger(__name__)
 
 
 def _normalize_classe_nome(nome: str) -> str:
@@ -51,20 +55,9 @@ def _normalize_classe_nome(nome: str) -> str:
 def _buscar_classe_por_nome(nome: str):
     """
     Encontra Classe usando normalizacao flexivel (SUB 13 vs SUB-13).
-    Retorna None se nao encontrar.
+    Retorna None se nao encontrar. Usa o índice em memória (sem consultas).
     """
-    if not nome:
-        return None
-    nome_norm = _normalize_classe_nome(nome)
-    # Tenta match direto primeiro
-    classe = Classe.objects.filter(nome__iexact=nome).first()
-    if classe:
-        return classe
-    # Match por normalizacao
-    for classe_obj in Classe.objects.all():
-        if _normalize_classe_nome(classe_obj.nome) == nome_norm:
-            return classe_obj
-    return None
+    return indice_categorias().classe(nome)
 
 
 def _tolerancia_por_classe(classe_nome: str) -> Decimal:
@@ -94,27 +87,8 @@ def calcular_categoria_por_peso(classe_nome: str, sexo: str, peso: Decimal) -> O
         peso = Decimal(str(peso))
     if not classe_nome or not sexo or peso is None:
         return None
-    classe_obj = _buscar_classe_por_nome(classe_nome)
-    if not classe_obj:
-        return None
-
-    qs = Categoria.objects.filter(
-        classe=classe_obj,
-        sexo=sexo
-    ).order_by('limite_min')
-
-    categoria = qs.filter(
-        limite_min__lte=peso
-    ).filter(
-        models.Q(limite_max__gte=peso) | models.Q(limite_max__isnull=True)
-    ).first()
-
-    if categoria:
-        return categoria
-
-    acima = qs.filter(limite_min__gt=peso).order_by('limite_min').first()
-    abaixo = qs.filter(limite_min__lte=peso).order_by('-limite_min').first()
-    return acima or abaixo
+    indice = indice_categorias()
+    return indice.por_peso(indice.classe(classe_nome), sexo, peso)
 
 
 def _limites_categoria(categoria: Optional[Categoria]) -> Tuple[Optional[Decimal], Optional[Decimal]]:
@@ -125,6 +99,7 @@ def _limites_categoria(categoria: Optional[Categoria]) -> Tuple[Optional[Decimal
     return limite_min, limite_max
 
 
+@medir('pesagem.validar')
 def validar_peso(inscricao: Inscricao, peso: float) -> Dict:
     """
     Não salva nada. Apenas valida peso contra categoria atual e sugere nova categoria.
@@ -170,22 +145,12 @@ def validar_peso(inscricao: Inscricao, peso: float) -> Dict:
         if inscricao.categoria_real:
             categoria_encontrada = inscricao.categoria_real
         else:
-            categoria_encontrada = Categoria.objects.filter(
-                categoria_nome=categoria_nome,
-                classe__nome=classe_atleta,
-                sexo=inscricao.atleta.sexo
-            ).first()
+            indice = indice_categorias()
+            categoria_encontrada = indice.por_nome(categoria_nome, classe_atleta, inscricao.atleta.sexo)
             if not categoria_encontrada and classe_atleta_raw and classe_atleta_raw != classe_atleta:
-                categoria_encontrada = Categoria.objects.filter(
-                    categoria_nome=categoria_nome,
-                    classe__nome=classe_atleta_raw,
-                    sexo=inscricao.atleta.sexo
-                ).first()
+                categoria_encontrada = indice.por_nome(categoria_nome, classe_atleta_raw, inscricao.atleta.sexo)
             if not categoria_encontrada:
-                categoria_encontrada = Categoria.objects.filter(
-                    categoria_nome=categoria_nome,
-                    sexo=inscricao.atleta.sexo
-                ).order_by('limite_min').first()
+                categoria_encontrada = indice.por_nome_qualquer_classe(categoria_nome, inscricao.atleta.sexo)
 
         if categoria_encontrada:
             tolerancia = _tolerancia_por_classe(classe_atleta)
@@ -220,16 +185,21 @@ def validar_peso(inscricao: Inscricao, peso: float) -> Dict:
             mensagem = 'Categoria não encontrada para validar peso'
             categoria_sugerida = calcular_categoria_por_peso(classe_atleta, inscricao.atleta.sexo, peso)
 
-    print("[AUDITORIA PESO] categoria_atual_raw=", categoria_nome_raw,
-          "categoria_normalizada=", categoria_nome,
-          "classe_raw=", classe_atleta_raw,
-          "classe_norm=", classe_atleta,
-          "tolerancia=", _tolerancia_por_classe(classe_atleta),
-          "limite_min=", categoria_encontrada.limite_min if categoria_encontrada else None,
-          "limite_max=", categoria_encontrada.limite_max if categoria_encontrada else None,
-          "limite_max_real=", limite_max_real if 'limite_max_real' in locals() else None,
-          "status_pesagem=", status_pesagem,
-          "categoria_sugerida=", categoria_sugerida.categoria_nome if categoria_sugerida else None)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "[AUDITORIA PESO] categoria_atual_raw=%s categoria_normalizada=%s classe_raw=%s classe_norm=%s "
+            "tolerancia=%s limite_min=%s limite_max=%s limite_max_real=%s status_pesagem=%s categoria_sugerida=%s",
+            categoria_nome_raw,
+            categoria_nome,
+            classe_atleta_raw,
+            classe_atleta,
+            _tolerancia_por_classe(classe_atleta),
+            categoria_encontrada.limite_min if categoria_encontrada else None,
+            categoria_encontrada.limite_max if categoria_encontrada else None,
+            limite_max_real if 'limite_max_real' in locals() else None,
+            status_pesagem,
+            categoria_sugerida.categoria_nome if categoria_sugerida else None,
+        )
 
     return {
         'categoria_ok': categoria_ok,
@@ -242,6 +212,7 @@ def validar_peso(inscricao: Inscricao, peso: float) -> Dict:
     }
 
 
+@medir('pesagem.registrar')
 def registrar_peso(inscricao: Inscricao, peso: Decimal, observacoes: str = "", usuario=None) -> Dict:
     """
     Fluxo central de registro de pesagem:
@@ -300,14 +271,17 @@ def registrar_peso(inscricao: Inscricao, peso: Decimal, observacoes: str = "", u
 
     limite_atual_min, limite_atual_max = _limites_categoria(categoria_encontrada)
     limite_novo_min, limite_novo_max = _limites_categoria(categoria_sugerida)
-    print("[AUDITORIA PESO] retorno_validacao",
-          "categoria_ok=", validacao.get("categoria_ok"),
-          "status=", validacao.get("status_pesagem"),
-          "categoria_atual=", validacao.get("categoria_atual_nome"),
-          "categoria_encontrada=", categoria_encontrada.categoria_nome if categoria_encontrada else None,
-          "categoria_sugerida=", categoria_sugerida.categoria_nome if categoria_sugerida else None,
-          "limite_atual=", (limite_atual_min, limite_atual_max),
-          "limite_novo=", (limite_novo_min, limite_novo_max))
+    logger.debug(
+        "[AUDITORIA PESO] retorno_validacao categoria_ok=%s status=%s categoria_atual=%s "
+        "categoria_encontrada=%s categoria_sugerida=%s limite_atual=%s limite_novo=%s",
+        validacao.get("categoria_ok"),
+        validacao.get("status_pesagem"),
+        validacao.get("categoria_atual_nome"),
+        categoria_encontrada.categoria_nome if categoria_encontrada else None,
+        categoria_sugerida.categoria_nome if categoria_sugerida else None,
+        (limite_atual_min, limite_atual_max),
+        (limite_novo_min, limite_novo_max),
+    )
     return {
         "categoria_ok": False,
         "precisa_confirmacao": True,
@@ -335,6 +309,8 @@ def remover_de_chaves(campeonato, atleta):
             models.Q(atleta_a=atleta) | models.Q(atleta_b=atleta) | models.Q(vencedor=atleta)
         ).delete()
         chave.save()
+        # Colocações podem ter mudado: estornar/aplicar pontuação da chave
+        sincronizar_chave(chave)
 
 
 def registrar_peso_ok(inscricao: Inscricao, peso: Decimal, categoria_final: Optional[Categoria] = None, observacoes: str = '', motivo_ajuste: str = '', usuario=None):
@@ -380,6 +356,9 @@ def registrar_peso_ok(inscricao: Inscricao, peso: Decimal, categoria_final: Opti
         pesado_por=usuario if usuario and usuario.is_authenticated else None
     )
 
+    # Aprovação pode gerar ponto de Festival ou desfazer remanejamento
+    sincronizar_inscricao(inscricao)
+
 
 @transaction.atomic
 def confirmar_remanejamento(inscricao: Inscricao, peso: Decimal, acao: str, categoria_sugerida: Optional[Categoria], observacoes: str = '', usuario=None):
@@ -460,14 +439,8 @@ def confirmar_remanejamento(inscricao: Inscricao, peso: Decimal, acao: str, cate
             }
         )
 
-        pontuacao, _ = AcademiaPontuacao.objects.get_or_create(
-            campeonato=inscricao.campeonato,
-            academia=inscricao.atleta.academia,
-            defaults={'pontos_totais': 0}
-        )
-        pontuacao.remanejamento = pontuacao.remanejamento + 1
-        pontuacao.pontos_totais = pontuacao.pontos_totais - 1
-        pontuacao.save()
+        # Debita 1 ponto da academia (delta incremental)
+        sincronizar_inscricao(inscricao)
 
         # Remover atleta de chaves antigas para reprocessar chaveamento
         remover_de_chaves(inscricao.campeonato, inscricao.atleta)
@@ -511,6 +484,7 @@ def confirmar_remanejamento(inscricao: Inscricao, peso: Decimal, acao: str, cate
             }
         )
 
+        sincronizar_inscricao(inscricao)
         remover_de_chaves(inscricao.campeonato, inscricao.atleta)
         return 'desclassificado', None
 
@@ -561,5 +535,6 @@ def desclassificar_por_faixa(inscricao: Inscricao, peso: Decimal, motivo: str, c
         }
     )
 
+    sincronizar_inscricao(inscricao)
     remover_de_chaves(inscricao.campeonato, inscricao.atleta)
 
@@ -0,0 +1,153 @@
+"""
+Modelo de leitura da tela de pesagem (desktop e mobile).
+
+A mesa de pesagem recarrega a lista após cada leitura da balança; por isso as
+linhas são montadas num número constante de consultas:
+
+    inscricoes = inscricoes_pesagem(campeonato, classe, sexo, categoria)
+    linhas = montar_linhas_pesagem(inscricoes, campeonato)
+
+- histórico recente via Prefetch fatiado (5 últimas pesagens por inscrição);
+- classes e categorias resolvidas no índice em memória
+  (services.indice_categorias), substituindo as buscas por linha de Categoria
+  e de `calcular_categoria_por_peso`.
+"""
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List
+
+from django.db.models import Prefetch, Q
+
+from atletas.models import (
+    AcademiaCampeonato,
+    Campeonato,
+    ConferenciaPagamento,
+    Inscricao,
+    PesagemHistorico,
+)
+from atletas.services.indice_categorias import indice_categorias
+
+HISTORICO_POR_INSCRICAO = 5
+
+STATUS_LABEL_MAP = {
+    'aprovado': 'OK',
+    'remanejado': 'Remanejado',
+    'desclassificado': 'Desclassificado',
+    'pendente': 'Pendente',
+    'inscrito': 'Inscrito',
+}
+
+
+def inscricoes_pesagem(campeonato: Campeonato, classe: str = '', sexo: str = '', categoria: str = ''):
+    """Inscrições exibidas na pesagem, já com o histórico recente pré-carregado."""
+    academias_permitidas_ids = list(AcademiaCampeonato.objects.filter(
+        campeonato=campeonato,
+        permitido=True
+    ).values_list('academia_id', flat=True))
+
+    academias_confirmadas_ids = list(ConferenciaPagamento.objects.filter(
+        campeonato=campeonato,
+        status='CONFIRMADO'
+    ).values_list('academia_id', flat=True))
+
+    status_filter = Q(status_inscricao__in=['aprovado', 'confirmado', 'ok', 'remanejado'])
+    status_filter |= Q(status_atual__in=['pendente', 'inscrito', 'aprovado', 'remanejado', 'desclassificado'])
+
+    historico = PesagemHistorico.objects.filter(campeonato=campeonato).order_by('-data_hora')
+    inscricoes = Inscricao.objects.filter(
+        campeonato=campeonato,
+    ).filter(status_filter).select_related(
+        'atleta', 'atleta__academia', 'campeonato', 'classe_real', 'categoria_real',
+    ).prefetch_related(
+        Prefetch('historico_pesagens', queryset=historico[:HISTORICO_POR_INSCRICAO], to_attr='historico_recente'),
+    )
+
+    # Mostrar apenas academias permitidas no campeonato
+    if academias_permitidas_ids:
+        inscricoes = inscricoes.filter(atleta__academia_id__in=academias_permitidas_ids)
+
+    # Se houver conferência confirmada, prioriza filtragem; caso contrário não esvazia a lista
+    if academias_confirmadas_ids:
+        inscricoes = inscricoes.filter(atleta__academia_id__in=academias_confirmadas_ids)
+
+    if classe:
+        inscricoes = inscricoes.filter(classe_real__nome=classe)
+    if sexo:
+        inscricoes = inscricoes.filter(atleta__sexo=sexo)
+    if categoria:
+        inscricoes = inscricoes.filter(categoria_real__categoria_nome=categoria)
+
+    return inscricoes.order_by('atleta__nome')
+
+
+def montar_linhas_pesagem(inscricoes, campeonato: Campeonato) -> List[SimpleNamespace]:
+    """Linhas da tela de pesagem; uma consulta para inscrições e uma para o histórico."""
+    indice = indice_categorias()
+    ano_evento = campeonato.data_competicao.year if campeonato and campeonato.data_competicao else None
+
+    atletas = []
+    for inscricao in inscricoes:
+        atleta = inscricao.atleta
+        categoria_nome_raw = (inscricao.categoria_real.categoria_nome if inscricao.categoria_real else '') or ''
+        classe_atleta = inscricao.classe_real.nome if inscricao.classe_real else atleta.get_classe_atual(ano_evento=ano_evento)
+
+        categoria_encontrada = inscricao.categoria_real
+        if not categoria_encontrada and categoria_nome_raw and classe_atleta:
+            categoria_encontrada = indice.por_nome(categoria_nome_raw, classe_atleta, atleta.sexo)
+        if not categoria_encontrada and classe_atleta:
+            peso_base = inscricao.peso_real
+            if peso_base is not None:
+                try:
+                    categoria_encontrada = indice.por_peso(indice.classe(classe_atleta), atleta.sexo, Decimal(peso_base))
+                except Exception:
+                    categoria_encontrada = None
+
+        limite_min = float(categoria_encontrada.limite_min) if categoria_encontrada else None
+        limite_max = float(categoria_encontrada.limite_max) if categoria_encontrada and categoria_encontrada.limite_max is not None else None
+
+        if categoria_encontrada:
+            if limite_min == 0:
+                limite_texto = f"Até {categoria_encontrada.limite_max:.1f} kg"
+            elif limite_max is None or limite_max >= 999:
+                limite_texto = f"+{limite_min:.1f} kg"
+            else:
+                limite_texto = f"{limite_min:.1f} a {limite_max:.1f} kg"
+            categoria_label = categoria_encontrada.label
+        else:
+            limite_texto = '-'
+            categoria_label = categoria_nome_raw or '-'
+
+        peso_oficial = inscricao.peso_real
+        status_codigo = inscricao.status_atual
+        peso_fora_categoria = False
+        if peso_oficial is not None and categoria_encontrada and limite_min is not None:
+            max_real = limite_max if limite_max is not None and limite_max < 999 else None
+            peso_fora_categoria = not (peso_oficial >= limite_min and (max_real is None or peso_oficial <= max_real))
+
+        atletas.append(SimpleNamespace(
+            id=atleta.id,
+            inscricao_id=inscricao.id,
+            inscricao_obj=inscricao,
+            nome=atleta.nome,
+            academia=atleta.academia,
+            sexo=atleta.sexo,
+            classe=classe_atleta,
+            categoria_nome=categoria_nome_raw,
+            categoria_ajustada=categoria_nome_raw,
+            categoria_label=categoria_label,
+            categoria_real_nome=categoria_encontrada.categoria_nome if categoria_encontrada else categoria_nome_raw or '',
+            limite_categoria_real=limite_texto,
+            limite_min=limite_min,
+            limite_max=limite_max,
+            limite_texto=limite_texto,
+            peso_oficial=peso_oficial,
+            remanejado=inscricao.remanejado,
+            motivo_ajuste=inscricao.motivo_ajuste or '',
+            status=STATUS_LABEL_MAP.get(status_codigo, 'Pendente'),
+            status_codigo=status_codigo,
+            peso_fora_categoria=peso_fora_categoria,
+            historico_pesagens=inscricao.historico_recente,
+            get_sexo_display=atleta.get_sexo_display,
+            bloqueado_chave=inscricao.bloqueado_chave,
+        ))
+    return atletas
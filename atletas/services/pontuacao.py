@@ -0,0 +1,351 @@
+"""
+Motor incremental de pontuação de academias.
+
+Em vez de apagar e recalcular todo o ranking a cada acesso aos painéis,
+cada evento que altera a pontuação (resultado de luta, remanejamento,
+aprovação de Festival) aplica apenas a diferença (delta) nas linhas de
+AcademiaPontuacao afetadas. O recálculo completo de um campeonato fica
+restrito a `recalcular_pontuacao_campeonato` (comando `recalcular_pontuacao`).
+
+O mesmo fluxo mantém o quadro de medalhas por atleta (MedalhaAtleta), lido
+pelos rankings com uma única consulta (`quadro_medalhas`).
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from atletas.models import (
+    Academia,
+    AcademiaPontuacao,
+    Atleta,
+    Campeonato,
+    Chave,
+    Inscricao,
+    MedalhaAtleta,
+)
+from atletas.utils import get_resultados_chave
+
+
+# Regras de pontuação:
+# Ouro = 10, Prata = 7, Bronze = 5, 4º = 3, 5º = 1, Festival = 1, Remanejamento = -1
+PONTOS_POR_CAMPO = {
+    'ouro': 10,
+    'prata': 7,
+    'bronze': 5,
+    'quarto': 3,
+    'quinto': 1,
+    'festival': 1,
+    'remanejamento': -1,
+}
+
+CAMPO_POR_COLOCACAO = {
+    1: 'ouro',
+    2: 'prata',
+    3: 'bronze',
+    4: 'quarto',
+    5: 'quinto',
+}
+
+
+def calcular_pontos_totais(contadores: Dict[str, int]) -> int:
+    """Converte contadores (ouro, prata, ...) em pontos totais."""
+    return sum(contadores.get(campo, 0) * pontos for campo, pontos in PONTOS_POR_CAMPO.items())
+
+
+def _filtro_festival() -> Q:
+    return Q(classe_escolhida='Festival', status_inscricao='aprovado')
+
+
+def _filtro_remanejamento() -> Q:
+    return Q(remanejado=True, status_inscricao='aprovado')
+
+
+def aplicar_delta(campeonato: Campeonato, academia_id: int, deltas: Dict[str, int]) -> None:
+    """
+    Soma os deltas informados nos contadores da academia no campeonato.
+
+    A atualização usa expressões F() para não depender do valor lido em memória
+    (duas mesas registrando lutas ao mesmo tempo não sobrescrevem uma à outra).
+    """
+    deltas = {campo: valor for campo, valor in deltas.items() if valor}
+    if not academia_id or not deltas:
+        return
+
+    pontos = calcular_pontos_totais(deltas)
+    with transaction.atomic():
+        AcademiaPontuacao.objects.get_or_create(campeonato=campeonato, academia_id=academia_id)
+        updates = {campo: F(campo) + valor for campo, valor in deltas.items()}
+        if pontos:
+            updates['pontos_totais'] = F('pontos_totais') + pontos
+        AcademiaPontuacao.objects.filter(
+            campeonato=campeonato,
+            academia_id=academia_id,
+        ).update(**updates)
+
+        # Academia.pontos espelha a pontuação do campeonato ativo
+        if pontos and campeonato.ativo:
+            Academia.objects.filter(id=academia_id).update(pontos=F('pontos') + pontos)
+
+
+def _classificacao_chave(chave: Chave, resultados: List[Optional[int]]) -> List[Dict]:
+    """Monta a classificação (com academia) a partir de get_resultados_chave."""
+    atletas_ids = [atleta_id for atleta_id in resultados if atleta_id]
+    academias = dict(
+        Atleta.objects.filter(id__in=atletas_ids).values_list('id', 'academia_id')
+    ) if atletas_ids else {}
+
+    classificacao = []
+    for idx, atleta_id in enumerate(resultados, 1):
+        if not atleta_id or atleta_id not in academias:
+            continue
+        classificacao.append({
+            "atleta_id": atleta_id,
+            "colocacao": idx,
+            "academia_id": academias[atleta_id],
+        })
+    return classificacao
+
+
+def _completar_academias(classificacao: List[Dict]) -> List[Dict]:
+    """Preenche academia_id em classificações gravadas antes do motor incremental."""
+    faltantes = [item["atleta_id"] for item in classificacao if not item.get("academia_id")]
+    if not faltantes:
+        return classificacao
+    academias = dict(Atleta.objects.filter(id__in=faltantes).values_list('id', 'academia_id'))
+    return [
+        item if item.get("academia_id") else {**item, "academia_id": academias.get(item["atleta_id"])}
+        for item in classificacao
+    ]
+
+
+def _contadores_classificacao(classificacao: Iterable[Dict], sinal: int = 1) -> Dict[int, Dict[str, int]]:
+    contadores = defaultdict(lambda: defaultdict(int))
+    for item in classificacao or []:
+        campo = CAMPO_POR_COLOCACAO.get(item.get("colocacao"))
+        academia_id = item.get("academia_id")
+        if campo and academia_id:
+            contadores[academia_id][campo] += sinal
+    return contadores
+
+
+def _medalhas_chave(chave: Chave, classificacao: Iterable[Dict]) -> List[MedalhaAtleta]:
+    """Linhas do quadro de medalhas (apenas 1º a 3º) para a classificação da chave."""
+    return [
+        MedalhaAtleta(
+            campeonato_id=chave.campeonato_id,
+            chave=chave,
+            atleta_id=item["atleta_id"],
+            colocacao=item["colocacao"],
+            classe=chave.classe or '',
+            sexo=chave.sexo or '',
+            categoria=chave.categoria or '',
+        )
+        for item in classificacao
+        if item.get("colocacao") in (1, 2, 3)
+    ]
+
+
+def sincronizar_chave(chave: Chave, classificacao_anterior: Optional[List[Dict]] = None) -> List[Dict]:
+    """
+    Recalcula a classificação de UMA chave e aplica a diferença na pontuação.
+
+    A classificação já contabilizada fica salva em `chave.estrutura["classificacao"]`
+    (com academia_id), de modo que o estorno não precisa consultar atletas.
+    Use `classificacao_anterior` quando a estrutura da chave já foi sobrescrita
+    (ex.: regeração da chave).
+    """
+    if not chave.campeonato_id:
+        return []
+
+    estrutura = chave.estrutura or {}
+    if classificacao_anterior is None:
+        classificacao_anterior = estrutura.get("classificacao", [])
+    classificacao_anterior = _completar_academias(classificacao_anterior or [])
+
+    resultados = get_resultados_chave(chave) if estrutura else []
+    classificacao_nova = _classificacao_chave(chave, resultados or [])
+
+    if classificacao_nova == classificacao_anterior and estrutura.get("classificacao") == classificacao_nova:
+        return classificacao_nova
+
+    with transaction.atomic():
+        if estrutura or classificacao_nova:
+            estrutura["classificacao"] = classificacao_nova
+            chave.estrutura = estrutura
+            chave.save(update_fields=['estrutura'])
+        aplicar_classificacoes(chave.campeonato, [(chave, classificacao_anterior, classificacao_nova)])
+
+    return classificacao_nova
+
+
+def aplicar_classificacoes(campeonato: Campeonato, alteracoes: Iterable) -> None:
+    """
+    Aplica a troca de classificação de várias chaves de uma vez.
+
+    `alteracoes` é uma sequência de (chave, classificacao_anterior, classificacao_nova).
+    Os deltas são somados por academia antes de gravar, e o quadro de medalhas
+    é reescrito apenas para as chaves informadas. Não grava `chave.estrutura`.
+    """
+    alteracoes = list(alteracoes)
+    if not alteracoes:
+        return
+
+    deltas = defaultdict(lambda: defaultdict(int))
+    medalhas = []
+    for chave, anterior, nova in alteracoes:
+        for sinal, classificacao in ((-1, _completar_academias(anterior or [])), (1, nova or [])):
+            for academia_id, campos in _contadores_classificacao(classificacao, sinal).items():
+                for campo, valor in campos.items():
+                    deltas[academia_id][campo] += valor
+        medalhas.extend(_medalhas_chave(chave, nova or []))
+
+    with transaction.atomic():
+        for academia_id, campos in deltas.items():
+            aplicar_delta(campeonato, academia_id, campos)
+        # Quadro de medalhas: só as linhas destas chaves são reescritas
+        MedalhaAtleta.objects.filter(chave__in=[chave for chave, _, _ in alteracoes]).delete()
+        MedalhaAtleta.objects.bulk_create(medalhas)
+
+
+def sincronizar_inscricoes_academia(campeonato: Campeonato, academia_id: int) -> None:
+    """
+    Reconta Festival e remanejamentos de uma academia e aplica a diferença.
+
+    Chamado depois de aprovações, remanejamentos e desclassificações (inclusive
+    atualizações em lote, como a conferência de pagamentos).
+    """
+    if not campeonato or not academia_id:
+        return
+
+    contagem = Inscricao.objects.filter(
+        campeonato=campeonato,
+        atleta__academia_id=academia_id,
+    ).aggregate(
+        festival=Count('id', filter=_filtro_festival()),
+        remanejamento=Count('id', filter=_filtro_remanejamento()),
+    )
+    atual = AcademiaPontuacao.objects.filter(
+        campeonato=campeonato,
+        academia_id=academia_id,
+    ).values('festival', 'remanejamento').first() or {'festival': 0, 'remanejamento': 0}
+
+    aplicar_delta(campeonato, academia_id, {
+        'festival': contagem['festival'] - atual['festival'],
+        'remanejamento': contagem['remanejamento'] - atual['remanejamento'],
+    })
+
+
+def sincronizar_inscricao(inscricao: Inscricao) -> None:
+    """Atalho para sincronizar a academia de uma inscrição."""
+    sincronizar_inscricoes_academia(inscricao.campeonato, inscricao.atleta.academia_id)
+
+
+@transaction.atomic
+def recalcular_pontuacao_campeonato(campeonato: Campeonato) -> int:
+    """
+    Recalcula do zero a pontuação de todas as academias de um campeonato.
+
+    Operação pesada: percorre todas as chaves. Não deve ser chamada por
+    painéis; use o comando `manage.py recalcular_pontuacao`.
+    Retorna o número de academias pontuadas.
+    """
+    contadores = defaultdict(lambda: defaultdict(int))
+
+    # 1. Festival e remanejamentos em uma única consulta agregada
+    inscricoes = (
+        Inscricao.objects.filter(campeonato=campeonato)
+        .filter(_filtro_festival() | _filtro_remanejamento())
+        .values('atleta__academia_id')
+        .annotate(
+            festival=Count('id', filter=_filtro_festival()),
+            remanejamento=Count('id', filter=_filtro_remanejamento()),
+        )
+    )
+    for linha in inscricoes:
+        academia_id = linha['atleta__academia_id']
+        contadores[academia_id]['festival'] += linha['festival']
+        contadores[academia_id]['remanejamento'] += linha['remanejamento']
+
+    # 2. Colocações nas chaves
+    chaves_alteradas = []
+    medalhas = []
+    for chave in Chave.objects.filter(campeonato=campeonato):
+        resultados = get_resultados_chave(chave) if chave.estrutura else []
+        if not resultados:
+            continue
+        classificacao = _classificacao_chave(chave, resultados)
+        chave.estrutura["classificacao"] = classificacao
+        chaves_alteradas.append(chave)
+        medalhas.extend(_medalhas_chave(chave, classificacao))
+        for academia_id, campos in _contadores_classificacao(classificacao).items():
+            for campo, valor in campos.items():
+                contadores[academia_id][campo] += valor
+
+    if chaves_alteradas:
+        Chave.objects.bulk_update(chaves_alteradas, ['estrutura'])
+
+    MedalhaAtleta.objects.filter(campeonato=campeonato).delete()
+    MedalhaAtleta.objects.bulk_create(medalhas)
+
+    # 3. Persistir
+    AcademiaPontuacao.objects.filter(campeonato=campeonato).delete()
+    registros = []
+    for academia_id, campos in contadores.items():
+        registros.append(AcademiaPontuacao(
+            campeonato=campeonato,
+            academia_id=academia_id,
+            pontos_totais=calcular_pontos_totais(campos),
+            **{campo: campos.get(campo, 0) for campo in PONTOS_POR_CAMPO},
+        ))
+    AcademiaPontuacao.objects.bulk_create(registros)
+
+    Academia.objects.all().update(pontos=0)
+    academias = [Academia(id=reg.academia_id, pontos=reg.pontos_totais) for reg in registros]
+    Academia.objects.bulk_update(academias, ['pontos'])
+
+    return len(registros)
+
+
+def quadro_medalhas(
+    campeonato: Campeonato,
+    classe: str = '',
+    sexo: str = '',
+    categoria: str = '',
+) -> List[Dict]:
+    """
+    Ranking de atletas por medalhas a partir do quadro materializado.
+
+    Uma única consulta (agregada por atleta, com academia via select_related).
+    Os filtros de classe/sexo/categoria usam os índices de MedalhaAtleta.
+    """
+    filtro = Q(medalhas__campeonato=campeonato)
+    if classe:
+        filtro &= Q(medalhas__classe=classe)
+    if sexo:
+        filtro &= Q(medalhas__sexo=sexo)
+    if categoria:
+        filtro &= Q(medalhas__categoria=categoria)
+
+    atletas = (
+        Atleta.objects.filter(filtro)
+        .select_related('academia')
+        .annotate(
+            ouro=Count('medalhas', filter=Q(medalhas__colocacao=1)),
+            prata=Count('medalhas', filter=Q(medalhas__colocacao=2)),
+            bronze=Count('medalhas', filter=Q(medalhas__colocacao=3)),
+            total_medalhas=Count('medalhas'),
+        )
+        .order_by('-total_medalhas', '-ouro', '-prata', '-bronze', 'nome')
+    )
+    return [
+        {
+            'atleta': atleta,
+            'ouro': atleta.ouro,
+            'prata': atleta.prata,
+            'bronze': atleta.bronze,
+            'total_medalhas': atleta.total_medalhas,
+        }
+        for atleta in atletas
+    ]
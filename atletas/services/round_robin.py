@@ -0,0 +1,107 @@
+"""
+Classificação de chaves round robin (`gerar_round_robin`) a partir das
+lutas já carregadas, sem consultas extras.
+
+A matriz de vitórias é montada em uma passada ({vencedor_id: {perdedor_id:
+vitórias}}). Empates entre dois ou mais atletas são resolvidos pelo
+mini-quadro de confronto direto (vitórias apenas entre os empatados),
+reaplicado a cada subgrupo que continuar empatado; quem seguir empatado
+cai nos critérios técnicos (ippons, wazaris, yukos).
+
+As regras são as mesmas de competition_api/brackets/standings.py; os dois
+projetos não compartilham código Python, por isso a lógica está replicada.
+"""
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Vitória por YUKO não conta como vitória na classificação (mesma regra da melhor de 3)
+TIPO_SEM_VITORIA = "YUKO"
+
+
+def matriz_vitorias(confrontos: Iterable) -> Dict[int, Dict[int, int]]:
+    """`confrontos`: pares (vencedor_id, perdedor_id) das lutas concluídas."""
+    matriz: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    for vencedor_id, perdedor_id in confrontos:
+        if vencedor_id and perdedor_id:
+            matriz[vencedor_id][perdedor_id] += 1
+    return matriz
+
+
+def vitorias_no_grupo(matriz: Dict, atleta_id: int, grupo: Iterable[int]) -> int:
+    linha = matriz.get(atleta_id, {})
+    return sum(linha.get(outro, 0) for outro in grupo if outro != atleta_id)
+
+
+def _separar(itens: Iterable, chave: Callable) -> List[List]:
+    grupos: List[List] = []
+    for item in sorted(itens, key=chave):
+        if grupos and chave(grupos[-1][0]) == chave(item):
+            grupos[-1].append(item)
+        else:
+            grupos.append([item])
+    return grupos
+
+
+def _desempatar(grupo: List, matriz: Dict, desempate: Callable) -> List:
+    if len(grupo) == 1:
+        return grupo
+    subgrupos = _separar(grupo, lambda a: -vitorias_no_grupo(matriz, a, grupo))
+    if len(subgrupos) == 1:
+        # O confronto direto não separa o grupo
+        return sorted(grupo, key=desempate)
+    ordenados = []
+    for subgrupo in subgrupos:
+        ordenados.extend(_desempatar(subgrupo, matriz, desempate))
+    return ordenados
+
+
+def ordenar_com_confronto_direto(
+    atletas_ids: Iterable[int],
+    chave: Callable,
+    matriz: Dict,
+    desempate: Optional[Callable] = None,
+) -> List[int]:
+    """
+    Ordena por `chave` (crescente; use valores negativos para "maior é
+    melhor") e resolve cada empate pelo mini-quadro de confronto direto;
+    o que restar empatado segue `desempate` (padrão: o próprio ID).
+    """
+    desempate = desempate or (lambda a: a)
+    ordenados = []
+    for grupo in _separar(atletas_ids, chave):
+        ordenados.extend(_desempatar(grupo, matriz, desempate))
+    return ordenados
+
+
+def classificacao_round_robin(lutas: Iterable) -> List[int]:
+    """
+    IDs dos atletas na ordem final: vitórias (sem YUKO), pontos, confronto
+    direto, ippons, wazaris e yukos. Usa apenas os campos *_id das lutas.
+    """
+    atletas_ids = set()
+    vitorias: Dict[int, int] = defaultdict(int)
+    pontos: Dict[int, int] = defaultdict(int)
+    tecnicos: Dict[int, List[int]] = defaultdict(lambda: [0, 0, 0])
+    confrontos = []
+
+    for luta in lutas:
+        for atleta_id in (luta.atleta_a_id, luta.atleta_b_id):
+            if atleta_id:
+                atletas_ids.add(atleta_id)
+        vencedor_id = luta.vencedor_id
+        if not vencedor_id or luta.tipo_vitoria == TIPO_SEM_VITORIA:
+            continue
+        vitorias[vencedor_id] += 1
+        pontos[vencedor_id] += luta.pontos_vencedor or 0
+        tecnicos[vencedor_id][0] += luta.ippon_count or 0
+        tecnicos[vencedor_id][1] += luta.wazari_count or 0
+        tecnicos[vencedor_id][2] += luta.yuko_count or 0
+        perdedor_id = luta.atleta_b_id if vencedor_id == luta.atleta_a_id else luta.atleta_a_id
+        confrontos.append((vencedor_id, perdedor_id))
+
+    return ordenar_com_confronto_direto(
+        atletas_ids,
+        chave=lambda a: (-vitorias[a], -pontos[a]),
+        matriz=matriz_vitorias(confrontos),
+        desempate=lambda a: tuple(-v for v in tecnicos[a]) + (a,),
+    )
@@ -0,0 +1,273 @@
+"""
+Fila de tarefas em segundo plano apoiada no banco de dados (sem broker externo).
+
+Fluxo:
+    tarefa = enfileirar('gerar_todas_chaves', campeonato=campeonato, usuario=request.user)
+    # view retorna imediatamente; o worker (`manage.py processar_tarefas`)
+    # chama reservar_proxima() + executar() em loop.
+
+Cada tipo de tarefa é uma função registrada com @registrar_tarefa('tipo') que
+recebe (tarefa, progresso) e devolve um dict serializável em JSON, gravado em
+`tarefa.resultado`. Exceções disparam nova tentativa com espera crescente até
+`max_tentativas`; depois disso a tarefa fica com status ERRO.
+"""
+import hashlib
+import logging
+import traceback
+from datetime import timedelta
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from atletas.models import Campeonato, TarefaBackground
+
+logger = logging.getLogger(__name__)
+
+# Espera entre tentativas: 30s, 60s, 120s...
+ESPERA_BASE_RETENTATIVA = 30
+# Tarefa em EXECUTANDO há mais tempo que isso é considerada abandonada (worker caiu)
+TEMPO_MAXIMO_EXECUCAO = timedelta(minutes=30)
+# PDF do regulamento que falhou só é tentado de novo depois deste intervalo
+ESPERA_REGULAMENTO_COM_ERRO = timedelta(minutes=10)
+
+TAREFAS: Dict[str, Callable] = {}
+
+
+def registrar_tarefa(tipo: str):
+    """Decorator que registra a função executora de um tipo de tarefa."""
+    def decorator(func):
+        TAREFAS[tipo] = func
+        return func
+    return decorator
+
+
+def enfileirar(
+    tipo: str,
+    parametros: Optional[Dict] = None,
+    campeonato: Optional[Campeonato] = None,
+    usuario=None,
+    max_tentativas: int = 3,
+) -> TarefaBackground:
+    """
+    Cria a tarefa como PENDENTE e retorna sem executá-la.
+
+    Com `TAREFAS_EXECUCAO_IMEDIATA = True` (testes/desenvolvimento sem worker)
+    a tarefa é executada na própria chamada.
+    """
+    if tipo not in TAREFAS:
+        raise ValueError(f"Tipo de tarefa desconhecido: {tipo}")
+
+    tarefa = TarefaBackground.objects.create(
+        tipo=tipo,
+        parametros=parametros or {},
+        campeonato=campeonato,
+        criado_por=usuario if usuario is not None and usuario.is_authenticated else None,
+        max_tentativas=max_tentativas,
+    )
+    if getattr(settings, 'TAREFAS_EXECUCAO_IMEDIATA', False):
+        if _marcar_executando(tarefa):
+            executar(tarefa)
+    return tarefa
+
+
+def _marcar_executando(tarefa: TarefaBackground) -> bool:
+    """Reserva a tarefa com UPDATE condicional (só um worker vence a disputa)."""
+    agora = timezone.now()
+    reservada = TarefaBackground.objects.filter(id=tarefa.id, status='PENDENTE').update(
+        status='EXECUTANDO',
+        iniciado_em=agora,
+        tentativas=tarefa.tentativas + 1,
+        mensagem='Em execução',
+    )
+    if reservada:
+        tarefa.status = 'EXECUTANDO'
+        tarefa.iniciado_em = agora
+        tarefa.tentativas += 1
+    return bool(reservada)
+
+
+def reservar_proxima() -> Optional[TarefaBackground]:
+    """Reserva a próxima tarefa pendente cujo horário já chegou."""
+    candidatas = TarefaBackground.objects.filter(
+        status='PENDENTE',
+        executar_apos__lte=timezone.now(),
+    ).order_by('executar_apos', 'id')[:10]
+    for tarefa in candidatas:
+        if _marcar_executando(tarefa):
+            return tarefa
+    return None
+
+
+def recuperar_abandonadas() -> int:
+    """Devolve à fila tarefas presas em EXECUTANDO por queda do worker."""
+    limite = timezone.now() - TEMPO_MAXIMO_EXECUCAO
+    return TarefaBackground.objects.filter(
+        status='EXECUTANDO',
+        iniciado_em__lt=limite,
+    ).update(status='PENDENTE', mensagem='Reenfileirada após interrupção do worker')
+
+
+def executar(tarefa: TarefaBackground) -> TarefaBackground:
+    """Executa uma tarefa já reservada e grava o desfecho."""
+    def progresso(percentual: int, mensagem: str = '') -> None:
+        percentual = max(0, min(100, int(percentual)))
+        TarefaBackground.objects.filter(id=tarefa.id).update(
+            progresso=percentual,
+            mensagem=mensagem[:255],
+        )
+        tarefa.progresso = percentual
+        tarefa.mensagem = mensagem[:255]
+
+    try:
+        resultado = TAREFAS[tarefa.tipo](tarefa, progresso)
+    except Exception as e:
+        logger.error(f"Tarefa #{tarefa.id} ({tarefa.tipo}) falhou na tentativa {tarefa.tentativas}: {e}")
+        tarefa.erro = traceback.format_exc()
+        if tarefa.tentativas < tarefa.max_tentativas:
+            espera = ESPERA_BASE_RETENTATIVA * (2 ** (tarefa.tentativas - 1))
+            tarefa.status = 'PENDENTE'
+            tarefa.executar_apos = timezone.now() + timedelta(seconds=espera)
+            tarefa.mensagem = f'Falhou ({e}); nova tentativa em {espera}s'[:255]
+        else:
+            tarefa.status = 'ERRO'
+            tarefa.concluido_em = timezone.now()
+            tarefa.mensagem = str(e)[:255]
+        tarefa.save(update_fields=['status', 'erro', 'executar_apos', 'mensagem', 'concluido_em'])
+        return tarefa
+
+    tarefa.status = 'CONCLUIDA'
+    tarefa.progresso = 100
+    tarefa.resultado = resultado or {}
+    tarefa.concluido_em = timezone.now()
+    if not tarefa.mensagem or tarefa.mensagem == 'Em execução':
+        tarefa.mensagem = 'Concluída'
+    tarefa.save(update_fields=['status', 'progresso', 'resultado', 'concluido_em', 'mensagem', 'arquivo'])
+    return tarefa
+
+
+def status_tarefa(tarefa: TarefaBackground) -> Dict:
+    """Representação JSON usada pelo endpoint de polling."""
+    return {
+        'id': tarefa.id,
+        'tipo': tarefa.tipo,
+        'status': tarefa.status,
+        'status_display': tarefa.get_status_display(),
+        'progresso': tarefa.progresso,
+        'mensagem': tarefa.mensagem,
+        'resultado': tarefa.resultado,
+        'tentativas': tarefa.tentativas,
+        'max_tentativas': tarefa.max_tentativas,
+        'finalizada': tarefa.finalizada,
+        'arquivo_url': tarefa.arquivo.url if tarefa.arquivo else None,
+        'criado_em': tarefa.criado_em.isoformat() if tarefa.criado_em else None,
+        'concluido_em': tarefa.concluido_em.isoformat() if tarefa.concluido_em else None,
+    }
+
+
+# =========================
+# Tarefas registradas
+# =========================
+def _campeonato_da_tarefa(tarefa: TarefaBackground) -> Campeonato:
+    if tarefa.campeonato_id:
+        return tarefa.campeonato
+    campeonato = Campeonato.objects.filter(ativo=True).first()
+    if not campeonato:
+        raise ValueError('Nenhum campeonato ativo encontrado.')
+    return campeonato
+
+
+@registrar_tarefa('gerar_todas_chaves')
+def _tarefa_gerar_todas_chaves(tarefa, progresso):
+    from atletas.services.chaveamento import gerar_chaves_campeonato
+
+    progresso(10, 'Gerando chaves')
+    resultado = gerar_chaves_campeonato(_campeonato_da_tarefa(tarefa))
+    progresso(100, f'{resultado.criadas} criada(s), {resultado.atualizadas} atualizada(s), {len(resultado.erros)} erro(s)')
+    return {
+        'criadas': resultado.criadas,
+        'atualizadas': resultado.atualizadas,
+        'erros': resultado.erros,
+        'total_inscricoes': resultado.total_inscricoes,
+        'total_combinacoes': resultado.total_combinacoes,
+    }
+
+
+@registrar_tarefa('recalcular_pontuacao')
+def _tarefa_recalcular_pontuacao(tarefa, progresso):
+    from atletas.services.pontuacao import recalcular_pontuacao_campeonato
+
+    progresso(10, 'Recalculando pontuação')
+    total = recalcular_pontuacao_campeonato(_campeonato_da_tarefa(tarefa))
+    progresso(100, f'{total} academia(s) pontuada(s)')
+    return {'academias': total}
+
+
+@registrar_tarefa('regulamento_pdf')
+def _tarefa_regulamento_pdf(tarefa, progresso):
+    from atletas.utils_pdf import montar_paragrafos_regulamento, renderizar_template_para_pdf_bytes
+
+    campeonato = _campeonato_da_tarefa(tarefa)
+    if not campeonato.regulamento:
+        raise ValueError('Regulamento não disponível para este evento.')
+
+    progresso(20, 'Renderizando PDF')
+    conteudo = renderizar_template_para_pdf_bytes('atletas/academia/regulamento_pdf.html', {
+        'campeonato': campeonato,
+        'regulamento': campeonato.regulamento,
+        'paragrafos': montar_paragrafos_regulamento(campeonato.regulamento),
+    })
+    filename = f"regulamento_{campeonato.nome.replace(' ', '_')}.pdf"
+    tarefa.arquivo.save(filename, ContentFile(conteudo), save=False)
+    return {'arquivo': filename}
+
+
+def versao_regulamento(campeonato: Campeonato) -> str:
+    """Identifica o conteúdo do PDF: muda quando o nome ou o texto do regulamento mudam."""
+    return hashlib.sha1(f"{campeonato.nome}\n{campeonato.regulamento}".encode()).hexdigest()[:16]
+
+
+def tarefa_regulamento_pdf(campeonato: Campeonato, usuario=None) -> TarefaBackground:
+    """
+    Tarefa do PDF do regulamento na versão atual do texto.
+
+    O PDF é o mesmo para todas as academias: a primeira que pede enfileira,
+    as demais reaproveitam a tarefa em andamento ou o arquivo já gerado. Só
+    enfileira de novo se não houver tarefa da versão, se o arquivo sumiu do
+    storage ou se a última falhou há mais de ESPERA_REGULAMENTO_COM_ERRO.
+    """
+    versao = versao_regulamento(campeonato)
+    tarefa = TarefaBackground.objects.filter(
+        tipo='regulamento_pdf',
+        campeonato=campeonato,
+        parametros__versao=versao,
+    ).order_by('-id').first()
+
+    if tarefa is not None:
+        if tarefa.status == 'CONCLUIDA' and tarefa.arquivo and not tarefa.arquivo.storage.exists(tarefa.arquivo.name):
+            tarefa = None
+        elif tarefa.status == 'ERRO' and tarefa.concluido_em and timezone.now() - tarefa.concluido_em > ESPERA_REGULAMENTO_COM_ERRO:
+            tarefa = None
+    if tarefa is None:
+        tarefa = enfileirar(
+            'regulamento_pdf',
+            parametros={'versao': versao},
+            campeonato=campeonato,
+            usuario=usuario,
+            max_tentativas=1,
+        )
+    return tarefa
+
+
+@registrar_tarefa('provisionar_credenciais')
+def _tarefa_provisionar_credenciais(tarefa, progresso):
+    from atletas.services.credenciais import provisionar_credenciais
+
+    progresso(10, 'Gerando credenciais das academias')
+    credenciais = provisionar_credenciais(
+        _campeonato_da_tarefa(tarefa),
+        academia_ids=tarefa.parametros.get('academia_ids'),
+    )
+    progresso(100, f'{len(credenciais)} credencial(is) gerada(s)')
+    return {'geradas': len(credenciais)}
@@ -1,37 +1,76 @@
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from django.contrib.auth import get_user_model
-from .models import Campeonato, Academia
+from .models import (
+    Academia, AcademiaCampeonatoSenha, Atleta, Campeonato, Categoria, Classe, ConferenciaPagamento,
+    Despesa, FinanceiroSnapshot, Inscricao, Organizador, Pagamento, UsuarioOperacional,
+)
+from .services import autorizacao_sessao
+from .services.financeiro import marcar_desatualizado
+from .services.indice_categorias import invalidar_indice_categorias
+from .services.organizacao_cache import invalidar_cache_organizacoes
 
-User = get_user_model()
 
-@receiver(post_save, sender=Campeonato)
-def criar_usuarios_operacionais(sender, instance, created, **kwargs):
-    """
-    Sempre que um novo campeonato é criado,
-    cada academia recebe um usuário operacional temporário.
-    """
-    if not created:
-        return
+@receiver([post_save, post_delete], sender=Classe)
+@receiver([post_save, post_delete], sender=Categoria)
+def invalidar_indice_categorias_ao_alterar(sender, **kwargs):
+    """Classes/categorias mudaram: o índice em memória é reconstruído na próxima busca."""
+    # Só após o commit: antes dele outro processo reconstruiria o índice com os dados antigos
+    transaction.on_commit(invalidar_indice_categorias)
+
+
+@receiver([post_save, post_delete], sender=Organizador)
+@receiver([post_save, post_delete], sender=Campeonato)
+def invalidar_cache_organizacoes_ao_alterar(sender, **kwargs):
+    """Organização ou campeonato (ativo) mudou: o middleware volta a consultar o banco."""
+    invalidar_cache_organizacoes()
+
+
+@receiver([post_save, post_delete], sender=Academia)
+@receiver([post_save, post_delete], sender=AcademiaCampeonatoSenha)
+def invalidar_autorizacao_academia(sender, instance, **kwargs):
+    """Academia ou credencial mudou: snapshots de sessão da academia são revalidados."""
+    academia_id = instance.pk if sender is Academia else instance.academia_id
+    autorizacao_sessao.invalidar(autorizacao_sessao.ACADEMIA, academia_id)
+
 
-    academias = Academia.objects.all()
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+@receiver([post_save, post_delete], sender=UsuarioOperacional)
+def invalidar_autorizacao_operacional(sender, instance, **kwargs):
+    """Usuário ou perfil operacional mudou: snapshots de sessão do usuário são revalidados."""
+    user_id = instance.user_id if sender is UsuarioOperacional else instance.pk
+    autorizacao_sessao.invalidar(autorizacao_sessao.OPERACIONAL, user_id)
 
-    for academia in academias:
-        username = f"academia_{academia.id}"
-        senha = f"academia{academia.id}2025"
 
-        user, new_user = User.objects.get_or_create(username=username)
+@receiver([post_save, post_delete], sender=Inscricao)
+def financeiro_inscricoes_ao_alterar(sender, instance, **kwargs):
+    marcar_desatualizado(instance.campeonato_id, 'inscricoes')
 
-        # Atualiza dados básicos
-        user.email = f"{username}@shiai.com"
-        user.set_password(senha)
 
-        # Vínculo com a Academia (se existir esse campo no User)
-        if hasattr(user, "academia"):
-            user.academia = academia
-        else:
-            print(f"⚠ AVISO: O usuário {username} não possui campo 'academia'. Verificar modelo User.")
+@receiver([post_save, post_delete], sender=Pagamento)
+@receiver([post_save, post_delete], sender=ConferenciaPagamento)
+def financeiro_conferencias_ao_alterar(sender, instance, **kwargs):
+    marcar_desatualizado(instance.campeonato_id, 'conferencias')
 
-        user.save()
 
-        print("✔ Usuário criado/atualizado:", username, "→", academia.nome)
+@receiver([post_save, post_delete], sender=Despesa)
+def financeiro_despesas_ao_alterar(sender, instance, **kwargs):
+    marcar_desatualizado(instance.campeonato_id, 'despesas')
+
+
+@receiver(post_save, sender=Campeonato)
+def financeiro_valores_campeonato_ao_alterar(sender, instance, created, **kwargs):
+    """Valores de inscrição entram nas entradas e no bônus."""
+    if not created:
+        marcar_desatualizado(instance.pk, 'inscricoes')
+
+
+@receiver(post_save, sender=Atleta)
+@receiver(post_save, sender=Academia)
+def financeiro_federado_bonus_ao_alterar(sender, instance, created, **kwargs):
+    """Atleta.federado e o bônus da academia entram nas entradas/bônus dos campeonatos em que têm inscrição."""
+    if created:
+        return
+    filtro = {'campeonato__inscricoes__atleta': instance} if sender is Atleta else {'campeonato__inscricoes__atleta__academia': instance}
+    FinanceiroSnapshot.objects.filter(**filtro, inscricoes_desatualizado=False).update(inscricoes_desatualizado=True)
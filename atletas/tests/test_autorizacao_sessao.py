@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from atletas.academia_auth import academia_required, operacional_required, pode_resetar_required
+from atletas.models import Academia, AcademiaCampeonatoSenha, Campeonato, Organizador, UsuarioOperacional
+from organizations.models import Organization
+
+
+@academia_required
+def _view_academia(request):
+    return HttpResponse('ok')
+
+
+@operacional_required
+def _view_operacional(request):
+    return HttpResponse('ok')
+
+
+@pode_resetar_required
+def _view_resetar(request):
+    return HttpResponse('ok')
+
+
+class AutorizacaoSessaoTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.sessao = SessionMiddleware(lambda request: None)
+        organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.academia = Academia.objects.create(nome="Academia Teste", organizador=organizador)
+        campeonato = Campeonato.objects.create(nome="Copa Teste", organizador=organizador)
+        self.credencial = AcademiaCampeonatoSenha.objects.create(
+            academia=self.academia,
+            campeonato=campeonato,
+            login="ACADEMIA_001",
+            senha="x",
+            senha_plana="x",
+            data_expiracao=timezone.now() + timedelta(days=5),
+        )
+
+    def _request(self, session, user=None):
+        request = self.factory.get('/')
+        request.session = session
+        request._messages = FallbackStorage(request)
+        if user is not None:
+            request.user = user
+        return request
+
+    def _sessao_academia(self):
+        request = self.factory.get('/')
+        self.sessao.process_request(request)
+        request.session['academia_id'] = self.academia.id
+        request.session['credencial_id'] = self.credencial.id
+        return request.session
+
+    def test_academia_snapshot_dispensa_consultas(self):
+        session = self._sessao_academia()
+        self.assertEqual(_view_academia(self._request(session)).status_code, 200)
+
+        request = self._request(session)
+        with self.assertNumQueries(0):
+            self.assertEqual(_view_academia(request).status_code, 200)
+        self.assertEqual(request.academia.nome, "Academia Teste")
+
+    def test_revogacao_invalida_snapshot(self):
+        session = self._sessao_academia()
+        _view_academia(self._request(session))
+
+        self.academia.ativo_login = False
+        self.academia.save()
+
+        resposta = _view_academia(self._request(session))
+        self.assertEqual(resposta.status_code, 302)
+
+    def test_credencial_expirada_invalida_snapshot(self):
+        session = self._sessao_academia()
+        _view_academia(self._request(session))
+
+        self.credencial.data_expiracao = timezone.now() - timedelta(minutes=1)
+        self.credencial.save()
+
+        self.assertEqual(_view_academia(self._request(session)).status_code, 302)
+
+    def test_operacional_snapshot_e_desativacao(self):
+        organization = Organization.objects.create(name="Org", slug="org")
+        user = get_user_model().objects.create_user(
+            email="op@teste.com", password="x", organization=organization, role="OPERATIONS"
+        )
+        perfil = UsuarioOperacional.objects.create(user=user, ativo=True, senha_alterada=True)
+        request = self.factory.get('/')
+        self.sessao.process_request(request)
+        session = request.session
+
+        self.assertEqual(_view_operacional(self._request(session, user)).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(_view_operacional(self._request(session, user)).status_code, 200)
+
+        perfil.ativo = False
+        perfil.save()
+        user = get_user_model().objects.get(pk=user.pk)
+        self.assertEqual(_view_operacional(self._request(session, user)).status_code, 302)
+
+    def test_permissao_de_reset_lida_do_snapshot(self):
+        organization = Organization.objects.create(name="Org", slug="org")
+        user = get_user_model().objects.create_user(
+            email="op@teste.com", password="x", organization=organization, role="OPERATIONS"
+        )
+        perfil = UsuarioOperacional.objects.create(
+            user=user, ativo=True, senha_alterada=True, pode_resetar_campeonato=True
+        )
+        request = self.factory.get('/')
+        self.sessao.process_request(request)
+        session = request.session
+        _view_operacional(self._request(session, user))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(_view_resetar(self._request(session, user)).status_code, 200)
+
+        # Permissão revogada: o sinal invalida o snapshot e o banco decide
+        perfil.pode_resetar_campeonato = False
+        perfil.save()
+        user = get_user_model().objects.get(pk=user.pk)
+        self.assertEqual(_view_resetar(self._request(session, user)).status_code, 302)
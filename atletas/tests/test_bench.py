@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from atletas.models import Atleta, Inscricao
+
+
+class BenchCommandTests(TestCase):
+    def _bench(self, *args):
+        saida = StringIO()
+        call_command(
+            "bench", "--academias", "4", "--atletas", "60", "--categorias", "20",
+            "--repeticoes", "2", *args, stdout=saida,
+        )
+        return saida.getvalue()
+
+    def test_gera_json_e_compara_baseline(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "bench.json")
+            self._bench("--saida", caminho)
+            with open(caminho, encoding="utf-8") as arquivo:
+                relatorio = json.load(arquivo)
+
+            self.assertEqual(relatorio["meta"]["atletas"], 60)
+            self.assertEqual(
+                set(relatorio["cenarios"]),
+                {
+                    "index", "montar_contexto_pesagem", "registrar_peso", "gerar_todas_chaves",
+                    "registrar_vencedor", "calcular_pontuacao_academias", "ranking_global", "metricas_evento",
+                },
+            )
+            # Dados sintéticos são desfeitos ao final
+            self.assertFalse(Atleta.objects.exists())
+            self.assertFalse(Inscricao.objects.exists())
+
+            # Baseline com menos consultas acusa regressão
+            for cenario in relatorio["cenarios"].values():
+                cenario["consultas"] = 0
+            baseline = os.path.join(pasta, "baseline.json")
+            with open(baseline, "w", encoding="utf-8") as arquivo:
+                json.dump(relatorio, arquivo)
+            with self.assertRaises(CommandError):
+                self._bench("--cenarios", "metricas_evento", "--baseline", baseline)
@@ -0,0 +1,124 @@
+from django.test import TestCase
+from atletas.models import (
+    Organizador,
+    Academia,
+    AcademiaPontuacao,
+    Classe,
+    Categoria,
+    Atleta,
+    Campeonato,
+    Chave,
+    Inscricao,
+    Luta,
+)
+from atletas.services.chaveamento import gerar_chaves_campeonato
+
+
+class GerarChavesCampeonatoTests(TestCase):
+    def setUp(self):
+        self.organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.campeonato = Campeonato.objects.create(
+            nome="Copa Teste", organizador=self.organizador, ativo=True
+        )
+        self.academias = [
+            Academia.objects.create(
+                nome=f"Academia {i}", cidade="SP", estado="SP", organizador=self.organizador
+            )
+            for i in range(3)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.classe = Classe.objects.create(nome="SUB11", idade_min=10, idade_max=11)
+            self.categorias = {
+                nome: Categoria.objects.create(
+                    classe=self.classe,
+                    sexo="M",
+                    categoria_nome=nome,
+                    limite_min=limite,
+                    limite_max=limite + 5,
+                    label=f"SUB11 - {nome}",
+                )
+                for nome, limite in (("Leve", 30), ("Medio", 35), ("Pesado", 40))
+            }
+
+    def _inscrever(self, categoria_nome, quantidade):
+        categoria = self.categorias[categoria_nome]
+        for i in range(quantidade):
+            atleta = Atleta.objects.create(
+                nome=f"{categoria_nome} {i}",
+                sexo="M",
+                academia=self.academias[i % 3],
+                ano_nasc=2014,
+            )
+            Inscricao.objects.create(
+                atleta=atleta,
+                campeonato=self.campeonato,
+                classe_escolhida=self.classe.nome,
+                categoria_escolhida=categoria_nome,
+                classe_real=self.classe,
+                categoria_real=categoria,
+                peso_real=categoria.limite_min + 1,
+                status_inscricao="aprovado",
+            )
+
+    def test_gera_todas_as_chaves_em_lote(self):
+        self._inscrever("Leve", 1)
+        self._inscrever("Medio", 3)
+        self._inscrever("Pesado", 7)
+
+        resultado = gerar_chaves_campeonato(self.campeonato)
+
+        self.assertEqual((resultado.criadas, resultado.atualizadas, resultado.erros), (3, 0, []))
+        leve = Chave.objects.get(categoria="Leve")
+        medio = Chave.objects.get(categoria="Medio")
+        pesado = Chave.objects.get(categoria="Pesado")
+        self.assertEqual(leve.estrutura["tipo"], "campeao_automatico")
+        self.assertEqual(medio.estrutura["tipo"], "round_robin")
+        self.assertEqual(medio.lutas.count(), 3)
+        self.assertEqual(pesado.estrutura["tipo"], "eliminatoria_repescagem")
+        self.assertEqual(pesado.atletas.count(), 7)
+
+        # Vínculos de próxima luta apontam para lutas da própria chave
+        ids_pesado = set(pesado.lutas.values_list("id", flat=True))
+        final = pesado.estrutura["rounds"]["3"][0]
+        for luta_id in pesado.estrutura["rounds"]["2"]:
+            self.assertEqual(Luta.objects.get(id=luta_id).proxima_luta, final)
+        self.assertTrue(set(pesado.estrutura["rounds"]["1"]) <= ids_pesado)
+        self.assertIn(pesado.estrutura["repescagem"]["luta_3_lugar"], ids_pesado)
+
+        # Campeão automático pontua uma única vez, mesmo regerando
+        gerar_chaves_campeonato(self.campeonato)
+        resultado = gerar_chaves_campeonato(self.campeonato)
+        self.assertEqual((resultado.criadas, resultado.atualizadas), (0, 3))
+        self.assertEqual(Chave.objects.count(), 3)
+        self.assertEqual(Luta.objects.filter(chave=medio).count(), 3)
+        self.assertEqual(AcademiaPontuacao.objects.get(academia=self.academias[0]).ouro, 1)
+
+    def test_erro_em_uma_categoria_nao_impede_as_demais(self):
+        self._inscrever("Medio", 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            classe = Classe.objects.create(nome="SENIOR", idade_min=18, idade_max=29)
+            categoria = Categoria.objects.create(
+                classe=classe, sexo="M", categoria_nome="Leve", limite_min=50, limite_max=55
+            )
+        for faixa in ("BRANCA", "PRETA"):
+            atleta = Atleta.objects.create(
+                nome=f"Faixa {faixa}", sexo="M", faixa=faixa,
+                academia=self.academias[0], ano_nasc=2000,
+            )
+            Inscricao.objects.create(
+                atleta=atleta,
+                campeonato=self.campeonato,
+                classe_escolhida=classe.nome,
+                categoria_escolhida="Leve",
+                classe_real=classe,
+                categoria_real=categoria,
+                peso_real=52,
+                status_inscricao="aprovado",
+            )
+
+        resultado = gerar_chaves_campeonato(self.campeonato)
+
+        self.assertEqual(resultado.criadas, 1)
+        self.assertEqual(len(resultado.erros), 1)
+        self.assertIn("SENIOR", resultado.erros[0]["combinacao"])
+        self.assertEqual(Chave.objects.get().estrutura["tipo"], "melhor_de_3")
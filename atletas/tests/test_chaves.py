@@ -20,15 +20,16 @@ class GerarChaveTests(TestCase):
             estado="SP",
             organizador=self.organizador,
         )
-        self.classe = Classe.objects.create(nome="SUB11", idade_min=10, idade_max=11)
-        self.categoria = Categoria.objects.create(
-            classe=self.classe,
-            sexo="M",
-            categoria_nome="Leve",
-            limite_min=30,
-            limite_max=35,
-            label="SUB11 - Leve (30-35kg)",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.classe = Classe.objects.create(nome="SUB11", idade_min=10, idade_max=11)
+            self.categoria = Categoria.objects.create(
+                classe=self.classe,
+                sexo="M",
+                categoria_nome="Leve",
+                limite_min=30,
+                limite_max=35,
+                label="SUB11 - Leve (30-35kg)",
+            )
         self.campeonato = Campeonato.objects.create(
             nome="Copa Teste", organizador=self.organizador, ativo=True
         )
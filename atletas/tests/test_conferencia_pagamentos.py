@@ -0,0 +1,122 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.test import RequestFactory, TestCase
+
+from atletas.models import (
+    Academia, AcademiaCampeonato, Atleta, Campeonato, ConferenciaPagamento, FinanceiroSnapshot, Inscricao,
+    Organizador,
+)
+from atletas.utils_historico import descarregar_historico
+from atletas.views_conferencia_pagamentos import (
+    academias_conferencia, calcular_valor_esperado_academia, conferencia_pagamentos_confirmar_lote,
+)
+from organizations.models import Organization
+
+
+class ConferenciaPagamentosTests(TestCase):
+    def setUp(self):
+        organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.campeonato = Campeonato.objects.create(
+            nome="Copa Teste",
+            organizador=organizador,
+            valor_inscricao_federado=Decimal('100.00'),
+            valor_inscricao_nao_federado=Decimal('80.00'),
+        )
+        # Alfa: 2 federados (1 aprovado) + 1 não federado; Beta: 1 não federado; Gama: sem inscrições
+        self.alfa = Academia.objects.create(nome="Alfa", organizador=organizador)
+        self.beta = Academia.objects.create(nome="Beta", organizador=organizador)
+        self.gama = Academia.objects.create(nome="Gama", organizador=organizador)
+        self.fora = Academia.objects.create(nome="Fora", organizador=organizador)
+        for academia in (self.alfa, self.beta, self.gama):
+            AcademiaCampeonato.objects.create(academia=academia, campeonato=self.campeonato, permitido=True)
+        AcademiaCampeonato.objects.create(academia=self.fora, campeonato=self.campeonato, permitido=False)
+
+        inscricoes = [
+            (self.alfa, True, 'aprovado'),
+            (self.alfa, True, 'pendente'),
+            (self.alfa, False, 'pendente'),
+            (self.beta, False, 'pendente'),
+            (self.fora, True, 'pendente'),
+        ]
+        for i, (academia, federado, status) in enumerate(inscricoes):
+            atleta = Atleta.objects.create(
+                nome=f"Atleta {i}", sexo="M", academia=academia, ano_nasc=2010, federado=federado
+            )
+            Inscricao.objects.create(atleta=atleta, campeonato=self.campeonato, status_inscricao=status)
+
+        ConferenciaPagamento.objects.create(
+            academia=self.beta, campeonato=self.campeonato, status='DIVERGENTE',
+            valor_esperado=Decimal('80.00'), valor_recebido=Decimal('50.00'),
+        )
+        organization = Organization.objects.create(name="Org", slug="org")
+        self.usuario = get_user_model().objects.create_user(
+            email="op@teste.com", password="x", organization=organization, role="OPERATIONS"
+        )
+
+    def tearDown(self):
+        # Histórico enfileirado pelos callbacks de commit é gravado antes do rollback do teste
+        descarregar_historico()
+
+    def test_lista_anotada_em_uma_consulta(self):
+        with self.assertNumQueries(1):
+            academias = list(academias_conferencia(self.campeonato))
+
+        # Pendente antes de Divergente; Gama (sem inscrições) e Fora (não permitida) ficam de fora
+        self.assertEqual([a.nome for a in academias], ["Alfa", "Beta"])
+        alfa, beta = academias
+        self.assertEqual((alfa.qtd_atletas, alfa.qtd_federados, alfa.qtd_confirmadas), (3, 2, 1))
+        self.assertEqual(alfa.valor_esperado, Decimal('280.00'))
+        self.assertEqual(alfa.valor_confirmado, Decimal('100.00'))
+        self.assertEqual(alfa.status, 'PENDENTE')
+        self.assertIsNone(alfa.conferencia_id)
+        self.assertEqual(beta.status, 'DIVERGENTE')
+        self.assertEqual(beta.valor_recebido, Decimal('50.00'))
+        self.assertEqual(beta.valor_confirmado, Decimal('0.00'))
+
+    def test_valor_esperado_por_academia(self):
+        self.assertEqual(calcular_valor_esperado_academia(self.alfa, self.campeonato), (Decimal('280.00'), 3))
+        self.assertEqual(calcular_valor_esperado_academia(self.gama, self.campeonato), (Decimal('0.00'), 0))
+
+    def _post_lote(self, academia_ids):
+        request = RequestFactory().post('/', {'academia_ids': [str(i) for i in academia_ids]})
+        SessionMiddleware(lambda request: None).process_request(request)
+        request._messages = FallbackStorage(request)
+        request.user = self.usuario
+        request.organizacao = SimpleNamespace(slug="org-teste")
+        # Sem operacional_required / require_http_methods: testa só a confirmação
+        view = conferencia_pagamentos_confirmar_lote.__wrapped__.__wrapped__
+        return view(request, self.campeonato.id)
+
+    def test_confirmar_lote(self):
+        FinanceiroSnapshot.objects.create(campeonato=self.campeonato)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resposta = self._post_lote([self.alfa.id, self.beta.id, self.gama.id])
+
+        self.assertEqual(resposta.status_code, 302)
+        conferencias = {c.academia_id: c for c in ConferenciaPagamento.objects.filter(campeonato=self.campeonato)}
+        self.assertEqual(set(conferencias), {self.alfa.id, self.beta.id})
+        self.assertEqual(conferencias[self.alfa.id].status, 'CONFIRMADO')
+        self.assertEqual(conferencias[self.alfa.id].valor_esperado, Decimal('280.00'))
+        self.assertEqual(conferencias[self.alfa.id].quantidade_atletas, 3)
+        self.assertEqual(conferencias[self.alfa.id].conferido_por, self.usuario)
+        self.assertEqual(conferencias[self.beta.id].status, 'CONFIRMADO')
+        # Valor recebido informado antes é preservado
+        self.assertEqual(conferencias[self.beta.id].valor_recebido, Decimal('50.00'))
+
+        pendentes = Inscricao.objects.filter(campeonato=self.campeonato).exclude(status_inscricao='aprovado')
+        self.assertEqual([i.atleta.academia_id for i in pendentes], [self.fora.id])
+
+        snapshot = FinanceiroSnapshot.objects.get(campeonato=self.campeonato)
+        self.assertTrue(snapshot.inscricoes_desatualizado)
+        self.assertTrue(snapshot.conferencias_desatualizado)
+
+    def test_confirmar_lote_sem_selecao(self):
+        resposta = self._post_lote([])
+
+        self.assertEqual(resposta.status_code, 302)
+        self.assertFalse(ConferenciaPagamento.objects.filter(academia=self.alfa).exists())
@@ -0,0 +1,85 @@
+from datetime import date
+
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from atletas.models import Academia, AcademiaCampeonato, AcademiaCampeonatoSenha, Campeonato, Organizador
+from atletas.services.credenciais import provisionar_credenciais, vincular_academias
+from atletas.services.tarefas import enfileirar
+from atletas.views import gerenciar_academias_campeonato
+
+
+class ProvisionarCredenciaisTests(TestCase):
+    def setUp(self):
+        self.organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.academias = [
+            Academia.objects.create(nome=f"Academia {i}", organizador=self.organizador)
+            for i in range(5)
+        ]
+        self.campeonato = Campeonato.objects.create(
+            nome="Copa Teste", organizador=self.organizador, data_competicao=date(2025, 6, 1)
+        )
+
+    def test_criar_campeonato_nao_gera_credenciais(self):
+        self.assertFalse(AcademiaCampeonatoSenha.objects.exists())
+
+    def test_somente_academias_vinculadas_e_ativas(self):
+        inativa = self.academias[2]
+        inativa.ativo_login = False
+        inativa.save()
+        vincular_academias(self.campeonato, self.academias[:3])
+
+        credenciais = provisionar_credenciais(self.campeonato)
+
+        self.assertEqual(len(credenciais), 2)
+        salvas = AcademiaCampeonatoSenha.objects.filter(campeonato=self.campeonato)
+        self.assertEqual(
+            set(salvas.values_list('academia_id', flat=True)),
+            {self.academias[0].id, self.academias[1].id},
+        )
+        credencial = salvas.get(academia=self.academias[0])
+        self.assertEqual(credencial.login, f"ACADEMIA_{self.academias[0].id:03d}")
+        self.assertTrue(credencial.verificar_senha(credencial.senha_plana))
+        self.assertEqual(credencial.data_expiracao.date(), date(2025, 6, 6))
+
+    def test_repetir_nao_duplica_e_usa_bulk(self):
+        vincular_academias(self.campeonato, self.academias)
+        provisionar_credenciais(self.campeonato, academia_ids=[self.academias[0].id])
+
+        with CaptureQueriesContext(connection) as ctx:
+            credenciais = provisionar_credenciais(self.campeonato)
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+
+        self.assertEqual(len(credenciais), 4)
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(AcademiaCampeonatoSenha.objects.filter(campeonato=self.campeonato).count(), 5)
+        self.assertEqual(provisionar_credenciais(self.campeonato), [])
+
+    def test_vincular_academias_ignora_existentes(self):
+        AcademiaCampeonato.objects.create(academia=self.academias[0], campeonato=self.campeonato)
+        self.assertEqual(vincular_academias(self.campeonato, self.academias), 4)
+        self.assertEqual(vincular_academias(self.campeonato, self.academias), 0)
+
+    @override_settings(TAREFAS_EXECUCAO_IMEDIATA=True)
+    def test_tarefa_provisionar_credenciais(self):
+        vincular_academias(self.campeonato, self.academias)
+        tarefa = enfileirar('provisionar_credenciais', campeonato=self.campeonato)
+        self.assertEqual(tarefa.status, 'CONCLUIDA')
+        self.assertEqual(tarefa.resultado, {'geradas': 5})
+
+    def test_vincular_academia_na_tela_gera_credencial(self):
+        request = RequestFactory().post('/', {'acao': 'adicionar_academia', 'academia_id': self.academias[0].id})
+        SessionMiddleware(lambda request: None).process_request(request)
+        request._messages = FallbackStorage(request)
+        # Sem operacional_required: testa só o vínculo
+        gerenciar_academias_campeonato.__wrapped__(
+            request, organizacao_slug=self.organizador.slug, campeonato_id=self.campeonato.id
+        )
+
+        self.assertEqual(
+            list(AcademiaCampeonatoSenha.objects.values_list('academia_id', flat=True)),
+            [self.academias[0].id],
+        )
@@ -0,0 +1,100 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+
+from atletas.models import (
+    Academia, Atleta, Campeonato, ConferenciaPagamento, Despesa, FinanceiroSnapshot, Inscricao, Organizador,
+)
+from atletas.services import financeiro
+from atletas.services.financeiro import obter_financeiro
+
+
+class FinanceiroSnapshotTests(TestCase):
+    def setUp(self):
+        organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.campeonato = Campeonato.objects.create(
+            nome="Copa Teste",
+            organizador=organizador,
+            valor_inscricao_federado=Decimal('100.00'),
+            valor_inscricao_nao_federado=Decimal('80.00'),
+        )
+        self.academia = Academia.objects.create(
+            nome="Academia Teste", organizador=organizador,
+            bonus_fixo=Decimal('5.00'), bonus_percentual=Decimal('10.00'),
+        )
+        status = ['aprovado', 'confirmado', 'pendente', 'reprovado']
+        for i, status_inscricao in enumerate(status):
+            atleta = Atleta.objects.create(
+                nome=f"Atleta {i}", sexo="M", academia=self.academia, ano_nasc=2010, federado=i % 2 == 0
+            )
+            Inscricao.objects.create(
+                atleta=atleta, campeonato=self.campeonato, status_inscricao=status_inscricao,
+            )
+        ConferenciaPagamento.objects.create(
+            academia=self.academia, campeonato=self.campeonato, status='CONFIRMADO',
+            valor_esperado=Decimal('180.00'), valor_recebido=Decimal('0'),
+        )
+        Despesa.objects.create(campeonato=self.campeonato, categoria='arbitros', nome='Árbitros', valor=Decimal('50.00'), status='pago')
+        Despesa.objects.create(campeonato=self.campeonato, categoria='insumos', nome='Água', valor=Decimal('20.00'))
+
+    def test_totais_agregados(self):
+        totais = obter_financeiro(self.campeonato)
+
+        self.assertEqual(totais['inscricoes_confirmadas'], 2)
+        self.assertEqual(totais['inscricoes_pendentes'], 1)
+        self.assertEqual(totais['entradas_federado'], Decimal('200.00'))
+        self.assertEqual(totais['entradas_nao_federado'], Decimal('160.00'))
+        # 2 confirmadas (1 federada + 1 não): 2 x 5,00 + 10% de 180,00
+        self.assertEqual(totais['total_bonus'], Decimal('28.00'))
+        # Recebido zerado conta o esperado
+        self.assertEqual(totais['dinheiro_caixa'], Decimal('180.00'))
+        self.assertEqual(totais['pagamentos_pendentes'], Decimal('0'))
+        self.assertEqual(totais['total_despesas'], Decimal('70.00'))
+        self.assertEqual(totais['despesas_pendentes'], Decimal('20.00'))
+        self.assertEqual(totais['despesas_pagas'], Decimal('50.00'))
+        self.assertEqual(totais['top_custos'][0], {'categoria': 'arbitros', 'valor': Decimal('50.00')})
+
+    def test_leitura_sem_alteracoes_e_recalculo_por_secao(self):
+        obter_financeiro(self.campeonato)
+        with self.assertNumQueries(1):
+            obter_financeiro(self.campeonato)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Despesa.objects.create(campeonato=self.campeonato, categoria='limpeza', nome='Limpeza', valor=Decimal('30.00'))
+        snapshot = FinanceiroSnapshot.objects.get(campeonato=self.campeonato)
+        self.assertTrue(snapshot.despesas_desatualizado)
+        self.assertFalse(snapshot.inscricoes_desatualizado)
+
+        totais = obter_financeiro(self.campeonato)
+        self.assertEqual(totais['total_despesas'], Decimal('100.00'))
+        self.assertEqual(totais['inscricoes_confirmadas'], 2)
+
+        inscricao = Inscricao.objects.get(status_inscricao='pendente')
+        inscricao.status_inscricao = 'aprovado'
+        with self.captureOnCommitCallbacks(execute=True):
+            inscricao.save()
+        self.assertEqual(obter_financeiro(self.campeonato)['inscricoes_confirmadas'], 3)
+
+    def test_alteracao_durante_recalculo_nao_se_perde(self):
+        obter_financeiro(self.campeonato)
+        with self.captureOnCommitCallbacks(execute=True):
+            Despesa.objects.create(campeonato=self.campeonato, categoria='limpeza', nome='Limpeza', valor=Decimal('30.00'))
+
+        calcular_despesas = financeiro.calcular_despesas
+
+        def calcular_com_alteracao_concorrente(campeonato):
+            # Outra requisição grava uma despesa depois que a flag foi limpa
+            Despesa.objects.create(campeonato=campeonato, categoria='som', nome='Som', valor=Decimal('15.00'))
+            snapshot = FinanceiroSnapshot.objects.get(campeonato=campeonato)
+            # A marcação só roda após o commit de quem alterou os dados
+            self.assertFalse(snapshot.despesas_desatualizado)
+            return calcular_despesas(campeonato)
+
+        with mock.patch.dict(financeiro.CALCULOS, despesas=calcular_com_alteracao_concorrente):
+            with self.captureOnCommitCallbacks(execute=True):
+                obter_financeiro(self.campeonato)
+
+        # A flag limpa pelo recálculo é marcada de novo: a leitura seguinte refaz a seção
+        self.assertTrue(FinanceiroSnapshot.objects.get(campeonato=self.campeonato).despesas_desatualizado)
+        self.assertEqual(obter_financeiro(self.campeonato)['total_despesas'], Decimal('115.00'))
@@ -0,0 +1,105 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.test import TestCase
+from atletas.models import Organizador, Academia, Atleta, Campeonato, Chave, Luta
+from atletas.services.grafo_chave import calcular_grafo_avanco
+from atletas.utils import atualizar_proxima_luta, gerar_eliminatoria_repescagem
+
+
+class GrafoAvancoTests(TestCase):
+    def setUp(self):
+        self.organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.campeonato = Campeonato.objects.create(
+            nome="Copa Teste", organizador=self.organizador, ativo=True
+        )
+        academias = [
+            Academia.objects.create(nome=f"Academia {i}", cidade="SP", estado="SP", organizador=self.organizador)
+            for i in range(4)
+        ]
+        self.atletas = [
+            Atleta.objects.create(nome=f"Atleta {i}", sexo="M", academia=academias[i % 4], ano_nasc=2014)
+            for i in range(8)
+        ]
+        self.chave = Chave.objects.create(
+            campeonato=self.campeonato, classe="SUB11", sexo="M", categoria="Leve"
+        )
+        self.estrutura = gerar_eliminatoria_repescagem(self.chave, self.atletas, tamanho_chave=8)
+        self.chave.estrutura = self.estrutura
+        self.chave.save()
+
+    def _vencer(self, luta_id, lado="A"):
+        luta = Luta.objects.get(id=luta_id)
+        luta.vencedor_id = luta.atleta_a_id if lado == "A" else luta.atleta_b_id
+        luta.concluida = True
+        luta.save()
+        atualizar_proxima_luta(luta)
+        return luta
+
+    def test_grafo_gravado_na_geracao(self):
+        rounds = self.estrutura["rounds"]
+        repescagem = self.estrutura["repescagem"]
+        terceiro = repescagem["luta_3_lugar"]
+
+        primeira = Luta.objects.get(id=rounds[1][1])
+        self.assertEqual((primeira.proxima_luta, primeira.posicao_proxima), (rounds[2][0], "B"))
+        self.assertEqual((primeira.luta_perdedor, primeira.posicao_perdedor), (repescagem["rounds"][100][0], "B"))
+
+        semifinal = Luta.objects.get(id=rounds[2][0])
+        self.assertEqual((semifinal.luta_perdedor, semifinal.posicao_perdedor), (terceiro, "B"))
+
+        final_repescagem = Luta.objects.get(id=repescagem["rounds"][101][0])
+        self.assertEqual((final_repescagem.proxima_luta, final_repescagem.posicao_proxima), (terceiro, "A"))
+
+        # Mesmo grafo a partir da estrutura salva em JSON (chaves em texto)
+        self.chave.refresh_from_db()
+        self.assertEqual(calcular_grafo_avanco(self.chave.estrutura), calcular_grafo_avanco(self.estrutura))
+
+    def test_registrar_resultado_sem_ler_estrutura(self):
+        rounds = self.estrutura["rounds"]
+        repescagem_100 = self.estrutura["repescagem"]["rounds"][100]
+
+        luta = Luta.objects.get(id=rounds[1][1])
+        luta.vencedor_id = luta.atleta_b_id
+        luta.concluida = True
+        luta.save()
+        # Dois UPDATEs dentro da transação (SAVEPOINT + RELEASE)
+        with self.assertNumQueries(4):
+            atualizar_proxima_luta(luta)
+
+        self.assertEqual(Luta.objects.get(id=rounds[2][0]).atleta_b_id, luta.atleta_b_id)
+        self.assertEqual(Luta.objects.get(id=repescagem_100[0]).atleta_b_id, luta.atleta_a_id)
+
+        self._vencer(rounds[1][0])
+        self.assertEqual(Luta.objects.get(id=rounds[2][0]).atleta_a_id, Luta.objects.get(id=rounds[1][0]).atleta_a_id)
+
+        # Semifinal: perdedor para a posição B da luta de 3º lugar
+        semifinal = self._vencer(rounds[2][0], "A")
+        terceiro = Luta.objects.get(id=self.estrutura["repescagem"]["luta_3_lugar"])
+        self.assertEqual(terceiro.atleta_b_id, semifinal.atleta_b_id)
+
+    def test_chave_parcial_preenchida_pela_migracao(self):
+        rounds = self.estrutura["rounds"]
+        semifinal_id = rounds[2][0]
+        # Chave anterior à migração 0045: sem grafo, e o vencedor da luta 1 (posição B
+        # no grafo) entrou na primeira posição livre da semifinal
+        Luta.objects.filter(chave=self.chave).update(
+            proxima_luta=None, posicao_proxima='', luta_perdedor=None, posicao_perdedor='',
+        )
+        luta_1 = Luta.objects.get(id=rounds[1][1])
+        Luta.objects.filter(id=luta_1.id).update(vencedor_id=luta_1.atleta_a_id, concluida=True)
+        Luta.objects.filter(id=semifinal_id).update(atleta_a_id=luta_1.atleta_a_id)
+
+        migracao = import_module("atletas.migrations.0045_luta_grafo_avanco")
+        migracao.preencher_grafo(apps, None)
+
+        with self.assertLogs("atletas.services.grafo_chave", "WARNING"):
+            luta_0 = self._vencer(rounds[1][0])
+        semifinal = Luta.objects.get(id=semifinal_id)
+        self.assertEqual(semifinal.atleta_a_id, luta_1.atleta_a_id)
+        self.assertEqual(semifinal.atleta_b_id, luta_0.atleta_a_id)
+
+        # Registrar o mesmo resultado de novo não muda a semifinal
+        atualizar_proxima_luta(luta_0)
+        semifinal.refresh_from_db()
+        self.assertEqual((semifinal.atleta_a_id, semifinal.atleta_b_id), (luta_1.atleta_a_id, luta_0.atleta_a_id))
@@ -0,0 +1,136 @@
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from atletas.models import Campeonato, HistoricoSistema, Organizador
+from atletas.services.historico import arquivar_campeonato, caminho_arquivo, ler_arquivo, pagina_historico
+from atletas.utils_historico import descarregar_historico, pendentes_historico, registrar_historico
+
+
+@override_settings(HISTORICO_ESCRITA_SINCRONA=False, HISTORICO_LOTE=100, HISTORICO_INTERVALO_FLUSH=60)
+class HistoricoWriteBehindTests(TestCase):
+    def setUp(self):
+        descarregar_historico()
+        self.organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.campeonato = Campeonato.objects.create(nome="Copa Teste", organizador=self.organizador)
+
+    def tearDown(self):
+        descarregar_historico()
+
+    def test_registros_gravados_em_lote_apos_commit(self):
+        antes = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                registrar_historico('RESULTADO', f'Luta {i}', campeonato=self.campeonato, dados_extras={'luta': i})
+            self.assertEqual(pendentes_historico(), 0)
+        self.assertEqual(pendentes_historico(), 3)
+        self.assertFalse(HistoricoSistema.objects.exists())
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(descarregar_historico(), 3)
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+
+        registro = HistoricoSistema.objects.get(descricao='Luta 0')
+        self.assertEqual(registro.campeonato, self.campeonato)
+        self.assertEqual(registro.dados_extras, '{"luta": 0}')
+        # Hora do evento, não da gravação do lote
+        self.assertLess(registro.data_hora - antes, timedelta(seconds=5))
+        self.assertEqual(pendentes_historico(), 0)
+
+    def test_rollback_descarta_registro(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    registrar_historico('PESAGEM', 'Pesagem desfeita')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(pendentes_historico(), 0)
+
+    @override_settings(HISTORICO_BUFFER_MAX=2)
+    def test_buffer_cheio_grava_na_hora(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            registrar_historico('RESULTADO', 'Luta 1')
+            registrar_historico('RESULTADO', 'Luta 2')
+        self.assertEqual(pendentes_historico(), 0)
+        self.assertEqual(HistoricoSistema.objects.count(), 2)
+
+    @override_settings(HISTORICO_ESCRITA_SINCRONA=True)
+    def test_modo_sincrono(self):
+        registrar_historico('CHAVE', 'Chave gerada', campeonato=self.campeonato)
+        self.assertEqual(pendentes_historico(), 0)
+        self.assertEqual(HistoricoSistema.objects.filter(campeonato=self.campeonato).count(), 1)
+
+
+@override_settings(HISTORICO_ESCRITA_SINCRONA=True)
+class HistoricoPaginacaoArquivoTests(TestCase):
+    def setUp(self):
+        self.organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.encerrado = Campeonato.objects.create(
+            nome="Copa Antiga", organizador=self.organizador, data_competicao=date(2020, 5, 1)
+        )
+        self.ativo = Campeonato.objects.create(
+            nome="Copa Atual", organizador=self.organizador, ativo=True, data_competicao=timezone.localdate()
+        )
+        agora = timezone.now()
+        # Mesma data_hora em pares: o desempate por id não pode pular nem repetir registros
+        HistoricoSistema.objects.bulk_create([
+            HistoricoSistema(
+                tipo_acao='RESULTADO',
+                descricao=f'Luta {i}',
+                campeonato=self.encerrado if i % 2 else self.ativo,
+                data_hora=agora - timedelta(minutes=i // 2),
+            )
+            for i in range(7)
+        ])
+
+    def test_paginacao_por_cursor_percorre_tudo_sem_repetir(self):
+        vistos = []
+        cursor = None
+        paginas = 0
+        while True:
+            registros, cursor = pagina_historico(HistoricoSistema.objects.all(), cursor, tamanho=3)
+            vistos.extend(r.pk for r in registros)
+            paginas += 1
+            if cursor is None:
+                break
+        esperado = list(HistoricoSistema.objects.order_by('-data_hora', '-pk').values_list('pk', flat=True))
+        self.assertEqual(vistos, esperado)
+        self.assertEqual(paginas, 3)
+        self.assertEqual(pagina_historico(HistoricoSistema.objects.all(), 'lixo', tamanho=3)[0][0].pk, esperado[0])
+
+    def test_arquivar_move_historico_do_campeonato_encerrado(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            call_command('arquivar_historico', diretorio=diretorio, stdout=StringIO())
+
+            self.assertFalse(HistoricoSistema.objects.filter(campeonato=self.encerrado).exists())
+            self.assertEqual(HistoricoSistema.objects.filter(campeonato=self.ativo).count(), 4)
+
+            caminho = caminho_arquivo(self.encerrado, diretorio)
+            registros = list(ler_arquivo(caminho))
+            self.assertEqual(sorted(r['descricao'] for r in registros), ['Luta 1', 'Luta 3', 'Luta 5'])
+
+            saida = StringIO()
+            call_command('buscar_historico_arquivado', diretorio=diretorio, texto='luta 3', stdout=saida)
+            self.assertIn('Luta 3', saida.getvalue())
+            self.assertNotIn('Luta 1', saida.getvalue())
+
+            # Nova rodada acrescenta ao mesmo arquivo sem perder o conteúdo anterior
+            registrar_historico('PESAGEM', 'Pesagem tardia', campeonato=self.encerrado)
+            call_command('arquivar_historico', diretorio=diretorio, stdout=StringIO())
+            self.assertEqual(len(list(ler_arquivo(caminho))), 4)
+
+    @override_settings(HISTORICO_ARQUIVO_DIR='')
+    def test_arquivar_sem_diretorio_configurado_nao_apaga(self):
+        with self.assertRaises(CommandError):
+            call_command('arquivar_historico', stdout=StringIO())
+        with self.assertRaises(ValueError):
+            arquivar_campeonato(self.encerrado)
+        self.assertEqual(HistoricoSistema.objects.filter(campeonato=self.encerrado).count(), 3)
@@ -0,0 +1,78 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.test import TestCase
+from atletas.models import Classe, Categoria
+from atletas.services.indice_categorias import indice_categorias
+from atletas.services.pesagem import calcular_categoria_por_peso
+from atletas.utils import ajustar_categoria_por_peso, buscar_classe_no_banco, categorias_permitidas
+
+
+class IndiceCategoriasTests(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.classe = Classe.objects.create(nome="SUB 9", idade_min=7, idade_max=8)
+            for nome, minimo, maximo in (("Ate 23kg", 0, 23), ("+23 a 26kg", 23, 26), ("+26kg", 26, None)):
+                Categoria.objects.create(
+                    classe=self.classe, sexo="M", categoria_nome=nome,
+                    limite_min=minimo, limite_max=maximo, label=f"SUB 9 - {nome}",
+                )
+
+    def test_busca_por_peso_sem_consultas(self):
+        indice_categorias()
+        with self.assertNumQueries(0):
+            # Limite compartilhado fica na categoria de baixo ("até 26kg")
+            self.assertEqual(calcular_categoria_por_peso("SUB-9", "M", Decimal("26")).categoria_nome, "+23 a 26kg")
+            self.assertEqual(calcular_categoria_por_peso("sub 9", "M", Decimal("23.4")).categoria_nome, "+23 a 26kg")
+            self.assertEqual(calcular_categoria_por_peso("SUB 9", "M", Decimal("80")).categoria_nome, "+26kg")
+            self.assertIsNone(calcular_categoria_por_peso("SUB 9", "F", Decimal("20")))
+
+    def test_max_fechado_usa_mais_proxima(self):
+        indice = indice_categorias()
+        categoria = indice.por_peso(self.classe, "M", Decimal("80"), max_aberto=False)
+        self.assertEqual(categoria.categoria_nome, "+26kg")
+
+    def test_alteracao_invalida_indice(self):
+        self.assertEqual(calcular_categoria_por_peso("SUB 9", "M", Decimal("20")).categoria_nome, "Ate 23kg")
+        with self.captureOnCommitCallbacks(execute=True):
+            Categoria.objects.filter(categoria_nome="Ate 23kg").first().delete()
+            # Antes do commit o índice (deste e dos demais processos) não muda
+            self.assertEqual(calcular_categoria_por_peso("SUB 9", "M", Decimal("20")).categoria_nome, "Ate 23kg")
+        self.assertEqual(calcular_categoria_por_peso("SUB 9", "M", Decimal("20")).categoria_nome, "+23 a 26kg")
+
+    def test_ajustar_categoria_por_peso_abaixo_do_limite(self):
+        atleta = SimpleNamespace(
+            classe="SUB 9", sexo="M", categoria_nome="+26kg",
+            categoria_ajustada="", motivo_ajuste="", status="",
+        )
+        categoria, mensagem = ajustar_categoria_por_peso(atleta, Decimal("25"))
+        self.assertEqual(categoria.categoria_nome, "+23 a 26kg")
+        self.assertEqual(mensagem, "Pode rebaixar para categoria inferior")
+
+
+class RegistroClassesTests(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sub18 = Classe.objects.create(nome="SUB 18", idade_min=15, idade_max=17)
+            self.sub21 = Classe.objects.create(nome="SUB 21", idade_min=18, idade_max=20)
+            self.senior = Classe.objects.create(nome="SÊNIOR", idade_min=21, idade_max=29)
+            for classe in (self.sub18, self.sub21, self.senior):
+                Categoria.objects.create(
+                    classe=classe, sexo="F", categoria_nome="Leve",
+                    limite_min=52, limite_max=57, label=f"{classe.nome} - Leve",
+                )
+
+    def test_elegibilidade_sem_consultas(self):
+        indice_categorias()
+        with self.assertNumQueries(0):
+            self.assertEqual(buscar_classe_no_banco("sub-18"), self.sub18)
+            self.assertEqual(categorias_permitidas("SUB-18"), ["SUB 18", "SUB 21", "SÊNIOR"])
+            self.assertEqual(categorias_permitidas("SUB 21", ["SÊNIOR"]), ["SÊNIOR"])
+            elegiveis = indice_categorias().categorias_elegiveis("SUB 21", "F")
+        self.assertEqual([c.classe.nome for c in elegiveis], ["SUB 21", "SÊNIOR"])
+
+    def test_nova_classe_invalida_registro(self):
+        self.assertEqual(categorias_permitidas("Master"), ["Master", "SÊNIOR"])
+        with self.captureOnCommitCallbacks(execute=True):
+            Classe.objects.create(nome="MASTER", idade_min=30, idade_max=99)
+        self.assertEqual(categorias_permitidas("Master"), ["MASTER", "SÊNIOR"])
@@ -0,0 +1,61 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from atletas.models import Organizador
+from atletas.services import instrumentacao
+from atletas.services.instrumentacao import LIMITES_MS, medir, publicar, resumo
+
+
+class InstrumentacaoTests(TestCase):
+    def setUp(self):
+        instrumentacao.limpar()
+        self.addCleanup(instrumentacao.limpar)
+
+    def test_conta_consultas_por_etapa(self):
+        @medir("teste.decorada")
+        def consultar():
+            return Organizador.objects.count()
+
+        with medir("teste.externa"):
+            consultar()
+            Organizador.objects.exists()
+        consultar()
+
+        dados = resumo()
+        self.assertEqual(dados["teste.decorada"]["amostras"], 2)
+        self.assertEqual(dados["teste.decorada"]["max_consultas"], 1)
+        # Etapas aninhadas são inclusivas
+        self.assertEqual(dados["teste.externa"]["max_consultas"], 2)
+        self.assertEqual(sum(dados["teste.externa"]["histograma"]), 1)
+        self.assertEqual(len(dados["teste.externa"]["histograma"]), len(LIMITES_MS) + 1)
+
+    def test_janela_deslizante(self):
+        with override_settings(INSTRUMENTACAO_JANELA=3):
+            for duracao in (0.001, 0.002, 0.003, 0.2):
+                instrumentacao.registrar_amostra("teste.janela", duracao)
+        dados = resumo("teste.janela")["teste.janela"]
+        self.assertEqual(dados["amostras"], 3)
+        self.assertEqual(dados["max_ms"], 200.0)
+        self.assertEqual(dados["p50_ms"], 3.0)
+
+    @override_settings(INSTRUMENTACAO_ATIVA=False)
+    def test_desativada_nao_registra(self):
+        with medir("teste.desativada"):
+            Organizador.objects.count()
+        self.assertEqual(resumo(), {})
+
+    def test_comando_relatorio(self):
+        with medir("pesagem.validar"):
+            pass
+        publicar()
+        saida = StringIO()
+        call_command("instrumentacao", "--json", stdout=saida)
+        processos = json.loads(saida.getvalue())["processos"]
+        self.assertTrue(any("pesagem.validar" in p["etapas"] for p in processos))
+
+    def test_endpoint_exige_login_operacional(self):
+        Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        response = self.client.get("/org-teste/instrumentacao/")
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,80 @@
+from django.test import TestCase
+from atletas.models import (
+    Organizador,
+    Academia,
+    Atleta,
+    Campeonato,
+    Chave,
+    Inscricao,
+    Luta,
+)
+from atletas.services.metricas import MetricasEvento
+
+
+class MetricasEventoTests(TestCase):
+    def setUp(self):
+        self.organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.campeonato = Campeonato.objects.create(
+            nome="Copa Teste", organizador=self.organizador, ativo=True
+        )
+        self.academia = Academia.objects.create(
+            nome="Academia A", cidade="SP", estado="SP", organizador=self.organizador
+        )
+
+    def _inscricao(self, nome, **campos):
+        atleta = Atleta.objects.create(nome=nome, sexo="M", academia=self.academia, ano_nasc=2014)
+        campos.setdefault("classe_escolhida", "SUB11")
+        campos.setdefault("categoria_escolhida", "Leve")
+        return Inscricao.objects.create(atleta=atleta, campeonato=self.campeonato, **campos)
+
+    def _chave(self, categoria, total_lutas, concluidas):
+        chave = Chave.objects.create(
+            campeonato=self.campeonato, classe="SUB11", sexo="M", categoria=categoria
+        )
+        for i in range(total_lutas):
+            Luta.objects.create(chave=chave, round=1, concluida=i < concluidas)
+        return chave
+
+    def test_indicadores(self):
+        self._inscricao("Pesado", peso=30)
+        self._inscricao("Sem peso")
+        self._inscricao("Aceito", peso=40, remanejado=True, categoria_ajustada="Medio")
+        self._inscricao("Pendente", peso=41, remanejado=True)
+        self._inscricao("Rejeitado", peso=42, remanejado=True, status_inscricao="rejeitado")
+        self._chave("Leve", 2, 2)
+        self._chave("Medio", 3, 1)
+        self._chave("Pesado", 0, 0)
+
+        dados = MetricasEvento(self.campeonato).calcular()
+
+        pesagem = dados["indicadores_pesagem"]
+        self.assertEqual(pesagem["total_inscritos"], 5)
+        self.assertEqual(pesagem["total_pesados"], 4)
+        self.assertEqual(pesagem["total_fora_categoria"], 3)
+        self.assertEqual(pesagem["remanejados_aceitos"], 1)
+
+        remanejamentos = dados["remanejamentos"]
+        self.assertEqual(remanejamentos["resolvidos"], 1)
+        self.assertEqual(remanejamentos["desclassificados"], 1)
+        self.assertEqual(remanejamentos["pendentes"], 1)
+        self.assertEqual(
+            [item["atleta_nome"] for item in remanejamentos["lista_pendentes"]], ["Pendente"]
+        )
+
+        chaves = dados["indicadores_chaves"]
+        self.assertEqual(chaves["total_chaves"], 3)
+        self.assertEqual(chaves["chaves_finalizadas"], 1)
+        self.assertEqual(chaves["chaves_pendentes"], 1)
+        self.assertEqual(chaves["chaves_em_construcao"], 1)
+        self.assertEqual(chaves["total_lutas_geradas"], 5)
+        self.assertEqual(chaves["total_lutas_finalizadas"], 3)
+        self.assertEqual(dados["progresso_campeonato"], 60.0)
+
+    def test_consultas_nao_crescem_com_chaves(self):
+        self._inscricao("Pendente", peso=41, remanejado=True)
+        for i in range(10):
+            self._chave(f"Cat {i}", 3, i % 4)
+
+        # academias permitidas, agregado, por categoria, pendentes, chaves
+        with self.assertNumQueries(5):
+            MetricasEvento(self.campeonato).calcular()
@@ -0,0 +1,53 @@
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.test import RequestFactory, SimpleTestCase
+
+from atletas.middleware import MobileRedirectMiddleware
+
+UA_IPHONE = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) Mobile/15E148"
+UA_DESKTOP = "Mozilla/5.0 (X11; Linux x86_64) Firefox/130.0"
+
+
+class MobileRedirectMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _middleware(self, response):
+        return MobileRedirectMiddleware(lambda request: response)
+
+    def test_redireciona_user_agent_mobile(self):
+        middleware = self._middleware(HttpResponse("ok"))
+        response = middleware(self.factory.get("/pesagem/", HTTP_USER_AGENT=UA_IPHONE))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "/pesagem/mobile/")
+
+        response = middleware(self.factory.get("/chaves/12/", HTTP_USER_AGENT=UA_IPHONE))
+        self.assertEqual(response["Location"], "/chave/mobile/12/")
+
+    def test_cookie_de_largura_prevalece(self):
+        middleware = self._middleware(HttpResponse("ok"))
+        request = self.factory.get("/pesagem/", HTTP_USER_AGENT=UA_IPHONE)
+        request.COOKIES["screen_width"] = "1280"
+        self.assertEqual(middleware(request).status_code, 200)
+
+    def test_respostas_passam_intactas(self):
+        html = HttpResponse("<html><body>conteudo</body></html>")
+        self.assertIs(self._middleware(html)(self.factory.get("/", HTTP_USER_AGENT=UA_DESKTOP)), html)
+        self.assertEqual(html.content, b"<html><body>conteudo</body></html>")
+
+        def corpo():
+            yield b"<html><body>"
+            yield b"</body></html>"
+
+        streaming = StreamingHttpResponse(corpo(), content_type="text/html")
+        self.assertIs(self._middleware(streaming)(self.factory.get("/", HTTP_USER_AGENT=UA_DESKTOP)), streaming)
+
+        arquivo = FileResponse(iter([b"%PDF"]), content_type="application/pdf")
+        self.assertIs(self._middleware(arquivo)(self.factory.get("/", HTTP_USER_AGENT=UA_DESKTOP)), arquivo)
+
+    def test_fragmento_do_script(self):
+        html = render_to_string("atletas/ui/_mobile_redirect.html")
+        # O comentário do template não pode vazar para as páginas
+        self.assertTrue(html.startswith("<script>"))
+        self.assertIn("screen_width", html)
+        self.assertIn("/chave/mobile/", html)
@@ -0,0 +1,47 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from atletas.middleware.mobile_redirect import OrganizacaoMiddleware
+from atletas.models import Campeonato, Organizador
+from atletas.services.organizacao_cache import invalidar_cache_organizacoes
+
+
+class OrganizacaoMiddlewareCacheTests(TestCase):
+    def setUp(self):
+        invalidar_cache_organizacoes()
+        self.organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.campeonato = Campeonato.objects.create(
+            nome="Copa Teste", organizador=self.organizador, ativo=True
+        )
+        self.vistos = []
+
+        def view(request):
+            self.vistos.append(request)
+            return HttpResponse("ok")
+
+        self.middleware = OrganizacaoMiddleware(view)
+        self.factory = RequestFactory()
+
+    def _get(self, caminho="/org-teste/pesagem/"):
+        return self.middleware(self.factory.get(caminho))
+
+    def test_resolve_organizacao_e_campeonato_uma_vez(self):
+        with self.assertNumQueries(2):
+            self._get()
+        with self.assertNumQueries(0):
+            self._get()
+            self.assertEqual(self.vistos[-1].campeonato_ativo.organizador.slug, "org-teste")
+        self.assertEqual(self.vistos[-1].organizacao, self.organizador)
+        self.assertEqual(self.vistos[-1].campeonato_ativo, self.campeonato)
+
+    def test_salvar_campeonato_invalida(self):
+        self._get()
+        self.campeonato.ativo = False
+        self.campeonato.save()
+        self._get()
+        self.assertIsNone(self.vistos[-1].campeonato_ativo)
+
+    def test_organizacao_inativa_retorna_404(self):
+        self.organizador.ativo = False
+        self.organizador.save()
+        self.assertEqual(self._get().status_code, 404)
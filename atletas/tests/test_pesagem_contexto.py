@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from atletas.models import (
+    Organizador,
+    Academia,
+    Classe,
+    Categoria,
+    Atleta,
+    Campeonato,
+    Inscricao,
+    PesagemHistorico,
+)
+from atletas.services.indice_categorias import indice_categorias
+from atletas.services.pesagem_contexto import inscricoes_pesagem, montar_linhas_pesagem
+
+
+class MontarLinhasPesagemTests(TestCase):
+    def setUp(self):
+        self.organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.campeonato = Campeonato.objects.create(
+            nome="Copa Teste", organizador=self.organizador, ativo=True
+        )
+        self.academia = Academia.objects.create(
+            nome="Academia A", cidade="SP", estado="SP", organizador=self.organizador
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.classe = Classe.objects.create(nome="SUB-11", idade_min=10, idade_max=11)
+            self.leve = Categoria.objects.create(
+                classe=self.classe, sexo="M", categoria_nome="Leve",
+                limite_min=30, limite_max=35, label="SUB-11 - Leve",
+            )
+            self.medio = Categoria.objects.create(
+                classe=self.classe, sexo="M", categoria_nome="Medio",
+                limite_min=35, limite_max=40, label="SUB-11 - Medio",
+            )
+
+    def _inscrever(self, nome, peso, categoria=None, pesagens=0):
+        atleta = Atleta.objects.create(nome=nome, sexo="M", academia=self.academia, ano_nasc=2014)
+        inscricao = Inscricao.objects.create(
+            atleta=atleta,
+            campeonato=self.campeonato,
+            classe_escolhida=self.classe.nome,
+            categoria_escolhida=categoria.categoria_nome if categoria else "",
+            classe_real=self.classe,
+            categoria_real=categoria,
+            peso_real=peso,
+            status_inscricao="aprovado",
+        )
+        for i in range(pesagens):
+            PesagemHistorico.objects.create(
+                inscricao=inscricao, campeonato=self.campeonato, peso_registrado=Decimal(30 + i)
+            )
+        return inscricao
+
+    def _linhas(self):
+        return montar_linhas_pesagem(inscricoes_pesagem(self.campeonato), self.campeonato)
+
+    def test_categoria_por_peso_e_historico_recente(self):
+        self._inscrever("A Com categoria", Decimal("41"), categoria=self.leve, pesagens=7)
+        self._inscrever("B Sem categoria", Decimal("37"))
+
+        com_categoria, sem_categoria = self._linhas()
+
+        self.assertEqual(com_categoria.categoria_label, "SUB-11 - Leve")
+        self.assertTrue(com_categoria.peso_fora_categoria)
+        self.assertEqual(len(com_categoria.historico_pesagens), 5)
+        self.assertEqual(sem_categoria.categoria_real_nome, "Medio")
+        self.assertEqual(sem_categoria.limite_texto, "35.0 a 40.0 kg")
+        self.assertEqual(sem_categoria.historico_pesagens, [])
+
+    def test_consultas_constantes(self):
+        for i in range(3):
+            self._inscrever(f"Atleta {i}", Decimal("33"), pesagens=2)
+        indice_categorias()
+        # permitidas, confirmadas, inscrições, histórico (categorias vêm do índice)
+        with self.assertNumQueries(4):
+            self._linhas()
+
+        for i in range(3, 12):
+            self._inscrever(f"Atleta {i}", Decimal("38"), categoria=self.medio, pesagens=2)
+        with self.assertNumQueries(4):
+            self.assertEqual(len(self._linhas()), 12)
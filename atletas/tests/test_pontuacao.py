@@ -0,0 +1,144 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from atletas.models import (
+    Organizador,
+    Academia,
+    AcademiaPontuacao,
+    Atleta,
+    Campeonato,
+    Chave,
+    Inscricao,
+    MedalhaAtleta,
+)
+from atletas.services.pontuacao import (
+    quadro_medalhas,
+    recalcular_pontuacao_campeonato,
+    sincronizar_chave,
+    sincronizar_inscricoes_academia,
+)
+
+
+class PontuacaoIncrementalTests(TestCase):
+    def setUp(self):
+        self.organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.campeonato = Campeonato.objects.create(
+            nome="Copa Teste", organizador=self.organizador, ativo=True
+        )
+        self.academia_a = Academia.objects.create(
+            nome="Academia A", cidade="SP", estado="SP", organizador=self.organizador
+        )
+        self.academia_b = Academia.objects.create(
+            nome="Academia B", cidade="SP", estado="SP", organizador=self.organizador
+        )
+        self.atleta_a = Atleta.objects.create(
+            nome="Atleta A", sexo="M", academia=self.academia_a, ano_nasc=2014
+        )
+        self.atleta_b = Atleta.objects.create(
+            nome="Atleta B", sexo="M", academia=self.academia_b, ano_nasc=2014
+        )
+
+    def _pontuacao(self, academia):
+        return AcademiaPontuacao.objects.get(campeonato=self.campeonato, academia=academia)
+
+    def _chave_campeao(self, atleta):
+        return Chave.objects.create(
+            campeonato=self.campeonato,
+            classe="SUB11",
+            sexo="M",
+            categoria="Leve",
+            estrutura={"tipo": "campeao_automatico", "vencedor": atleta.id},
+        )
+
+    def test_troca_de_campeao_aplica_apenas_delta(self):
+        chave = self._chave_campeao(self.atleta_a)
+        sincronizar_chave(chave)
+        self.assertEqual(self._pontuacao(self.academia_a).ouro, 1)
+        self.assertEqual(self._pontuacao(self.academia_a).pontos_totais, 10)
+
+        # Reprocessar sem mudança não duplica pontos
+        sincronizar_chave(chave)
+        self.assertEqual(self._pontuacao(self.academia_a).pontos_totais, 10)
+
+        chave.estrutura["vencedor"] = self.atleta_b.id
+        chave.save()
+        sincronizar_chave(chave)
+        self.assertEqual(self._pontuacao(self.academia_a).ouro, 0)
+        self.assertEqual(self._pontuacao(self.academia_a).pontos_totais, 0)
+        self.assertEqual(self._pontuacao(self.academia_b).pontos_totais, 10)
+        self.academia_b.refresh_from_db()
+        self.assertEqual(self.academia_b.pontos, 10)
+
+    def test_inscricoes_e_recalculo_completo_coincidem(self):
+        self._chave_campeao(self.atleta_a)
+        sincronizar_chave(Chave.objects.get())
+        Inscricao.objects.create(
+            atleta=self.atleta_b,
+            campeonato=self.campeonato,
+            classe_escolhida="Festival",
+            categoria_escolhida="Festival",
+            status_inscricao="aprovado",
+        )
+        Inscricao.objects.create(
+            atleta=self.atleta_a,
+            campeonato=self.campeonato,
+            classe_escolhida="SUB11",
+            categoria_escolhida="Leve",
+            status_inscricao="aprovado",
+            remanejado=True,
+        )
+        sincronizar_inscricoes_academia(self.campeonato, self.academia_a.id)
+        sincronizar_inscricoes_academia(self.campeonato, self.academia_b.id)
+
+        incremental = {
+            p.academia_id: (p.ouro, p.festival, p.remanejamento, p.pontos_totais)
+            for p in AcademiaPontuacao.objects.filter(campeonato=self.campeonato)
+        }
+        self.assertEqual(incremental[self.academia_a.id], (1, 0, 1, 9))
+        self.assertEqual(incremental[self.academia_b.id], (0, 1, 0, 1))
+
+        recalcular_pontuacao_campeonato(self.campeonato)
+        completo = {
+            p.academia_id: (p.ouro, p.festival, p.remanejamento, p.pontos_totais)
+            for p in AcademiaPontuacao.objects.filter(campeonato=self.campeonato)
+        }
+        self.assertEqual(incremental, completo)
+
+    def test_quadro_de_medalhas_materializado(self):
+        chave = self._chave_campeao(self.atleta_a)
+        sincronizar_chave(chave)
+        self._chave_campeao(self.atleta_a)
+        sincronizar_chave(Chave.objects.latest('id'))
+
+        ranking = quadro_medalhas(self.campeonato)
+        self.assertEqual(len(ranking), 1)
+        self.assertEqual(ranking[0]['atleta'], self.atleta_a)
+        self.assertEqual((ranking[0]['ouro'], ranking[0]['total_medalhas']), (2, 2))
+        self.assertEqual(quadro_medalhas(self.campeonato, sexo='F'), [])
+
+        chave.estrutura["vencedor"] = self.atleta_b.id
+        chave.save()
+        sincronizar_chave(chave)
+        ranking = quadro_medalhas(self.campeonato, categoria="Leve")
+        self.assertEqual([item['ouro'] for item in ranking], [1, 1])
+        self.assertEqual(MedalhaAtleta.objects.filter(campeonato=self.campeonato).count(), 2)
+
+    def test_comando_todos_preenche_campeonatos_antigos(self):
+        # Chave com resultado gravada antes da migração 0043: sem medalhas nem classificação salva
+        chave = self._chave_campeao(self.atleta_a)
+        antigo = Campeonato.objects.create(nome="Copa Antiga", organizador=self.organizador)
+        Chave.objects.create(
+            campeonato=antigo, classe="SUB11", sexo="M", categoria="Leve",
+            estrutura={"tipo": "campeao_automatico", "vencedor": self.atleta_b.id},
+        )
+
+        call_command('recalcular_pontuacao', todos=True, stdout=StringIO())
+
+        self.assertEqual(quadro_medalhas(antigo)[0]['atleta'], self.atleta_b)
+        self.assertEqual(quadro_medalhas(self.campeonato)[0]['atleta'], self.atleta_a)
+        chave.refresh_from_db()
+        self.assertEqual(chave.estrutura["classificacao"][0]["atleta_id"], self.atleta_a.id)
+        # O ativo é processado por último: Academia.pontos reflete o campeonato ativo
+        self.academia_a.refresh_from_db()
+        self.assertEqual(self.academia_a.pontos, 10)
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from atletas.services.round_robin import classificacao_round_robin, matriz_vitorias, ordenar_com_confronto_direto
+
+
+def _luta(a, b, vencedor, tipo="IPPON", pontos=10, ippons=1):
+    return SimpleNamespace(
+        atleta_a_id=a,
+        atleta_b_id=b,
+        vencedor_id=vencedor,
+        tipo_vitoria=tipo,
+        pontos_vencedor=pontos,
+        ippon_count=ippons,
+        wazari_count=0,
+        yuko_count=0,
+    )
+
+
+class ClassificacaoRoundRobinTests(SimpleTestCase):
+    def test_confronto_direto_resolve_empate_de_tres(self):
+        # 1, 2 e 3 empatados no critério principal; entre eles 1 > 2 > 3
+        matriz = matriz_vitorias([(1, 2), (1, 3), (2, 3), (3, 4), (2, 4), (4, 1)])
+        ordem = ordenar_com_confronto_direto([3, 2, 1, 4], chave=lambda a: 0 if a != 4 else 1, matriz=matriz)
+        self.assertEqual(ordem, [1, 2, 3, 4])
+
+    def test_ciclo_cai_nos_criterios_tecnicos(self):
+        lutas = [
+            _luta(1, 2, 1, ippons=0),
+            _luta(2, 3, 2, ippons=2),
+            _luta(3, 1, 3, ippons=1),
+        ]
+        self.assertEqual(classificacao_round_robin(lutas), [2, 3, 1])
+
+    def test_yuko_nao_conta_como_vitoria(self):
+        lutas = [
+            _luta(1, 2, 1, tipo="YUKO"),
+            _luta(2, 3, 2),
+            _luta(1, 3, 3),
+        ]
+        self.assertEqual(classificacao_round_robin(lutas), [2, 3, 1])
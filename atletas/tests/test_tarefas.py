@@ -0,0 +1,103 @@
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from atletas.models import Organizador, Campeonato, TarefaBackground
+from atletas.services.tarefas import (
+    TAREFAS,
+    enfileirar,
+    executar,
+    registrar_tarefa,
+    reservar_proxima,
+    tarefa_regulamento_pdf,
+)
+from atletas.views_tarefas import tarefa_status
+
+
+@registrar_tarefa('teste_falha')
+def _tarefa_falha(tarefa, progresso):
+    progresso(50, 'Quase')
+    raise RuntimeError('falhou')
+
+
+class FilaTarefasTests(TestCase):
+    def setUp(self):
+        self.organizador = Organizador.objects.create(nome="Org Teste", slug="org-teste")
+        self.campeonato = Campeonato.objects.create(
+            nome="Copa Teste", organizador=self.organizador, ativo=True
+        )
+
+    def test_enfileirar_nao_executa_e_worker_conclui(self):
+        tarefa = enfileirar('recalcular_pontuacao', campeonato=self.campeonato)
+        self.assertEqual(tarefa.status, 'PENDENTE')
+
+        call_command('processar_tarefas', uma_vez=True, stdout=StringIO())
+
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, 'CONCLUIDA')
+        self.assertEqual(tarefa.progresso, 100)
+        self.assertEqual(tarefa.resultado, {'academias': 0})
+        self.assertEqual(tarefa.tentativas, 1)
+
+    def test_retentativa_ate_max_tentativas(self):
+        tarefa = enfileirar('teste_falha', max_tentativas=2)
+
+        tarefa = executar(reservar_proxima())
+        self.assertEqual(tarefa.status, 'PENDENTE')
+        self.assertGreater(tarefa.executar_apos, tarefa.iniciado_em)
+        # Ainda aguardando o tempo de espera: nada a reservar
+        self.assertIsNone(reservar_proxima())
+
+        TarefaBackground.objects.filter(id=tarefa.id).update(executar_apos=tarefa.iniciado_em)
+        tarefa = executar(reservar_proxima())
+        self.assertEqual(tarefa.status, 'ERRO')
+        self.assertEqual(tarefa.tentativas, 2)
+        self.assertIn('RuntimeError', tarefa.erro)
+
+    @override_settings(TAREFAS_EXECUCAO_IMEDIATA=True)
+    def test_execucao_imediata(self):
+        tarefa = enfileirar('gerar_todas_chaves', campeonato=self.campeonato)
+        self.assertEqual(tarefa.status, 'CONCLUIDA')
+        self.assertEqual(tarefa.resultado['criadas'], 0)
+
+    def test_tipo_desconhecido(self):
+        self.assertNotIn('inexistente', TAREFAS)
+        with self.assertRaises(ValueError):
+            enfileirar('inexistente')
+
+    def test_status_restrito_a_organizacao(self):
+        tarefa = enfileirar('recalcular_pontuacao', campeonato=self.campeonato)
+        outra = Organizador.objects.create(nome="Outra Org", slug="outra-org")
+        # Sem operacional_required: testa só o escopo da consulta
+        view = tarefa_status.__wrapped__
+
+        request = RequestFactory().get('/')
+        request.organizacao = self.organizador
+        self.assertEqual(view(request, tarefa.id).status_code, 200)
+
+        request.organizacao = outra
+        with self.assertRaises(Http404):
+            view(request, tarefa.id)
+
+    def test_regulamento_pdf_reaproveita_tarefa_da_versao(self):
+        self.campeonato.regulamento = "1. Disposições\n\nTexto do regulamento."
+        self.campeonato.save()
+
+        tarefa = tarefa_regulamento_pdf(self.campeonato)
+        self.assertEqual(tarefa.status, 'PENDENTE')
+        # Outra academia pedindo enquanto o worker não rodou: mesma tarefa
+        self.assertEqual(tarefa_regulamento_pdf(self.campeonato).id, tarefa.id)
+
+        with tempfile.TemporaryDirectory() as media, self.settings(MEDIA_ROOT=media):
+            call_command('processar_tarefas', uma_vez=True, stdout=StringIO())
+            tarefa.refresh_from_db()
+            self.assertEqual(tarefa.status, 'CONCLUIDA')
+            self.assertTrue(tarefa.arquivo.read().startswith(b'%PDF'))
+            self.assertEqual(tarefa_regulamento_pdf(self.campeonato).id, tarefa.id)
+
+            # Texto alterado: nova versão, novo PDF
+            self.campeonato.regulamento += "\n\n2. Novo item"
+            self.campeonato.save()
+            self.assertNotEqual(tarefa_regulamento_pdf(self.campeonato).id, tarefa.id)
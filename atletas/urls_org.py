@@ -67,6 +67,7 @@ urlpatterns = [
     # Inscrições e Métricas do Evento
     path('inscricoes/', views.inscrever_atletas, name='inscrever_atletas'),
     path('metricas/', views.metricas_evento, name='metricas_evento'),
+    path('metricas/dados/', views.metricas_evento_dados, name='metricas_evento_dados'),
 
     # Relatórios (mantidos para compatibilidade, mas consolidados em Métricas)
     path('relatorios/dashboard/', views.dashboard, name='dashboard'),
@@ -119,6 +120,7 @@ urlpatterns = [
 
     # Conferência de Pagamentos (fluxo principal unificado)
     path('administracao/conferencia-pagamentos/', views.conferencia_pagamentos_lista, name='conferencia_pagamentos_lista'),
+    path('administracao/conferencia-pagamentos/<int:campeonato_id>/confirmar-selecionadas/', views.conferencia_pagamentos_confirmar_lote, name='conferencia_pagamentos_confirmar_lote'),
     path('administracao/conferencia-pagamentos/<int:academia_id>/<int:campeonato_id>/', views.conferencia_pagamentos_detalhe, name='conferencia_pagamentos_detalhe'),
     path('administracao/conferencia-pagamentos/<int:academia_id>/<int:campeonato_id>/salvar/', views.conferencia_pagamentos_salvar, name='conferencia_pagamentos_salvar'),
     path('administracao/conferencia-pagamentos/<int:academia_id>/<int:campeonato_id>/mensagem-whatsapp/', views.gerar_mensagem_whatsapp, name='gerar_mensagem_whatsapp'),
@@ -128,6 +130,12 @@ urlpatterns = [
     path('administracao/ocorrencias/criar/', views.ocorrencias_criar, name='ocorrencias_criar'),
     path('administracao/ocorrencias/<int:ocorrencia_id>/', views.ocorrencias_detalhe, name='ocorrencias_detalhe'),
     path('administracao/ocorrencias/historico/', views.ocorrencias_historico, name='ocorrencias_historico'),
+
+    # Tarefas em segundo plano
+    path('tarefas/<int:tarefa_id>/status/', views.tarefa_status, name='tarefa_status'),
+
+    # Instrumentação (tempo/consultas por etapa)
+    path('instrumentacao/', views.instrumentacao_dados, name='instrumentacao_dados'),
 ]
 
 
@@ -1,10 +1,33 @@
+import logging
 from datetime import date
 from decimal import Decimal
 from typing import Optional
+from django.db import transaction
 from django.db.models import Q
 from .models import Atleta, Categoria, Chave, Luta, Academia, Campeonato, AcademiaPontuacao, Inscricao, Classe
 import random
 import re
+from functools import lru_cache
+
+from .services.grafo_chave import gravar_grafo_avanco, ocupar_posicao
+from .services.instrumentacao import medir
+from .services.round_robin import classificacao_round_robin
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1024)
+def _normalizar_nome_classe(nome_classe):
+    nome = nome_classe.upper().strip()
+    
+    # Remover espaços e hífens de "SUB X" ou "SUB-X" -> "SUBX"
+    nome = re.sub(r'SUB\s*[- ]?\s*(\d+)', r'SUB\1', nome)
+    
+    # Normalizar variações comuns
+    nome = nome.replace("SÊNIOR", "SENIOR")
+    nome = nome.replace("VETERANO", "VETERANOS")
+    
+    return nome
 
 
 def normalizar_nome_classe(nome_classe):
@@ -28,17 +51,8 @@ def normalizar_nome_classe(nome_classe):
     if not nome_classe:
         return ""
     
-    # Converter para maiúsculas e remover espaços extras
-    nome = str(nome_classe).upper().strip()
-    
-    # Remover espaços e hífens de "SUB X" ou "SUB-X" -> "SUBX"
-    nome = re.sub(r'SUB\s*[- ]?\s*(\d+)', r'SUB\1', nome)
-    
-    # Normalizar variações comuns
-    nome = nome.replace("SÊNIOR", "SENIOR")
-    nome = nome.replace("VETERANO", "VETERANOS")
-    
-    return nome
+    # Resultado memorizado: chamada em laços de elegibilidade e pesagem
+    return _normalizar_nome_classe(str(nome_classe))
 
 
 FAIXA_MIN_IDADE = {
@@ -249,24 +263,9 @@ def buscar_classe_no_banco(nome_classe):
     Returns:
         Objeto Classe se encontrado, None caso contrário
     """
-    if not nome_classe:
-        return None
-    
-    # Tentar busca exata primeiro
-    classe = Classe.objects.filter(nome__iexact=nome_classe).first()
-    if classe:
-        return classe
-    
-    # Normalizar para busca flexível
-    nome_normalizado = normalizar_nome_classe(nome_classe)
-    
-    # Buscar todas as classes e comparar normalizadas
-    todas_classes = Classe.objects.all()
-    for classe_obj in todas_classes:
-        if normalizar_nome_classe(classe_obj.nome) == nome_normalizado:
-            return classe_obj
-    
-    return None
+    # Registro de classes em memória (reconstruído quando uma Classe é salva)
+    from .services.indice_categorias import indice_categorias
+    return indice_categorias().classe_no_banco(nome_classe)
 
 
 def calcular_classe(ano_nasc, ano_evento=None):
@@ -298,29 +297,19 @@ def calcular_classe(ano_nasc, ano_evento=None):
     return "VETERANOS"
 
 
-def categorias_permitidas(classe_atleta, categorias_existentes=None):
-    """Retorna as classes de categorias que um atleta pode escolher baseado na sua classe
-    
-    Regras de elegibilidade:
-    - FESTIVAL: somente FESTIVAL
-    - SUB-9, SUB-11, SUB-13, SUB-15: somente sua própria classe
-    - SUB-18: pode escolher SUB-18, SUB-21, SÊNIOR/VET
-    - SUB-21: pode escolher SUB-21 ou SÊNIOR/VET
-    - SÊNIOR/VET: pode escolher apenas SÊNIOR/VET
-    - VETERANOS: pode escolher VETERANOS ou SÊNIOR/VET
-    
-    Args:
-        classe_atleta: Classe do atleta (ex: "VETERANOS", "SUB-18", "SÊNIOR/VET", "SUB 18", "SUB-13")
-        categorias_existentes: Lista opcional de classes que existem no evento (filtra resultados)
-    
-    Returns:
-        Lista de classes permitidas para inscrição (nomes reais do banco de dados)
+def calcular_classes_permitidas(classe_atleta, buscar_classe=None):
+    """Regra de elegibilidade de categorias_permitidas, sem o filtro por evento.
+
+    Calculada uma vez por nome de classe e memorizada em
+    services.indice_categorias; use categorias_permitidas() nas views.
     """
+    buscar_classe = buscar_classe or buscar_classe_no_banco
+
     # Normalizar nome da classe para comparação
     classe_normalizada = normalizar_nome_classe(classe_atleta)
 
     # Buscar classe no banco para obter o nome exato
-    classe_obj = buscar_classe_no_banco(classe_atleta)
+    classe_obj = buscar_classe(classe_atleta)
     nome_classe_exato = classe_obj.nome if classe_obj else classe_atleta
 
     # Determinar classes permitidas baseado na classe normalizada
@@ -340,27 +329,53 @@ def categorias_permitidas(classe_atleta, categorias_existentes=None):
         classes_permitidas_nomes = [nome_classe_exato]
     elif classe_normalizada in ["SUB18", "SUB-18", "SUB 18"]:
         classes_permitidas_nomes = [nome_classe_exato]
-        sub21 = buscar_classe_no_banco("SUB-21")
+        sub21 = buscar_classe("SUB-21")
         if sub21:
             classes_permitidas_nomes.append(sub21.nome)
-        senior = buscar_classe_no_banco("SÊNIOR")
+        senior = buscar_classe("SÊNIOR")
         if senior:
             classes_permitidas_nomes.append(senior.nome)
     elif classe_normalizada in ["SUB21", "SUB-21", "SUB 21"]:
         classes_permitidas_nomes = [nome_classe_exato]
-        senior = buscar_classe_no_banco("SÊNIOR")
+        senior = buscar_classe("SÊNIOR")
         if senior:
             classes_permitidas_nomes.append(senior.nome)
     elif classe_normalizada in ["SENIOR", "SÊNIOR"]:
         classes_permitidas_nomes = [nome_classe_exato]
     elif classe_normalizada in ["VETERANOS", "VETERANO", "MASTER", "MASTERS"]:
         classes_permitidas_nomes = [nome_classe_exato]
-        senior = buscar_classe_no_banco("SÊNIOR")
+        senior = buscar_classe("SÊNIOR")
         if senior:
             classes_permitidas_nomes.append(senior.nome)
     else:
         classes_permitidas_nomes = [nome_classe_exato]
     
+    return classes_permitidas_nomes
+
+
+def categorias_permitidas(classe_atleta, categorias_existentes=None):
+    """Retorna as classes de categorias que um atleta pode escolher baseado na sua classe
+    
+    Regras de elegibilidade:
+    - FESTIVAL: somente FESTIVAL
+    - SUB-9, SUB-11, SUB-13, SUB-15: somente sua própria classe
+    - SUB-18: pode escolher SUB-18, SUB-21, SÊNIOR/VET
+    - SUB-21: pode escolher SUB-21 ou SÊNIOR/VET
+    - SÊNIOR/VET: pode escolher apenas SÊNIOR/VET
+    - VETERANOS: pode escolher VETERANOS ou SÊNIOR/VET
+    
+    Args:
+        classe_atleta: Classe do atleta (ex: "VETERANOS", "SUB-18", "SÊNIOR/VET", "SUB 18", "SUB-13")
+        categorias_existentes: Lista opcional de classes que existem no evento (filtra resultados)
+    
+    Returns:
+        Lista de classes permitidas para inscrição (nomes reais do banco de dados)
+    """
+    from .services.indice_categorias import indice_categorias
+
+    # Lista pré-calculada por classe no registro em memória
+    classes_permitidas_nomes = list(indice_categorias().classes_permitidas(classe_atleta))
+    
     # Filtrar apenas classes que existem no evento (se fornecido)
     if categorias_existentes is not None:
         # Converter para lista se necessário
@@ -450,26 +465,16 @@ def get_categorias_elegiveis(classe_atleta, sexo):
     Returns:
         QuerySet de categorias elegíveis
     """
-    # Obter classes permitidas para esta classe de atleta (retorna nomes reais do banco)
-    classes_permitidas = categorias_permitidas(classe_atleta)
-    
-    if not classes_permitidas:
-        return Categoria.objects.none()
-    
-    # Buscar objetos Classe no banco usando normalização flexível
-    classes_objs = []
-    for classe_nome in classes_permitidas:
-        classe_obj = buscar_classe_no_banco(classe_nome)
-        if classe_obj:
-            classes_objs.append(classe_obj)
-    
-    if not classes_objs:
+    from .services.indice_categorias import indice_categorias
+
+    # Classes permitidas resolvidas no registro em memória (sem consultas)
+    categorias = indice_categorias().categorias_elegiveis(classe_atleta, sexo)
+    if not categorias:
         return Categoria.objects.none()
     
     # Retornar categorias dessas classes
     return Categoria.objects.filter(
-        classe__in=classes_objs,
-        sexo=sexo
+        id__in=[c.id for c in categorias]
     ).order_by('classe__idade_min', 'limite_min')
 
 
@@ -477,47 +482,58 @@ def ajustar_categoria_por_peso(atleta, peso_oficial):
     """Ajusta a categoria do atleta baseado no peso oficial, respeitando elegibilidade
     
     IMPORTANTE: Ao ajustar categoria, só considera categorias elegíveis para a classe do atleta.
+    As categorias vêm do índice em memória (services.indice_categorias), sem consultas por pesagem.
     """
-    categoria_atual = Categoria.objects.filter(
-        classe=atleta.classe,
-        sexo=atleta.sexo,
-        categoria_nome=atleta.categoria_nome
-    ).first()
+    from .services.indice_categorias import indice_categorias
+
+    indice = indice_categorias()
+    classe_obj = indice.classe_no_banco(atleta.classe)
+    categoria_atual = None
+    if classe_obj:
+        categoria_atual = indice.por_nome(atleta.categoria_nome, classe_obj.nome, atleta.sexo)
     
     if not categoria_atual:
         # Tentar buscar pela categoria_ajustada se existir
         if atleta.categoria_ajustada:
-            categoria_atual = Categoria.objects.filter(
-                categoria_nome=atleta.categoria_ajustada,
-                sexo=atleta.sexo
-            ).first()
+            categoria_atual = indice.por_nome_qualquer_classe(atleta.categoria_ajustada, atleta.sexo)
         
         if not categoria_atual:
             return None, "Categoria não encontrada"
     
+    def _max(categoria):
+        # limite_max vazio ou >= 999.0 representa categoria "acima de"
+        return categoria.limite_max if categoria.limite_max is not None else Decimal("999.0")
+    
+    def _elegiveis():
+        # Mesma seleção/ordem de get_categorias_elegiveis, a partir do índice
+        return indice.categorias_elegiveis(atleta.classe, atleta.sexo)
+    
     # Obter classes elegíveis para o atleta
     classes_elegiveis = categorias_permitidas(atleta.classe)
     classes_elegiveis_normalizadas = [c.upper().strip() for c in classes_elegiveis]
     
     # Verifica se peso está dentro dos limites (limite_max pode ser 999.0 para categorias "acima de")
-    limite_max_real = categoria_atual.limite_max if categoria_atual.limite_max < 999.0 else 999999.0
+    limite_max_real = _max(categoria_atual) if _max(categoria_atual) < 999.0 else 999999.0
     
     if categoria_atual.limite_min <= peso_oficial <= limite_max_real:
         # Verificar se a categoria atual é elegível
-        if categoria_atual.classe.upper().strip() not in classes_elegiveis_normalizadas:
+        if categoria_atual.classe.nome.upper().strip() not in classes_elegiveis_normalizadas:
             # Categoria atual não é elegível, precisa ajustar
-            atleta.motivo_ajuste = f"Categoria atual ({categoria_atual.classe}) não é elegível para atleta de classe {atleta.classe}"
+            atleta.motivo_ajuste = f"Categoria atual ({categoria_atual.classe.nome}) não é elegível para atleta de classe {atleta.classe}"
             # Buscar categoria elegível que contenha o peso
-            categorias_elegiveis = get_categorias_elegiveis(atleta.classe, atleta.sexo)
-            categoria_correta = categorias_elegiveis.filter(
-                limite_min__lte=peso_oficial
+            categoria_correta = [c for c in _elegiveis() if c.limite_min <= peso_oficial]
+            categorias_normais = [c for c in categoria_correta if _max(c) < 999.0]
+            categoria_que_contem = min(
+                (c for c in categorias_normais if _max(c) >= peso_oficial),
+                key=lambda c: c.limite_min, default=None,
             )
-            categorias_normais = categoria_correta.filter(limite_max__lt=999.0)
-            categoria_que_contem = categorias_normais.filter(limite_max__gte=peso_oficial).order_by('limite_min').first()
             if categoria_que_contem:
                 return categoria_que_contem, "Categoria ajustada para elegível"
             # Tentar categoria "acima de"
-            categoria_acima = categoria_correta.filter(limite_max__gte=999.0).order_by('-limite_min').first()
+            categoria_acima = max(
+                (c for c in categoria_correta if _max(c) >= 999.0),
+                key=lambda c: c.limite_min, default=None,
+            )
             if categoria_acima and peso_oficial >= categoria_acima.limite_min:
                 return categoria_acima, "Categoria ajustada para elegível"
             return None, "Não há categoria elegível que contenha este peso"
@@ -525,26 +541,25 @@ def ajustar_categoria_por_peso(atleta, peso_oficial):
         return categoria_atual, "OK"
     
     # Peso acima do limite máximo - usar apenas categorias elegíveis
-    limite_max_real = categoria_atual.limite_max if categoria_atual.limite_max < 999.0 else 999999.0
-    
     if peso_oficial > limite_max_real:
         # Buscar próxima categoria superior apenas entre categorias elegíveis
-        categorias_elegiveis = get_categorias_elegiveis(atleta.classe, atleta.sexo)
+        categorias_elegiveis = _elegiveis()
         
-        categoria_superior = categorias_elegiveis.filter(
-            limite_min__gt=limite_max_real
-        ).exclude(limite_max__gte=999.0).order_by('limite_min').first()
+        categoria_superior = min(
+            (c for c in categorias_elegiveis if c.limite_min > limite_max_real and _max(c) < 999.0),
+            key=lambda c: c.limite_min, default=None,
+        )
         
         if not categoria_superior:
             # Tentar categoria "acima de" se existir (apenas se elegível)
-            categoria_superior = categorias_elegiveis.filter(
-                limite_min__lte=peso_oficial,
-                limite_max__gte=999.0
-            ).order_by('-limite_min').first()
+            categoria_superior = max(
+                (c for c in categorias_elegiveis if c.limite_min <= peso_oficial and _max(c) >= 999.0),
+                key=lambda c: c.limite_min, default=None,
+            )
         
         if categoria_superior:
             # Verificar se é elegível
-            if categoria_superior.classe.upper().strip() in classes_elegiveis_normalizadas:
+            if categoria_superior.classe.nome.upper().strip() in classes_elegiveis_normalizadas:
                 # Existe categoria superior elegível, ajustar
                 atleta.categoria_ajustada = categoria_superior.categoria_nome
                 atleta.motivo_ajuste = f"Peso {peso_oficial}kg acima do limite máximo ({limite_max_real}kg)"
@@ -556,49 +571,50 @@ def ajustar_categoria_por_peso(atleta, peso_oficial):
         return None, "Eliminado - Peso acima da última categoria elegível"
     
     # Peso abaixo do limite mínimo - buscar categoria correta que contenha o peso
-    if peso_oficial < categoria_atual.limite_min:
-        # Buscar categoria que contenha o peso do atleta
-        limite_max_real = categoria_atual.limite_max if categoria_atual.limite_max < 999.0 else 999999.0
-        
-        # Primeiro tentar encontrar categoria que contenha o peso exato
-        categoria_correta = Categoria.objects.filter(
-            classe=atleta.classe,
-            sexo=atleta.sexo,
-            limite_min__lte=peso_oficial
-        ).exclude(
-            categoria_nome=categoria_atual.categoria_nome  # Excluir a categoria atual
+    # Primeiro tentar encontrar categoria que contenha o peso exato (excluindo a atual)
+    categoria_correta = [
+        c for c in indice.categorias(categoria_atual.classe, atleta.sexo)
+        if c.limite_min <= peso_oficial and c.categoria_nome != categoria_atual.categoria_nome
+    ]
+    
+    # Filtrar categorias normais (com limite_max < 999.0)
+    categorias_normais = [c for c in categoria_correta if _max(c) < 999.0]
+    
+    if categorias_normais:
+        # Buscar categoria que contenha o peso (limite_min <= peso <= limite_max)
+        categoria_que_contem = min(
+            (c for c in categorias_normais if _max(c) >= peso_oficial),
+            key=lambda c: c.limite_min, default=None,
         )
-        
-        # Filtrar categorias normais (com limite_max < 999.0)
-        categorias_normais = categoria_correta.filter(limite_max__lt=999.0)
-        
-        if categorias_normais.exists():
-            # Buscar categoria que contenha o peso (limite_min <= peso <= limite_max)
-            categoria_que_contem = categorias_normais.filter(limite_max__gte=peso_oficial).order_by('limite_min').first()
-            if categoria_que_contem:
-                atleta.motivo_ajuste = f"Peso {peso_oficial}kg abaixo do limite mínimo da categoria atual ({categoria_atual.limite_min}kg). Categoria correta: {categoria_que_contem.categoria_nome}"
-                return categoria_que_contem, "Pode rebaixar para categoria inferior"
-            
-            # Se não encontrou categoria que contenha, buscar a categoria com limite_max mais próximo e menor que o peso
-            categoria_inferior = categorias_normais.filter(limite_max__lt=peso_oficial).order_by('-limite_max').first()
-            if categoria_inferior:
-                atleta.motivo_ajuste = f"Peso {peso_oficial}kg abaixo do limite mínimo ({categoria_atual.limite_min}kg) - Pode rebaixar"
-                return categoria_inferior, "Pode rebaixar para categoria inferior"
-        
-        # Verificar categoria "acima de" (Super Pesado)
-        categoria_acima = categoria_correta.filter(limite_max__gte=999.0).order_by('-limite_min').first()
-        if categoria_acima and categoria_acima.limite_min <= peso_oficial:
-            atleta.motivo_ajuste = f"Peso {peso_oficial}kg abaixo do limite mínimo ({categoria_atual.limite_min}kg). Categoria correta: {categoria_acima.categoria_nome}"
-            return categoria_acima, "Pode rebaixar para categoria inferior"
-        
-        # Não encontrou categoria apropriada
-        atleta.status = "Eliminado Peso"
-        atleta.motivo_ajuste = f"Peso {peso_oficial}kg abaixo da primeira categoria disponível"
-        return None, "Eliminado - Peso abaixo da primeira categoria"
+        if categoria_que_contem:
+            atleta.motivo_ajuste = f"Peso {peso_oficial}kg abaixo do limite mínimo da categoria atual ({categoria_atual.limite_min}kg). Categoria correta: {categoria_que_contem.categoria_nome}"
+            return categoria_que_contem, "Pode rebaixar para categoria inferior"
+        
+        # Se não encontrou categoria que contenha, buscar a categoria com limite_max mais próximo e menor que o peso
+        categoria_inferior = max(
+            (c for c in categorias_normais if _max(c) < peso_oficial),
+            key=_max, default=None,
+        )
+        if categoria_inferior:
+            atleta.motivo_ajuste = f"Peso {peso_oficial}kg abaixo do limite mínimo ({categoria_atual.limite_min}kg) - Pode rebaixar"
+            return categoria_inferior, "Pode rebaixar para categoria inferior"
+    
+    # Verificar categoria "acima de" (Super Pesado)
+    categoria_acima = max(
+        (c for c in categoria_correta if _max(c) >= 999.0),
+        key=lambda c: c.limite_min, default=None,
+    )
+    if categoria_acima and categoria_acima.limite_min <= peso_oficial:
+        atleta.motivo_ajuste = f"Peso {peso_oficial}kg abaixo do limite mínimo ({categoria_atual.limite_min}kg). Categoria correta: {categoria_acima.categoria_nome}"
+        return categoria_acima, "Pode rebaixar para categoria inferior"
     
-    return categoria_atual, "OK"
+    # Não encontrou categoria apropriada
+    atleta.status = "Eliminado Peso"
+    atleta.motivo_ajuste = f"Peso {peso_oficial}kg abaixo da primeira categoria disponível"
+    return None, "Eliminado - Peso abaixo da primeira categoria"
 
 
+@medir('chave.gerar')
 def gerar_chave(categoria_nome, classe, sexo, modelo_chave=None, campeonato=None):
     """Gera a chave para uma categoria usando inscrições do campeonato
     
@@ -613,49 +629,45 @@ def gerar_chave(categoria_nome, classe, sexo, modelo_chave=None, campeonato=None
     
     Returns:
         Chave criada ou atualizada
-    """
-    import logging
-    logger = logging.getLogger(__name__)
     
+    Etapas medidas em services.instrumentacao (chave.buscar_inscricoes,
+    chave.persistir_lutas, chave.pontuacao); a auditoria detalhada só é
+    montada com o logger 'atletas.utils' em DEBUG.
+    """
     from .models import Inscricao
     
-    print(f"\n{'='*80}")
-    print(f" AUDITORIA: Iniciando geração de chave")
-    print(f"{'='*80}")
-    print(f" Parâmetros recebidos:")
-    print(f"   - Categoria: {categoria_nome}")
-    print(f"   - Classe: {classe}")
-    print(f"   - Sexo: {sexo}")
-    print(f"   - Modelo: {modelo_chave}")
-    print(f"   - Campeonato: {campeonato}")
+    auditoria = logger.isEnabledFor(logging.DEBUG)
+    logger.debug(
+        f"AUDITORIA: Iniciando geração de chave - categoria={categoria_nome} classe={classe} "
+        f"sexo={sexo} modelo={modelo_chave} campeonato={campeonato}"
+    )
     
     if not campeonato:
-        print(f" ERRO: Campeonato não fornecido")
         raise ValueError("Campeonato é obrigatório para gerar chaves")
     
-    print(f"\n Buscando inscrições...")
-    from django.db.models import Q
-
-    fields = {f.name for f in Inscricao._meta.get_fields()}
-    has_classe_real = 'classe_real' in fields
-    has_categoria_real = 'categoria_real' in fields
-    has_peso_real = 'peso_real' in fields
-    has_status_atual = 'status_atual' in fields
+    with medir('chave.buscar_inscricoes'):
+        from django.db.models import Q
 
-    base_qs = Inscricao.objects.filter(
-        campeonato=campeonato,
-        atleta__sexo=sexo
-    )
+        fields = {f.name for f in Inscricao._meta.get_fields()}
+        has_classe_real = 'classe_real' in fields
+        has_categoria_real = 'categoria_real' in fields
+        has_peso_real = 'peso_real' in fields
+        has_status_atual = 'status_atual' in fields
 
-    if has_classe_real:
-        base_qs = base_qs.filter(classe_real__nome=classe).exclude(
-            classe_real__nome__iexact='Festival'
-        )
-    else:
-        base_qs = base_qs.filter(classe_escolhida=classe).exclude(
-            classe_escolhida__iexact='Festival'
+        base_qs = Inscricao.objects.filter(
+            campeonato=campeonato,
+            atleta__sexo=sexo
         )
 
+        if has_classe_real:
+            base_qs = base_qs.filter(classe_real__nome=classe).exclude(
+                classe_real__nome__iexact='Festival'
+            )
+        else:
+            base_qs = base_qs.filter(classe_escolhida=classe).exclude(
+                classe_escolhida__iexact='Festival'
+            )
+
         categoria_filter = Q()
         if has_categoria_real:
             categoria_filter |= Q(categoria_real__categoria_nome=categoria_nome)
@@ -674,65 +686,50 @@ def gerar_chave(categoria_nome, classe, sexo, modelo_chave=None, campeonato=None
             select_related.append('categoria_real')
         base_qs = base_qs.select_related(*select_related)
 
-        total_inscritos = base_qs.count()
-    bloqueados = base_qs.filter(bloqueado_chave=True).count()
-    sem_categoria = (
-        base_qs.filter(categoria_real__isnull=True).count()
-        if has_categoria_real
-        else base_qs.filter(Q(categoria_escolhida__isnull=True) | Q(categoria_escolhida='')).count()
-    )
-    if has_peso_real:
-        sem_peso = base_qs.filter(Q(peso_real__isnull=True) | Q(peso_real=0)).count()
-    else:
-        sem_peso = base_qs.filter(Q(peso__isnull=True) | Q(peso=0)).count()
+        status_filter = Q(status_inscricao__in=['aprovado', 'confirmado', 'ok', 'remanejado'])
+        if has_status_atual:
+            status_filter |= Q(status_atual__in=['pendente', 'inscrito', 'aprovado', 'remanejado'])
 
-    status_filter = Q(status_inscricao__in=['aprovado', 'confirmado', 'ok', 'remanejado'])
-    if has_status_atual:
-        status_filter |= Q(status_atual__in=['pendente', 'inscrito', 'aprovado', 'remanejado'])
+        inscricoes = base_qs.filter(
+            status_filter,
+            bloqueado_chave=False,
+        )
+        if has_categoria_real:
+            inscricoes = inscricoes.filter(categoria_real__isnull=False)
+        if has_peso_real:
+            inscricoes = inscricoes.filter(peso_real__gt=Decimal('0.0'))
+        else:
+            inscricoes = inscricoes.filter(peso__gt=Decimal('0.0'))
+        
+        # Extrair lista de atletas das inscrições
+        atletas_list = [inscricao.atleta for inscricao in inscricoes]
+        num_atletas = len(atletas_list)
 
-    inscricoes = base_qs.filter(
-        status_filter,
-        bloqueado_chave=False,
-    )
-    if has_categoria_real:
-        inscricoes = inscricoes.filter(categoria_real__isnull=False)
-    if has_peso_real:
-        inscricoes = inscricoes.filter(peso_real__gt=Decimal('0.0'))
-    else:
-        inscricoes = inscricoes.filter(peso__gt=Decimal('0.0'))
-    
-    inscricoes_count = inscricoes.count()
-    print(f"    Totais para {classe}/{sexo}/{categoria_nome}:")
-    print(f"      - Inscritos (classe/sexo): {total_inscritos}")
-    print(f"      - Bloqueados: {bloqueados}")
-    print(f"      - Sem categoria_real: {sem_categoria}")
-    print(f"      - Sem peso_real: {sem_peso}")
-    print(f"      - Aptos (status_inscricao aprovado/remanejado, desbloqueados, peso_real>0, categoria_real ok): {inscricoes_count}")
-    
-    if inscricoes_count == 0:
-        print(f"   ️  Nenhuma inscrição encontrada com os critérios:")
-        print(f"      - Campeonato: {campeonato.id} ({campeonato.nome})")
-        print(f"      - Classe: {classe}")
-        print(f"      - Sexo: {sexo}")
-        print(f"      - Categoria: {categoria_nome}")
-        print(f"      - Status: aprovado")
-        print(f"      - Peso: não nulo e != 0")
-    
-    # Extrair lista de atletas das inscrições
-    atletas_list = [inscricao.atleta for inscricao in inscricoes]
-    num_atletas = len(atletas_list)
-    print(f"    {num_atletas} atletas extraídos")
+        if auditoria:
+            # Totais de auditoria: consultas extras feitas apenas com DEBUG ativo
+            sem_categoria = (
+                base_qs.filter(categoria_real__isnull=True).count()
+                if has_categoria_real
+                else base_qs.filter(Q(categoria_escolhida__isnull=True) | Q(categoria_escolhida='')).count()
+            )
+            if has_peso_real:
+                sem_peso = base_qs.filter(Q(peso_real__isnull=True) | Q(peso_real=0)).count()
+            else:
+                sem_peso = base_qs.filter(Q(peso__isnull=True) | Q(peso=0)).count()
+            logger.debug(
+                f"Totais para {classe}/{sexo}/{categoria_nome}: inscritos={base_qs.count()} "
+                f"bloqueados={base_qs.filter(bloqueado_chave=True).count()} sem_categoria_real={sem_categoria} "
+                f"sem_peso_real={sem_peso} aptos={num_atletas}"
+            )
+            for idx, atleta in enumerate(atletas_list, 1):
+                logger.debug(f"  {idx}. {atleta.nome} (ID: {atleta.id}, Academia: {atleta.academia.nome})")
     
-    if num_atletas > 0:
-        print(f"    Atletas:")
-        for idx, atleta in enumerate(atletas_list, 1):
-            print(f"      {idx}. {atleta.nome} (ID: {atleta.id}, Academia: {atleta.academia.nome})")
-    else:
+    if num_atletas == 0:
         aviso = (
             f"Nenhuma inscrição elegível para gerar chave "
             f"({classe} / {sexo} / {categoria_nome}) no campeonato {campeonato.id}."
         )
-        print(f"   ️  {aviso}")
+        logger.debug(aviso)
         # Não gerar/atualizar chave vazia
         raise ValueError(aviso)
     
@@ -749,75 +746,62 @@ def gerar_chave(categoria_nome, classe, sexo, modelo_chave=None, campeonato=None
             raise ValueError(f"Atletas pertencem a múltiplos grupos de faixas ({grupos_detectados}) para {classe}/{sexo}/{categoria_nome}.")
         grupo_faixas = grupos_detectados.pop()
 
-    # Criar ou atualizar chave vinculada ao campeonato
-    print(f"\n Criando/atualizando chave no banco...")
-    defaults = {'estrutura': {}, 'grupo_faixas': grupo_faixas}
-    chave, created = Chave.objects.get_or_create(
-        campeonato=campeonato,
-        classe=classe,
-        sexo=sexo,
-        categoria=categoria_nome,
-        defaults=defaults
-    )
-    
-    print(f"   {' Chave criada' if created else ' Chave existente encontrada'} (ID: {chave.id})")
-    
-    # Garantir que o campeonato está definido (caso a chave já existisse)
-    if not chave.campeonato:
-        chave.campeonato = campeonato
-        chave.save()
-        print(f"    Campeonato vinculado à chave")
-    
-    if chave.grupo_faixas != grupo_faixas:
-        chave.grupo_faixas = grupo_faixas
-        chave.save(update_fields=['grupo_faixas'])
+    with medir('chave.persistir_lutas'):
+        # Criar ou atualizar chave vinculada ao campeonato
+        defaults = {'estrutura': {}, 'grupo_faixas': grupo_faixas}
+        chave, created = Chave.objects.get_or_create(
+            campeonato=campeonato,
+            classe=classe,
+            sexo=sexo,
+            categoria=categoria_nome,
+            defaults=defaults
+        )
+        logger.debug(f"{'Chave criada' if created else 'Chave existente encontrada'} (ID: {chave.id})")
+        # Classificação já pontuada (para estornar ao refazer a chave)
+        classificacao_anterior = (chave.estrutura or {}).get('classificacao', [])
+        
+        # Garantir que o campeonato está definido (caso a chave já existisse)
+        if not chave.campeonato:
+            chave.campeonato = campeonato
+            chave.save()
+        
+        if chave.grupo_faixas != grupo_faixas:
+            chave.grupo_faixas = grupo_faixas
+            chave.save(update_fields=['grupo_faixas'])
 
-    # Limpar lutas antigas e atletas
-    print(f"\n Limpando dados antigos...")
-    lutas_antigas_count = chave.lutas.count()
-    atletas_antigos_count = chave.atletas.count()
-    print(f"   - Lutas antigas: {lutas_antigas_count}")
-    print(f"   - Atletas antigos: {atletas_antigos_count}")
-    
-    chave.lutas.all().delete()
-    chave.atletas.clear()
-    print(f"    Dados antigos removidos")
-    
-    # Vincular novos atletas
-    if atletas_list:
+        # Limpar lutas antigas e atletas
+        chave.lutas.all().delete()
+        chave.atletas.clear()
+        
+        # Vincular novos atletas
         chave.atletas.set(atletas_list)
-        print(f"    {len(atletas_list)} atletas vinculados à chave")
-    else:
-        print(f"   ️  Nenhum atleta para vincular")
-    
-    # Se modelo escolhido manualmente, usar ele
-    if modelo_chave and modelo_chave != 'automatico':
-        print(f"\n Gerando chave com modelo manual: {modelo_chave}")
-        estrutura = gerar_chave_escolhida(chave, atletas_list, modelo_chave)
-    else:
-        # Comportamento automático baseado no número de atletas
-        print(f"\n Gerando chave automática para {num_atletas} atleta(s)")
-        estrutura = gerar_chave_automatica(chave, atletas_list)
-    
-    print(f"    Estrutura gerada: tipo={estrutura.get('tipo')}, atletas={estrutura.get('atletas', 0)}")
-    
-    # Verificar se lutas foram criadas
-    lutas_criadas_count = chave.lutas.count()
-    print(f"    Lutas criadas no banco: {lutas_criadas_count}")
-    
-    if lutas_criadas_count == 0 and num_atletas > 0:
-        print(f"   ️  ATENÇÃO: Nenhuma luta foi criada, mas há {num_atletas} atleta(s)!")
-        print(f"   ️  Tipo de estrutura: {estrutura.get('tipo')}")
-        if 'lutas' in estrutura:
-            print(f"   ️  IDs de lutas na estrutura: {estrutura.get('lutas', [])}")
-    
-    chave.estrutura = estrutura
-    chave.save()
-    print(f"    Chave salva no banco")
+        
+        # Se modelo escolhido manualmente, usar ele
+        if modelo_chave and modelo_chave != 'automatico':
+            logger.debug(f"Gerando chave com modelo manual: {modelo_chave}")
+            estrutura = gerar_chave_escolhida(chave, atletas_list, modelo_chave)
+        else:
+            # Comportamento automático baseado no número de atletas
+            logger.debug(f"Gerando chave automática para {num_atletas} atleta(s)")
+            estrutura = gerar_chave_automatica(chave, atletas_list)
+        
+        if auditoria:
+            lutas_criadas_count = chave.lutas.count()
+            logger.debug(
+                f"Estrutura gerada: tipo={estrutura.get('tipo')}, atletas={estrutura.get('atletas', 0)}, "
+                f"lutas no banco={lutas_criadas_count}"
+            )
+            if lutas_criadas_count == 0:
+                logger.debug(f"ATENÇÃO: Nenhuma luta foi criada, mas há {num_atletas} atleta(s)!")
+        
+        chave.estrutura = estrutura
+        chave.save()
+
+    with medir('chave.pontuacao'):
+        from .services.pontuacao import sincronizar_chave
+        sincronizar_chave(chave, classificacao_anterior=classificacao_anterior)
     
-    print(f"\n{'='*80}")
-    print(f" Geração de chave concluída (ID: {chave.id})")
-    print(f"{'='*80}\n")
+    logger.debug(f"Geração de chave concluída (ID: {chave.id})")
     
     return chave
 
@@ -904,10 +888,10 @@ def alternar_lado_kimono(round_num, luta_num):
 
 def gerar_melhor_de_3(chave, atletas_list):
     """Gera chave tipo Melhor de 3 com alternância de lados"""
-    print(f"    gerar_melhor_de_3: {len(atletas_list)} atleta(s)")
+    logger.debug(f"gerar_melhor_de_3: {len(atletas_list)} atleta(s)")
     
     if len(atletas_list) < 2:
-        print(f"    ERRO: Melhor de 3 requer pelo menos 2 atletas")
+        logger.error("Melhor de 3 requer pelo menos 2 atletas")
         return {"tipo": "vazia", "atletas": len(atletas_list)}
     
     estrutura = {
@@ -918,7 +902,7 @@ def gerar_melhor_de_3(chave, atletas_list):
     }
     
     # Criar 3 lutas com alternância de lados
-    print(f"    Criando 3 lutas entre {atletas_list[0].nome} e {atletas_list[1].nome}")
+    logger.debug(f"Criando 3 lutas entre {atletas_list[0].nome} e {atletas_list[1].nome}")
     for i in range(3):
         try:
             # Alternar lados: 1ª luta = A branco, 2ª = A azul, 3ª = A branco
@@ -934,20 +918,18 @@ def gerar_melhor_de_3(chave, atletas_list):
                 lado_atleta_b=lado_b
             )
             estrutura["lutas"].append(luta.id)
-            print(f"       Luta {i+1} criada (ID: {luta.id}) - A: {lado_a}, B: {lado_b}")
+            logger.debug(f"Luta {i+1} criada (ID: {luta.id}) - A: {lado_a}, B: {lado_b}")
         except Exception as e:
-            print(f"       ERRO ao criar luta {i+1}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"ERRO ao criar luta {i+1}: {str(e)}")
     
-    print(f"    Melhor de 3 gerado: {len(estrutura['lutas'])} lutas criadas")
+    logger.debug(f"Melhor de 3 gerado: {len(estrutura['lutas'])} lutas criadas")
     return estrutura
 
 
 def gerar_round_robin(chave, atletas_list):
     """Gera chave tipo Round Robin (todos contra todos - Rodízio)"""
     num_atletas = len(atletas_list)
-    print(f"    gerar_round_robin: {num_atletas} atleta(s)")
+    logger.debug(f"gerar_round_robin: {num_atletas} atleta(s)")
     
     estrutura = {
         "tipo": "round_robin",
@@ -959,7 +941,7 @@ def gerar_round_robin(chave, atletas_list):
     # Gerar todas as combinações possíveis (todos contra todos)
     lutas_ids = []
     total_combinacoes = (num_atletas * (num_atletas - 1)) // 2
-    print(f"    Criando {total_combinacoes} combinações de lutas")
+    logger.debug(f"Criando {total_combinacoes} combinações de lutas")
     
     luta_num = 0
     for i in range(num_atletas):
@@ -978,20 +960,19 @@ def gerar_round_robin(chave, atletas_list):
                     lado_atleta_b=lado_b
                 )
                 lutas_ids.append(luta.id)
-                print(f"       Luta criada: {atletas_list[i].nome} vs {atletas_list[j].nome} (ID: {luta.id}) - A: {lado_a}, B: {lado_b}")
+                logger.debug(f"Luta criada: {atletas_list[i].nome} vs {atletas_list[j].nome} (ID: {luta.id}) - A: {lado_a}, B: {lado_b}")
                 luta_num += 1
             except Exception as e:
-                print(f"       ERRO ao criar luta {atletas_list[i].nome} vs {atletas_list[j].nome}: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception(f"ERRO ao criar luta {atletas_list[i].nome} vs {atletas_list[j].nome}: {str(e)}")
     
     estrutura["lutas"] = lutas_ids
     estrutura["rounds"][1] = lutas_ids
     
-    print(f"    Round Robin gerado: {len(lutas_ids)} lutas criadas")
+    logger.debug(f"Round Robin gerado: {len(lutas_ids)} lutas criadas")
     return estrutura
 
 
+@medir('chave.eliminatoria_repescagem')
 def gerar_eliminatoria_repescagem(chave, atletas_list, tamanho_chave=8):
     """Gera chave eliminatória com repescagem (modelo CBJ correto)
     
@@ -1009,15 +990,15 @@ def gerar_eliminatoria_repescagem(chave, atletas_list, tamanho_chave=8):
     Atletas da mesma academia não se enfrentam na primeira rodada.
     """
     num_atletas = len(atletas_list)
-    print(f"    gerar_eliminatoria_repescagem: {num_atletas} atleta(s), tamanho_chave={tamanho_chave}")
+    logger.debug(f"gerar_eliminatoria_repescagem: {num_atletas} atleta(s), tamanho_chave={tamanho_chave}")
     
     # Organizar atletas para evitar mesma academia na 1ª rodada
     atletas_organizados = agrupar_atletas_por_academia(atletas_list)
-    print(f"    Atletas organizados: {len(atletas_organizados)}")
+    logger.debug(f"Atletas organizados: {len(atletas_organizados)}")
     
     # Preencher com BYEs se necessário
     atletas_com_bye = atletas_organizados + [None] * (tamanho_chave - num_atletas)
-    print(f"    Atletas com BYEs: {len(atletas_com_bye)} (BYEs: {tamanho_chave - num_atletas})")
+    logger.debug(f"Atletas com BYEs: {len(atletas_com_bye)} (BYEs: {tamanho_chave - num_atletas})")
     
     estrutura = {
         "tipo": "eliminatoria_repescagem",
@@ -1034,7 +1015,7 @@ def gerar_eliminatoria_repescagem(chave, atletas_list, tamanho_chave=8):
     round_num = 1
     lutas_round1 = []
     num_lutas_round1 = tamanho_chave // 2
-    print(f"    Criando {num_lutas_round1} lutas do Round {round_num} (inicial)")
+    logger.debug(f"Criando {num_lutas_round1} lutas do Round {round_num} (inicial)")
     
     for i in range(0, tamanho_chave, 2):
         atleta_a = atletas_com_bye[i] if i < len(atletas_organizados) else None
@@ -1058,14 +1039,12 @@ def gerar_eliminatoria_repescagem(chave, atletas_list, tamanho_chave=8):
             lutas_round1.append(luta.id)
             nome_a = atleta_a.nome if atleta_a else "BYE"
             nome_b = atleta_b.nome if atleta_b else "BYE"
-            print(f"       Luta Round {round_num} criada: {nome_a} vs {nome_b} (ID: {luta.id}) - A: {lado_a}, B: {lado_b}")
+            logger.debug(f"Luta Round {round_num} criada: {nome_a} vs {nome_b} (ID: {luta.id}) - A: {lado_a}, B: {lado_b}")
         except Exception as e:
-            print(f"       ERRO ao criar luta Round {round_num}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"ERRO ao criar luta Round {round_num}: {str(e)}")
     
     estrutura["rounds"][round_num] = lutas_round1
-    print(f"    Round {round_num} criado: {len(lutas_round1)} lutas")
+    logger.debug(f"Round {round_num} criado: {len(lutas_round1)} lutas")
     
     # ========== CHAVE PRINCIPAL: VENCEDORES SEGUEM ==========
     lutas_anteriores = lutas_round1
@@ -1074,7 +1053,7 @@ def gerar_eliminatoria_repescagem(chave, atletas_list, tamanho_chave=8):
     while len(lutas_anteriores) > 1:
         num_lutas = len(lutas_anteriores) // 2
         lutas_novo_round = []
-        print(f"    Criando Round {round_num_principal} (Principal): {num_lutas} lutas")
+        logger.debug(f"Criando Round {round_num_principal} (Principal): {num_lutas} lutas")
         
         for i in range(num_lutas):
             try:
@@ -1086,25 +1065,12 @@ def gerar_eliminatoria_repescagem(chave, atletas_list, tamanho_chave=8):
                     proxima_luta=None
                 )
                 lutas_novo_round.append(luta.id)
-                print(f"       Luta Round {round_num_principal} criada (ID: {luta.id})")
+                logger.debug(f"Luta Round {round_num_principal} criada (ID: {luta.id})")
             except Exception as e:
-                print(f"       ERRO ao criar luta Round {round_num_principal}: {str(e)}")
-                import traceback
-                traceback.print_exc()
-        
-        # Vincular lutas da chave principal
-        for idx, luta_ant_id in enumerate(lutas_anteriores):
-            try:
-                luta_ant = Luta.objects.get(id=luta_ant_id)
-                proxima_luta_idx = idx // 2
-                if proxima_luta_idx < len(lutas_novo_round):
-                    luta_ant.proxima_luta = lutas_novo_round[proxima_luta_idx]
-                    luta_ant.save()
-            except Luta.DoesNotExist:
-                print(f"      ️  Luta anterior {luta_ant_id} não encontrada para vincular")
+                logger.exception(f"ERRO ao criar luta Round {round_num_principal}: {str(e)}")
         
         estrutura["rounds"][round_num_principal] = lutas_novo_round
-        print(f"    Round {round_num_principal} (Principal) criado: {len(lutas_novo_round)} lutas")
+        logger.debug(f"Round {round_num_principal} (Principal) criado: {len(lutas_novo_round)} lutas")
         lutas_anteriores = lutas_novo_round
         round_num_principal += 1
     
@@ -1124,7 +1090,7 @@ def gerar_eliminatoria_repescagem(chave, atletas_list, tamanho_chave=8):
     num_lutas_repescagem = num_lutas_round1 // 2  # Metade dos perdedores vão para próxima rodada
     
     if num_lutas_repescagem > 0:
-        print(f"    Criando estrutura de repescagem (Round {repescagem_round})")
+        logger.debug(f"Criando estrutura de repescagem (Round {repescagem_round})")
         lutas_repescagem_round1 = []
         
         for i in range(num_lutas_repescagem):
@@ -1137,11 +1103,9 @@ def gerar_eliminatoria_repescagem(chave, atletas_list, tamanho_chave=8):
                     proxima_luta=None
                 )
                 lutas_repescagem_round1.append(luta.id)
-                print(f"       Luta Repescagem Round {repescagem_round} criada (ID: {luta.id})")
+                logger.debug(f"Luta Repescagem Round {repescagem_round} criada (ID: {luta.id})")
             except Exception as e:
-                print(f"       ERRO ao criar luta de repescagem: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception(f"ERRO ao criar luta de repescagem: {str(e)}")
         
         estrutura["repescagem"]["rounds"][repescagem_round] = lutas_repescagem_round1
         
@@ -1164,18 +1128,7 @@ def gerar_eliminatoria_repescagem(chave, atletas_list, tamanho_chave=8):
                     )
                     lutas_rep_novo_round.append(luta.id)
                 except Exception as e:
-                    print(f"       ERRO ao criar luta de repescagem Round {repescagem_round}: {str(e)}")
-            
-            # Vincular lutas da repescagem
-            for idx, luta_ant_id in enumerate(lutas_rep_anteriores):
-                try:
-                    luta_ant = Luta.objects.get(id=luta_ant_id)
-                    proxima_luta_idx = idx // 2
-                    if proxima_luta_idx < len(lutas_rep_novo_round):
-                        luta_ant.proxima_luta = lutas_rep_novo_round[proxima_luta_idx]
-                        luta_ant.save()
-                except Luta.DoesNotExist:
-                    pass
+                    logger.exception(f"ERRO ao criar luta de repescagem Round {repescagem_round}: {str(e)}")
             
             estrutura["repescagem"]["rounds"][repescagem_round] = lutas_rep_novo_round
             lutas_rep_anteriores = lutas_rep_novo_round
@@ -1183,7 +1136,7 @@ def gerar_eliminatoria_repescagem(chave, atletas_list, tamanho_chave=8):
     
     # ========== LUTA DE 3º LUGAR ==========
     # Vencedor da repescagem vs Perdedor da semifinal da chave principal
-    print(f"    Criando luta de 3º lugar (Round 999)")
+    logger.debug("Criando luta de 3º lugar (Round 999)")
     try:
         luta_3_lugar = Luta.objects.create(
             chave=chave,
@@ -1194,19 +1147,19 @@ def gerar_eliminatoria_repescagem(chave, atletas_list, tamanho_chave=8):
         )
         estrutura["repescagem"]["luta_3_lugar"] = luta_3_lugar.id
         estrutura["rounds"][999] = [luta_3_lugar.id]  # Incluir no rounds para facilitar busca
-        print(f"       Luta de 3º lugar criada (ID: {luta_3_lugar.id})")
+        logger.debug(f"Luta de 3º lugar criada (ID: {luta_3_lugar.id})")
     except Exception as e:
-        print(f"       ERRO ao criar luta de 3º lugar: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"ERRO ao criar luta de 3º lugar: {str(e)}")
     
     total_lutas = sum(len(lutas) for lutas in estrutura["rounds"].values())
     total_lutas_rep = sum(len(lutas) for lutas in estrutura["repescagem"]["rounds"].values())
-    print(f"    Eliminatória com repescagem gerada:")
-    print(f"      - Chave Principal: {total_lutas - 1} lutas (sem contar 3º lugar)")
-    print(f"      - Chave Repescagem: {total_lutas_rep} lutas")
-    print(f"      - Luta 3º lugar: 1 luta")
-    print(f"      - Total: {total_lutas + total_lutas_rep} lutas")
+    logger.debug(
+        f"Eliminatória com repescagem gerada: principal={total_lutas - 1} repescagem={total_lutas_rep} "
+        f"3º lugar=1 total={total_lutas + total_lutas_rep} lutas"
+    )
+    
+    # Vencedor/perdedor de cada luta -> luta e posição de destino
+    gravar_grafo_avanco(chave, estrutura)
     
     return estrutura
 
@@ -1273,20 +1226,12 @@ def gerar_eliminatoria_simples(chave, atletas_list, tamanho_chave=8):
             )
             lutas_novo_round.append(luta.id)
         
-        # Vincular lutas
-        for idx, luta_ant_id in enumerate(lutas_anteriores):
-            try:
-                luta_ant = Luta.objects.get(id=luta_ant_id)
-                proxima_luta_idx = idx // 2
-                if proxima_luta_idx < len(lutas_novo_round):
-                    luta_ant.proxima_luta = lutas_novo_round[proxima_luta_idx]
-                    luta_ant.save()
-            except Luta.DoesNotExist:
-                pass
-        
         estrutura["rounds"][round_num] = lutas_novo_round
         lutas_anteriores = lutas_novo_round
     
+    # Vencedor de cada luta -> luta e posição de destino
+    gravar_grafo_avanco(chave, estrutura)
+    
     return estrutura
 
 
@@ -1589,116 +1534,47 @@ def gerar_chave_olimpica_manual(chave, atletas_list, tamanho_chave):
             )
             lutas_novo_round.append(luta.id)
         
-        # Vincular lutas do round anterior às do novo round
-        for idx, luta_ant_id in enumerate(lutas_anteriores):
-            try:
-                luta_ant = Luta.objects.get(id=luta_ant_id)
-                proxima_luta_idx = idx // 2
-                if proxima_luta_idx < len(lutas_novo_round):
-                    luta_ant.proxima_luta = lutas_novo_round[proxima_luta_idx]
-                    luta_ant.save()
-            except Luta.DoesNotExist:
-                pass
-        
         estrutura["rounds"][round_num] = lutas_novo_round
         lutas_anteriores = lutas_novo_round
     
+    # Vencedor de cada luta -> luta e posição de destino
+    gravar_grafo_avanco(chave, estrutura)
+    
     return estrutura
 
 
 def atualizar_proxima_luta(luta):
     """Atualiza a próxima luta quando uma luta é concluída
-    Também atualiza lutas de repescagem quando aplicável.
+    Também atualiza lutas de repescagem e de 3º lugar quando aplicável.
+    
+    Os destinos vêm do grafo de avanço gravado na geração da chave
+    (services.grafo_chave): no máximo dois UPDATEs, sem ler a estrutura.
     """
-    if not luta.vencedor or not luta.concluida:
+    if not luta.vencedor_id or not luta.concluida:
         return
     
-    # Atualizar próxima luta normal
-    if luta.proxima_luta:
-        try:
-            proxima = Luta.objects.get(id=luta.proxima_luta, chave=luta.chave)
-            
-            # Determinar qual posição preencher (A ou B)
-            if proxima.atleta_a is None:
-                proxima.atleta_a = luta.vencedor
-            elif proxima.atleta_b is None:
-                proxima.atleta_b = luta.vencedor
-            
-            proxima.save()
-        except Luta.DoesNotExist:
-            pass
+    # Identificar perdedor
+    perdedor_id = None
+    if luta.atleta_a_id == luta.vencedor_id:
+        perdedor_id = luta.atleta_b_id
+    elif luta.atleta_b_id == luta.vencedor_id:
+        perdedor_id = luta.atleta_a_id
     
-    # Atualizar repescagem se a chave tiver repescagem (SISTEMA CORRETO)
-    estrutura = luta.chave.estrutura or {}
-    if estrutura.get("tipo") == "eliminatoria_repescagem":
-        repescagem = estrutura.get("repescagem", {})
-        rounds_dict = estrutura.get("rounds", {})
-        rounds_keys = [int(k) for k in rounds_dict.keys() if str(k).isdigit() and int(k) < 100]
-        
-        # Identificar perdedor
-        perdedor = None
-        if luta.atleta_a == luta.vencedor:
-            perdedor = luta.atleta_b
-        elif luta.atleta_b == luta.vencedor:
-            perdedor = luta.atleta_a
-        
-        # ROUND 1: Perdedores vão para repescagem (Round 100)
-        if luta.round == 1 and perdedor:
-            repescagem_rounds = repescagem.get("rounds", {})
-            if 100 in repescagem_rounds:
-                lutas_repescagem_round1 = repescagem_rounds[100]
-                # Encontrar próxima luta vazia na repescagem
-                for luta_rep_id in lutas_repescagem_round1:
-                    try:
-                        luta_rep = Luta.objects.get(id=luta_rep_id, chave=luta.chave)
-                        if luta_rep.atleta_a is None:
-                            luta_rep.atleta_a = perdedor
-                            luta_rep.save()
-                            break
-                        elif luta_rep.atleta_b is None:
-                            luta_rep.atleta_b = perdedor
-                            luta_rep.save()
-                            break
-                    except Luta.DoesNotExist:
-                        continue
-        
-        # SEMIFINAL PRINCIPAL: Perdedor vai para luta de 3º lugar
-        if rounds_keys:
-            ultimo_round_principal = max(rounds_keys)
-            if luta.round == ultimo_round_principal - 1:  # Semifinal da chave principal
-                if perdedor and repescagem.get("luta_3_lugar"):
-                    try:
-                        luta_3_lugar = Luta.objects.get(id=repescagem["luta_3_lugar"], chave=luta.chave)
-                        # Perdedor da semifinal vai para posição B da luta de 3º lugar
-                        if luta_3_lugar.atleta_b is None:
-                            luta_3_lugar.atleta_b = perdedor
-                            luta_3_lugar.save()
-                    except Luta.DoesNotExist:
-                        pass
-        
-        # FINAL DA REPESCAGEM: Vencedor vai para luta de 3º lugar
-        repescagem_rounds = repescagem.get("rounds", {})
-        if repescagem_rounds:
-            rounds_rep_keys = sorted([int(k) for k in repescagem_rounds.keys()])
-            if rounds_rep_keys:
-                ultimo_round_rep = max(rounds_rep_keys)
-                # Verificar se esta é a última luta da repescagem
-                lutas_ultimo_round_rep = repescagem_rounds[ultimo_round_rep]
-                if len(lutas_ultimo_round_rep) == 1 and luta.round == ultimo_round_rep:
-                    # Esta é a final da repescagem, vencedor vai para 3º lugar
-                    if luta.vencedor and repescagem.get("luta_3_lugar"):
-                        try:
-                            luta_3_lugar = Luta.objects.get(id=repescagem["luta_3_lugar"], chave=luta.chave)
-                            # Vencedor da repescagem vai para posição A da luta de 3º lugar
-                            if luta_3_lugar.atleta_a is None:
-                                luta_3_lugar.atleta_a = luta.vencedor
-                                luta_3_lugar.save()
-                        except Luta.DoesNotExist:
-                            pass
+    with transaction.atomic():
+        ocupar_posicao(luta.proxima_luta, luta.posicao_proxima, luta.vencedor_id, luta.chave_id)
+        if luta.luta_perdedor:
+            ocupar_posicao(luta.luta_perdedor, luta.posicao_perdedor, perdedor_id, luta.chave_id)
 
 
 def calcular_pontuacao_academias(campeonato_id=None):
-    """Calcula e atualiza a pontuação de todas as academias para um campeonato"""
+    """Recalcula do zero a pontuação de todas as academias para um campeonato
+
+    Operação completa e pesada. Os painéis leem AcademiaPontuacao já mantida
+    de forma incremental por atletas.services.pontuacao; este recálculo só
+    deve ser disparado explicitamente (comando recalcular_pontuacao).
+    """
+    from .services.pontuacao import recalcular_pontuacao_campeonato
+
     # Obter ou criar campeonato padrão/ativo
     if campeonato_id:
         campeonato = Campeonato.objects.filter(id=campeonato_id).first()
@@ -1706,155 +1582,24 @@ def calcular_pontuacao_academias(campeonato_id=None):
         campeonato = Campeonato.objects.filter(ativo=True).first()
     if not campeonato:
         campeonato = Campeonato.objects.create(nome="Campeonato Padrão", ativo=True)
-    
-    # Limpar pontuações anteriores deste campeonato
-    AcademiaPontuacao.objects.filter(campeonato=campeonato).delete()
-    
-    # Mapa de pontuações por academia
-    pontos_academias = {}
-    
-    def get_registro(academia):
-        if academia.id not in pontos_academias:
-            pontos_academias[academia.id] = {
-                'academia': academia,
-                'ouro': 0,
-                'prata': 0,
-                'bronze': 0,
-                'quarto': 0,
-                'quinto': 0,
-                'festival': 0,
-                'remanejamento': 0,
-            }
-        return pontos_academias[academia.id]
-    
-    # 1. Pontos de Festival (através de inscrições)
-    inscricoes_festival = Inscricao.objects.filter(
-        campeonato=campeonato,
-        classe_escolhida='Festival',
-        status_inscricao='aprovado'
-    ).select_related('atleta', 'atleta__academia')
-    
-    for inscricao in inscricoes_festival:
-        reg = get_registro(inscricao.atleta.academia)
-        reg['festival'] += 1
-    
-    # 2. Pontos por colocações nas chaves
-    # Filtrar chaves do campeonato (se o modelo tiver campo campeonato)
-    if hasattr(Chave, 'campeonato'):
-        chaves = Chave.objects.filter(campeonato=campeonato)
-    else:
-        # Se não tiver campo campeonato, buscar todas (compatibilidade)
-        chaves = Chave.objects.all()
-    for chave in chaves:
-        # Sempre usar get_resultados_chave:
-        # - Conta resultados reais de lutas já decididas
-        # - Inclui WOs e casos de campeão automático
-        resultados = get_resultados_chave(chave)
-        if not resultados:
-            continue
-        
-        # Salvar classificação no JSON da chave
-        classificacao = []
-        for idx, atleta_id in enumerate(resultados, 1):
-            if not atleta_id:
-                continue
-            classificacao.append({
-                "atleta_id": atleta_id,
-                "colocacao": idx,
-            })
-        estrutura = chave.estrutura or {}
-        estrutura["classificacao"] = classificacao
-        chave.estrutura = estrutura
-        chave.save()
-        
-        # Aplicar contagem por colocação
-        for idx, atleta_id in enumerate(resultados, 1):
-            if not atleta_id:
-                continue
-            try:
-                atleta = Atleta.objects.get(id=atleta_id)
-            except Atleta.DoesNotExist:
-                continue
-
-            reg = get_registro(atleta.academia)
-
-            # Pontuação por colocação:
-            # 1º = ouro, 2º = prata, 3º = bronze, 4º = quarto, 5º = quinto
-            if idx == 1:
-                reg['ouro'] += 1
-            elif idx == 2:
-                reg['prata'] += 1
-            elif idx == 3:
-                reg['bronze'] += 1
-            elif idx == 4:
-                reg['quarto'] += 1
-            elif idx == 5:
-                reg['quinto'] += 1
-    
-    # 3. Remanejamentos (-1 ponto por atleta remanejado)
-    inscricoes_remanejadas = Inscricao.objects.filter(
-        campeonato=campeonato,
-        remanejado=True,
-        status_inscricao='aprovado'
-    ).select_related('atleta', 'atleta__academia')
-    
-    for inscricao in inscricoes_remanejadas:
-        reg = get_registro(inscricao.atleta.academia)
-        reg['remanejamento'] += 1
-    
-    # 4. Calcular pontos totais e salvar registros
-    Academia.objects.all().update(pontos=0)
-    for data in pontos_academias.values():
-        academia = data['academia']
-        ouro = data['ouro']
-        prata = data['prata']
-        bronze = data['bronze']
-        quarto = data['quarto']
-        quinto = data['quinto']
-        festival = data['festival']
-        remanejamento = data['remanejamento']
-        
-        # Regras informadas:
-        # Ouro = 10, Prata = 7, Bronze = 5, 4º = 3, 5º = 1, Festival = 1
-        pontos_totais = (
-            ouro * 10 +
-            prata * 7 +
-            bronze * 5 +
-            quarto * 3 +
-            quinto * 1 +
-            festival * 1 +
-            remanejamento * (-1)
-        )
-        
-        AcademiaPontuacao.objects.create(
-            campeonato=campeonato,
-            academia=academia,
-            ouro=ouro,
-            prata=prata,
-            bronze=bronze,
-            quarto=quarto,
-            quinto=quinto,
-            festival=festival,
-            remanejamento=remanejamento,
-            pontos_totais=pontos_totais,
-        )
-        
-        academia.pontos = pontos_totais
-        academia.save()
+
+    recalcular_pontuacao_campeonato(campeonato)
 
 
 def registrar_remanejamento(inscricao_id):
     """Registra remanejamento de um atleta (inscrição) e aplica -1 ponto automaticamente"""
+    from .services.pontuacao import sincronizar_inscricao
+
     try:
-        atleta = Atleta.objects.get(id=inscricao_id)
-    except Atleta.DoesNotExist:
+        inscricao = Inscricao.objects.select_related('atleta', 'campeonato').get(id=inscricao_id)
+    except Inscricao.DoesNotExist:
         return
     
-    atleta.remanejado = True
-    atleta.save()
+    inscricao.remanejado = True
+    inscricao.save(update_fields=['remanejado'])
     
-    # Reprocessar pontuações
-    calcular_pontuacao_academias()
+    # Aplicar apenas o delta da academia
+    sincronizar_inscricao(inscricao)
 
 
 def get_resultados_chave(chave):
@@ -2051,56 +1796,17 @@ def get_resultados_chave(chave):
     
     # Round Robin (todos contra todos)
     if estrutura.get("tipo") == "round_robin":
-        lutas = Luta.objects.filter(chave=chave, round=1).order_by('id')
+        lutas = list(Luta.objects.filter(chave=chave, round=1).order_by('id'))
         if len(lutas) == 0:
             return []
         
         # Verificar se todas as lutas foram concluídas
-        todas_concluidas = all(luta.concluida and luta.vencedor for luta in lutas)
+        todas_concluidas = all(luta.concluida and luta.vencedor_id for luta in lutas)
         if not todas_concluidas:
             return []
         
-        # Coletar todos os atletas
-        atletas_ids = set()
-        for luta in lutas:
-            if luta.atleta_a:
-                atletas_ids.add(luta.atleta_a.id)
-            if luta.atleta_b:
-                atletas_ids.add(luta.atleta_b.id)
-        
-        # Contar vitórias
-        vitorias = {}
-        pontos_por_atleta = {}
-        ippons_por_atleta = {}
-        wazaris_por_atleta = {}
-        yukos_por_atleta = {}
-        
-        for atleta_id in atletas_ids:
-            vitorias[atleta_id] = 0
-            pontos_por_atleta[atleta_id] = 0
-            ippons_por_atleta[atleta_id] = 0
-            wazaris_por_atleta[atleta_id] = 0
-            yukos_por_atleta[atleta_id] = 0
-        
-        for luta in lutas:
-            if luta.vencedor and luta.tipo_vitoria != "YUKO":
-                vencedor_id = luta.vencedor.id
-                vitorias[vencedor_id] = vitorias.get(vencedor_id, 0) + 1
-                pontos_por_atleta[vencedor_id] += luta.pontos_vencedor or 0
-                ippons_por_atleta[vencedor_id] += luta.ippon_count or 0
-                wazaris_por_atleta[vencedor_id] += luta.wazari_count or 0
-                yukos_por_atleta[vencedor_id] += luta.yuko_count or 0
-        
-        # Ordenar por: 1) Vitórias, 2) Pontos, 3) Ippons, 4) Wazaris, 5) Yukos
-        resultados = sorted(atletas_ids, key=lambda x: (
-            vitorias.get(x, 0),
-            pontos_por_atleta.get(x, 0),
-            ippons_por_atleta.get(x, 0),
-            wazaris_por_atleta.get(x, 0),
-            yukos_por_atleta.get(x, 0)
-        ), reverse=True)
-        
-        return resultados[:5]  # Retornar até 5 colocados
+        # Vitórias, pontos, confronto direto (empates de N atletas), ippons, wazaris, yukos
+        return classificacao_round_robin(lutas)[:5]  # Retornar até 5 colocados
     
     # Eliminatória com Repescagem (CBJ)
     if estrutura.get("tipo") == "eliminatoria_repescagem":
@@ -1,16 +1,59 @@
 """
 Utilitário para registrar histórico de ações no sistema
+
+A gravação é write-behind: `registrar_historico` monta o registro em memória
+e, quando a transação corrente confirma (`transaction.on_commit`), o coloca
+num buffer limitado deste processo. O buffer é gravado com `bulk_create`:
+
+- ao atingir HISTORICO_LOTE registros;
+- HISTORICO_INTERVALO_FLUSH segundos depois do primeiro registro pendente;
+- no fim de cada requisição, se o intervalo já passou;
+- ao encerrar o processo (atexit, `worker_exit` do gunicorn e fim do
+  `processar_tarefas`), via `descarregar_historico()`.
+
+Se o buffer chegar a HISTORICO_BUFFER_MAX (banco lento), quem registra grava
+o lote na hora em vez de descartar eventos. Com HISTORICO_ESCRITA_SINCRONA
+(testes) cada registro é gravado imediatamente, como antes.
 """
+import atexit
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import connection, transaction
 from django.utils import timezone
+
 from .models import HistoricoSistema
-import json
 
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_pendentes = []
+_primeiro_pendente_em = None
+_timer = None
 
-def registrar_historico(tipo_acao, descricao, usuario=None, campeonato=None, 
+
+def _lote() -> int:
+    return getattr(settings, 'HISTORICO_LOTE', 200)
+
+
+def _buffer_max() -> int:
+    return getattr(settings, 'HISTORICO_BUFFER_MAX', 5000)
+
+
+def _intervalo() -> float:
+    return getattr(settings, 'HISTORICO_INTERVALO_FLUSH', 2.0)
+
+
+def registrar_historico(tipo_acao, descricao, usuario=None, campeonato=None,
                         academia=None, atleta=None, dados_extras=None, request=None):
     """
     Registra uma ação no histórico do sistema
-    
+
     Args:
         tipo_acao: Tipo da ação (ver TIPO_ACAO_CHOICES em HistoricoSistema)
         descricao: Descrição da ação
@@ -29,7 +72,7 @@ def registrar_historico(tipo_acao, descricao, usuario=None, campeonato=None,
             ip_address = x_forwarded_for.split(',')[0].strip()
         else:
             ip_address = request.META.get('REMOTE_ADDR')
-    
+
     # Converter dados_extras para JSON se necessário
     dados_json = None
     if dados_extras:
@@ -37,8 +80,8 @@ def registrar_historico(tipo_acao, descricao, usuario=None, campeonato=None,
             dados_json = json.dumps(dados_extras) if isinstance(dados_extras, dict) else dados_extras
         except:
             dados_json = str(dados_extras)
-    
-    HistoricoSistema.objects.create(
+
+    registro = HistoricoSistema(
         tipo_acao=tipo_acao,
         descricao=descricao,
         usuario=usuario,
@@ -50,5 +93,90 @@ def registrar_historico(tipo_acao, descricao, usuario=None, campeonato=None,
         data_hora=timezone.now()
     )
 
+    if getattr(settings, 'HISTORICO_ESCRITA_SINCRONA', False):
+        registro.save()
+        return
+
+    # Ação desfeita por rollback não entra no histórico
+    transaction.on_commit(lambda: _enfileirar(registro))
+
+
+def _enfileirar(registro):
+    global _primeiro_pendente_em
+    with _lock:
+        _pendentes.append(registro)
+        total = len(_pendentes)
+        if _primeiro_pendente_em is None:
+            _primeiro_pendente_em = time.monotonic()
+            _agendar_timer()
+    if total >= _buffer_max():
+        # Buffer cheio (gravação atrasada): grava na requisição corrente em vez de perder eventos
+        descarregar_historico()
+    elif total == _lote():
+        threading.Thread(target=_descarregar_e_fechar, name='historico-flush', daemon=True).start()
+
+
+def _agendar_timer():
+    """Chamado com _lock: agenda a gravação por tempo do lote que acabou de começar."""
+    global _timer
+    if _timer is not None and _timer.is_alive():
+        return
+    _timer = threading.Timer(_intervalo(), _descarregar_e_fechar)
+    _timer.daemon = True
+    _timer.start()
+
+
+def _descarregar_e_fechar():
+    """Alvo das threads de gravação: cada thread tem conexão própria, fechada ao final."""
+    try:
+        descarregar_historico()
+    finally:
+        connection.close()
+
+
+def descarregar_historico() -> int:
+    """Grava tudo o que está no buffer; retorna quantos registros foram gravados."""
+    global _primeiro_pendente_em, _timer
+    with _flush_lock:
+        with _lock:
+            lote = _pendentes[:]
+            _pendentes.clear()
+            _primeiro_pendente_em = None
+            if _timer is not None:
+                _timer.cancel()
+                _timer = None
+        if not lote:
+            return 0
+        try:
+            with transaction.atomic():
+                HistoricoSistema.objects.bulk_create(lote, batch_size=_lote())
+        except Exception:
+            # Um registro inválido não pode derrubar o lote inteiro
+            logger.exception('Falha ao gravar lote de %s registro(s) de histórico; gravando um a um', len(lote))
+            for registro in lote:
+                try:
+                    registro.pk = None
+                    registro.save(force_insert=True)
+                except Exception:
+                    logger.exception('Registro de histórico descartado: %s', registro.descricao[:100])
+        return len(lote)
+
+
+def pendentes_historico() -> int:
+    """Quantidade de registros aguardando gravação neste processo."""
+    with _lock:
+        return len(_pendentes)
+
+
+def _descarregar_ao_fim_da_requisicao(sender, **kwargs):
+    with _lock:
+        vencido = (
+            _primeiro_pendente_em is not None
+            and time.monotonic() - _primeiro_pendente_em >= _intervalo()
+        )
+    if vencido:
+        descarregar_historico()
 
 
+request_finished.connect(_descarregar_ao_fim_da_requisicao, dispatch_uid='atletas_historico_flush')
+atexit.register(descarregar_historico)
@@ -9,6 +9,40 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def gerar_pdf_bytes(html_content):
+    """
+    Converte HTML em PDF e retorna os bytes (sem HttpResponse).
+    Usado tanto pelas views quanto pelas tarefas em segundo plano.
+    """
+    try:
+        from xhtml2pdf import pisa
+    except ImportError:
+        logger.error('xhtml2pdf não está instalado. Instale com: pip install xhtml2pdf')
+        raise ImportError(
+            'xhtml2pdf não está instalado. '
+            'Instale com: pip install xhtml2pdf'
+        )
+
+    # Criar buffer para o PDF
+    buffer = BytesIO()
+
+    # Converter HTML para PDF
+    pdf = pisa.pisaDocument(
+        BytesIO(html_content.encode('UTF-8')),
+        buffer,
+        encoding='UTF-8'
+    )
+
+    if pdf.err:
+        logger.error(f'Erro ao gerar PDF: {pdf.err}')
+        raise Exception(f'Erro ao gerar PDF: {pdf.err}')
+
+    # Obter conteúdo do buffer
+    pdf_content = buffer.getvalue()
+    buffer.close()
+    return pdf_content
+
+
 def gerar_pdf_de_html(html_content, filename='documento.pdf', content_disposition='attachment'):
     """
     Gera um PDF a partir de conteúdo HTML usando xhtml2pdf
@@ -22,25 +56,7 @@ def gerar_pdf_de_html(html_content, filename='documento.pdf', content_dispositio
         HttpResponse: Resposta HTTP com o PDF gerado
     """
     try:
-        from xhtml2pdf import pisa
-        
-        # Criar buffer para o PDF
-        buffer = BytesIO()
-        
-        # Converter HTML para PDF
-        pdf = pisa.pisaDocument(
-            BytesIO(html_content.encode('UTF-8')),
-            buffer,
-            encoding='UTF-8'
-        )
-        
-        if pdf.err:
-            logger.error(f'Erro ao gerar PDF: {pdf.err}')
-            raise Exception(f'Erro ao gerar PDF: {pdf.err}')
-        
-        # Obter conteúdo do buffer
-        pdf_content = buffer.getvalue()
-        buffer.close()
+        pdf_content = gerar_pdf_bytes(html_content)
         
         # Criar resposta HTTP
         response = HttpResponse(pdf_content, content_type='application/pdf')
@@ -49,11 +65,7 @@ def gerar_pdf_de_html(html_content, filename='documento.pdf', content_dispositio
         return response
         
     except ImportError:
-        logger.error('xhtml2pdf não está instalado. Instale com: pip install xhtml2pdf')
-        raise ImportError(
-            'xhtml2pdf não está instalado. '
-            'Instale com: pip install xhtml2pdf'
-        )
+        raise
     except Exception as e:
         logger.error(f'Erro ao gerar PDF: {str(e)}')
         raise
@@ -83,3 +95,45 @@ def renderizar_template_para_pdf(template_path, context, filename='documento.pdf
         logger.error(f'Erro ao renderizar template para PDF: {str(e)}')
         raise
 
+
+
+def renderizar_template_para_pdf_bytes(template_path, context):
+    """
+    Renderiza um template Django e retorna o PDF em bytes
+    (para gravar em arquivo, ex.: tarefas em segundo plano).
+    """
+    try:
+        html_content = render_to_string(template_path, context)
+        return gerar_pdf_bytes(html_content)
+    except Exception as e:
+        logger.error(f'Erro ao renderizar template para PDF: {str(e)}')
+        raise
+
+
+def montar_paragrafos_regulamento(texto_regulamento):
+    """
+    Divide o texto do regulamento em parágrafos, identificando títulos
+    (linha única curta ou iniciada por numeração, ex.: "1. ", "2) ").
+    """
+    import re
+
+    paragrafos = []
+    # Dividir em parágrafos (linhas vazias indicam novo parágrafo)
+    for bloco in (texto_regulamento or '').split('\n\n'):
+        bloco = bloco.strip()
+        if not bloco:
+            continue
+
+        linhas = bloco.split('\n')
+        is_titulo = False
+        if len(linhas) == 1:
+            linha = linhas[0].strip()
+            # Título se: linha curta (< 80 chars) ou começa com número seguido de ponto/parentese
+            if len(linha) < 80 or re.match(r'^\d+[\.\)]\s', linha):
+                is_titulo = True
+
+        paragrafos.append({
+            'texto': bloco,
+            'is_titulo': is_titulo
+        })
+    return paragrafos
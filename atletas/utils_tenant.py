@@ -61,3 +61,21 @@ def verificar_organizador_objeto(obj, user, campo_organizador='organizador'):
     obj_organizador = getattr(obj, campo_organizador, None)
     return obj_organizador == organizador
 
+
+
+def get_campeonato_ativo(request):
+    """
+    Retorna o campeonato ativo da organização da requisição.
+    Em rotas multi-tenant ele já vem resolvido (e em cache) pelo OrganizacaoMiddleware;
+    fora delas, consulta o banco filtrando pela organização, se houver.
+    """
+    if hasattr(request, 'campeonato_ativo'):
+        return request.campeonato_ativo
+
+    from .models import Campeonato
+
+    organizacao = getattr(request, 'organizacao', None)
+    campeonatos = Campeonato.objects.filter(ativo=True)
+    if organizacao:
+        campeonatos = campeonatos.filter(organizador=organizacao)
+    return campeonatos.first()
@@ -14,7 +14,6 @@ import os
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q, Sum, Count, F
 from django.utils import timezone
-from types import SimpleNamespace
 from django.contrib.auth import login as django_login, logout as django_logout, authenticate
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
@@ -37,7 +36,7 @@ from .academia_auth import (
     pode_criar_usuarios_required,
     organizacao_required,
 )
-from .utils import gerar_chave, get_resultados_chave, calcular_pontuacao_academias, normalizar_nome_classe, classe_exige_grupo, calcular_grupo_faixa
+from .utils import gerar_chave, get_resultados_chave, normalizar_nome_classe, classe_exige_grupo, calcular_grupo_faixa
 
 def _normalize_value(value: str) -> str:
     if not value:
@@ -58,14 +57,19 @@ def _build_categoria_key(classe_name: str, sexo: str, categoria_name: str, grupo
         return None
     return (normalized_classe, sexo_norm, normalized_categoria, normalized_grupo)
 from .utils_historico import registrar_historico
-from .utils_tenant import get_organizador_usuario
+from .utils_tenant import get_organizador_usuario, get_campeonato_ativo
 from .services.pesagem import (
     registrar_peso as service_registrar_peso,
     confirmar_remanejamento as service_confirmar_remanejamento,
-    calcular_categoria_por_peso,
 )
 from .services.inscricoes_service import inscrever_atleta as service_inscrever_atleta, aprovar as service_aprovar, remanejar as service_remanejar, desclassificar as service_desclassificar
 from .services.inscricoes_service import inscrever_atleta as service_inscrever_atleta
+from .services.pontuacao import quadro_medalhas
+from .services.tarefas import enfileirar, tarefa_regulamento_pdf
+from .services.credenciais import provisionar_credenciais, vincular_academias
+from .services.financeiro import obter_financeiro
+from .services.metricas import MetricasEvento
+from .services.pesagem_contexto import inscricoes_pesagem, montar_linhas_pesagem
 from datetime import datetime, timedelta, date
 import json
 
@@ -74,6 +78,7 @@ from .views_conferencia_pagamentos import (
     conferencia_pagamentos_lista,
     conferencia_pagamentos_detalhe,
     conferencia_pagamentos_salvar,
+    conferencia_pagamentos_confirmar_lote,
     gerar_mensagem_whatsapp,
     calcular_valor_esperado_academia,
 )
@@ -83,6 +88,8 @@ from .views_ocorrencias import (
     ocorrencias_detalhe,
     ocorrencias_historico,
 )
+from .views_tarefas import tarefa_status
+from .views_instrumentacao import instrumentacao_dados
 
 # ========== LOGIN E AUTENTICAÇÃO ==========
 
@@ -574,7 +581,7 @@ def index(request, organizacao_slug=None):
     if not request.user.is_authenticated:
         return redirect('login')
     
-    campeonato_ativo = Campeonato.objects.filter(ativo=True, organizador=organizacao).first()
+    campeonato_ativo = get_campeonato_ativo(request)
     
     # Estatísticas básicas
     total_atletas = Atleta.objects.filter(academia__organizador=organizacao).count()
@@ -598,10 +605,7 @@ def index(request, organizacao_slug=None):
     atletas_sem_pesagem = 0
     lutas_pendentes = 0
     if campeonato_ativo:
-        from .utils import calcular_pontuacao_academias, get_resultados_chave
-        
-        # Calcular pontuação das academias primeiro
-        calcular_pontuacao_academias(campeonato_ativo.id)
+        # Pontuação e medalhas são mantidas incrementalmente (services.pontuacao)
         
         academias_permitidas_ids = list(AcademiaCampeonato.objects.filter(
             campeonato=campeonato_ativo,
@@ -729,52 +733,8 @@ def index(request, organizacao_slug=None):
         # Ranking top 5 apenas de academias permitidas (para compatibilidade)
         top_academias = ranking_academias_completo[:5]
         
-        # Calcular ranking global de atletas
-        chaves = Chave.objects.filter(campeonato=campeonato_ativo)
-        medalhas_por_atleta = {}
-        
-        for chave in chaves:
-            resultados = get_resultados_chave(chave)
-            if not resultados:
-                continue
-            
-            # 1º lugar = ouro, 2º lugar = prata, 3º lugar = bronze
-            for idx, atleta_id in enumerate(resultados[:3], 1):
-                if not atleta_id:
-                    continue
-                
-                if atleta_id not in medalhas_por_atleta:
-                    try:
-                        atleta = Atleta.objects.get(id=atleta_id)
-                        medalhas_por_atleta[atleta_id] = {
-                            'atleta': atleta,
-                            'ouro': 0,
-                            'prata': 0,
-                            'bronze': 0,
-                            'total_medalhas': 0,
-                        }
-                    except Atleta.DoesNotExist:
-                        continue
-                
-                if idx == 1:
-                    medalhas_por_atleta[atleta_id]['ouro'] += 1
-                elif idx == 2:
-                    medalhas_por_atleta[atleta_id]['prata'] += 1
-                elif idx == 3:
-                    medalhas_por_atleta[atleta_id]['bronze'] += 1
-                
-                medalhas_por_atleta[atleta_id]['total_medalhas'] = (
-                    medalhas_por_atleta[atleta_id]['ouro'] +
-                    medalhas_por_atleta[atleta_id]['prata'] +
-                    medalhas_por_atleta[atleta_id]['bronze']
-                )
-        
-        # Ordenar por total de medalhas (ouro > prata > bronze)
-        ranking_global_atletas = sorted(
-            medalhas_por_atleta.values(),
-            key=lambda x: (x['total_medalhas'], x['ouro'], x['prata'], x['bronze']),
-            reverse=True
-        )
+        # Ranking global de atletas (quadro de medalhas materializado)
+        ranking_global_atletas = quadro_medalhas(campeonato_ativo)
     else:
         total_inscricoes = 0
         inscricoes_federados = 0
@@ -888,7 +848,7 @@ def cadastrar_academia(request, organizacao_slug=None, *args, **kwargs):
                 academia.save()
             
             # Vincular automaticamente ao campeonato ativo (se houver) e gerar senha
-            campeonato_ativo = Campeonato.objects.filter(ativo=True, organizador=organizacao).first()
+            campeonato_ativo = get_campeonato_ativo(request)
             if campeonato_ativo:
                 # Vincular ao campeonato (verificar se já existe antes)
                 if not AcademiaCampeonato.objects.filter(academia=academia, campeonato=campeonato_ativo).exists():
@@ -1359,7 +1319,7 @@ def get_categorias_por_sexo(request, organizacao_slug=None, *args, **kwargs):
         if not sexo:
             return JsonResponse({'categorias': []})
         
-        campeonato_ativo = Campeonato.objects.filter(ativo=True, organizador=organizacao).first() if organizacao else Campeonato.objects.filter(ativo=True).first()
+        campeonato_ativo = get_campeonato_ativo(request)
         if not campeonato_ativo:
             return JsonResponse({'categorias': []})
         
@@ -1493,149 +1453,13 @@ def _montar_contexto_pesagem(request):
             'categoria_filtro': '',
         }
     
-    # Filtrar academias permitidas e confirmadas dentro do campeonato
-    academias_permitidas_ids = list(AcademiaCampeonato.objects.filter(
-        campeonato=campeonato_selecionado,
-        permitido=True
-    ).values_list('academia_id', flat=True))
-    
-    academias_confirmadas_ids = list(ConferenciaPagamento.objects.filter(
-        campeonato=campeonato_selecionado,
-        status='CONFIRMADO'
-    ).values_list('academia_id', flat=True))
-
-    fields = {f.name for f in Inscricao._meta.get_fields()}
-    has_classe_real = 'classe_real' in fields
-    has_categoria_real = 'categoria_real' in fields
-    has_status_atual = 'status_atual' in fields
-
-    status_filter = Q(status_inscricao__in=['aprovado', 'confirmado', 'ok', 'remanejado'])
-    if has_status_atual:
-        status_filter |= Q(status_atual__in=['pendente', 'inscrito', 'aprovado', 'remanejado', 'desclassificado'])
-
-    select_related = ['atleta', 'atleta__academia']
-    if has_classe_real:
-        select_related.append('classe_real')
-    if has_categoria_real:
-        select_related.append('categoria_real')
-
-    inscricoes = Inscricao.objects.filter(
-        campeonato=campeonato_selecionado,
-    ).filter(status_filter).select_related(*select_related)
-    
-    # Mostrar apenas academias permitidas no campeonato
-    if academias_permitidas_ids:
-        inscricoes = inscricoes.filter(atleta__academia_id__in=academias_permitidas_ids)
-    
-    # Se houver conferência confirmada, prioriza filtragem; caso contrário não esvazia a lista
-    if academias_confirmadas_ids:
-        inscricoes = inscricoes.filter(atleta__academia_id__in=academias_confirmadas_ids)
-    
     # Filtros
     classe_filtro = request.GET.get('classe', '').strip()
     sexo_filtro = request.GET.get('sexo', '').strip()
     categoria_filtro = request.GET.get('categoria', '').strip()
     
-    if classe_filtro:
-        if has_classe_real:
-            inscricoes = inscricoes.filter(classe_real__nome=classe_filtro)
-        else:
-            inscricoes = inscricoes.filter(classe_escolhida=classe_filtro)
-    if sexo_filtro:
-        inscricoes = inscricoes.filter(atleta__sexo=sexo_filtro)
-    if categoria_filtro:
-        if has_categoria_real:
-            inscricoes = inscricoes.filter(categoria_real__categoria_nome=categoria_filtro)
-        else:
-            inscricoes = inscricoes.filter(categoria_escolhida=categoria_filtro)
-    
-    inscricoes = inscricoes.order_by('atleta__nome')
-
-    atletas = []
-    status_label_map = {
-        'aprovado': 'OK',
-        'remanejado': 'Remanejado',
-        'desclassificado': 'Desclassificado',
-        'pendente': 'Pendente',
-        'inscrito': 'Inscrito',
-    }
-    for inscricao in inscricoes:
-        atleta = inscricao.atleta
-        categoria_nome_raw = (inscricao.categoria_real.categoria_nome if inscricao.categoria_real else '') or ''
-        ano_evento = inscricao.campeonato.data_competicao.year if inscricao.campeonato and inscricao.campeonato.data_competicao else None
-        classe_atleta = inscricao.classe_real.nome if inscricao.classe_real else atleta.get_classe_atual(ano_evento=ano_evento)
-        
-        categoria_encontrada = inscricao.categoria_real
-        if not categoria_encontrada and categoria_nome_raw and classe_atleta:
-            categoria_encontrada = Categoria.objects.filter(
-                categoria_nome=categoria_nome_raw,
-                classe__nome=classe_atleta,
-                sexo=atleta.sexo
-            ).first()
-        if not categoria_encontrada and classe_atleta:
-            peso_base = inscricao.peso_real
-            if peso_base is not None:
-                try:
-                    from decimal import Decimal
-                    categoria_encontrada = calcular_categoria_por_peso(classe_atleta, atleta.sexo, Decimal(peso_base))
-                except Exception:
-                    categoria_encontrada = None
-                
-        limite_min = float(categoria_encontrada.limite_min) if categoria_encontrada else None
-        limite_max = float(categoria_encontrada.limite_max) if categoria_encontrada and categoria_encontrada.limite_max is not None else None
-
-        if categoria_encontrada:
-            if limite_min == 0:
-                limite_texto = f"Até {categoria_encontrada.limite_max:.1f} kg"
-            elif limite_max is None or limite_max >= 999:
-                limite_texto = f"+{limite_min:.1f} kg"
-            else:
-                limite_texto = f"{limite_min:.1f} a {limite_max:.1f} kg"
-            categoria_label = categoria_encontrada.label
-        else:
-            limite_texto = '-'
-            categoria_label = categoria_nome_raw or '-'
-
-        historico_pesagens = list(PesagemHistorico.objects.filter(
-            inscricao=inscricao,
-            campeonato=campeonato_selecionado
-        ).order_by('-data_hora')[:5])
-        
-        peso_oficial = inscricao.peso_real
-        status_codigo = inscricao.status_atual
-        status_pesagem = status_label_map.get(status_codigo, 'Pendente')
-        peso_fora_categoria = False
-        
-        if peso_oficial is not None and categoria_encontrada and limite_min is not None:
-            max_real = limite_max if limite_max is not None and limite_max < 999 else None
-            peso_fora_categoria = not (peso_oficial >= limite_min and (max_real is None or peso_oficial <= max_real))
-        
-        atletas.append(SimpleNamespace(
-            id=atleta.id,
-            inscricao_id=inscricao.id,
-            inscricao_obj=inscricao,
-            nome=atleta.nome,
-            academia=atleta.academia,
-            sexo=atleta.sexo,
-            classe=classe_atleta,
-            categoria_nome=categoria_nome_raw,
-            categoria_ajustada=categoria_nome_raw,
-            categoria_label=categoria_label,
-            categoria_real_nome=categoria_encontrada.categoria_nome if categoria_encontrada else categoria_nome_raw or '',
-            limite_categoria_real=limite_texto,
-            limite_min=limite_min,
-            limite_max=limite_max,
-            limite_texto=limite_texto,
-            peso_oficial=peso_oficial,
-            remanejado=inscricao.remanejado,
-            motivo_ajuste=inscricao.motivo_ajuste or '',
-            status=status_pesagem,
-            status_codigo=status_codigo,
-            peso_fora_categoria=peso_fora_categoria,
-            historico_pesagens=historico_pesagens,
-            get_sexo_display=atleta.get_sexo_display,
-            bloqueado_chave=inscricao.bloqueado_chave,
-        ))
+    inscricoes = inscricoes_pesagem(campeonato_selecionado, classe_filtro, sexo_filtro, categoria_filtro)
+    atletas = montar_linhas_pesagem(inscricoes, campeonato_selecionado)
 
     classes = sorted(set(Inscricao.objects.filter(
         campeonato=campeonato_selecionado, 
@@ -1837,8 +1661,7 @@ def lista_chaves(request, organizacao_slug=None, *args, **kwargs):
         kwargs.pop("organizacao_slug")
     """Lista todas as chaves do campeonato ativo"""
     organizador = getattr(request, "organizacao", None)
-    campeonato_ativo = Campeonato.objects.filter(ativo=True, organizador=organizador) if organizador else Campeonato.objects.filter(ativo=True)
-    campeonato_ativo = campeonato_ativo.first()
+    campeonato_ativo = get_campeonato_ativo(request)
     
     if not campeonato_ativo:
         messages.warning(request, 'Nenhum campeonato ativo encontrado.')
@@ -1880,6 +1703,8 @@ def lista_chaves(request, organizacao_slug=None, *args, **kwargs):
         'classe_filtro': classe_filtro,
         'sexo_filtro': sexo_filtro,
         'categoria_filtro': categoria_filtro,
+        # Tarefa de geração em andamento (acompanhada por polling na página)
+        'tarefa_id': request.GET.get('tarefa', '') if request.GET.get('tarefa', '').isdigit() else None,
     }
     
     return render(request, 'atletas/lista_chaves.html', context)
@@ -1891,8 +1716,7 @@ def gerar_chave_view(request, organizacao_slug=None, *args, **kwargs):
         kwargs.pop("organizacao_slug")
     """Gerar chave - mostra apenas classes/categorias com atletas com peso confirmado"""
     organizador = getattr(request, "organizacao", None)
-    campeonato_ativo = Campeonato.objects.filter(ativo=True, organizador=organizador) if organizador else Campeonato.objects.filter(ativo=True)
-    campeonato_ativo = campeonato_ativo.first()
+    campeonato_ativo = get_campeonato_ativo(request)
     
     if not campeonato_ativo:
         messages.warning(request, 'Nenhum campeonato ativo encontrado.')
@@ -1953,103 +1777,24 @@ def gerar_todas_chaves(request, organizacao_slug=None, *args, **kwargs):
         kwargs.pop("organizacao_slug")
     """Gera todas as chaves possíveis de uma única vez"""
     organizador = getattr(request, "organizacao", None)
-    campeonato_ativo = Campeonato.objects.filter(ativo=True, organizador=organizador) if organizador else Campeonato.objects.filter(ativo=True)
-    campeonato_ativo = campeonato_ativo.first()
+    campeonato_ativo = get_campeonato_ativo(request)
     
     if not campeonato_ativo:
         messages.error(request, 'Nenhum campeonato ativo encontrado.')
         return redirect('lista_chaves', organizacao_slug=request.organizacao.slug)
     
-    # Buscar todas as combinações únicas de classe, sexo e categoria
-    # que têm inscrições aprovadas/remanejadas com peso confirmado (normalizado)
-    base_qs = Inscricao.objects.filter(
-        campeonato=campeonato_ativo,
-        classe_real__isnull=False,
-        categoria_real__isnull=False
-    ).exclude(
-        classe_real__nome__iexact='Festival'
-    )
-
-    inscricoes_aptas = base_qs.filter(
-        status_inscricao__in=['aprovado', 'remanejado'],
-        bloqueado_chave=False,
-        peso_real__gt=0
-    )
-    
-    # Agrupar por classe, sexo e categoria (usando campos normalizados)
-    combinacoes = {}
-    for inscricao in inscricoes_aptas:
-        classe = inscricao.classe_real.nome if inscricao.classe_real else ''
-        sexo = inscricao.atleta.sexo
-        categoria = inscricao.categoria_real.categoria_nome if inscricao.categoria_real else ''
-        
-        if not categoria:
-            continue
-        
-        chave_combinacao = (classe, sexo, categoria)
-        if chave_combinacao not in combinacoes:
-            combinacoes[chave_combinacao] = {
-                'classe': classe,
-                'sexo': sexo,
-                'categoria': categoria,
-                'count': 0
-            }
-        combinacoes[chave_combinacao]['count'] += 1
-    
-    # Gerar chaves para cada combinação
-    chaves_criadas = 0
-    chaves_atualizadas = 0
-    chaves_erro = []
-    
-    for combinacao in combinacoes.values():
-        try:
-            # Verificar se chave já existe
-            chave_existente = Chave.objects.filter(
-                campeonato=campeonato_ativo,
-                classe=combinacao['classe'],
-                sexo=combinacao['sexo'],
-                categoria=combinacao['categoria']
-            ).first()
-            
-            # Gerar chave (a função gerar_chave cria ou atualiza automaticamente)
-            chave = gerar_chave(
-                categoria_nome=combinacao['categoria'],
-                classe=combinacao['classe'],
-                sexo=combinacao['sexo'],
-                modelo_chave=None,  # Automático
-                campeonato=campeonato_ativo
-            )
-            
-            if chave_existente:
-                chaves_atualizadas += 1
-            else:
-                chaves_criadas += 1
-                
-        except Exception as e:
-            chaves_erro.append({
-                'combinacao': f"{combinacao['classe']} - {combinacao['sexo']} - {combinacao['categoria']}",
-                'erro': str(e)
-            })
-
-    # Log simples para diagnóstico em dev
-    total_combinacoes = len(combinacoes)
-    total_inscricoes = inscricoes_aptas.count()
-    print(f"[GERAR TODAS CHAVES] inscricoes_aptas={total_inscricoes} combinacoes={total_combinacoes} criadas={chaves_criadas} atualizadas={chaves_atualizadas} erros={len(chaves_erro)}")
-    
-    # Mensagem de sucesso
-    if chaves_criadas > 0 or chaves_atualizadas > 0:
-        mensagem = f"✅ {chaves_criadas} chave(s) criada(s) e {chaves_atualizadas} chave(s) atualizada(s) com sucesso!"
-        if chaves_erro:
-            mensagem += f" ⚠️ {len(chaves_erro)} erro(s) encontrado(s)."
-        messages.success(request, mensagem)
-    else:
-        messages.warning(request, 'Nenhuma chave foi gerada. Verifique se há inscrições aprovadas com peso confirmado.')
-    
-    if chaves_erro:
-        for erro in chaves_erro[:5]:  # Mostrar apenas os 5 primeiros erros
+    # Geração em lote roda no worker (manage.py processar_tarefas) para não
+    # travar pesagem e mesa enquanto as chaves são montadas
+    tarefa = enfileirar('gerar_todas_chaves', campeonato=campeonato_ativo, usuario=request.user)
+    if tarefa.status == 'CONCLUIDA':
+        resultado = tarefa.resultado
+        messages.success(request, f"✅ {resultado['criadas']} chave(s) criada(s) e {resultado['atualizadas']} chave(s) atualizada(s) com sucesso!")
+        for erro in resultado['erros'][:5]:  # Mostrar apenas os 5 primeiros erros
             messages.error(request, f"Erro em {erro['combinacao']}: {erro['erro']}")
-    
-    return redirect('lista_chaves', organizacao_slug=request.organizacao.slug)
+        return redirect('lista_chaves', organizacao_slug=request.organizacao.slug)
+
+    messages.info(request, f'Geração de chaves enfileirada (tarefa #{tarefa.id}). A lista será atualizada ao concluir.')
+    return redirect(f"{reverse('lista_chaves', kwargs={'organizacao_slug': request.organizacao.slug})}?tarefa={tarefa.id}")
 
 @operacional_required
 @organizacao_required
@@ -2058,8 +1803,7 @@ def gerar_chave_manual(request, organizacao_slug=None, *args, **kwargs):
         kwargs.pop("organizacao_slug")
     """Gerar lutas casadas (chave manual) - apenas atletas com peso confirmado"""
     organizador = getattr(request, "organizacao", None)
-    campeonato_ativo = Campeonato.objects.filter(ativo=True, organizador=organizador) if organizador else Campeonato.objects.filter(ativo=True)
-    campeonato_ativo = campeonato_ativo.first()
+    campeonato_ativo = get_campeonato_ativo(request)
     
     if not campeonato_ativo:
         messages.warning(request, 'Nenhum campeonato ativo encontrado.')
@@ -2347,6 +2091,10 @@ def registrar_vencedor(request, organizacao_slug=None, luta_id=None, *args, **kw
         from .utils import atualizar_proxima_luta
         atualizar_proxima_luta(luta)
         
+        # Aplicar apenas a diferença de colocações desta chave na pontuação
+        from .services.pontuacao import sincronizar_chave
+        sincronizar_chave(luta.chave)
+        
         # Registrar histórico
         from .utils_historico import registrar_historico
         campeonato = luta.chave.campeonato if luta.chave.campeonato else None
@@ -2427,9 +2175,6 @@ def ranking_global(request, organizacao_slug=None, *args, **kwargs):
     sexo_filtro = request.GET.get('sexo', '').strip()
     categoria_filtro = request.GET.get('categoria', '').strip()
     
-    # Calcular pontuação das academias primeiro
-    calcular_pontuacao_academias(campeonato_ativo.id)
-    
     # Buscar pontuações de academias
     pontuacoes = AcademiaPontuacao.objects.filter(
         campeonato=campeonato_ativo
@@ -2450,92 +2195,20 @@ def ranking_global(request, organizacao_slug=None, *args, **kwargs):
     # Top 3 academias para os cards
     top3_academias = ranking_academias_completo[:3]
     
-    # Buscar resultados de todas as chaves para calcular ranking de atletas
     chaves = Chave.objects.filter(campeonato=campeonato_ativo)
     
-    # Contar medalhas por atleta
-    medalhas_por_atleta = {}
-    
-    for chave in chaves:
-        resultados = get_resultados_chave(chave)
-        if not resultados:
-            continue
-        
-        # 1º lugar = ouro, 2º lugar = prata, 3º lugar = bronze
-        for idx, atleta_id in enumerate(resultados[:3], 1):
-            if not atleta_id:
-                continue
-            
-            if atleta_id not in medalhas_por_atleta:
-                try:
-                    atleta = Atleta.objects.get(id=atleta_id)
-                    medalhas_por_atleta[atleta_id] = {
-                        'atleta': atleta,
-                        'ouro': 0,
-                        'prata': 0,
-                        'bronze': 0,
-                        'total_medalhas': 0,
-                    }
-                except Atleta.DoesNotExist:
-                    continue
-            
-            if idx == 1:
-                medalhas_por_atleta[atleta_id]['ouro'] += 1
-            elif idx == 2:
-                medalhas_por_atleta[atleta_id]['prata'] += 1
-            elif idx == 3:
-                medalhas_por_atleta[atleta_id]['bronze'] += 1
-            
-            medalhas_por_atleta[atleta_id]['total_medalhas'] = (
-                medalhas_por_atleta[atleta_id]['ouro'] +
-                medalhas_por_atleta[atleta_id]['prata'] +
-                medalhas_por_atleta[atleta_id]['bronze']
-            )
-    
-    # Ordenar por total de medalhas (ouro > prata > bronze)
-    ranking_atletas_completo = sorted(
-        medalhas_por_atleta.values(),
-        key=lambda x: (x['total_medalhas'], x['ouro'], x['prata'], x['bronze']),
-        reverse=True
+    # Ranking de atletas a partir do quadro de medalhas materializado;
+    # filtros de classe/sexo/categoria são consultas indexadas na mesma tabela
+    ranking_atletas_completo = quadro_medalhas(
+        campeonato_ativo,
+        classe=classe_filtro,
+        sexo=sexo_filtro,
+        categoria=categoria_filtro,
     )
     
     # Top 3 atletas para os cards
     top3_atletas = ranking_atletas_completo[:3]
     
-    # Aplicar filtros ao ranking de atletas
-    if classe_filtro or sexo_filtro or categoria_filtro:
-        ranking_atletas_filtrado = []
-        for item in ranking_atletas_completo:
-            atleta = item['atleta']
-            
-            # Filtrar por classe (buscar na inscrição do campeonato)
-            if classe_filtro:
-                inscricao = Inscricao.objects.filter(
-                    atleta=atleta,
-                    campeonato=campeonato_ativo,
-                    classe_escolhida=classe_filtro
-                ).first()
-                if not inscricao:
-                    continue
-            
-            # Filtrar por sexo
-            if sexo_filtro and atleta.sexo != sexo_filtro:
-                continue
-            
-            # Filtrar por categoria (buscar na inscrição do campeonato)
-            if categoria_filtro:
-                inscricao = Inscricao.objects.filter(
-                    atleta=atleta,
-                    campeonato=campeonato_ativo
-                ).first()
-                if not inscricao or categoria_filtro not in inscricao.categoria_escolhida:
-                    continue
-            
-            ranking_atletas_filtrado.append(item)
-        
-        ranking_atletas_completo = ranking_atletas_filtrado
-        top3_atletas = ranking_atletas_completo[:3]
-    
     # Obter classes e categorias disponíveis
     classes_disponiveis = sorted(set(chaves.exclude(classe='').values_list('classe', flat=True).distinct()))
     categorias_disponiveis = sorted(set(chaves.exclude(categoria='').values_list('categoria', flat=True).distinct()))
@@ -2575,9 +2248,6 @@ def ranking_academias(request, organizacao_slug=None, *args, **kwargs):
             'total_academias': 0,
         })
     
-    # Calcular pontuação das academias
-    calcular_pontuacao_academias(campeonato_ativo.id)
-    
     # Buscar apenas academias permitidas no campeonato
     academias_permitidas_ids = list(AcademiaCampeonato.objects.filter(
         campeonato=campeonato_ativo,
@@ -2632,8 +2302,11 @@ def calcular_pontuacao(request, organizacao_slug=None, *args, **kwargs):
     campeonato_ativo = Campeonato.objects.filter(ativo=True).first()
     
     if campeonato_ativo:
-        calcular_pontuacao_academias(campeonato_ativo.id)
-        messages.success(request, 'Pontuação recalculada com sucesso!')
+        tarefa = enfileirar('recalcular_pontuacao', campeonato=campeonato_ativo, usuario=request.user)
+        if tarefa.status == 'CONCLUIDA':
+            messages.success(request, 'Pontuação recalculada com sucesso!')
+        else:
+            messages.info(request, f'Recálculo da pontuação enfileirado (tarefa #{tarefa.id}).')
     else:
         messages.warning(request, 'Nenhum campeonato ativo encontrado.')
     
@@ -2758,7 +2431,7 @@ def inscrever_atletas(request, organizacao_slug=None, *args, **kwargs):
         kwargs.pop("organizacao_slug")
     organizacao = getattr(request, "organizacao", None)
     """Inscrever atletas no campeonato ativo da organização - Login Operacional"""
-    campeonato_ativo = Campeonato.objects.filter(ativo=True, organizador=organizacao).first()
+    campeonato_ativo = get_campeonato_ativo(request)
     
     if not campeonato_ativo:
         messages.warning(request, 'Nenhum campeonato ativo encontrado. Ative um campeonato para inscrever atletas.')
@@ -2930,7 +2603,7 @@ def metricas_evento(request, organizacao_slug=None, *args, **kwargs):
         kwargs.pop("organizacao_slug")
     organizacao = getattr(request, "organizacao", None)
     """Painel operacional completo com métricas do evento em tempo real"""
-    campeonato_ativo = Campeonato.objects.filter(ativo=True, organizador=organizacao).first()
+    campeonato_ativo = get_campeonato_ativo(request)
     
     if not campeonato_ativo:
         messages.warning(request, 'Nenhum campeonato ativo encontrado.')
@@ -2943,140 +2616,25 @@ def metricas_evento(request, organizacao_slug=None, *args, **kwargs):
             'progresso_campeonato': 0,
         })
     
-    # Filtrar apenas academias permitidas
-    academias_permitidas_ids = list(AcademiaCampeonato.objects.filter(
-        campeonato=campeonato_ativo,
-        permitido=True
-    ).values_list('academia_id', flat=True))
-    
-    # ========== 1. INDICADORES DE PESAGEM ==========
-    inscricoes_query = Inscricao.objects.filter(campeonato=campeonato_ativo)
-    if academias_permitidas_ids:
-        inscricoes_query = inscricoes_query.filter(atleta__academia_id__in=academias_permitidas_ids)
-    
-    total_inscritos = inscricoes_query.count()
-    total_pesados = inscricoes_query.filter(peso__isnull=False).exclude(peso=0).count()
-    total_pendentes = total_inscritos - total_pesados
-    total_fora_categoria = inscricoes_query.filter(remanejado=True).count()
-    
-    # Contar remanejados que foram aceitos vs pendentes
-    remanejados_aceitos = inscricoes_query.filter(remanejado=True, categoria_ajustada__isnull=False).exclude(categoria_ajustada='').count()
-    remanejados_pendentes = inscricoes_query.filter(remanejado=True, categoria_ajustada__isnull=True).count() + inscricoes_query.filter(remanejado=True, categoria_ajustada='').count()
-    
-    indicadores_pesagem = {
-        'total_inscritos': total_inscritos,
-        'total_pesados': total_pesados,
-        'total_pendentes': total_pendentes,
-        'total_fora_categoria': total_fora_categoria,
-        'remanejados_aceitos': remanejados_aceitos,
-        'remanejados_pendentes': remanejados_pendentes,
-        'percentual_pesados': round((total_pesados / total_inscritos * 100) if total_inscritos > 0 else 0, 1),
-    }
-    
-    # ========== 2. ATLETAS POR CATEGORIA ==========
-    inscricoes_por_categoria = inscricoes_query.values(
-        'classe_escolhida', 'categoria_escolhida', 'categoria_ajustada'
-    ).annotate(
-        total=Count('id'),
-        pesados=Count('id', filter=Q(peso__isnull=False) & ~Q(peso=0)),
-        pendentes=Count('id', filter=Q(peso__isnull=True) | Q(peso=0)),
-        remanejados=Count('id', filter=Q(remanejado=True))
-    ).order_by('classe_escolhida', 'categoria_escolhida')
-    
-    atletas_por_categoria = []
-    for item in inscricoes_por_categoria:
-        categoria_nome = item['categoria_ajustada'] if item['categoria_ajustada'] else item['categoria_escolhida']
-        atletas_por_categoria.append({
-            'classe': item['classe_escolhida'],
-            'categoria': categoria_nome,
-            'total': item['total'],
-            'pesados': item['pesados'],
-            'pendentes': item['pendentes'],
-            'remanejados': item['remanejados'],
-        })
-    
-    # ========== 3. REMANEJAMENTOS ==========
-    remanejamentos_query = inscricoes_query.filter(remanejado=True).select_related('atleta', 'atleta__academia')
-    
-    remanejamentos_pendentes_list = []
-    remanejamentos_resolvidos = 0
-    remanejamentos_desclassificados = 0
-    
-    for inscricao in remanejamentos_query:
-        if inscricao.categoria_ajustada and inscricao.categoria_ajustada.strip():
-            remanejamentos_resolvidos += 1
-        elif inscricao.categoria_ajustada == 'DESCLASSIFICADO' or inscricao.status_inscricao == 'rejeitado':
-            remanejamentos_desclassificados += 1
-        else:
-            remanejamentos_pendentes_list.append({
-                'id': inscricao.id,
-                'atleta_nome': inscricao.atleta.nome,
-                'peso_registrado': inscricao.peso or 0,
-                'professor': inscricao.atleta.academia.responsavel if inscricao.atleta.academia else 'N/A',
-                'academia': inscricao.atleta.academia.nome if inscricao.atleta.academia else 'N/A',
-                'categoria_original': inscricao.categoria_escolhida,
-                'categoria_proposta': inscricao.categoria_ajustada or 'Aguardando decisão',
-                'classe': inscricao.classe_escolhida,
-            })
-    
-    remanejamentos = {
-        'pendentes': len(remanejamentos_pendentes_list),
-        'resolvidos': remanejamentos_resolvidos,
-        'desclassificados': remanejamentos_desclassificados,
-        'total': remanejamentos_query.count(),
-        'lista_pendentes': remanejamentos_pendentes_list[:10],  # Limitar a 10 para não sobrecarregar
-    }
-    
-    # ========== 4. INDICADORES DE CHAVES ==========
-    chaves_query = Chave.objects.filter(campeonato=campeonato_ativo)
-    total_chaves = chaves_query.count()
-    
-    # Contar chaves por status
-    chaves_finalizadas = 0
-    chaves_pendentes = 0
-    chaves_em_construcao = 0
-    total_lutas_geradas = 0
-    total_lutas_finalizadas = 0
-    
-    for chave in chaves_query:
-        lutas_chave = chave.lutas.all()
-        total_lutas_chave = lutas_chave.count()
-        lutas_finalizadas_chave = lutas_chave.filter(concluida=True).count()
-        
-        total_lutas_geradas += total_lutas_chave
-        total_lutas_finalizadas += lutas_finalizadas_chave
-        
-        if total_lutas_chave == 0:
-            chaves_em_construcao += 1
-        elif lutas_finalizadas_chave == total_lutas_chave and total_lutas_chave > 0:
-            chaves_finalizadas += 1
-        else:
-            chaves_pendentes += 1
-    
-    # Calcular progresso do campeonato
-    progresso_campeonato = round((total_lutas_finalizadas / total_lutas_geradas * 100) if total_lutas_geradas > 0 else 0, 1)
-    
-    indicadores_chaves = {
-        'total_chaves': total_chaves,
-        'chaves_finalizadas': chaves_finalizadas,
-        'chaves_pendentes': chaves_pendentes,
-        'chaves_em_construcao': chaves_em_construcao,
-        'total_lutas_geradas': total_lutas_geradas,
-        'total_lutas_finalizadas': total_lutas_finalizadas,
-        'progresso_campeonato': progresso_campeonato,
-    }
-    
-    context = {
-        'campeonato_ativo': campeonato_ativo,
-        'indicadores_pesagem': indicadores_pesagem,
-        'atletas_por_categoria': atletas_por_categoria,
-        'remanejamentos': remanejamentos,
-        'indicadores_chaves': indicadores_chaves,
-        'progresso_campeonato': progresso_campeonato,
-    }
+    context = {'campeonato_ativo': campeonato_ativo}
+    context.update(MetricasEvento(campeonato_ativo).calcular())
     
     return render(request, 'atletas/metricas_evento.html', context)
 
+
+@operacional_required
+@organizacao_required
+def metricas_evento_dados(request, organizacao_slug=None, *args, **kwargs):
+    """Indicadores do painel em JSON, consultados periodicamente para atualizar a página"""
+    organizacao = getattr(request, "organizacao", None)
+    campeonato_ativo = get_campeonato_ativo(request)
+    if not campeonato_ativo:
+        return JsonResponse({'campeonato_ativo': None}, status=404)
+    
+    dados = MetricasEvento(campeonato_ativo).calcular()
+    dados['campeonato_ativo'] = {'id': campeonato_ativo.id, 'nome': campeonato_ativo.nome}
+    return JsonResponse(dados)
+
 def dashboard(request):
     return render(request, 'atletas/dashboard.html')
 
@@ -3160,43 +2718,8 @@ def cadastrar_campeonato(request, organizacao_slug=None, *args, **kwargs):
             if campeonato.ativo:
                 Campeonato.objects.filter(organizador=organizacao).exclude(id=campeonato.id).update(ativo=False)
             
-            # Gerar senhas para academias
-            from datetime import timedelta
-            academias_ativas = Academia.objects.filter(ativo_login=True, organizador=organizacao)
-            
-            for academia in academias_ativas:
-                # Gerar login e senha
-                import random
-                import string
-                login = f"ACADEMIA_{academia.id:03d}"
-                senha_plana = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-                
-                # Calcular data de expiração (5 dias após término do campeonato)
-                data_expiracao = None
-                if campeonato.data_competicao:
-                    data_expiracao = timezone.make_aware(
-                        datetime.combine(campeonato.data_competicao, datetime.min.time())
-                    ) + timedelta(days=5)
-                
-                # Criar ou atualizar senha
-                senha_obj, created = AcademiaCampeonatoSenha.objects.get_or_create(
-                    academia=academia,
-                    campeonato=campeonato,
-                    defaults={
-                        'login': login,
-                        'senha_plana': senha_plana,
-                        'data_expiracao': data_expiracao,
-                    }
-                )
-                
-                if not created:
-                    senha_obj.login = login
-                    senha_obj.senha_plana = senha_plana
-                    senha_obj.data_expiracao = data_expiracao
-                    senha_obj.save()
-                
-                senha_obj.definir_senha(senha_plana)
-                senha_obj.save()
+            # Nenhuma academia é vinculada aqui: o administrador escolhe em
+            # gerenciar_academias_campeonato, que gera as credenciais das vinculadas
             
             messages.success(request, "Campeonato cadastrado com sucesso!")
             return redirect('lista_campeonatos', organizacao_slug=request.organizacao.slug)
@@ -3420,48 +2943,20 @@ def definir_campeonato_ativo(request, campeonato_id):
     campeonato.ativo = True
     campeonato.save()
     
-    # Vincular todas as academias ativas ao campeonato ativo (se ainda não estiverem vinculadas) e gerar senhas
-    academias_ativas = Academia.objects.filter(ativo_login=True)
-    vinculadas = 0
-    senhas_geradas = 0
-    
-    import random
-    import string
-    from datetime import timedelta
-    from datetime import datetime as dt
-    
-    for academia in academias_ativas:
-        vinculo, created = AcademiaCampeonato.objects.get_or_create(
-            academia=academia,
-            campeonato=campeonato,
-            defaults={'permitido': True}
-        )
-        if created:
-            vinculadas += 1
-        
-        # Gerar senha se não existir
-        senha_obj, senha_created = AcademiaCampeonatoSenha.objects.get_or_create(
-            academia=academia,
-            campeonato=campeonato,
-            defaults={
-                'login': f"ACADEMIA_{academia.id:03d}",
-                'senha_plana': ''.join(random.choices(string.ascii_letters + string.digits, k=8)),
-                'data_expiracao': timezone.make_aware(
-                    dt.combine(campeonato.data_competicao, dt.min.time())
-                ) + timedelta(days=5) if campeonato.data_competicao else None,
-            }
-        )
-        
-        if senha_created:
-            senha_obj.definir_senha(senha_obj.senha_plana)
-            senha_obj.save()
-            senhas_geradas += 1
+    # Vincular todas as academias ativas ao campeonato ativo (se ainda não estiverem vinculadas);
+    # as senhas que faltarem são geradas em lote pelo worker
+    vinculadas = vincular_academias(
+        campeonato, Academia.objects.filter(ativo_login=True).values_list('id', flat=True)
+    )
+    tarefa = enfileirar('provisionar_credenciais', campeonato=campeonato, usuario=request.user)
     
     messages.success(request, f'Campeonato "{campeonato.nome}" ativado com sucesso!')
     if vinculadas > 0:
         messages.info(request, f'{vinculadas} academia(s) vinculada(s) automaticamente ao campeonato.')
-    if senhas_geradas > 0:
-        messages.info(request, f'{senhas_geradas} senha(s) gerada(s) para as academias.')
+    if tarefa.status != 'CONCLUIDA':
+        messages.info(request, f'Geração de senhas das academias enfileirada (tarefa #{tarefa.id}).')
+    elif tarefa.resultado['geradas'] > 0:
+        messages.info(request, f"{tarefa.resultado['geradas']} senha(s) gerada(s) para as academias.")
     return _redirect_lista_campeonatos(request)
 
 @operacional_required
@@ -3494,6 +2989,8 @@ def gerenciar_academias_campeonato(request, organizacao_slug=None, campeonato_id
                     )
                     vinculo.permitido = permitido
                     vinculo.save()
+                    if created:
+                        provisionar_credenciais(campeonato, academia_ids=[academia.id])
                     
                     status = 'permitida' if permitido else 'bloqueada'
                     messages.success(request, f'Academia "{academia.nome}" {status} no campeonato.')
@@ -3514,6 +3011,7 @@ def gerenciar_academias_campeonato(request, organizacao_slug=None, campeonato_id
                             campeonato=campeonato,
                             permitido=True
                         )
+                        provisionar_credenciais(campeonato, academia_ids=[academia.id])
                         messages.success(request, f'Academia "{academia.nome}" adicionada ao campeonato.')
                 except Exception as e:
                     messages.error(request, f'Erro ao adicionar academia: {str(e)}')
@@ -3566,6 +3064,10 @@ def gerenciar_senhas_campeonato(request, campeonato_id):
         campeonato=campeonato
     ).select_related('academia').order_by('academia__nome')
     
+    # Academias vinculadas que ainda não têm credencial (worker não rodou ou vínculo
+    # criado fora desta tela): gerar agora em lote; sem pendências é só uma consulta
+    provisionar_credenciais(campeonato)
+    
     academias_com_senhas = []
     for credencial in credenciais:
         academias_com_senhas.append({
@@ -3581,43 +3083,6 @@ def gerenciar_senhas_campeonato(request, campeonato_id):
             'credencial_id': credencial.id,
         })
     
-    # Se não há credenciais, gerar para todas as academias
-    if not academias_com_senhas:
-        import random
-        import string
-        academias = Academia.objects.filter(ativo_login=True)
-        
-        for academia in academias:
-            login = f"ACADEMIA_{academia.id:03d}"
-            senha_plana = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-            data_expiracao = None
-            if campeonato.data_competicao:
-                data_expiracao = campeonato.data_competicao + timedelta(days=5)
-            
-            credencial = AcademiaCampeonatoSenha(
-                academia=academia,
-                campeonato=campeonato,
-                login=login,
-                senha_plana=senha_plana,
-                data_expiracao=data_expiracao,
-            )
-            # Definir senha (criptografa) - IMPORTANTE: fazer ANTES do save
-            credencial.definir_senha(senha_plana)
-            credencial.save()
-            
-            academias_com_senhas.append({
-                'academia': academia,
-                'login': login,
-                'senha_plana': senha_plana,
-                'telefone': academia.telefone,
-                'responsavel': academia.responsavel,
-                'enviado_whatsapp': False,
-                'data_envio': None,
-                'data_expiracao': data_expiracao,
-                'esta_expirado': False,
-                'credencial_id': credencial.id,
-            })
-    
     # Processar POST (marcar como enviado)
     if request.method == 'POST' and request.POST.get('marcar_enviado'):
         credencial_id = request.POST.get('credencial_id')
@@ -3713,10 +3178,7 @@ def academia_painel(request):
     campeonato_ativo = Campeonato.objects.filter(ativo=True).first()
     
     if campeonato_ativo:
-        from .utils import calcular_pontuacao_academias, get_resultados_chave
-        
-        # Calcular pontuação das academias primeiro
-        calcular_pontuacao_academias(campeonato_ativo.id)
+        # Pontuação e medalhas são mantidas incrementalmente (services.pontuacao)
         
         academias_permitidas_ids = list(AcademiaCampeonato.objects.filter(
             campeonato=campeonato_ativo,
@@ -3752,52 +3214,8 @@ def academia_painel(request):
                 'total_atletas_ativos': total_atletas_ativos,
             })
         
-        # Calcular ranking global de atletas
-        chaves = Chave.objects.filter(campeonato=campeonato_ativo)
-        medalhas_por_atleta = {}
-        
-        for chave in chaves:
-            resultados = get_resultados_chave(chave)
-            if not resultados:
-                continue
-            
-            # 1º lugar = ouro, 2º lugar = prata, 3º lugar = bronze
-            for idx, atleta_id in enumerate(resultados[:3], 1):
-                if not atleta_id:
-                    continue
-                
-                if atleta_id not in medalhas_por_atleta:
-                    try:
-                        atleta = Atleta.objects.get(id=atleta_id)
-                        medalhas_por_atleta[atleta_id] = {
-                            'atleta': atleta,
-                            'ouro': 0,
-                            'prata': 0,
-                            'bronze': 0,
-                            'total_medalhas': 0,
-                        }
-                    except Atleta.DoesNotExist:
-                        continue
-                
-                if idx == 1:
-                    medalhas_por_atleta[atleta_id]['ouro'] += 1
-                elif idx == 2:
-                    medalhas_por_atleta[atleta_id]['prata'] += 1
-                elif idx == 3:
-                    medalhas_por_atleta[atleta_id]['bronze'] += 1
-                
-                medalhas_por_atleta[atleta_id]['total_medalhas'] = (
-                    medalhas_por_atleta[atleta_id]['ouro'] +
-                    medalhas_por_atleta[atleta_id]['prata'] +
-                    medalhas_por_atleta[atleta_id]['bronze']
-                )
-        
-        # Ordenar por total de medalhas (ouro > prata > bronze)
-        ranking_global_atletas = sorted(
-            medalhas_por_atleta.values(),
-            key=lambda x: (x['total_medalhas'], x['ouro'], x['prata'], x['bronze']),
-            reverse=True
-        )
+        # Ranking global de atletas (quadro de medalhas materializado)
+        ranking_global_atletas = quadro_medalhas(campeonato_ativo)
 
     inscricoes_resumo = []
     inscricoes_qs = Inscricao.objects.filter(
@@ -4302,77 +3720,35 @@ def academia_detalhe_chave(request, campeonato_id, chave_id):
 
 @academia_required
 def academia_baixar_regulamento(request, campeonato_id):
-    """Baixa o regulamento do campeonato em formato PDF usando xhtml2pdf"""
+    """Baixa o regulamento do campeonato em PDF, gerado em segundo plano (tarefa regulamento_pdf)"""
     campeonato = get_object_or_404(Campeonato, id=campeonato_id)
     
     if not campeonato.regulamento:
         messages.error(request, 'Regulamento não disponível para este evento.')
         return redirect('academia_evento', campeonato_id=campeonato_id)
     
-    try:
-        from .utils_pdf import renderizar_template_para_pdf
-        import re
-        
-        # Processar texto do regulamento para identificar títulos e parágrafos
-        texto_regulamento = campeonato.regulamento
-        paragrafos = []
-        
-        # Dividir em parágrafos (linhas vazias indicam novo parágrafo)
-        blocos = texto_regulamento.split('\n\n')
-        
-        for bloco in blocos:
-            bloco = bloco.strip()
-            if not bloco:
-                continue
-            
-            # Verificar se é um título (linha curta, sem pontuação final, ou começa com número)
-            linhas = bloco.split('\n')
-            is_titulo = False
-            
-            if len(linhas) == 1:
-                linha = linhas[0].strip()
-                # Título se: linha curta (< 80 chars) ou começa com número seguido de ponto/parentese
-                if len(linha) < 80 or re.match(r'^\d+[\.\)]\s', linha):
-                    is_titulo = True
-            
-            paragrafos.append({
-                'texto': bloco,
-                'is_titulo': is_titulo
-            })
-        
-        # Preparar contexto para o template
-        context = {
-            'campeonato': campeonato,
-            'regulamento': campeonato.regulamento,
-            'paragrafos': paragrafos,
-        }
-        
-        # Gerar nome do arquivo
+    tarefa = tarefa_regulamento_pdf(campeonato, usuario=request.user)
+    
+    if tarefa.status == 'CONCLUIDA' and tarefa.arquivo:
         filename = f"regulamento_{campeonato.nome.replace(' ', '_')}.pdf"
-        
-        # Gerar PDF usando xhtml2pdf
-        return renderizar_template_para_pdf(
-            template_path='atletas/academia/regulamento_pdf.html',
-            context=context,
-            filename=filename,
-            content_disposition='attachment'
-        )
-        
-    except ImportError as e:
-        # Se xhtml2pdf não estiver instalado, retornar como HTML para impressão
-        messages.warning(request, 'Biblioteca de PDF não disponível. Retornando HTML para impressão.')
+        return FileResponse(tarefa.arquivo.open('rb'), as_attachment=True, filename=filename, content_type='application/pdf')
+    
+    if tarefa.status == 'ERRO':
+        # PDF indisponível (ex.: xhtml2pdf não instalado): HTML para impressão
+        messages.warning(request, 'Não foi possível gerar o PDF. Retornando HTML para impressão.')
         from django.template.loader import render_to_string
+        from .utils_pdf import montar_paragrafos_regulamento
         html_content = render_to_string('atletas/academia/regulamento_pdf.html', {
             'campeonato': campeonato,
             'regulamento': campeonato.regulamento,
-            'paragrafos': []
+            'paragrafos': montar_paragrafos_regulamento(campeonato.regulamento),
         })
         response = HttpResponse(html_content, content_type='text/html')
         response['Content-Disposition'] = f'inline; filename="regulamento_{campeonato.nome}.html"'
         return response
-    except Exception as e:
-        messages.error(request, f'Erro ao gerar PDF: {str(e)}')
-        return redirect('academia_evento', campeonato_id=campeonato_id)
+    
+    messages.info(request, 'O PDF do regulamento está sendo gerado. Tente baixar novamente em alguns instantes.')
+    return redirect('academia_evento', campeonato_id=campeonato_id)
 
 @academia_required
 def tabela_categorias_peso(request):
@@ -4447,165 +3823,68 @@ def administracao_financeiro(request):
         messages.warning(request, 'Nenhum evento selecionado. Selecione um evento para acessar o módulo financeiro.')
         return redirect('lista_campeonatos', organizacao_slug=request.organizacao.slug)
     
-    # Inicializar todas as variáveis
-    ganho_previsto = 0
-    dinheiro_caixa = 0
-    pagamentos_pendentes = 0
-    total_despesas = 0
-    despesas_pendentes = 0
-    despesas_pagas = 0
-    total_bonus = 0
-    saldo_final = 0
-    lucro_atual = 0
-    patrocinios_total = 0
-    
-    # Inscrições
-    inscricoes_pendentes = 0
-    inscricoes_confirmadas = 0
-    entradas_federado = 0
-    entradas_nao_federado = 0
-    total_inscricoes = 0  # Total de inscrições para o gráfico
-    
-    # Operacionais
+    # ========== TOTAIS FINANCEIROS (snapshot agregado, ver services/financeiro.py) ==========
+    # Inscrições e conferências (ConferenciaPagamento é a fonte única do caixa),
+    # despesas 100% vinculadas ao campeonato_ativo
+    financeiro = obter_financeiro(campeonato_ativo)
+    dinheiro_caixa = financeiro['dinheiro_caixa']
+    pagamentos_pendentes = financeiro['pagamentos_pendentes']
+    entradas_federado = financeiro['entradas_federado']
+    entradas_nao_federado = financeiro['entradas_nao_federado']
+    total_despesas = financeiro['total_despesas']
+    patrocinios_total = financeiro['patrocinios_total']
+    
+    # Total de inscrições (para o gráfico de pilhas) = ganho previsto (confirmadas + pendentes)
+    total_inscricoes = entradas_federado + entradas_nao_federado
+    ganho_previsto = total_inscricoes
+    
+    # ========== CÁLCULOS DE LUCRO/PREJUÍZO ==========
+    lucro_atual = dinheiro_caixa + patrocinios_total - total_despesas
+    saldo_final = dinheiro_caixa - total_despesas
+    
+    # ========== INDICADORES OPERACIONAIS ==========
+    # Pessoas da equipe técnica vinculadas ao campeonato ativo, por função (uma consulta)
+    from .models import EquipeTecnicaCampeonato, Despesa
     operacional_counts = {
         'arbitro': 0,
         'mesario': 0,
         'oficial_mesa': 0,
         'oficial_pesagem': 0,
     }
+    por_funcao = EquipeTecnicaCampeonato.objects.filter(
+        campeonato=campeonato_ativo,
+        funcao__in=list(operacional_counts),
+        ativo=True
+    ).values('funcao').annotate(total=Count('id'))
+    for item in por_funcao:
+        operacional_counts[item['funcao']] = item['total']
     
-    # Rankings
-    ranking_academias = []
-    top_custos = []
+    # ========== RANKINGS ==========
+    # Top 5 academias (permitidas no campeonato) por número de inscrições
+    ranking = list(Inscricao.objects.filter(
+        campeonato=campeonato_ativo,
+        atleta__academia__vinculos_campeonatos__campeonato=campeonato_ativo,
+        atleta__academia__vinculos_campeonatos__permitido=True,
+    ).values('atleta__academia').annotate(
+        total=Count('id')
+    ).order_by('-total')[:5])
+    academias = Academia.objects.in_bulk([item['atleta__academia'] for item in ranking])
+    ranking_academias = [
+        {'academia': academias[item['atleta__academia']], 'total': item['total']}
+        for item in ranking
+        if item['atleta__academia'] in academias
+    ]
     
-    if campeonato_ativo:
-        # ========== CÁLCULOS BASEADOS EM ConferenciaPagamento (FONTE ÚNICA) ==========
-        
-        # Buscar todas as conferências do campeonato
-        conferencias = ConferenciaPagamento.objects.filter(campeonato=campeonato_ativo)
-        
-        # Dinheiro em caixa: soma de conferências confirmadas
-        conferencias_confirmadas = conferencias.filter(status='CONFIRMADO')
-        dinheiro_caixa = sum(c.valor_recebido or c.valor_esperado for c in conferencias_confirmadas)
-        
-        # Pagamentos pendentes: soma de conferências pendentes
-        conferencias_pendentes = conferencias.filter(status='PENDENTE')
-        pagamentos_pendentes = sum(c.valor_esperado for c in conferencias_pendentes)
-        
-        # ========== CÁLCULOS DE INSCRIÇÕES (BASEADO EM Inscricao - FONTE REAL) ==========
-        # Buscar TODAS as inscrições do campeonato
-        inscricoes = Inscricao.objects.filter(campeonato=campeonato_ativo)
-        valor_federado = campeonato_ativo.valor_inscricao_federado or 0
-        valor_nao_federado = campeonato_ativo.valor_inscricao_nao_federado or 0
-        
-        # Contar inscrições por status (baseado nas inscrições reais)
-        # IMPORTANTE: Incluir todas as inscrições que não estão confirmadas/aprovadas como pendentes
-        inscricoes_confirmadas = inscricoes.filter(status_inscricao__in=['confirmado', 'aprovado']).count()
-        # Contar todas as inscrições pendentes (status='pendente' ou qualquer outro status que não seja confirmado/aprovado)
-        inscricoes_pendentes = inscricoes.exclude(status_inscricao__in=['confirmado', 'aprovado', 'reprovado']).count()
-        
-        # Calcular entradas por categoria (federado/não federado) baseado nas inscrições reais
-        for ins in inscricoes:
-            if ins.atleta.federado:
-                entradas_federado += valor_federado
-            else:
-                entradas_nao_federado += valor_nao_federado
-        
-        # Total de inscrições (para o gráfico de pilhas)
-        total_inscricoes = entradas_federado + entradas_nao_federado
-        
-        # Ganho previsto: soma de todas as inscrições (confirmadas + pendentes)
-        ganho_previsto = total_inscricoes
-        
-        # ========== CÁLCULOS DE DESPESAS ==========
-        # IMPORTANTE: Todas as despesas são 100% vinculadas ao campeonato_ativo
-        # Não há mistura de valores entre eventos diferentes
-        from .models import Despesa
-        despesas = Despesa.objects.filter(campeonato=campeonato_ativo)
-        total_despesas = sum(d.valor for d in despesas)
-        despesas_pendentes = sum(d.valor for d in despesas.filter(status='pendente'))
-        despesas_pagas = sum(d.valor for d in despesas.filter(status='pago'))
-        
-        # Patrocínios: despesas com categoria 'patrocinios' (entrada de dinheiro)
-        patrocinios_total = sum(d.valor for d in despesas.filter(categoria='patrocinios', status='pago'))
-        
-        # ========== CÁLCULOS DE LUCRO/PREJUÍZO ==========
-        lucro_atual = dinheiro_caixa + patrocinios_total - total_despesas
-        saldo_final = dinheiro_caixa - total_despesas
-        
-        # ========== INDICADORES OPERACIONAIS ==========
-        # Contar pessoas da equipe técnica vinculadas ao campeonato ativo por função
-        from .models import EquipeTecnicaCampeonato
-        operacional_counts['arbitro'] = EquipeTecnicaCampeonato.objects.filter(
-            campeonato=campeonato_ativo,
-            funcao='arbitro',
-            ativo=True
-        ).count()
-        operacional_counts['mesario'] = EquipeTecnicaCampeonato.objects.filter(
-            campeonato=campeonato_ativo,
-            funcao='mesario',
-            ativo=True
-        ).count()
-        operacional_counts['oficial_mesa'] = EquipeTecnicaCampeonato.objects.filter(
-            campeonato=campeonato_ativo,
-            funcao='oficial_mesa',
-            ativo=True
-        ).count()
-        operacional_counts['oficial_pesagem'] = EquipeTecnicaCampeonato.objects.filter(
-            campeonato=campeonato_ativo,
-            funcao='oficial_pesagem',
-            ativo=True
-        ).count()
-        
-        # ========== RANKINGS ==========
-        # Top 5 academias por número de inscrições
-        from django.db.models import Count
-        academias_permitidas_ids = list(AcademiaCampeonato.objects.filter(
-            campeonato=campeonato_ativo,
-            permitido=True
-        ).values_list('academia_id', flat=True))
-        
-        if academias_permitidas_ids:
-            ranking_academias = Inscricao.objects.filter(
-                campeonato=campeonato_ativo,
-                atleta__academia_id__in=academias_permitidas_ids
-            ).values('atleta__academia').annotate(
-                total=Count('id')
-            ).order_by('-total')[:5]
-            
-            # Adicionar objeto academia ao ranking
-            ranking_academias_list = []
-            for item in ranking_academias:
-                try:
-                    academia = Academia.objects.get(id=item['atleta__academia'])
-                    ranking_academias_list.append({
-                        'academia': academia,
-                        'total': item['total']
-                    })
-                except Academia.DoesNotExist:
-                    pass
-            ranking_academias = ranking_academias_list
-        
-        # Top 5 custos por categoria
-        from django.db.models import Sum
-        top_custos_raw = despesas.values('categoria').annotate(
-            valor_total=Sum('valor')
-        ).order_by('-valor_total')[:5]
-        
-        top_custos = []
-        for item in top_custos_raw:
-            # Combinar todas as categorias possíveis (despesa + receita)
-            todas_categorias = dict(Despesa.CATEGORIA_DESPESA_CHOICES)
-            todas_categorias.update(dict(Despesa.CATEGORIA_RECEITA_CHOICES))
-            categoria_display = todas_categorias.get(item['categoria'], item['categoria'])
-            top_custos.append({
-                'categoria': categoria_display,
-                'valor': item['valor_total']
-            })
+    # Top 5 custos por categoria (despesa + receita)
+    todas_categorias = dict(Despesa.CATEGORIA_DESPESA_CHOICES)
+    todas_categorias.update(dict(Despesa.CATEGORIA_RECEITA_CHOICES))
+    top_custos = [
+        {'categoria': todas_categorias.get(item['categoria'], item['categoria']), 'valor': item['valor']}
+        for item in financeiro['top_custos']
+    ]
     
     # Despesas recentes - SEMPRE filtrar por campeonato
-    from .models import Despesa
-    despesas_recentes = Despesa.objects.filter(campeonato=campeonato_ativo).order_by('-data_cadastro')[:10] if campeonato_ativo else Despesa.objects.none()
+    despesas_recentes = Despesa.objects.filter(campeonato=campeonato_ativo).order_by('-data_cadastro')[:10]
     
     context = {
         'campeonato_ativo': campeonato_ativo,
@@ -4614,15 +3893,15 @@ def administracao_financeiro(request):
         'dinheiro_caixa': dinheiro_caixa,
         'pagamentos_pendentes': pagamentos_pendentes,
         'total_despesas': total_despesas,
-        'despesas_pendentes': despesas_pendentes,
-        'despesas_pagas': despesas_pagas,
-        'total_bonus': total_bonus,
+        'despesas_pendentes': financeiro['despesas_pendentes'],
+        'despesas_pagas': financeiro['despesas_pagas'],
+        'total_bonus': financeiro['total_bonus'],
         'saldo_final': saldo_final,
         'lucro_atual': lucro_atual,
         'patrocinios_total': patrocinios_total,
         # Inscrições
-        'inscricoes_pendentes': inscricoes_pendentes,
-        'inscricoes_confirmadas': inscricoes_confirmadas,
+        'inscricoes_pendentes': financeiro['inscricoes_pendentes'],
+        'inscricoes_confirmadas': financeiro['inscricoes_confirmadas'],
         'entradas_federado': entradas_federado,
         'entradas_nao_federado': entradas_nao_federado,
         'total_inscricoes': total_inscricoes,  # Total de inscrições para o gráfico
@@ -4,7 +4,10 @@ Views para o fluxo completo de conferência de pagamentos
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.http import JsonResponse
-from django.db.models import Q, Sum, Count
+from django.db import transaction
+from django.db.models import Case, CharField, Count, DecimalField, Exists, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 from decimal import Decimal
@@ -15,26 +18,77 @@ from .models import (
 )
 from .academia_auth import operacional_required
 from .utils_historico import registrar_historico
+from .services.financeiro import STATUS_CONFIRMADOS, marcar_desatualizado
+from .services.pontuacao import sincronizar_inscricoes_academia
+
+LOTE_CONFERENCIAS = 500
+# Ordem da lista: Pendente primeiro, depois Divergente, depois Confirmado
+ORDEM_STATUS = {'PENDENTE': 0, 'DIVERGENTE': 1, 'CONFIRMADO': 2}
+
+_DECIMAL = DecimalField(max_digits=12, decimal_places=2)
+
+
+def _valor_inscricao(campeonato, prefixo=''):
+    """Preço da inscrição conforme o atleta seja federado (para Sum condicional)."""
+    return Case(
+        When(**{f'{prefixo}federado': True}, then=Value(campeonato.valor_inscricao_federado or Decimal('0.00'))),
+        default=Value(campeonato.valor_inscricao_nao_federado or Decimal('0.00')),
+        output_field=_DECIMAL,
+    )
 
 
 def calcular_valor_esperado_academia(academia, campeonato):
     """Calcula o valor total esperado de uma academia baseado nas inscrições"""
-    inscricoes = Inscricao.objects.filter(
+    totais = Inscricao.objects.filter(
         atleta__academia=academia,
         campeonato=campeonato
-    ).select_related('atleta')
-    
-    valor_federado = campeonato.valor_inscricao_federado or Decimal('0.00')
-    valor_nao_federado = campeonato.valor_inscricao_nao_federado or Decimal('0.00')
-    
-    valor_total = Decimal('0.00')
-    for inscricao in inscricoes:
-        if inscricao.atleta.federado:
-            valor_total += valor_federado
-        else:
-            valor_total += valor_nao_federado
-    
-    return valor_total, inscricoes.count()
+    ).aggregate(
+        valor_total=Coalesce(Sum(_valor_inscricao(campeonato, 'atleta__')), Value(Decimal('0.00')), output_field=_DECIMAL),
+        quantidade=Count('id'),
+    )
+    return totais['valor_total'], totais['quantidade']
+
+
+def academias_conferencia(campeonato):
+    """
+    Academias permitidas no campeonato e com inscrições, anotadas com os totais da conferência.
+
+    Uma consulta: contagens e valores por Count/Sum condicional sobre as
+    inscrições do campeonato e a conferência (status, valor recebido) por
+    Subquery. Campos anotados: qtd_atletas, qtd_federados, qtd_confirmadas,
+    valor_esperado, valor_confirmado (inscrições já aprovadas), conferencia_id,
+    status (PENDENTE quando ainda não há conferência) e valor_recebido.
+    """
+    conferencia = ConferenciaPagamento.objects.filter(academia=OuterRef('pk'), campeonato=campeonato)
+    permitida = AcademiaCampeonato.objects.filter(academia=OuterRef('pk'), campeonato=campeonato, permitido=True)
+    inscricao_confirmada = Q(atletas__inscricoes__status_inscricao__in=STATUS_CONFIRMADOS)
+    valor = _valor_inscricao(campeonato, 'atletas__')
+    zero = Value(Decimal('0.00'))
+
+    # O filtro de inscrições vem antes do annotate: os agregados usam o mesmo JOIN
+    return Academia.objects.filter(
+        Exists(permitida),
+        atletas__inscricoes__campeonato=campeonato,
+    ).annotate(
+        qtd_atletas=Count('atletas__inscricoes'),
+        qtd_federados=Count('atletas__inscricoes', filter=Q(atletas__federado=True)),
+        qtd_confirmadas=Count('atletas__inscricoes', filter=inscricao_confirmada),
+        valor_esperado=Coalesce(Sum(valor), zero, output_field=_DECIMAL),
+        valor_confirmado=Coalesce(Sum(valor, filter=inscricao_confirmada), zero, output_field=_DECIMAL),
+        conferencia_id=Subquery(conferencia.values('id')[:1]),
+        status=Coalesce(Subquery(conferencia.values('status')[:1]), Value('PENDENTE'), output_field=CharField()),
+        valor_recebido=Subquery(conferencia.values('valor_recebido')[:1], output_field=_DECIMAL),
+    ).annotate(
+        ordem_status=Case(
+            *[When(status=status, then=Value(ordem)) for status, ordem in ORDEM_STATUS.items()],
+            default=Value(99),
+            output_field=IntegerField(),
+        ),
+    ).order_by('ordem_status', 'nome')
+
+
+def _url_lista(request, campeonato):
+    return f"{reverse('conferencia_pagamentos_lista', kwargs={'organizacao_slug': request.organizacao.slug})}?campeonato_id={campeonato.id}"
 
 
 @operacional_required
@@ -47,73 +101,101 @@ def conferencia_pagamentos_lista(request):
     else:
         campeonato = Campeonato.objects.filter(ativo=True).first()
     
+    campeonatos = Campeonato.objects.all().order_by('-data_competicao', '-data_inicio')
+    
     if not campeonato:
         messages.warning(request, 'Nenhum evento selecionado ou encontrado.')
-        campeonatos = Campeonato.objects.all().order_by('-data_competicao', '-data_inicio')
         return render(request, 'atletas/administracao/conferencia_pagamentos_lista.html', {
             'campeonatos': campeonatos,
             'campeonato_selecionado': None,
             'academias': [],
         })
     
-    # Buscar academias permitidas no campeonato
-    academias_permitidas = AcademiaCampeonato.objects.filter(
-        campeonato=campeonato,
-        permitido=True
-    ).select_related('academia')
-    
-    # Buscar academias que têm inscrições
-    academias_com_inscricoes = Inscricao.objects.filter(
-        campeonato=campeonato
-    ).values_list('atleta__academia_id', flat=True).distinct()
-    
-    academias_dados = []
-    for vinculo in academias_permitidas:
-        academia = vinculo.academia
-        if academia.id not in academias_com_inscricoes:
-            continue
-        
-        # Calcular valor esperado e quantidade de atletas
-        valor_esperado, qtd_atletas = calcular_valor_esperado_academia(academia, campeonato)
-        
-        # Buscar conferência (único modelo oficial)
-        conferencia = ConferenciaPagamento.objects.filter(
-            academia=academia,
-            campeonato=campeonato
-        ).first()
-        
-        # Determinar status (apenas de ConferenciaPagamento)
-        if conferencia:
-            status = conferencia.status
-            valor_recebido = conferencia.valor_recebido
-        else:
-            status = 'PENDENTE'
-            valor_recebido = None
-        
-        academias_dados.append({
-            'academia': academia,
-            'valor_esperado': valor_esperado,
-            'qtd_atletas': qtd_atletas,
-            'status': status,
-            'valor_recebido': valor_recebido,
-            'conferencia': conferencia,
-        })
-    
-    # Ordenar por status (Pendente primeiro, depois Divergente, depois Confirmado)
-    status_order = {'PENDENTE': 0, 'DIVERGENTE': 1, 'CONFIRMADO': 2}
-    academias_dados.sort(key=lambda x: (status_order.get(x['status'], 99), x['academia'].nome))
-    
-    campeonatos = Campeonato.objects.all().order_by('-data_competicao', '-data_inicio')
-    
     context = {
         'campeonatos': campeonatos,
         'campeonato_selecionado': campeonato,
-        'academias': academias_dados,
+        'academias': academias_conferencia(campeonato),
     }
     
     return render(request, 'atletas/administracao/conferencia_pagamentos_lista.html', context)
 
 
+@operacional_required
+@require_http_methods(["POST"])
+def conferencia_pagamentos_confirmar_lote(request, campeonato_id):
+    """Confirma de uma vez o pagamento das academias selecionadas na lista"""
+    campeonato = get_object_or_404(Campeonato, id=campeonato_id)
+    academia_ids = {int(valor) for valor in request.POST.getlist('academia_ids') if valor.isdigit()}
+    
+    if not academia_ids:
+        messages.warning(request, 'Selecione ao menos uma academia para confirmar.')
+        return redirect(_url_lista(request, campeonato))
+    
+    agora = timezone.now()
+    with transaction.atomic():
+        academias = list(academias_conferencia(campeonato).filter(id__in=academia_ids))
+        existentes = {
+            conferencia.academia_id: conferencia
+            for conferencia in ConferenciaPagamento.objects.select_for_update().filter(
+                campeonato=campeonato,
+                academia_id__in=[academia.id for academia in academias],
+            )
+        }
+        
+        novas, alteradas = [], []
+        for academia in academias:
+            conferencia = existentes.get(academia.id)
+            if conferencia is None:
+                conferencia = ConferenciaPagamento(academia=academia, campeonato=campeonato)
+                novas.append(conferencia)
+            else:
+                alteradas.append(conferencia)
+            # Valor recebido fica como estava: vazio conta o esperado no financeiro
+            conferencia.status = 'CONFIRMADO'
+            conferencia.valor_esperado = academia.valor_esperado
+            conferencia.quantidade_atletas = academia.qtd_atletas
+            conferencia.conferido_por = request.user
+            conferencia.data_conferencia = agora
+            conferencia.atualizado_em = agora
+        
+        # bulk_update não aplica auto_now: atualizado_em vai explícito
+        ConferenciaPagamento.objects.bulk_update(
+            alteradas,
+            ['status', 'valor_esperado', 'quantidade_atletas', 'conferido_por', 'data_conferencia', 'atualizado_em'],
+            batch_size=LOTE_CONFERENCIAS,
+        )
+        ConferenciaPagamento.objects.bulk_create(novas, batch_size=LOTE_CONFERENCIAS)
+        
+        confirmadas_ids = [academia.id for academia in academias]
+        # Mesma regra de conferencia_pagamentos_salvar: aprovado libera para a pesagem
+        Inscricao.objects.filter(
+            campeonato=campeonato,
+            atleta__academia_id__in=confirmadas_ids,
+        ).update(status_inscricao='aprovado')
+        
+        for academia in academias:
+            sincronizar_inscricoes_academia(campeonato, academia.id)
+            registrar_historico(
+                tipo_acao='CONFERENCIA_PAGAMENTO',
+                descricao=f'Conferência de pagamento (em lote): {academia.nome} - Status: CONFIRMADO - Valor esperado: R$ {academia.valor_esperado}',
+                usuario=request.user,
+                campeonato=campeonato,
+                academia=academia,
+                dados_extras={'status': 'CONFIRMADO', 'valor_esperado': str(academia.valor_esperado), 'lote': True},
+                request=request
+            )
+        
+        # Atualizações em lote não disparam os sinais do painel financeiro
+        marcar_desatualizado(campeonato.id, 'inscricoes', 'conferencias')
+    
+    if academias:
+        total_inscricoes = sum(academia.qtd_atletas for academia in academias)
+        messages.success(request, f'{len(academias)} academia(s) confirmada(s). {total_inscricoes} inscrição(ões) aprovada(s) e liberada(s) para pesagem.')
+    else:
+        messages.warning(request, 'Nenhuma das academias selecionadas tem inscrições neste evento.')
+    return redirect(_url_lista(request, campeonato))
+
+
 @operacional_required
 def conferencia_pagamentos_detalhe(request, academia_id, campeonato_id):
     """Tela de conferência detalhada por academia"""
@@ -244,6 +326,11 @@ def conferencia_pagamentos_salvar(request, academia_id, campeonato_id):
         inscricoes.update(status_inscricao='pendente')
         messages.info(request, f'Conferência salva com sucesso! Status: PENDENTE. Inscrições permanecem pendentes.')
     
+    # Atualização em lote muda Festival/remanejamentos aprovados: aplicar delta
+    sincronizar_inscricoes_academia(campeonato, academia.id)
+    # QuerySet.update não dispara o sinal de Inscricao do painel financeiro
+    marcar_desatualizado(campeonato.id, 'inscricoes')
+    
     # Registrar no histórico
     registrar_historico(
         tipo_acao='CONFERENCIA_PAGAMENTO',
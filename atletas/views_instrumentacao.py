@@ -0,0 +1,17 @@
+"""
+Views da instrumentação dos caminhos quentes (JSON para a equipe operacional)
+"""
+from django.http import JsonResponse
+
+from .academia_auth import operacional_required
+from .services.instrumentacao import LIMITES_MS, resumo
+
+
+@operacional_required
+def instrumentacao_dados(request):
+    """Histograma e percentis por etapa deste processo; ?etapa=pesagem.validar filtra uma etapa"""
+    etapa = request.GET.get('etapa') or None
+    return JsonResponse({
+        'limites_ms': list(LIMITES_MS),
+        'etapas': resumo(etapa),
+    })
@@ -10,6 +10,7 @@ import datetime
 from .models import Ocorrencia, Campeonato, Academia, Atleta, Inscricao
 from .academia_auth import operacional_required
 from .utils_historico import registrar_historico
+from .services.historico import pagina_historico
 
 
 @operacional_required
@@ -279,12 +280,16 @@ def ocorrencias_historico(request):
     
     historicos = historicos.select_related(
         'usuario', 'campeonato', 'academia', 'atleta'
-    ).order_by('-data_hora')
+    )
     
-    # Paginação
-    paginator = Paginator(historicos, 50)
-    page = request.GET.get('page')
-    historicos_page = paginator.get_page(page)
+    # Paginação por cursor em (data_hora, id): custo constante em qualquer página
+    cursor = request.GET.get('cursor')
+    historicos_page, proximo_cursor = pagina_historico(historicos, cursor)
+    
+    # Filtros atuais preservados nos links de navegação
+    filtros = request.GET.copy()
+    filtros.pop('cursor', None)
+    filtros.pop('page', None)
     
     campeonatos = Campeonato.objects.all().order_by('-data_competicao', '-data_inicio')
     from django.contrib.auth.models import User
@@ -292,6 +297,9 @@ def ocorrencias_historico(request):
     
     context = {
         'historicos': historicos_page,
+        'proximo_cursor': proximo_cursor,
+        'pagina_inicial': not cursor,
+        'filtros_query': filtros.urlencode(),
         'campeonatos': campeonatos,
         'usuarios': usuarios,
         'tipo_acao_filtro': tipo_acao_filtro,
@@ -0,0 +1,21 @@
+"""
+Views de acompanhamento das tarefas em segundo plano (polling JSON)
+"""
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+
+from .models import TarefaBackground
+from .academia_auth import operacional_required
+from .services.tarefas import status_tarefa
+
+
+@operacional_required
+def tarefa_status(request, tarefa_id):
+    """Status e progresso de uma tarefa; consultado periodicamente pela interface"""
+    # Só tarefas de campeonatos da organização da URL
+    tarefa = get_object_or_404(
+        TarefaBackground,
+        id=tarefa_id,
+        campeonato__organizador=request.organizacao,
+    )
+    return JsonResponse(status_tarefa(tarefa))
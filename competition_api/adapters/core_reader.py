@@ -9,6 +9,15 @@ from adapters.exceptions import CoreUnavailableError
 logger = logging.getLogger(__name__)
 
 
+def profile_from_row(row) -> dict:
+    if not row:
+        raise ValueError("Perfil do atleta não encontrado ou inativo")
+    sexo, faixa = row
+    if not sexo or not faixa:
+        raise ValueError("Perfil do atleta incompleto (sexo/faixa ausentes)")
+    return {"sex": sexo, "belt": faixa}
+
+
 class CoreSQLReader:
     statement_timeout_ms = 2000  # fail fast
 
@@ -63,10 +72,105 @@ class CoreSQLReader:
             logger.warning("Core indisponível ao obter perfil do atleta", exc_info=exc)
             raise CoreUnavailableError("Core indisponível para obter perfil") from exc
 
-        if not row:
-            raise ValueError("Perfil do atleta não encontrado ou inativo")
-        sexo, faixa = row
-        if not sexo or not faixa:
-            raise ValueError("Perfil do atleta incompleto (sexo/faixa ausentes)")
-        return {"sex": sexo, "belt": faixa}
+        return profile_from_row(row)
+
+    def athletes_belonging_to_org(self, athlete_ids, organization_id: UUID) -> set:
+        """IDs (dentre `athlete_ids`) de atletas ativos da organização, em uma consulta."""
+        athlete_ids = list(athlete_ids)
+        if not athlete_ids:
+            return set()
+        query = """
+            SELECT id
+            FROM core.athletes_athlete
+            WHERE id = ANY(%s) AND organization_id = %s AND is_active = TRUE
+        """
+        try:
+            with connection.cursor() as cursor:
+                self._set_statement_timeout(cursor)
+                cursor.execute(query, [athlete_ids, organization_id])
+                return {row[0] for row in cursor.fetchall()}
+        except (OperationalError, DatabaseError) as exc:
+            logger.warning("Core indisponível ao validar atletas", exc_info=exc)
+            raise CoreUnavailableError("Core indisponível para validar atletas") from exc
+
+    def get_athlete_profiles(self, athlete_ids) -> dict:
+        """
+        {athlete_id: {"sex", "belt"}} dos atletas ativos encontrados, em uma
+        consulta. Perfis incompletos vêm como estão; use `profile_from_row`.
+        """
+        athlete_ids = list(athlete_ids)
+        if not athlete_ids:
+            return {}
+        query = """
+            SELECT id, sexo, faixa
+            FROM core.atletas_atleta
+            WHERE id = ANY(%s) AND status_ativo = TRUE
+        """
+        try:
+            with connection.cursor() as cursor:
+                self._set_statement_timeout(cursor)
+                cursor.execute(query, [athlete_ids])
+                rows = cursor.fetchall()
+        except (OperationalError, DatabaseError) as exc:
+            logger.warning("Core indisponível ao obter perfis de atletas", exc_info=exc)
+            raise CoreUnavailableError("Core indisponível para obter perfis") from exc
+        return {athlete_id: {"sex": sexo, "belt": faixa} for athlete_id, sexo, faixa in rows}
+
+
+class MemoizedCoreReader:
+    """
+    Memo de uma unidade de trabalho (requisição, inscrição em lote) sobre um
+    CoreReadContract. Cada organização, vínculo atleta/organização e perfil
+    é consultado no Core no máximo uma vez; `prefetch` carrega um lote
+    inteiro com três consultas, e as chamadas unitárias seguintes não vão
+    ao banco. Não deve ser reaproveitado entre requisições.
+    """
+
+    def __init__(self, reader=None):
+        self._reader = reader or CoreSQLReader()
+        self._organizations = {}
+        self._memberships = {}
+        self._profiles = {}
+
+    def prefetch(self, athlete_ids, organization_id: UUID) -> None:
+        athlete_ids = list(athlete_ids)
+        if self.organization_exists_and_active(organization_id):
+            self.athletes_belonging_to_org(athlete_ids, organization_id)
+            self.get_athlete_profiles(athlete_ids)
+
+    def organization_exists_and_active(self, organization_id: UUID) -> bool:
+        if organization_id not in self._organizations:
+            self._organizations[organization_id] = self._reader.organization_exists_and_active(organization_id)
+        return self._organizations[organization_id]
+
+    def athlete_belongs_to_org(self, athlete_id: UUID, organization_id: UUID) -> bool:
+        key = (athlete_id, organization_id)
+        if key not in self._memberships:
+            self._memberships[key] = self._reader.athlete_belongs_to_org(athlete_id, organization_id)
+        return self._memberships[key]
+
+    def athletes_belonging_to_org(self, athlete_ids, organization_id: UUID) -> set:
+        athlete_ids = list(athlete_ids)
+        missing = [a for a in athlete_ids if (a, organization_id) not in self._memberships]
+        if missing:
+            found = self._reader.athletes_belonging_to_org(missing, organization_id)
+            for athlete_id in missing:
+                self._memberships[(athlete_id, organization_id)] = athlete_id in found
+        return {a for a in athlete_ids if self._memberships[(a, organization_id)]}
+
+    def get_athlete_profiles(self, athlete_ids) -> dict:
+        athlete_ids = list(athlete_ids)
+        missing = [a for a in athlete_ids if a not in self._profiles]
+        if missing:
+            found = self._reader.get_athlete_profiles(missing)
+            for athlete_id in missing:
+                self._profiles[athlete_id] = found.get(athlete_id)
+        return {a: self._profiles[a] for a in athlete_ids if self._profiles[a] is not None}
+
+    def get_athlete_profile(self, athlete_id: UUID) -> dict:
+        if athlete_id not in self._profiles:
+            # Unitário: erros de perfil ausente/incompleto vêm do leitor de origem
+            self._profiles[athlete_id] = self._reader.get_athlete_profile(athlete_id)
+        profile = self._profiles[athlete_id]
+        return profile_from_row((profile["sex"], profile["belt"]) if profile else None)
 
@@ -1,9 +1,11 @@
 import math
+import uuid
 from collections import defaultdict
 
 from django.db import transaction
 
 from brackets.models import Bracket, BracketParticipant, BracketFormat
+from brackets.standings import build_win_matrix, rank_with_head_to_head
 from brackets.belt_groups import (
     resolve_belt_group,
     allowed_groups_for_class,
@@ -26,6 +28,21 @@ def list_eligible_registrations_for_brackets(event_id):
     ).exclude(class_code__isnull=True).exclude(sex__isnull=True).exclude(belt_snapshot__isnull=True)
 
 
+# Lotes do bulk_create/bulk_update; as lutas de um evento grande cabem em poucas idas ao banco
+BULK_BATCH_SIZE = 500
+
+MATCH_PLAN_FIELDS = [
+    "round_number",
+    "match_number",
+    "phase",
+    "source_blue_match_id",
+    "source_white_match_id",
+    "blue_athlete_id",
+    "white_athlete_id",
+]
+PARTICIPANT_FIELDS = ["registration_id", "organization_id", "seed"]
+
+
 def _pairwise(lst):
     it = iter(lst)
     return list(zip(it, it))
@@ -35,75 +52,188 @@ def _next_power_of_two(n):
     return 1 << (n - 1).bit_length()
 
 
-def _create_single_elim_matches(bracket: Bracket, participants):
-    # Seeds by order given
-    slots = [p for p in participants]
+def _new_match(bracket: Bracket, round_number, match_number, phase="MAIN", blue=None, white=None,
+               source_blue=None, source_white=None):
+    # UUID gerado aqui: os vínculos de origem já são conhecidos antes do INSERT
+    return Match(
+        id=uuid.uuid4(),
+        bracket=bracket,
+        round_number=round_number,
+        match_number=match_number,
+        phase=phase,
+        blue_athlete_id=blue,
+        white_athlete_id=white,
+        source_blue_match_id=source_blue.id if source_blue else None,
+        source_white_match_id=source_white.id if source_white else None,
+        status=MatchStatus.SCHEDULED,
+    )
+
+
+def _plan_elimination_rounds(bracket: Bracket, athletes):
+    # Seeds by order given; cada luta aponta para as duas que a alimentam
+    # (ímpar -> azul, par -> branco, como em advance_single_elimination)
+    slots = list(athletes)
     size = _next_power_of_two(len(slots))
-    while len(slots) < size:
-        slots.append(None)  # bye
-
-    matches_created = []
-    round_number = 1
-    current = slots
-    match_number = 1
-    while len(current) > 1:
-        next_round = []
-        for a, b in _pairwise(current):
-            blue = a.athlete_id if a else None
-            white = b.athlete_id if b else None
-            match = Match.objects.create(
-                bracket=bracket,
-                round_number=round_number,
-                match_number=match_number,
-                blue_athlete_id=blue,
-                white_athlete_id=white,
-                status=MatchStatus.SCHEDULED,
-            )
-            matches_created.append(match)
-            next_round.append(match)
-            match_number += 1
-        current = next_round
-        round_number += 1
-        match_number = 1
-    return matches_created
-
-
-def _create_round_robin_matches(bracket: Bracket, participants):
-    matches_created = []
-    athletes = [p.athlete_id for p in participants]
+    slots += [None] * (size - len(slots))  # byes
+
+    rounds = []
+    current = [
+        _new_match(bracket, 1, number, blue=a, white=b)
+        for number, (a, b) in enumerate(_pairwise(slots), start=1)
+    ]
+    while current:
+        rounds.append(current)
+        if len(current) == 1:
+            break
+        current = [
+            _new_match(bracket, len(rounds) + 1, number, source_blue=a, source_white=b)
+            for number, (a, b) in enumerate(_pairwise(current), start=1)
+        ]
+    return rounds
+
+
+def _plan_single_elim_matches(bracket: Bracket, athletes):
+    return [m for round_matches in _plan_elimination_rounds(bracket, athletes) for m in round_matches]
+
+
+def _plan_round_robin_matches(bracket: Bracket, athletes):
     n = len(athletes)
-    match_no = 1
-    for i in range(n):
-        for j in range(i + 1, n):
-            match = Match.objects.create(
-                bracket=bracket,
-                round_number=1,
-                match_number=match_no,
-                blue_athlete_id=athletes[i],
-                white_athlete_id=athletes[j],
-                status=MatchStatus.SCHEDULED,
-            )
-            matches_created.append(match)
-            match_no += 1
-    return matches_created
+    pairs = [(athletes[i], athletes[j]) for i in range(n) for j in range(i + 1, n)]
+    return [
+        _new_match(bracket, 1, number, blue=a, white=b)
+        for number, (a, b) in enumerate(pairs, start=1)
+    ]
 
 
-def _create_best_of_3(bracket: Bracket, participants):
-    matches_created = []
-    athletes = [p.athlete_id for p in participants]
+def _plan_best_of_3(bracket: Bracket, athletes):
     if len(athletes) != 2:
         raise ValueError("Best of 3 requer exatamente 2 atletas")
-    for num in range(1, 4):
-        match = Match.objects.create(
-            bracket=bracket,
-            round_number=1,
-            match_number=num,
-            blue_athlete_id=athletes[0],
-            white_athlete_id=athletes[1],
-            status=MatchStatus.SCHEDULED,
-        )
-        matches_created.append(match)
-    return matches_created
+    return [_new_match(bracket, 1, number, blue=athletes[0], white=athletes[1]) for number in range(1, 4)]
+
+
+def _plan_elim_with_repechage(bracket: Bracket, athletes):
+    rounds = _plan_elimination_rounds(bracket, athletes)
+    main_matches = [m for round_matches in rounds for m in round_matches]
+    by_id = {m.id: m for m in main_matches}
+    final_match = rounds[-1][0]
+
+    def feeders(match):
+        # Lutas abaixo de `match` na árvore: seus perdedores perderam para o finalista daquele lado
+        chain = []
+        for source_id in (match.source_blue_match_id, match.source_white_match_id):
+            child = by_id.get(source_id)
+            if child:
+                chain.append(child)
+                chain.extend(feeders(child))
+        return chain
+
+    def plan_repechage_side(chain):
+        # simplistic: pair sequentially until one remains; the first level points at the main matches
+        current = list(chain)
+        rep_round = 1
+        planned = []
+        while len(current) > 1:
+            next_level = []
+            it = iter(current)
+            for a in it:
+                b = next(it, None)
+                match = _new_match(bracket, rep_round, 0, phase="REPECHAGE", source_blue=a, source_white=b)
+                planned.append(match)
+                next_level.append(match)
+            current = next_level
+            rep_round += 1
+        return (current[0] if current else None), planned
+
+    # assume top finalist from first half, bottom from second half
+    semifinals = rounds[-2] if len(rounds) > 1 else []
+    semi_top = semifinals[0] if semifinals else None
+    semi_bottom = semifinals[1] if len(semifinals) > 1 else None
+
+    rep_top_final, rep_top = plan_repechage_side(feeders(semi_top) if semi_top else [])
+    rep_bottom_final, rep_bottom = plan_repechage_side(feeders(semi_bottom) if semi_bottom else [])
+
+    # Numeração por round contínua entre os dois lados: (fase, round, número) identifica a luta
+    numbers = defaultdict(int)
+    for match in rep_top + rep_bottom:
+        numbers[match.round_number] += 1
+        match.match_number = numbers[match.round_number]
+
+    bronze_matches = []
+    for rep_final, semi in ((rep_top_final, semi_top), (rep_bottom_final, semi_bottom)):
+        if rep_final and semi:
+            bronze_matches.append(
+                _new_match(
+                    bracket,
+                    final_match.round_number,  # align with final round
+                    0,
+                    phase="BRONZE",
+                    source_blue=rep_final,
+                    source_white=semi,
+                )
+            )
+
+    return main_matches + rep_top + rep_bottom + bronze_matches
+
+
+def _plan_matches(bracket: Bracket, fmt, athletes):
+    if fmt == BracketFormat.BEST_OF_3:
+        return _plan_best_of_3(bracket, athletes)
+    if fmt == BracketFormat.ROUND_ROBIN:
+        return _plan_round_robin_matches(bracket, athletes)
+    if fmt == BracketFormat.ELIMINATION_WITH_REPECHAGE:
+        return _plan_elim_with_repechage(bracket, athletes)
+    return _plan_single_elim_matches(bracket, athletes)
+
+
+def _match_keys(matches):
+    # Chave natural: (fase, round, número); os dois bronzes (número 0) se distinguem pela semifinal de origem
+    base = {m.id: (m.phase, m.round_number, m.match_number) for m in matches}
+    return [
+        base[m.id] + ((base.get(m.source_white_match_id),) if m.phase == "BRONZE" else ())
+        for m in matches
+    ]
+
+
+def _diff_matches(planned, existing):
+    """
+    Compara o plano com as lutas já gravadas da chave e devolve
+    (criar, atualizar, remover). Lutas existentes com a mesma chave natural
+    mantêm o ID; os vínculos de origem do plano são remapeados para eles.
+    """
+    if any(m.status != MatchStatus.SCHEDULED for m in existing):
+        raise ValueError("Chave já possui lutas encerradas; não é possível regerar")
+
+    existing_by_key = {}
+    to_delete = []
+    for key, match in zip(_match_keys(existing), existing):
+        if key in existing_by_key:
+            to_delete.append(match)  # duplicada por gerações anteriores
+        else:
+            existing_by_key[key] = match
+
+    reused = {}
+    pairs = []
+    to_create = []
+    for key, match in zip(_match_keys(planned), planned):
+        current = existing_by_key.pop(key, None)
+        if current is None:
+            to_create.append(match)
+        else:
+            reused[match.id] = current.id
+            match.id = current.id
+            pairs.append((match, current))
+    to_delete.extend(existing_by_key.values())
+
+    for match in planned:
+        match.source_blue_match_id = reused.get(match.source_blue_match_id, match.source_blue_match_id)
+        match.source_white_match_id = reused.get(match.source_white_match_id, match.source_white_match_id)
+
+    to_update = [
+        match
+        for match, current in pairs
+        if any(getattr(match, f) != getattr(current, f) for f in MATCH_PLAN_FIELDS)
+    ]
+    return to_create, to_update, to_delete
 
 
 def _select_format(n, override=None):
@@ -129,183 +259,17 @@ def _ensure_allowed_group(reg: Registration):
     return group
 
 
-def _next_power_of_two(n):
-    return 1 << (n - 1).bit_length()
-
-
-def _pairwise(lst):
-    it = iter(lst)
-    return list(zip(it, it))
-
-
-def _build_main_bracket(participants):
-    slots = [p for p in participants]
-    size = _next_power_of_two(len(slots))
-    while len(slots) < size:
-        slots.append(None)
-
-    matches = []
-    round_number = 1
-    current = slots
-    match_number = 1
-    while len(current) > 1:
-        next_round = []
-        for a, b in _pairwise(current):
-            blue = a.athlete_id if a else None
-            white = b.athlete_id if b else None
-            match = {
-                "round": round_number,
-                "number": match_number,
-                "blue": blue,
-                "white": white,
-                "phase": "MAIN",
-            }
-            matches.append(match)
-            next_round.append(match)
-            match_number += 1
-        current = next_round
-        round_number += 1
-        match_number = 1
-    return matches
-
-
-def _create_elim_with_repechage(bracket: Bracket, participants):
-    main_matches = _build_main_bracket(participants)
-    # Persist main matches
-    persisted = []
-    for m in main_matches:
-        obj = Match.objects.create(
-            bracket=bracket,
-            round_number=m["round"],
-            match_number=m["number"],
-            blue_athlete_id=m["blue"],
-            white_athlete_id=m["white"],
-            status=MatchStatus.SCHEDULED,
-            phase="MAIN",
-        )
-        m["id"] = obj.id
-        persisted.append(obj)
-
-    # Determine finalist paths
-    rounds = {}
-    for m in main_matches:
-        rounds.setdefault(m["round"], []).append(m)
-    max_round = max(rounds.keys())
-    final_match = [m for m in main_matches if m["round"] == max_round][0]
-
-    # map winners to next
-    def parent_id(round_no, match_no):
-        return (round_no + 1, (match_no + 1) // 2)
-
-    tree = {}
-    for m in main_matches:
-        tree[(m["round"], m["number"])] = m
-    for m in main_matches:
-        pr = parent_id(m["round"], m["number"])
-        if pr in tree:
-            pm = tree[pr]
-            # mark source for clarity
-            if m["number"] % 2 == 1:
-                pm.setdefault("sources", {})["blue"] = tree[(m["round"], m["number"])]
-            else:
-                pm.setdefault("sources", {})["white"] = tree[(m["round"], m["number"])]
-
-    # Collect losers to each finalist
-    finalist_slots = {"top": [], "bottom": []}
-
-    def collect_losers(m, slot):
-        if "sources" not in m:
-            return
-        for side, child in m["sources"].items():
-            # child is a dict; attach loser list when result arrives; for structure, we store match id
-            finalist_slots[slot].append(child)
-            collect_losers(child, slot)
-
-    # assume top finalist from first half, bottom from second half
-    # finals sources:
-    if "sources" in final_match:
-        if "blue" in final_match["sources"]:
-            collect_losers(final_match["sources"]["blue"], "top")
-        if "white" in final_match["sources"]:
-            collect_losers(final_match["sources"]["white"], "bottom")
-
-    # Helper to get match by round/number persisted id
-    id_map = {(m["round"], m["number"]): m["id"] for m in main_matches}
-
-    def losers_chain(chain):
-        # chain is list of match dicts; losers are the athlete not winner (manual later). For structure, keep match ids.
-        return [c for c in chain if c.get("id")]
-
-    repechage_matches = []
-
-    def build_repechage_side(chain, side_name):
-        # chain is matches that lost to finalist; they enter repescagem
-        # create linear elimination until one remains; then bronze vs semifinal loser of same side
-        entries = losers_chain(chain)
-        if len(entries) <= 0:
-            return None, []
-        # order by round descending (losers closer to final enter later)
-        entries.sort(key=lambda cid: -tree[(final_match["round"], final_match["number"])]["round"] if False else 0)
-        # simplistic: pair sequentially
-        current = [e for e in entries]
-        rep_round = 1
-        match_no = 1
-        created = []
-        while len(current) > 1:
-            next_level = []
-            it = iter(current)
-            for a in it:
-                b = next(it, None)
-                match = Match.objects.create(
-                    bracket=bracket,
-                    round_number=rep_round,
-                    match_number=match_no,
-                    status=MatchStatus.SCHEDULED,
-                    phase="REPECHAGE",
-                    source_blue_match_id=id_map.get(getattr(a, "key", (0, 0)), None),
-                    source_white_match_id=id_map.get(getattr(b, "key", (0, 0)), None) if b else None,
-                )
-                created.append(match)
-                next_level.append(match)
-                match_no += 1
-            current = next_level
-            rep_round += 1
-            match_no = 1
-        final_rep = current[0] if current else None
-        return final_rep, created
-
-    bronze_matches = []
-
-    def create_bronze(rep_winner, semifinal_match):
-        return Match.objects.create(
-            bracket=bracket,
-            round_number=final_match["round"],  # align with final round
-            match_number=0,
-            status=MatchStatus.SCHEDULED,
-            phase="BRONZE",
-            source_blue_match_id=rep_winner.id if rep_winner else None,
-            source_white_match_id=id_map.get((semifinal_match["round"], semifinal_match["number"]), None) if semifinal_match else None,
-        )
-
-    # Identify semifinals (round before final)
-    semifinal_round = max_round - 1
-    semifinals = [m for m in main_matches if m["round"] == semifinal_round]
-    semi_top = semifinals[0] if semifinals else None
-    semi_bottom = semifinals[1] if len(semifinals) > 1 else None
-
-    rep_top_final, rep_top_created = build_repechage_side(finalist_slots["top"], "top")
-    rep_bottom_final, rep_bottom_created = build_repechage_side(finalist_slots["bottom"], "bottom")
-
-    if rep_top_final and semi_top:
-        bronze_matches.append(create_bronze(rep_top_final, semi_top))
-    if rep_bottom_final and semi_bottom:
-        bronze_matches.append(create_bronze(rep_bottom_final, semi_bottom))
-
-    return persisted + rep_top_created + rep_bottom_created + bronze_matches
-
-
 @transaction.atomic
-def generate_brackets_for_event(event_id, format_by_category=None):
+def generate_brackets_for_event(event_id, format_by_category=None, regenerate=False):
+    """
+    Monta chaves, participantes e lutas do evento em memória e grava tudo em lote.
+
+    Chaves já geradas ficam como estão, então chamar de novo não duplica nada.
+    Com `regenerate=True` elas são comparadas com o plano atual: linhas
+    equivalentes mantêm o ID, as alteradas são atualizadas, as que faltam são
+    criadas e as que sobraram removidas. Chaves com lutas encerradas não são
+    regeradas.
+    """
     event = Event.objects.filter(id=event_id).first()
     if not event:
         raise ValueError("Evento não encontrado")
@@ -321,7 +285,15 @@ def generate_brackets_for_event(event_id, format_by_category=None):
         cls = canonical_class_code(reg.class_code)
         grouped[(cls, reg.sex, reg.category_code_final, group_id)].append(reg)
 
+    existing_brackets = {
+        (b.category_code, b.class_code, b.sex, b.belt_group): b
+        for b in Bracket.objects.filter(event_id=event_id)
+    }
+
     brackets = []
+    new_brackets = []
+    changed_brackets = []
+    plans = []
     for key, regs_cat in grouped.items():
         cls, sex, category_code, group_id = key
         n = len(regs_cat)
@@ -330,54 +302,92 @@ def generate_brackets_for_event(event_id, format_by_category=None):
             fmt_override = format_by_category[category_code]
         fmt = _select_format(n, fmt_override)
 
-        bracket, _ = Bracket.objects.get_or_create(
-            event_id=event_id,
-            category_code=category_code,
-            class_code=cls,
-            sex=sex,
-            belt_group=group_id,
-            defaults={"format": fmt or BracketFormat.SINGLE_ELIMINATION},
-        )
-        participants = []
-        for idx, reg in enumerate(regs_cat, start=1):
-            participant, _ = BracketParticipant.objects.get_or_create(
-                bracket=bracket,
-                athlete_id=reg.athlete_id,
-                registration_id=reg.id,
-                organization_id=reg.organization_id,
-                defaults={"seed": idx},
+        bracket = existing_brackets.get((category_code, cls, sex, group_id))
+        if bracket is None:
+            bracket = Bracket(
+                id=uuid.uuid4(),
+                event_id=event_id,
+                category_code=category_code,
+                class_code=cls,
+                sex=sex,
+                belt_group=group_id,
+                format=fmt or BracketFormat.SINGLE_ELIMINATION,
+                is_generated=True,
             )
-            participants.append(participant)
-
-        if n == 1:
-            bracket.is_generated = True
-            bracket.save(update_fields=["is_generated"])
+            new_brackets.append(bracket)
+        elif bracket.is_generated and not regenerate:
             brackets.append(bracket)
             continue
-
-        if fmt == BracketFormat.BEST_OF_3:
-            _create_best_of_3(bracket, participants)
-        elif fmt == BracketFormat.ROUND_ROBIN:
-            _create_round_robin_matches(bracket, participants)
-        elif fmt == BracketFormat.ELIMINATION_WITH_REPECHAGE:
-            _create_elim_with_repechage(bracket, participants)
         else:
-            _create_single_elim_matches(bracket, participants)
-
-        bracket.format = fmt or BracketFormat.SINGLE_ELIMINATION
-        bracket.is_generated = True
-        bracket.save(update_fields=["format", "is_generated"])
+            bracket.format = fmt or BracketFormat.SINGLE_ELIMINATION
+            bracket.is_generated = True
+            changed_brackets.append(bracket)
         brackets.append(bracket)
+        plans.append((bracket, regs_cat, fmt))
+
+    # Estado atual das chaves reaproveitadas: uma consulta para participantes e outra para lutas
+    reused_ids = [b.id for b in changed_brackets]
+    participants_by_bracket = defaultdict(dict)
+    matches_by_bracket = defaultdict(list)
+    if reused_ids:
+        for participant in BracketParticipant.objects.filter(bracket_id__in=reused_ids):
+            participants_by_bracket[participant.bracket_id][participant.athlete_id] = participant
+        for match in Match.objects.filter(bracket_id__in=reused_ids).order_by("round_number", "match_number"):
+            matches_by_bracket[match.bracket_id].append(match)
+
+    participants_to_create, participants_to_update, participants_to_delete = [], [], []
+    matches_to_create, matches_to_update, matches_to_delete = [], [], []
+    for bracket, regs_cat, fmt in plans:
+        existing_participants = participants_by_bracket.get(bracket.id, {})
+        for seed, reg in enumerate(regs_cat, start=1):
+            values = {"registration_id": reg.id, "organization_id": reg.organization_id, "seed": seed}
+            participant = existing_participants.pop(reg.athlete_id, None)
+            if participant is None:
+                participants_to_create.append(
+                    BracketParticipant(id=uuid.uuid4(), bracket=bracket, athlete_id=reg.athlete_id, **values)
+                )
+            elif any(getattr(participant, f) != v for f, v in values.items()):
+                for f, v in values.items():
+                    setattr(participant, f, v)
+                participants_to_update.append(participant)
+        participants_to_delete.extend(existing_participants.values())
+
+        athletes = [reg.athlete_id for reg in regs_cat]
+        planned = _plan_matches(bracket, fmt, athletes) if len(athletes) > 1 else []
+        to_create, to_update, to_delete = _diff_matches(planned, matches_by_bracket.get(bracket.id, []))
+        matches_to_create.extend(to_create)
+        matches_to_update.extend(to_update)
+        matches_to_delete.extend(to_delete)
+
+    Bracket.objects.bulk_create(new_brackets, batch_size=BULK_BATCH_SIZE)
+    Bracket.objects.bulk_update(changed_brackets, ["format", "is_generated"], batch_size=BULK_BATCH_SIZE)
+
+    if participants_to_delete:
+        BracketParticipant.objects.filter(id__in=[p.id for p in participants_to_delete]).delete()
+    BracketParticipant.objects.bulk_create(participants_to_create, batch_size=BULK_BATCH_SIZE)
+    BracketParticipant.objects.bulk_update(participants_to_update, PARTICIPANT_FIELDS, batch_size=BULK_BATCH_SIZE)
+
+    if matches_to_delete:
+        Match.objects.filter(id__in=[m.id for m in matches_to_delete]).delete()
+    Match.objects.bulk_create(matches_to_create, batch_size=BULK_BATCH_SIZE)
+    Match.objects.bulk_update(matches_to_update, MATCH_PLAN_FIELDS, batch_size=BULK_BATCH_SIZE)
 
     return brackets
 
 
-def compute_round_robin_standings(bracket: Bracket):
+def compute_round_robin_standings(bracket: Bracket, matches=None):
     if bracket.format != BracketFormat.ROUND_ROBIN:
         raise ValueError("Bracket não é round-robin")
 
-    matches = bracket.matches.filter(status=MatchStatus.FINISHED)
+    # `matches`: lutas já carregadas da chave (ex.: resultados oficiais do evento inteiro)
+    if matches is None:
+        matches = bracket.matches.filter(status=MatchStatus.FINISHED)
+    else:
+        matches = [m for m in matches if m.status == MatchStatus.FINISHED]
+
+    # Uma passada: estatísticas e matriz de confronto direto
     stats = {}
+    results = []
 
     def ensure(athlete_id):
         if athlete_id not in stats:
@@ -396,38 +406,14 @@ def compute_round_robin_standings(bracket: Bracket):
         stats[winner]["fight_points"] += m.fight_points_winner
         stats[loser]["losses"] += 1
         stats[loser]["fight_points"] += m.fight_points_loser
+        results.append((winner, loser))
 
-    # confronto direto helper
-    def head_to_head(a, b):
-        match = bracket.matches.filter(
-            status=MatchStatus.FINISHED,
-            winner_athlete_id__in=[a, b],
-        ).filter(
-            blue_athlete_id__in=[a, b],
-            white_athlete_id__in=[a, b],
-        ).first()
-        if match and match.winner_athlete_id in (a, b):
-            return match.winner_athlete_id
-        return None
-
-    athletes = list(stats.keys())
-
-    def sort_key(a):
-        return (-stats[a]["wins"], -stats[a]["fight_points"], a)
-
-    athletes.sort(key=sort_key)
-
-    i = 0
-    while i < len(athletes) - 1:
-        a, b = athletes[i], athletes[i + 1]
-        if (
-            stats[a]["wins"] == stats[b]["wins"]
-            and stats[a]["fight_points"] == stats[b]["fight_points"]
-        ):
-            winner = head_to_head(a, b)
-            if winner and winner != a:
-                athletes[i], athletes[i + 1] = athletes[i + 1], athletes[i]
-        i += 1
+    matrix = build_win_matrix(results)
+    athletes = rank_with_head_to_head(
+        list(stats.keys()),
+        key=lambda a: (-stats[a]["wins"], -stats[a]["fight_points"]),
+        matrix=matrix,
+    )
 
     ordered = []
     for athlete_id in athletes:
@@ -440,4 +426,3 @@ def compute_round_robin_standings(bracket: Bracket):
             }
         )
     return ordered
-
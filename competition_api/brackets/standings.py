@@ -0,0 +1,66 @@
+"""
+Round-robin standings helpers that work on already-loaded matches.
+
+`build_win_matrix` makes one pass over the finished matches and returns
+{winner: {loser: wins}}. `rank_with_head_to_head` orders athletes by a
+primary key (e.g. wins, fight points) and breaks N-way ties with a
+head-to-head mini-table: wins among the tied athletes only, re-applied
+to each sub-group that is still tied. No queries are issued.
+
+atletas.services.round_robin follows the same rules for the Luta model.
+"""
+from collections import defaultdict
+
+
+def build_win_matrix(results):
+    """
+    `results`: iterable of (winner_id, loser_id) pairs from finished matches.
+    Returns {winner_id: {loser_id: wins}}.
+    """
+    matrix = defaultdict(lambda: defaultdict(int))
+    for winner, loser in results:
+        if winner and loser:
+            matrix[winner][loser] += 1
+    return matrix
+
+
+def head_to_head_wins(matrix, athlete, group):
+    row = matrix.get(athlete, {})
+    return sum(row.get(other, 0) for other in group if other != athlete)
+
+
+def _split(items, key):
+    groups = []
+    for item in sorted(items, key=key):
+        if groups and key(groups[-1][0]) == key(item):
+            groups[-1].append(item)
+        else:
+            groups.append([item])
+    return groups
+
+
+def _resolve_tie(group, matrix, fallback):
+    if len(group) == 1:
+        return group
+    subgroups = _split(group, lambda a: -head_to_head_wins(matrix, a, group))
+    if len(subgroups) == 1:
+        # mini-table does not separate them
+        return sorted(group, key=fallback)
+    ordered = []
+    for subgroup in subgroups:
+        ordered.extend(_resolve_tie(subgroup, matrix, fallback))
+    return ordered
+
+
+def rank_with_head_to_head(athletes, key, matrix, fallback=None):
+    """
+    Orders `athletes` by `key` (ascending; negate values for "more is
+    better") and resolves every tied group with the head-to-head
+    mini-table. Athletes still tied are ordered by `fallback`
+    (default: the athlete id).
+    """
+    fallback = fallback or (lambda a: a)
+    ordered = []
+    for group in _split(athletes, key):
+        ordered.extend(_resolve_tie(group, matrix, fallback))
+    return ordered
@@ -0,0 +1,103 @@
+import uuid
+
+from django.test import TestCase
+
+from events.models import Event, EventStatus
+from registrations.models import Registration, RegistrationStatus
+from brackets.services import generate_brackets_for_event
+from brackets.models import Bracket, BracketFormat, BracketParticipant
+from matches.models import Match, MatchStatus
+
+
+class BulkGenerationTests(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(
+            id=uuid.uuid4(),
+            organization_id=uuid.uuid4(),
+            name="Open",
+            start_date="2025-01-01",
+            end_date="2025-01-02",
+            status=EventStatus.CLOSED,
+        )
+
+    def _create_regs(self, category_code, n):
+        return Registration.objects.bulk_create(
+            [
+                Registration(
+                    id=uuid.uuid4(),
+                    event_id=self.event.id,
+                    athlete_id=uuid.uuid4(),
+                    organization_id=uuid.uuid4(),
+                    status=RegistrationStatus.APPROVED,
+                    is_confirmed=True,
+                    disqualified=False,
+                    category_code_final=category_code,
+                    class_code="SUB-13",
+                    sex="M",
+                    belt_snapshot="BRANCA",
+                )
+                for _ in range(n)
+            ]
+        )
+
+    def test_query_count_does_not_grow_with_event_size(self):
+        for idx in range(4):
+            self._create_regs(f"CAT{idx}", 8)
+        # savepoint, evento, inscrições, chaves existentes, um INSERT por tabela, release
+        with self.assertNumQueries(8):
+            brackets = generate_brackets_for_event(self.event.id)
+        self.assertEqual(len(brackets), 4)
+        self.assertEqual(BracketParticipant.objects.count(), 32)
+        self.assertEqual(Match.objects.count(), 44)
+
+    def test_repechage_links_are_set_before_insert(self):
+        self._create_regs("CAT1", 8)
+        bracket = generate_brackets_for_event(self.event.id)[0]
+        self.assertEqual(bracket.format, BracketFormat.ELIMINATION_WITH_REPECHAGE)
+        matches = {m.id: m for m in bracket.matches.all()}
+
+        repechage = [m for m in matches.values() if m.phase == "REPECHAGE"]
+        self.assertEqual(len(repechage), 2)
+        self.assertEqual(sorted(m.match_number for m in repechage), [1, 2])
+        for match in repechage:
+            self.assertEqual(matches[match.source_blue_match_id].phase, "MAIN")
+            self.assertEqual(matches[match.source_white_match_id].round_number, 1)
+
+        bronzes = [m for m in matches.values() if m.phase == "BRONZE"]
+        self.assertEqual(len(bronzes), 2)
+        for bronze in bronzes:
+            self.assertEqual(matches[bronze.source_blue_match_id].phase, "REPECHAGE")
+            self.assertEqual(matches[bronze.source_white_match_id].round_number, 2)
+
+    def test_second_call_does_not_duplicate(self):
+        self._create_regs("CAT1", 4)
+        generate_brackets_for_event(self.event.id)
+        generate_brackets_for_event(self.event.id)
+        self.assertEqual(Bracket.objects.count(), 1)
+        self.assertEqual(BracketParticipant.objects.count(), 4)
+        self.assertEqual(Match.objects.count(), 6)
+
+    def test_regenerate_diffs_against_existing_rows(self):
+        self._create_regs("CAT1", 4)
+        fmt = {"CAT1": BracketFormat.SINGLE_ELIMINATION}
+        bracket = generate_brackets_for_event(self.event.id, format_by_category=fmt)[0]
+        before = {(m.round_number, m.match_number): m.id for m in bracket.matches.all()}
+
+        self._create_regs("CAT1", 1)
+        generate_brackets_for_event(self.event.id, format_by_category=fmt, regenerate=True)
+
+        after = {(m.round_number, m.match_number): m for m in bracket.matches.all()}
+        self.assertEqual(len(after), 7)  # 8 slots: 4 + 2 + 1
+        for key, match_id in before.items():
+            self.assertEqual(after[key].id, match_id)
+        final = after[(3, 1)]
+        self.assertEqual(final.source_blue_match_id, after[(2, 1)].id)
+        self.assertEqual(final.source_white_match_id, after[(2, 2)].id)
+        self.assertEqual(bracket.participants.count(), 5)
+
+    def test_regenerate_refuses_finished_brackets(self):
+        self._create_regs("CAT1", 2)
+        bracket = generate_brackets_for_event(self.event.id)[0]
+        bracket.matches.filter(match_number=1).update(status=MatchStatus.FINISHED)
+        with self.assertRaises(ValueError):
+            generate_brackets_for_event(self.event.id, regenerate=True)
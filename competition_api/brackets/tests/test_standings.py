@@ -0,0 +1,63 @@
+import uuid
+
+from django.test import SimpleTestCase, TestCase
+
+from events.models import Event, EventStatus
+from registrations.models import Registration, RegistrationStatus
+from brackets.models import BracketFormat
+from brackets.services import generate_brackets_for_event, compute_round_robin_standings
+from brackets.standings import build_win_matrix, rank_with_head_to_head
+from matches.models import MatchStatus
+
+
+class HeadToHeadRankingTests(SimpleTestCase):
+    def test_mini_table_orders_three_way_tie(self):
+        # a, b e c empatados no critério principal; no confronto entre eles a > b > c
+        matrix = build_win_matrix([("a", "b"), ("a", "c"), ("b", "c"), ("c", "d"), ("b", "d"), ("d", "a")])
+        ranked = rank_with_head_to_head(["c", "b", "a", "d"], key=lambda x: 0 if x != "d" else 1, matrix=matrix)
+        self.assertEqual(ranked, ["a", "b", "c", "d"])
+
+    def test_mini_table_is_reapplied_to_remaining_tie(self):
+        # a vence os três; b, c e d formam um ciclo e ficam na ordem do fallback
+        matrix = build_win_matrix([("a", "b"), ("a", "c"), ("a", "d"), ("b", "c"), ("c", "d"), ("d", "b")])
+        ranked = rank_with_head_to_head(["d", "c", "b", "a"], key=lambda x: 0, matrix=matrix)
+        self.assertEqual(ranked, ["a", "b", "c", "d"])
+
+
+class RoundRobinStandingsTests(TestCase):
+    def test_standings_use_loaded_matches_only(self):
+        event = Event.objects.create(
+            id=uuid.uuid4(),
+            organization_id=uuid.uuid4(),
+            name="Open",
+            start_date="2025-01-01",
+            end_date="2025-01-02",
+            status=EventStatus.CLOSED,
+        )
+        for _ in range(3):
+            Registration.objects.create(
+                id=uuid.uuid4(),
+                event_id=event.id,
+                athlete_id=uuid.uuid4(),
+                organization_id=uuid.uuid4(),
+                status=RegistrationStatus.APPROVED,
+                is_confirmed=True,
+                disqualified=False,
+                category_code_final="CAT1",
+                class_code="SUB-13",
+                sex="M",
+                belt_snapshot="BRANCA",
+            )
+        bracket = generate_brackets_for_event(event.id, format_by_category={"CAT1": BracketFormat.ROUND_ROBIN})[0]
+        matches = list(bracket.matches.order_by("match_number"))  # (0x1), (0x2), (1x2)
+        for match in matches:
+            match.status = MatchStatus.FINISHED
+            match.winner_athlete_id = match.blue_athlete_id
+            match.fight_points_winner = 10
+        # ciclo 0 > 1 > 2 > 0: todos com 1 vitória e 10 pontos
+        matches[1].winner_athlete_id = matches[1].white_athlete_id
+
+        with self.assertNumQueries(0):
+            standings = compute_round_robin_standings(bracket, matches=matches)
+        self.assertEqual([row["wins"] for row in standings], [1, 1, 1])
+        self.assertEqual([row["athlete_id"] for row in standings], sorted(row["athlete_id"] for row in standings))
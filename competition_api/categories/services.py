@@ -1,21 +1,113 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.cache import cache
+
 from categories.models import CategoryRule
 
 
+class CategoryRuleIndex:
+    """
+    Active category rules in memory, grouped by (sex, class_code).
+
+    Rules of each group are sorted by min_weight with parallel limit arrays, so
+    weight lookups are a bisect instead of a query per scale reading.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        grouped = defaultdict(list)
+        self._by_code = {}
+        for rule in CategoryRule.objects.filter(is_active=True).order_by("min_weight", "max_weight"):
+            grouped[(rule.sex, rule.class_code)].append(rule)
+            self._by_code[(rule.sex, rule.class_code, rule.category_code)] = rule
+        self._groups = {}
+        for key, rules in grouped.items():
+            max_weights = [rule.max_weight for rule in rules]
+            self._groups[key] = (
+                rules,
+                [rule.min_weight for rule in rules],
+                max_weights,
+                all(a <= b for a, b in zip(max_weights, max_weights[1:])),
+            )
+
+    def get_by_code(self, sex, class_code, category_code):
+        return self._by_code.get((sex, class_code, category_code))
+
+    def find_for_weight(self, sex, class_code, weight):
+        group = self._groups.get((sex, class_code))
+        if not group:
+            return None
+        rules, min_weights, max_weights, sorted_max = group
+        if not isinstance(weight, Decimal):
+            weight = Decimal(str(weight))
+        end = bisect_right(min_weights, weight)
+        # Overlapping rules (unsorted max weights) fall back to a linear scan
+        start = bisect_left(max_weights, weight, 0, end) if sorted_max else 0
+        for i in range(start, end):
+            if max_weights[i] >= weight:
+                return rules[i]
+        return None
+
+
+CACHE_VERSION_KEY = "categories:rule_index:version"
+CHECK_INTERVAL = 5  # seconds between reads of the shared version
+
+_lock = threading.Lock()
+_index = None
+_local_version = 0
+_checked_at = 0.0
+
+
+def _shared_version():
+    try:
+        return cache.get(CACHE_VERSION_KEY, 0)
+    except Exception:
+        return 0
+
+
+def rule_index():
+    """
+    Current index, rebuilt when invalidated in this process or in another one.
+
+    The version is published in the Django cache: with a shared backend
+    (Redis/database) other workers pick up a CategoryRule change within
+    CHECK_INTERVAL seconds; with the default local-memory cache only this
+    process sees it.
+    """
+    global _index, _local_version, _checked_at
+
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < CHECK_INTERVAL:
+        return _index
+
+    with _lock:
+        version = max(_local_version, _shared_version())
+        if _index is None or _index.version != version:
+            _index = CategoryRuleIndex(version)
+        _local_version = version
+        _checked_at = now
+        return _index
+
+
+def invalidate_rule_index():
+    """Drop the cached index everywhere; called on CategoryRule save/delete (see categories.signals)."""
+    global _index, _local_version
+    with _lock:
+        _local_version = max(_local_version, _shared_version()) + 1
+        _index = None
+    try:
+        cache.set(CACHE_VERSION_KEY, _local_version, None)
+    except Exception:
+        pass
+
+
 def get_rule_by_code(sex, class_code, category_code):
-    return CategoryRule.objects.filter(
-        sex=sex,
-        class_code=class_code,
-        category_code=category_code,
-        is_active=True,
-    ).first()
+    return rule_index().get_by_code(sex, class_code, category_code)
 
 
 def find_rule_for_weight(sex, class_code, weight):
-    return CategoryRule.objects.filter(
-        sex=sex,
-        class_code=class_code,
-        is_active=True,
-        min_weight__lte=weight,
-        max_weight__gte=weight,
-    ).first()
-
+    return rule_index().find_for_weight(sex, class_code, weight)
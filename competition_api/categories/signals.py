@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from categories.models import CategoryRule
+from categories.services import invalidate_rule_index
+
+
+@receiver([post_save, post_delete], sender=CategoryRule)
+def invalidate_rule_index_on_change(sender, **kwargs):
+    # After commit only: another worker rebuilding before it would cache the old rows
+    transaction.on_commit(invalidate_rule_index)
@@ -1,3 +1,37 @@
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from categories import services
+from categories.models import CategoryRule
+
+
+class RuleIndexVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        services.invalidate_rule_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rule = CategoryRule.objects.create(
+                sex="M", class_code="SUB-13", category_code="M-50", min_weight=Decimal("45.00"), max_weight=Decimal("50.00")
+            )
+
+    def test_save_invalidates_index(self):
+        self.assertEqual(services.find_rule_for_weight("M", "SUB-13", "48"), self.rule)
+        self.rule.max_weight = Decimal("47.00")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rule.save()
+            # Nothing is invalidated until the change is committed
+            self.assertEqual(services.find_rule_for_weight("M", "SUB-13", "48"), self.rule)
+        self.assertIsNone(services.find_rule_for_weight("M", "SUB-13", "48"))
+
+    def test_version_published_by_another_worker_rebuilds_index(self):
+        self.assertEqual(services.find_rule_for_weight("M", "SUB-13", "48"), self.rule)
+
+        # Another worker edits the rule: only the shared version tells this process
+        CategoryRule.objects.filter(pk=self.rule.pk).update(max_weight=Decimal("47.00"))
+        cache.set(services.CACHE_VERSION_KEY, services.rule_index().version + 1, None)
+        self.assertEqual(services.find_rule_for_weight("M", "SUB-13", "48"), self.rule)
+
+        services._checked_at -= services.CHECK_INTERVAL
+        self.assertIsNone(services.find_rule_for_weight("M", "SUB-13", "48"))
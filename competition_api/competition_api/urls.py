@@ -33,4 +33,5 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('matches/', include('matches.urls')),
     path('results/', include('results.urls')),
+    path('registrations/', include('registrations.urls')),
 ]
@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Iterable, Protocol
 from uuid import UUID
 
 
@@ -9,3 +9,7 @@ class CoreReadContract(Protocol):
 
     def get_athlete_profile(self, athlete_id: UUID) -> dict: ...
 
+    def athletes_belonging_to_org(self, athlete_ids: Iterable[UUID], org_id: UUID) -> set[UUID]: ...
+
+    def get_athlete_profiles(self, athlete_ids: Iterable[UUID]) -> dict[UUID, dict]: ...
+
@@ -1,10 +1,11 @@
 import logging
+from django.db import transaction
 from django.utils import timezone
 
 from registrations.models import Registration, RegistrationStatus
 from events.models import Event, EventStatus
 from contracts.core_read_contract import CoreReadContract
-from adapters.core_reader import CoreSQLReader
+from adapters.core_reader import CoreSQLReader, MemoizedCoreReader, profile_from_row
 from adapters.exceptions import CoreUnavailableError
 from brackets.belt_groups import canonical_class_code
 
@@ -90,6 +91,90 @@ def register_athlete_operational(
     )
 
 
+BULK_BATCH_SIZE = 500
+
+
+def register_many(
+    event: Event,
+    organization_id,
+    rows,
+    requested_by_user_id=None,
+    confirmed_by_user_id=None,
+    core_reader: CoreReadContract | None = None,
+):
+    """
+    Inscreve vários atletas de uma organização de uma vez.
+
+    `rows`: sequência de (athlete_id, class_code, category_code_requested).
+    O Core é consultado em lote (organização, vínculos e perfis: três
+    consultas no total), cada linha inválida gera um erro próprio e as
+    válidas são gravadas com um único bulk_create. Com
+    `confirmed_by_user_id` as inscrições já saem confirmadas, como em
+    `register_athlete_operational`.
+
+    Retorna {"created": [Registration], "errors": [{"index", "athlete_id", "error"}]}.
+    """
+    _validate_event_open(event)
+    rows = list(rows)
+    athlete_ids = [row[0] for row in rows]
+    reader = MemoizedCoreReader(core_reader or CoreSQLReader())
+    try:
+        if not reader.organization_exists_and_active(organization_id):
+            raise ValueError("Organização inexistente ou inativa")
+        members = reader.athletes_belonging_to_org(athlete_ids, organization_id)
+        profiles = reader.get_athlete_profiles(members)
+    except CoreUnavailableError as exc:
+        logging.getLogger(__name__).warning("Falha ao consultar Core", exc_info=exc)
+        raise
+
+    already_registered = set(
+        Registration.objects.filter(event_id=event.id, athlete_id__in=athlete_ids).values_list("athlete_id", flat=True)
+    )
+    confirmed_at = timezone.now() if confirmed_by_user_id else None
+
+    to_create = []
+    errors = []
+    seen = set()
+    for index, (athlete_id, class_code, category_code_requested) in enumerate(rows):
+        try:
+            if athlete_id in seen:
+                raise ValueError("Atleta repetido no lote")
+            seen.add(athlete_id)
+            if athlete_id in already_registered:
+                raise ValueError("Atleta já inscrito neste evento")
+            if athlete_id not in members:
+                raise ValueError("Atleta inexistente, inativo ou fora da organização")
+            profile = profiles.get(athlete_id)
+            profile = profile_from_row((profile["sex"], profile["belt"]) if profile else None)
+            class_code_canon = canonical_class_code(class_code)
+            if not class_code_canon:
+                raise ValueError("class_code inválido ou ausente")
+        except ValueError as exc:
+            errors.append({"index": index, "athlete_id": athlete_id, "error": str(exc)})
+            continue
+
+        to_create.append(
+            Registration(
+                event_id=event.id,
+                athlete_id=athlete_id,
+                organization_id=organization_id,
+                class_code=class_code_canon,
+                sex=profile["sex"],
+                belt_snapshot=profile["belt"],
+                status=RegistrationStatus.PENDING,
+                is_confirmed=bool(confirmed_by_user_id),
+                confirmed_at=confirmed_at,
+                confirmed_by_user_id=confirmed_by_user_id,
+                requested_by_user_id=requested_by_user_id,
+                category_code_requested=category_code_requested,
+            )
+        )
+
+    with transaction.atomic():
+        created = Registration.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+    return {"created": created, "errors": errors}
+
+
 def confirm_registration(registration: Registration, confirmed_by_user_id):
     if registration.is_confirmed:
         raise ValueError("Inscrição já confirmada")
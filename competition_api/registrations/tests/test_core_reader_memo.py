@@ -0,0 +1,50 @@
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from adapters.core_reader import MemoizedCoreReader
+from contracts.core_read_contract import CoreReadContract
+
+
+class MemoizedCoreReaderTests(SimpleTestCase):
+    def setUp(self):
+        self.org_id = uuid.uuid4()
+        self.athletes = [uuid.uuid4() for _ in range(3)]
+        self.outsider = uuid.uuid4()
+        self.reader = mock.Mock(spec=CoreReadContract)
+        self.reader.organization_exists_and_active.return_value = True
+        self.reader.athletes_belonging_to_org.return_value = set(self.athletes)
+        self.reader.get_athlete_profiles.return_value = {
+            self.athletes[0]: {"sex": "M", "belt": "BRANCA"},
+            self.athletes[1]: {"sex": "F", "belt": "AZUL"},
+            self.athletes[2]: {"sex": "M", "belt": None},
+        }
+
+    def test_prefetch_serves_single_lookups_without_new_queries(self):
+        memo = MemoizedCoreReader(self.reader)
+        memo.prefetch(self.athletes + [self.outsider], self.org_id)
+
+        for athlete_id in self.athletes:
+            self.assertTrue(memo.organization_exists_and_active(self.org_id))
+            self.assertTrue(memo.athlete_belongs_to_org(athlete_id, self.org_id))
+        self.assertFalse(memo.athlete_belongs_to_org(self.outsider, self.org_id))
+        self.assertEqual(memo.get_athlete_profile(self.athletes[1]), {"sex": "F", "belt": "AZUL"})
+        with self.assertRaises(ValueError):
+            memo.get_athlete_profile(self.athletes[2])  # incompleto
+        with self.assertRaises(ValueError):
+            memo.get_athlete_profile(self.outsider)  # não encontrado
+
+        self.assertEqual(self.reader.organization_exists_and_active.call_count, 1)
+        self.assertEqual(self.reader.athletes_belonging_to_org.call_count, 1)
+        self.assertEqual(self.reader.get_athlete_profiles.call_count, 1)
+        self.reader.athlete_belongs_to_org.assert_not_called()
+        self.reader.get_athlete_profile.assert_not_called()
+
+    def test_batch_only_fetches_missing_ids(self):
+        memo = MemoizedCoreReader(self.reader)
+        memo.athletes_belonging_to_org(self.athletes[:2], self.org_id)
+        memo.athletes_belonging_to_org(self.athletes, self.org_id)
+        self.assertEqual(
+            self.reader.athletes_belonging_to_org.call_args_list[1].args[0], [self.athletes[2]]
+        )
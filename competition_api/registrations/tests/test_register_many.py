@@ -0,0 +1,131 @@
+import json
+import time
+import uuid
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from registrations.models import Registration
+from registrations.services import register_many
+from registrations.views import register_many_view
+from events.models import Event, EventStatus
+from contracts.core_read_contract import CoreReadContract
+
+
+class RegisterManyTests(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(
+            id=uuid.uuid4(),
+            organization_id=uuid.uuid4(),
+            name="Open",
+            start_date="2025-01-01",
+            end_date="2025-01-02",
+            status=EventStatus.OPEN,
+        )
+        self.org_id = uuid.uuid4()
+        self.user = get_user_model().objects.create_user(username="academia", password="x")
+
+    def _reader(self, athlete_ids, profiles=None):
+        reader = mock.Mock(spec=CoreReadContract)
+        reader.organization_exists_and_active.return_value = True
+        reader.athletes_belonging_to_org.return_value = set(athlete_ids)
+        reader.get_athlete_profiles.return_value = (
+            profiles if profiles is not None else {a: {"sex": "M", "belt": "BRANCA"} for a in athlete_ids}
+        )
+        return reader
+
+    def test_reports_per_row_errors_and_creates_valid_rows(self):
+        ok, incomplete, outsider = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        reader = self._reader(
+            [ok, incomplete],
+            profiles={ok: {"sex": "M", "belt": "BRANCA"}, incomplete: {"sex": None, "belt": "AZUL"}},
+        )
+        outcome = register_many(
+            self.event,
+            self.org_id,
+            [(ok, "SUB-13", "M-50"), (ok, "SUB-13", None), (incomplete, "SUB-13", None), (outsider, "SUB-13", None)],
+            core_reader=reader,
+        )
+        self.assertEqual([reg.athlete_id for reg in outcome["created"]], [ok])
+        self.assertEqual([err["index"] for err in outcome["errors"]], [1, 2, 3])
+        self.assertEqual(Registration.objects.get().category_code_requested, "M-50")
+
+        again = register_many(self.event, self.org_id, [(ok, "SUB-13", None)], core_reader=reader)
+        self.assertEqual(again["errors"][0]["error"], "Atleta já inscrito neste evento")
+
+    def test_bench_200_athletes(self):
+        athlete_ids = [uuid.uuid4() for _ in range(200)]
+        reader = self._reader(athlete_ids)
+        rows = [(athlete_id, "SUB-13", None) for athlete_id in athlete_ids]
+
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            outcome = register_many(self.event, self.org_id, rows, core_reader=reader)
+        elapsed = time.perf_counter() - started
+
+        # Uma leitura (inscrições existentes); o resto é o bulk_create em lotes
+        selects = [q for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 1)
+
+        self.assertEqual(len(outcome["created"]), 200)
+        self.assertEqual(Registration.objects.filter(event_id=self.event.id).count(), 200)
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(reader.athletes_belonging_to_org.call_count, 1)
+        self.assertEqual(reader.get_athlete_profiles.call_count, 1)
+
+    def _post_view(self, payload, organization_id=None, role=None):
+        # Organização e papel vêm do usuário do core (autenticação compartilhada)
+        self.user.organization_id = organization_id
+        self.user.role = role
+        request = RequestFactory().post(
+            reverse("registrations:register_many"), data=json.dumps(payload), content_type="application/json"
+        )
+        request.user = self.user
+        return register_many_view(request)
+
+    def test_view_returns_created_and_errors(self):
+        athlete_id = uuid.uuid4()
+        payload = {
+            "event_id": str(self.event.id),
+            "organization_id": str(self.org_id),
+            "registrations": [
+                {"athlete_id": str(athlete_id), "class_code": "SUB-13"},
+                {"athlete_id": str(uuid.uuid4()), "class_code": "SUB-13"},
+            ],
+        }
+        with mock.patch("registrations.services.CoreSQLReader", return_value=self._reader([athlete_id])):
+            response = self._post_view(payload, organization_id=self.org_id)
+        self.assertEqual(response.status_code, 201)
+        body = json.loads(response.content)
+        self.assertEqual(len(body["created"]), 1)
+        self.assertEqual(body["errors"][0]["index"], 1)
+
+    def test_view_rejects_other_organization(self):
+        payload = {
+            "event_id": str(self.event.id),
+            "organization_id": str(uuid.uuid4()),
+            "registrations": [{"athlete_id": str(uuid.uuid4()), "class_code": "SUB-13"}],
+        }
+        with mock.patch("registrations.views.register_many") as register:
+            response = self._post_view(payload, organization_id=self.org_id)
+        self.assertEqual(response.status_code, 403)
+        register.assert_not_called()
+        self.assertFalse(Registration.objects.exists())
+
+        # Sem organização no usuário também é recusado
+        self.assertEqual(self._post_view(payload).status_code, 403)
+
+    def test_view_operations_registers_for_any_organization(self):
+        athlete_id = uuid.uuid4()
+        payload = {
+            "event_id": str(self.event.id),
+            "organization_id": str(self.org_id),
+            "registrations": [{"athlete_id": str(athlete_id), "class_code": "SUB-13"}],
+        }
+        with mock.patch("registrations.services.CoreSQLReader", return_value=self._reader([athlete_id])):
+            response = self._post_view(payload, role="OPERATIONS")
+        self.assertEqual(response.status_code, 201)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from registrations import views
+
+app_name = "registrations"
+
+urlpatterns = [
+    path("register-many/", views.register_many_view, name="register_many"),
+]
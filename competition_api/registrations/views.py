@@ -1,3 +1,96 @@
-from django.shortcuts import render
+import json
+import uuid
 
-# Create your views here.
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+
+from events.models import Event
+from adapters.exceptions import CoreUnavailableError
+from registrations.services import register_many
+
+
+def _user_is_operational(user):
+    return getattr(user, "role", None) == "OPERATIONS"
+
+
+def _user_can_register_for(user, organization_id):
+    """Operacional inscreve por qualquer organização; os demais, só pela própria."""
+    if _user_is_operational(user):
+        return True
+    user_organization_id = getattr(user, "organization_id", None)
+    return user_organization_id is not None and str(user_organization_id) == str(organization_id)
+
+
+def _parse_rows(payload):
+    rows = []
+    for item in payload.get("registrations") or []:
+        rows.append(
+            (
+                uuid.UUID(str(item["athlete_id"])),
+                item.get("class_code"),
+                item.get("category_code"),
+            )
+        )
+    return rows
+
+
+@require_POST
+def register_many_view(request):
+    """
+    Inscrição em lote (JSON):
+
+        {"event_id": "...", "organization_id": "...", "confirm": false,
+         "registrations": [{"athlete_id": "...", "class_code": "...", "category_code": "..."}]}
+
+    Responde 201 com as inscrições criadas e os erros por linha. Só o
+    operacional ou um usuário da própria organização pode inscrever;
+    `confirm` exige usuário operacional.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"detail": "Autenticação necessária."}, status=401)
+    try:
+        payload = json.loads(request.body or b"{}")
+        event_id = uuid.UUID(str(payload["event_id"]))
+        organization_id = uuid.UUID(str(payload["organization_id"]))
+        rows = _parse_rows(payload)
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({"detail": "JSON inválido: informe event_id, organization_id e registrations."}, status=400)
+
+    if not _user_can_register_for(request.user, organization_id):
+        return JsonResponse({"detail": "Sem permissão para inscrever por esta organização."}, status=403)
+
+    confirm = bool(payload.get("confirm"))
+    if confirm and not _user_is_operational(request.user):
+        return JsonResponse({"detail": "Confirmação restrita ao operacional."}, status=403)
+
+    event = Event.objects.filter(id=event_id).first()
+    if not event:
+        return JsonResponse({"detail": "Evento não encontrado."}, status=404)
+
+    user_id = getattr(request.user, "id", None)
+    try:
+        outcome = register_many(
+            event,
+            organization_id,
+            rows,
+            requested_by_user_id=user_id,
+            confirmed_by_user_id=user_id if confirm else None,
+        )
+    except CoreUnavailableError:
+        return JsonResponse({"detail": "Core indisponível; tente novamente."}, status=503)
+    except ValueError as exc:
+        return JsonResponse({"detail": str(exc)}, status=400)
+
+    return JsonResponse(
+        {
+            "created": [
+                {"id": str(reg.id), "athlete_id": str(reg.athlete_id), "class_code": reg.class_code}
+                for reg in outcome["created"]
+            ],
+            "errors": [
+                {"index": err["index"], "athlete_id": str(err["athlete_id"]), "error": err["error"]}
+                for err in outcome["errors"]
+            ],
+        },
+        status=201,
+    )
@@ -1,113 +1,158 @@
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 from django.db import transaction
 
 from results.models import OfficialResult
 from events.models import Event, EventStatus
-from brackets.models import Bracket, BracketFormat
-from matches.models import MatchStatus
+from brackets.models import Bracket, BracketFormat, BracketParticipant
+from matches.models import Match, MatchStatus
 from brackets.services import compute_round_robin_standings
 
+BULK_BATCH_SIZE = 500
+DECIDED_STATUSES = (MatchStatus.FINISHED, MatchStatus.WALKOVER)
 
-def _all_matches_completed(bracket: Bracket) -> bool:
-    return not bracket.matches.filter(status=MatchStatus.SCHEDULED).exists()
 
+def _loser(m):
+    if m.winner_athlete_id and m.blue_athlete_id and m.white_athlete_id:
+        return m.white_athlete_id if m.winner_athlete_id == m.blue_athlete_id else m.blue_athlete_id
+    return None
 
-def _fight_points_totals(bracket: Bracket):
+
+def _fight_points_totals(matches):
     totals = defaultdict(int)
-    for m in bracket.matches.filter(status=MatchStatus.FINISHED):
+    for m in matches:
+        if m.status != MatchStatus.FINISHED:
+            continue
         if m.winner_athlete_id:
             totals[m.winner_athlete_id] += m.fight_points_winner
-        loser = None
-        if m.winner_athlete_id and m.blue_athlete_id and m.white_athlete_id:
-            loser = m.white_athlete_id if m.winner_athlete_id == m.blue_athlete_id else m.blue_athlete_id
+        loser = _loser(m)
         if loser:
             totals[loser] += m.fight_points_loser
     return totals
 
 
+def _round_robin_placements(bracket: Bracket, matches):
+    standings = compute_round_robin_standings(bracket, matches=matches)
+    return [(row["athlete_id"], placement) for placement, row in enumerate(standings, start=1)]
+
+
+def _best_of_3_placements(matches):
+    # vence quem tiver mais vitórias na série; empate não gera resultado
+    wins = Counter(m.winner_athlete_id for m in matches if m.status in DECIDED_STATUSES and m.winner_athlete_id)
+    athletes = {a for m in matches for a in (m.blue_athlete_id, m.white_athlete_id) if a}
+    ranked = sorted(athletes, key=lambda a: (-wins[a], str(a)))
+    if len(ranked) != 2 or wins[ranked[0]] == wins[ranked[1]]:
+        return []
+    return [(ranked[0], 1), (ranked[1], 2)]
+
+
+def _elimination_placements(matches):
+    decided = [m for m in matches if m.status in DECIDED_STATUSES]
+    main = [m for m in decided if m.phase == "MAIN"]
+    if not main:
+        return []
+    final = max(main, key=lambda m: (m.round_number, -m.match_number))
+    if not final.winner_athlete_id:
+        return []
+    winner = final.winner_athlete_id
+    loser = final.blue_athlete_id if final.winner_athlete_id == final.white_athlete_id else final.white_athlete_id
+
+    rows = [(winner, 1)]
+    if loser:
+        rows.append((loser, 2))
+
+    bronzes = [m for m in decided if m.phase == "BRONZE" and m.winner_athlete_id]
+    if bronzes:
+        # repescagem: vencedores do bronze 3/4 e perdedores 5/6, estável por athlete_id
+        thirds = sorted(m.winner_athlete_id for m in bronzes)
+        fifths = sorted(filter(None, (_loser(m) for m in bronzes)))
+    else:
+        # semis losers -> 3/4 estável por athlete_id
+        thirds = sorted(filter(None, (_loser(m) for m in main if m.round_number == final.round_number - 1)))
+        fifths = []
+    rows.extend((athlete_id, idx) for idx, athlete_id in enumerate(thirds, start=3))
+    rows.extend((athlete_id, idx) for idx, athlete_id in enumerate(fifths, start=3 + len(thirds)))
+    return rows
+
+
+def _placements(bracket: Bracket, matches):
+    if bracket.format == BracketFormat.ROUND_ROBIN:
+        return _round_robin_placements(bracket, matches)
+    if bracket.format == BracketFormat.BEST_OF_3:
+        return _best_of_3_placements(matches)
+    return _elimination_placements(matches)
+
+
 @transaction.atomic
-def generate_official_results_for_event(event_id):
+def generate_official_results_for_event(event_id, changed_only=False):
+    """
+    Gera os resultados oficiais do evento a partir de uma única leitura das
+    lutas, agrupadas por chave em memória, e grava tudo com um bulk_create.
+
+    Com `changed_only=True` só as chaves com luta encerrada depois dos seus
+    resultados gravados (ou ainda sem resultado) são recalculadas; as demais
+    mantêm as linhas existentes. Retorna quantos resultados foram gravados.
+    """
     event = Event.objects.filter(id=event_id).first()
     if not event:
         raise ValueError("Evento não encontrado")
     if event.status != EventStatus.CLOSED:
         raise ValueError("Evento precisa estar CLOSED para gerar resultados oficiais")
 
-    brackets = Bracket.objects.filter(event_id=event_id, is_generated=True)
-    for b in brackets:
-        if not _all_matches_completed(b):
+    brackets = list(Bracket.objects.filter(event_id=event_id, is_generated=True))
+    matches_by_bracket = defaultdict(list)
+    for m in Match.objects.filter(bracket__event_id=event_id, bracket__is_generated=True):
+        if m.status == MatchStatus.SCHEDULED:
             raise ValueError("Existem lutas pendentes neste evento; finalize antes de gerar resultados oficiais")
+        matches_by_bracket[m.bracket_id].append(m)
 
-    OfficialResult.objects.filter(event_id=event_id).delete()
-    created = 0
+    organizations = {}
+    bracket_by_result = {}
+    category_by_bracket = {b.id: b.category_code for b in brackets}
+    for bracket_id, athlete_id, organization_id in BracketParticipant.objects.filter(
+        bracket_id__in=list(category_by_bracket)
+    ).values_list("bracket_id", "athlete_id", "organization_id"):
+        organizations[(bracket_id, athlete_id)] = organization_id
+        bracket_by_result[(category_by_bracket[bracket_id], athlete_id)] = bracket_id
 
-    for bracket in brackets:
-        fp_totals = _fight_points_totals(bracket)
-        if bracket.format == BracketFormat.ROUND_ROBIN:
-            standings = compute_round_robin_standings(bracket)
-            placement = 1
-            for row in standings:
-                OfficialResult.objects.create(
-                    event_id=event_id,
-                    category_code=bracket.category_code,
-                    athlete_id=row["athlete_id"],
-                    organization_id=None,
-                    placement=placement,
-                    fight_points_total=fp_totals.get(row["athlete_id"], row["fight_points"]),
-                )
-                placement += 1
-                created += 1
-        else:
-            # single elim simplificado: final + semis
-            matches = list(bracket.matches.filter(status__in=[MatchStatus.FINISHED, MatchStatus.WALKOVER]))
-            if not matches:
-                continue
-            final = max(matches, key=lambda m: (m.round_number, -m.match_number))
-            if not final.winner_athlete_id:
-                continue
-            winner = final.winner_athlete_id
-            loser = final.blue_athlete_id if final.winner_athlete_id == final.white_athlete_id else final.white_athlete_id
-
-            OfficialResult.objects.create(
-                event_id=event_id,
-                category_code=bracket.category_code,
-                athlete_id=winner,
-                organization_id=None,
-                placement=1,
-                fight_points_total=fp_totals.get(winner, 0),
+    targets = brackets
+    if changed_only:
+        stored = defaultdict(list)
+        for result_id, category_code, athlete_id, created_at in OfficialResult.objects.filter(
+            event_id=event_id
+        ).values_list("id", "category_code", "athlete_id", "created_at"):
+            stored[bracket_by_result.get((category_code, athlete_id))].append((result_id, created_at))
+
+        targets = []
+        stale_ids = [result_id for result_id, _ in stored.pop(None, [])]  # sem chave correspondente
+        for bracket in brackets:
+            rows = stored.get(bracket.id)
+            last_finished = max(
+                (m.finished_at for m in matches_by_bracket[bracket.id] if m.finished_at), default=None
             )
-            created += 1
-            if loser:
-                OfficialResult.objects.create(
-                    event_id=event_id,
-                    category_code=bracket.category_code,
-                    athlete_id=loser,
-                    organization_id=None,
-                    placement=2,
-                    fight_points_total=fp_totals.get(loser, 0),
-                )
-                created += 1
-
-            # semis losers -> 3/4 estável por athlete_id
-            semis = [m for m in matches if m.round_number == final.round_number - 1]
-            semi_losers = []
-            for m in semis:
-                if not m.winner_athlete_id:
-                    continue
-                if m.blue_athlete_id and m.white_athlete_id:
-                    loser_id = m.white_athlete_id if m.winner_athlete_id == m.blue_athlete_id else m.blue_athlete_id
-                    semi_losers.append(loser_id)
-            for idx, athlete_id in enumerate(sorted(semi_losers), start=3):
-                OfficialResult.objects.create(
+            if rows and (last_finished is None or last_finished <= min(created for _, created in rows)):
+                continue
+            targets.append(bracket)
+            stale_ids.extend(result_id for result_id, _ in rows or [])
+        if stale_ids:
+            OfficialResult.objects.filter(id__in=stale_ids).delete()
+    else:
+        OfficialResult.objects.filter(event_id=event_id).delete()
+
+    results = []
+    for bracket in targets:
+        matches = matches_by_bracket.get(bracket.id, [])
+        fp_totals = _fight_points_totals(matches)
+        for athlete_id, placement in _placements(bracket, matches):
+            results.append(
+                OfficialResult(
                     event_id=event_id,
                     category_code=bracket.category_code,
                     athlete_id=athlete_id,
-                    organization_id=None,
-                    placement=idx,
+                    organization_id=organizations.get((bracket.id, athlete_id)),
+                    placement=placement,
                     fight_points_total=fp_totals.get(athlete_id, 0),
                 )
-                created += 1
-
-    return created
-
+            )
+    OfficialResult.objects.bulk_create(results, batch_size=BULK_BATCH_SIZE)
+    return len(results)
@@ -0,0 +1,93 @@
+import uuid
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from events.models import Event, EventStatus
+from registrations.models import Registration, RegistrationStatus
+from brackets.models import BracketFormat
+from brackets.services import generate_brackets_for_event
+from matches.models import WinMethod
+from matches.services import record_match_result, advance_single_elimination
+from results.models import OfficialResult
+from results.services import generate_official_results_for_event
+
+
+class OfficialResultsTests(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(
+            id=uuid.uuid4(),
+            organization_id=uuid.uuid4(),
+            name="Open",
+            start_date="2025-01-01",
+            end_date="2025-01-02",
+            status=EventStatus.CLOSED,
+        )
+        for category_code, n in (("CAT1", 4), ("CAT2", 2)):
+            for _ in range(n):
+                Registration.objects.create(
+                    id=uuid.uuid4(),
+                    event_id=self.event.id,
+                    athlete_id=uuid.uuid4(),
+                    organization_id=uuid.uuid4(),
+                    status=RegistrationStatus.APPROVED,
+                    is_confirmed=True,
+                    disqualified=False,
+                    category_code_final=category_code,
+                    class_code="SUB-13",
+                    sex="M",
+                    belt_snapshot="BRANCA",
+                )
+        brackets = generate_brackets_for_event(
+            self.event.id, format_by_category={"CAT1": BracketFormat.SINGLE_ELIMINATION}
+        )
+        self.elim = next(b for b in brackets if b.category_code == "CAT1")
+        self.best_of_3 = next(b for b in brackets if b.category_code == "CAT2")
+        self._play()
+
+    def _play(self):
+        for match in self.elim.matches.filter(round_number=1).order_by("match_number"):
+            record_match_result(match, winner_athlete_id=match.blue_athlete_id, win_method=WinMethod.IPPON)
+            advance_single_elimination(self.elim, match)
+        self.final = self.elim.matches.get(round_number=2)
+        record_match_result(self.final, winner_athlete_id=self.final.white_athlete_id, win_method=WinMethod.WAZA_ARI)
+
+        matches = list(self.best_of_3.matches.order_by("match_number"))
+        self.champion = matches[0].white_athlete_id
+        for match in matches:
+            record_match_result(match, winner_athlete_id=self.champion, win_method=WinMethod.YUKO)
+
+    def test_placements_for_every_format_in_constant_queries(self):
+        # savepoint, evento, chaves, lutas, participantes, delete, insert, release
+        with self.assertNumQueries(8):
+            created = generate_official_results_for_event(self.event.id)
+        self.assertEqual(created, 6)
+
+        elim = {r.placement: r for r in OfficialResult.objects.filter(category_code="CAT1")}
+        self.assertEqual(sorted(elim), [1, 2, 3, 4])
+        self.assertEqual(elim[1].athlete_id, self.final.white_athlete_id)
+        self.assertEqual(elim[1].fight_points_total, 10 + 7)
+        self.assertTrue(all(r.organization_id for r in elim.values()))
+
+        champion = OfficialResult.objects.get(category_code="CAT2", placement=1)
+        self.assertEqual(champion.athlete_id, self.champion)
+
+    def test_changed_only_recomputes_changed_brackets(self):
+        generate_official_results_for_event(self.event.id)
+        untouched = set(OfficialResult.objects.filter(category_code="CAT2").values_list("id", flat=True))
+
+        self.assertEqual(generate_official_results_for_event(self.event.id, changed_only=True), 0)
+
+        self.final.winner_athlete_id = self.final.blue_athlete_id
+        self.final.finished_at = timezone.now() + timedelta(seconds=1)
+        self.final.save(update_fields=["winner_athlete_id", "finished_at"])
+
+        self.assertEqual(generate_official_results_for_event(self.event.id, changed_only=True), 4)
+        self.assertEqual(
+            OfficialResult.objects.get(category_code="CAT1", placement=1).athlete_id,
+            self.final.blue_athlete_id,
+        )
+        self.assertEqual(
+            set(OfficialResult.objects.filter(category_code="CAT2").values_list("id", flat=True)), untouched
+        )
@@ -6,3 +6,9 @@ preload_app = True
 timeout = 120
 keepalive = 5
 
+
+
+def worker_exit(server, worker):
+    # Grava o histórico que ainda está no buffer do worker (atletas.utils_historico)
+    from atletas.utils_historico import descarregar_historico
+    descarregar_historico()
@@ -269,6 +269,42 @@ SESSION_COOKIE_SAMESITE = 'Lax'
 SESSION_SAVE_EVERY_REQUEST = False
 # NUNCA permitir login automático - sempre exigir usuário e senha
 
+# Tarefas em segundo plano (atletas.services.tarefas)
+# Em produção as tarefas ficam na fila e são executadas por `manage.py processar_tarefas`.
+# TAREFAS_EXECUCAO_IMEDIATA=True executa na própria requisição: obrigatório em deploys sem worker
+# (ex.: Render com SQLite no disco do serviço web, ver RENDER_DEPLOY.md) e em desenvolvimento.
+TAREFAS_EXECUCAO_IMEDIATA = os.getenv('TAREFAS_EXECUCAO_IMEDIATA', 'False') == 'True'
+
+# Histórico de ações (atletas.utils_historico): gravação write-behind em lotes de HISTORICO_LOTE,
+# no máximo HISTORICO_INTERVALO_FLUSH segundos após o evento. HISTORICO_BUFFER_MAX limita a memória
+# por processo. HISTORICO_ESCRITA_SINCRONA=True grava cada registro na hora (testes/depuração).
+HISTORICO_ESCRITA_SINCRONA = os.getenv('HISTORICO_ESCRITA_SINCRONA', 'False') == 'True'
+HISTORICO_LOTE = int(os.getenv('HISTORICO_LOTE', '200'))
+HISTORICO_INTERVALO_FLUSH = float(os.getenv('HISTORICO_INTERVALO_FLUSH', '2.0'))
+HISTORICO_BUFFER_MAX = int(os.getenv('HISTORICO_BUFFER_MAX', '5000'))
+
+# Arquivos JSONL.gz do histórico de campeonatos encerrados (`manage.py arquivar_historico`).
+# Sem padrão de propósito: o arquivamento apaga as linhas da tabela, então exige um diretório
+# durável informado explicitamente (ex.: /var/data/arquivo_historico no disco persistente do
+# Render; a pasta do projeto é recriada a cada deploy).
+HISTORICO_ARQUIVO_DIR = os.getenv('HISTORICO_ARQUIVO_DIR', '')
+
+# Segundos que o OrganizacaoMiddleware mantém organização/campeonato ativo em memória.
+# Alterações salvas no mesmo processo invalidam na hora; o TTL limita a defasagem entre workers.
+ORGANIZACAO_CACHE_TTL = int(os.getenv('ORGANIZACAO_CACHE_TTL', '60'))
+
+# Segundos que o snapshot de autorização na sessão (academia_required/operacional_required)
+# dispensa consultas; alterações de academia/credencial/perfil invalidam antes (atletas.services.autorizacao_sessao).
+AUTORIZACAO_SESSAO_TTL = int(os.getenv('AUTORIZACAO_SESSAO_TTL', '60'))
+
+# Instrumentação por etapa (atletas.services.instrumentacao): tempo, consultas e tempo de banco
+# das últimas INSTRUMENTACAO_JANELA execuções de cada etapa (pesagem, geração de chaves).
+INSTRUMENTACAO_ATIVA = os.getenv('INSTRUMENTACAO_ATIVA', 'True') == 'True'
+INSTRUMENTACAO_JANELA = int(os.getenv('INSTRUMENTACAO_JANELA', '1000'))
+
+# Auditoria detalhada de pesagem/chaves: ATLETAS_LOG_LEVEL=DEBUG (padrão: apenas erros)
+ATLETAS_LOG_LEVEL = os.getenv('ATLETAS_LOG_LEVEL', 'ERROR')
+
 # Logging para capturar erros
 LOGGING = {
     'version': 1,
@@ -281,7 +317,7 @@ LOGGING = {
         },
         'console': {
             'class': 'logging.StreamHandler',
-            'level': 'ERROR',
+            'level': ATLETAS_LOG_LEVEL,
         },
     },
     'loggers': {
@@ -292,7 +328,7 @@ LOGGING = {
         },
         'atletas': {
             'handlers': ['file', 'console'],
-            'level': 'ERROR',
+            'level': ATLETAS_LOG_LEVEL,
             'propagate': True,
         },
     },
@@ -10,27 +10,59 @@ from contracts.competition_read_contract import CompetitionReadContract
 logger = logging.getLogger(__name__)
 
 
+def _as_uuid(value) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def _official_result(row) -> dict:
+    return {
+        "event_id": row[0],
+        "category_code": row[1],
+        "athlete_id": row[2],
+        "organization_id": row[3],
+        "placement": row[4],
+        "points": row[5],
+    }
+
+
 class CompetitionSQLReader:
+    """
+    Uma instância por unidade de trabalho (ex.: uma importação): eventos já
+    confirmados como CLOSED ficam memorizados, então `list_official_results`
+    não repete a checagem que o chamador acabou de fazer. Só o status CLOSED
+    é memorizado; um evento ainda aberto é consultado de novo.
+    """
+
     statement_timeout_ms = 2000  # fail fast
 
+    def __init__(self):
+        self._closed_events = set()
+
     def _set_statement_timeout(self, cursor):
         cursor.execute(f"SET LOCAL statement_timeout = {self.statement_timeout_ms}")
 
     def event_is_closed(self, event_id: UUID) -> bool:
-        query = """
-            SELECT 1
-            FROM competition.events_event
-            WHERE id = %s AND status = 'CLOSED'
-            LIMIT 1
-        """
-        try:
-            with connection.cursor() as cursor:
-                self._set_statement_timeout(cursor)
-                cursor.execute(query, [event_id])
-                return cursor.fetchone() is not None
-        except (OperationalError, DatabaseError) as exc:
-            logger.warning("Competition indisponível ao validar evento", exc_info=exc)
-            raise CompetitionUnavailableError("Competition indisponível") from exc
+        return _as_uuid(event_id) in self.closed_events([event_id])
+
+    def closed_events(self, event_ids) -> set:
+        """IDs (dentre `event_ids`) de eventos CLOSED, com uma consulta para os ainda não memorizados."""
+        event_ids = {_as_uuid(event_id) for event_id in event_ids}
+        pending = [event_id for event_id in event_ids if event_id not in self._closed_events]
+        if pending:
+            query = """
+                SELECT id
+                FROM competition.events_event
+                WHERE id = ANY(%s) AND status = 'CLOSED'
+            """
+            try:
+                with connection.cursor() as cursor:
+                    self._set_statement_timeout(cursor)
+                    cursor.execute(query, [pending])
+                    self._closed_events.update(_as_uuid(row[0]) for row in cursor.fetchall())
+            except (OperationalError, DatabaseError) as exc:
+                logger.warning("Competition indisponível ao validar evento", exc_info=exc)
+                raise CompetitionUnavailableError("Competition indisponível") from exc
+        return event_ids & self._closed_events
 
     def list_event_results(self, event_id: UUID) -> list[dict]:
         # Garante que só retornará dados se o evento estiver CLOSED
@@ -71,34 +103,29 @@ class CompetitionSQLReader:
         return results
 
     def list_official_results(self, event_id: UUID) -> list[dict]:
-        if not self.event_is_closed(event_id):
-            return []
+        return self.list_official_results_for_events([event_id]).get(_as_uuid(event_id), [])
+
+    def list_official_results_for_events(self, event_ids) -> dict:
+        """{event_id: resultados oficiais} dos eventos CLOSED, em uma consulta."""
+        closed = self.closed_events(event_ids)
+        if not closed:
+            return {}
         query = """
             SELECT event_id, category_code, athlete_id, organization_id, placement, fight_points_total
             FROM competition.results_officialresult
-            WHERE event_id = %s
-            ORDER BY category_code, placement
+            WHERE event_id = ANY(%s)
+            ORDER BY event_id, category_code, placement
         """
         try:
             with connection.cursor() as cursor:
                 self._set_statement_timeout(cursor)
-                cursor.execute(query, [event_id])
+                cursor.execute(query, [list(closed)])
                 rows = cursor.fetchall()
         except (OperationalError, DatabaseError) as exc:
             logger.warning("Competition indisponível ao listar resultados oficiais", exc_info=exc)
             raise CompetitionUnavailableError("Competition indisponível") from exc
 
-        results = []
+        results = {event_id: [] for event_id in closed}
         for row in rows:
-            results.append(
-                {
-                    "event_id": row[0],
-                    "category_code": row[1],
-                    "athlete_id": row[2],
-                    "organization_id": row[3],
-                    "placement": row[4],
-                    "points": row[5],
-                }
-            )
+            results[_as_uuid(row[0])].append(_official_result(row))
         return results
-
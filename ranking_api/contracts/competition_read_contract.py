@@ -8,3 +8,7 @@ class CompetitionReadContract(Protocol):
 
     def list_official_results(self, event_id) -> list[dict]: ...
 
+    def closed_events(self, event_ids) -> set: ...
+
+    def list_official_results_for_events(self, event_ids) -> dict: ...
+
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+def remove_duplicates(apps, schema_editor):
+    # Mantém o resultado mais recente de cada (event_id, athlete_id)
+    Result = apps.get_model("results", "Result")
+    seen = set()
+    duplicates = []
+    for result_id, event_id, athlete_id in Result.objects.order_by("-created_at").values_list(
+        "id", "event_id", "athlete_id"
+    ):
+        if (event_id, athlete_id) in seen:
+            duplicates.append(result_id)
+        else:
+            seen.add((event_id, athlete_id))
+    if duplicates:
+        Result.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="result",
+            constraint=models.UniqueConstraint(fields=("event_id", "athlete_id"), name="results_result_unique_event_athlete"),
+        ),
+    ]
@@ -12,6 +12,11 @@ class Result(models.Model):
     points = models.PositiveIntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event_id", "athlete_id"], name="results_result_unique_event_athlete"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.event_id} - {self.athlete_id} ({self.points} pts)"
 
@@ -1,10 +1,14 @@
 import logging
 
+from django.db import transaction
+
 from results.models import Result
 from contracts.competition_read_contract import CompetitionReadContract
 from adapters.competition_reader import CompetitionSQLReader
 from adapters.exceptions import CompetitionUnavailableError
-from teams.services import add_points_to_team
+from teams.services import recompute_team_scores
+
+BULK_BATCH_SIZE = 500
 
 
 def _ensure_points(points):
@@ -68,18 +72,29 @@ def import_results_from_competition(event_id, reader: CompetitionReadContract |
         logging.getLogger(__name__).warning("Competition indisponível ao importar resultados oficiais", exc_info=exc)
         raise
 
-    imported = []
+    # Um resultado por (event_id, athlete_id): se o atleta vier repetido, vale o último
+    rows = {}
     for res in external_results:
         points_value = res.get("points", 0) or 0
-        result = upsert_result(
-            res["event_id"],
-            res["athlete_id"],
-            res["organization_id"],
-            res["placement"],
-            points_value,
+        _ensure_points(points_value)
+        rows[(res["event_id"], res["athlete_id"])] = Result(
+            event_id=res["event_id"],
+            athlete_id=res["athlete_id"],
+            organization_id=res["organization_id"],
+            placement=res["placement"],
+            points=points_value,
         )
-        add_points_to_team(res["event_id"], res["organization_id"], points_value)
-        imported.append(result)
 
-    return imported
+    # Upsert em lote + totais das equipes recalculados por agregação (idempotente)
+    with transaction.atomic():
+        imported = Result.objects.bulk_create(
+            list(rows.values()),
+            update_conflicts=True,
+            unique_fields=["event_id", "athlete_id"],
+            update_fields=["organization_id", "placement", "points"],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        for imported_event_id in {result.event_id for result in imported}:
+            recompute_team_scores(imported_event_id)
 
+    return imported
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+
+def remove_duplicates(apps, schema_editor):
+    # Totais duplicados vieram de importações concorrentes; o próximo import recalcula o total
+    TeamScore = apps.get_model("teams", "TeamScore")
+    seen = set()
+    duplicates = []
+    for score_id, event_id, organization_id in TeamScore.objects.order_by("-points_total").values_list(
+        "id", "event_id", "organization_id"
+    ):
+        if (event_id, organization_id) in seen:
+            duplicates.append(score_id)
+        else:
+            seen.add((event_id, organization_id))
+    if duplicates:
+        TeamScore.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teams", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="teamscore",
+            constraint=models.UniqueConstraint(
+                fields=("event_id", "organization_id"), name="teams_teamscore_unique_event_organization"
+            ),
+        ),
+    ]
@@ -9,6 +9,11 @@ class TeamScore(models.Model):
     organization_id = models.UUIDField()
     points_total = models.PositiveIntegerField()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event_id", "organization_id"], name="teams_teamscore_unique_event_organization"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.organization_id} - {self.points_total} pts"
 
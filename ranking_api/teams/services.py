@@ -1,3 +1,5 @@
+from django.db.models import Sum
+
 from teams.models import TeamScore
 
 
@@ -29,6 +31,37 @@ def add_points_to_team(event_id, organization_id, points_delta):
     return team_score
 
 
+def recompute_team_scores(event_id):
+    """
+    Recalcula os totais do evento a partir dos Results (soma por
+    organization_id) e grava todos com um único upsert. Como o total é
+    derivado, reimportar o mesmo evento não soma os pontos de novo.
+    """
+    from results.models import Result
+
+    totals = (
+        Result.objects.filter(event_id=event_id)
+        .values("organization_id")
+        .annotate(points_total=Sum("points"))
+        .order_by()
+    )
+    scores = [
+        TeamScore(event_id=event_id, organization_id=row["organization_id"], points_total=row["points_total"] or 0)
+        for row in totals
+    ]
+    TeamScore.objects.bulk_create(
+        scores,
+        update_conflicts=True,
+        unique_fields=["event_id", "organization_id"],
+        update_fields=["points_total"],
+    )
+    # Organizações que não têm mais resultados no evento
+    TeamScore.objects.filter(event_id=event_id).exclude(
+        organization_id__in=[score.organization_id for score in scores]
+    ).update(points_total=0)
+    return scores
+
+
 def set_team_score(event_id, organization_id, points_total):
     _ensure_int(points_total, "points_total")
 